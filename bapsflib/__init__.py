@@ -21,9 +21,14 @@ https://github.com/rocco8773/bapsflib
 """
 # --- Public API -------------------------------------------------------
 
-from . import _hdf
-from . import lapd
-from . import plasma
+# - sub-packages are imported on first access (see
+#   :mod:`bapsflib.utils.lazyload`)
+from .utils import lazyload
+
+__getattr__, __dir__, __all__ = lazyload.attach(
+    __name__,
+    submodules=['_hdf', 'aio', 'export', 'lapd', 'overview',
+                'plasma', 'synthetic', 'utils'])
 
 # --- Define version ---------------------------------------------------
 __version__ = '1.0.1.dev'
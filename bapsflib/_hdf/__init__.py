@@ -13,7 +13,10 @@ This package contains the mapping classes (in :mod:`~.maps`) and file
 access classes (in :mod:`~.utils`) used to map and interface with the
 HDF5 files generated at BaPSF.
 """
-from .maps import (ConType, HDFMap)
-from .utils.file import File
+from bapsflib.utils import lazyload
 
-__all__ = ['ConType', 'File', 'HDFMap']
+__getattr__, __dir__, __all__ = lazyload.attach(
+    __name__,
+    submodules=['maps', 'utils'],
+    submod_attrs={'maps': ['ConType', 'HDFMap'],
+                  'utils.file': ['File']})
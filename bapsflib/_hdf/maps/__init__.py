@@ -19,12 +19,12 @@ mapping :ibf:`Digitizer` HDF5 groups, and
 :mod:`~.msi` contains routines for mapping
 :ibf:`MSI Diagnostic` HDF5 groups.
 """
-from . import hdfmap
-from .controls import (ConType, HDFMapControls)
-from .digitizers import HDFMapDigitizers
-from .hdfmap import HDFMap
-from .msi import HDFMapMSI
-from .tests.fauxhdfbuilder import FauxHDFBuilder
+from bapsflib.utils import lazyload
 
-__all__ = ['ConType', 'FauxHDFBuilder', 'hdfmap', 'HDFMap',
-           'HDFMapControls', 'HDFMapDigitizers', 'HDFMapMSI']
+__getattr__, __dir__, __all__ = lazyload.attach(
+    __name__,
+    submodules=['helpers', 'hdfmap'],
+    submod_attrs={'controls': ['ConType', 'HDFMapControls'],
+                  'digitizers': ['HDFMapDigitizers'],
+                  'hdfmap': ['HDFMap'],
+                  'msi': ['HDFMapMSI']})
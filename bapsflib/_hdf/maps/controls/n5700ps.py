@@ -17,6 +17,7 @@ from warnings import warn
 
 from .contype import ConType
 from .templates import HDFMapControlCLTemplate
+from ..helpers import read_attrs
 
 
 class HDFMapControlN5700PS(HDFMapControlCLTemplate):
@@ -67,8 +68,9 @@ class HDFMapControlN5700PS(HDFMapControlCLTemplate):
         # - assume all configurations are active (i.e. used)
         #
         for name in self.subgroup_names:
-            # get configuration group
+            # get configuration group and a snapshot of its attributes
             cong = self.group[name]
+            cong_attrs = read_attrs(cong)
 
             # get dataset
             try:
@@ -92,23 +94,16 @@ class HDFMapControlN5700PS(HDFMapControlCLTemplate):
             for pair in pairs:
                 try:
                     # get attribute value
-                    val = cong.attrs[pair[1]]
+                    val = cong_attrs[pair[1]]
 
                     # condition value
+                    # - strings are already decoded to 'utf-8'
                     if pair[0] == 'command list':
-                        # - val gets returned as a np.bytes_ string
                         # - split line returns
                         # - remove trailing/leading whitespace
                         #
-                        val = val.decode('utf-8').splitlines()
-                        val = tuple([cls.strip() for cls in val])
-                    else:
-                        # pair[0] in ('IP address',
-                        #             'power supply device',
-                        #             'initial state'):
-                        # - val is a np.bytes_ string
-                        #
-                        val = val.decode('utf-8')
+                        val = tuple([cls.strip()
+                                     for cls in val.splitlines()])
 
                     # assign val to _configs
                     self._configs[name][pair[0]] = val
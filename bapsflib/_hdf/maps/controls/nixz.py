@@ -16,6 +16,7 @@ from warnings import warn
 
 from .contype import ConType
 from .templates import HDFMapControlTemplate
+from ..helpers import read_attrs
 
 
 class HDFMapControlNIXZ(HDFMapControlTemplate):
@@ -83,17 +84,20 @@ class HDFMapControlNIXZ(HDFMapControlTemplate):
         # ---- define motion list values                            ----
         self.configs[cname]['motion lists'] = {}
 
-        # get sub-group names (i.e. ml names)
-        _ml_names = []
+        # get sub-group names (i.e. ml names) and a snapshot of their
+        # attributes
+        _ml_attrs = {}
         for name in self.group:
-            if isinstance(self.group[name], h5py.Group):
-                _ml_names.append(name)
+            obj = self.group[name]
+            if isinstance(obj, h5py.Group):
+                _ml_attrs[name] = read_attrs(obj)
+        _ml_names = list(_ml_attrs)
 
         # a motion list group must have the attributes
         # Nx, Nz, dx, dz, x0, z0
         names_to_remove = []
         for name in _ml_names:
-            if all(attr not in self.group[name].attrs
+            if all(attr not in _ml_attrs[name]
                    for attr in ('Nx', 'Ny', 'dx', 'dz', 'x0', 'z0')):
                 names_to_remove.append(name)
         if bool(names_to_remove):
@@ -126,12 +130,9 @@ class HDFMapControlNIXZ(HDFMapControlTemplate):
             for pair in pairs:
                 try:
                     # get attribute value
-                    val = self.group[name].attrs[pair[1]]
+                    val = _ml_attrs[name][pair[1]]
 
                     # condition value
-                    if np.issubdtype(type(val), np.bytes_):
-                        # - val is a np.bytes_ string
-                        val = val.decode('utf-8')
                     if pair[1] == 'fan_XZ':
                         # convert to boolean
                         if val == 'TRUE':
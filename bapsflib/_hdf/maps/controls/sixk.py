@@ -17,6 +17,7 @@ from warnings import warn
 
 from .contype import ConType
 from .templates import HDFMapControlTemplate
+from ..helpers import read_attrs
 
 
 class HDFMapControl6K(HDFMapControlTemplate):
@@ -230,8 +231,9 @@ class HDFMapControl6K(HDFMapControlTemplate):
             ml = {'name': _match.group('NAME'),
                   'config': {}}
 
-            # get ml group
+            # get ml group and a snapshot of its attributes
             mlg = self.group[gname]
+            mlg_attrs = read_attrs(mlg)
 
             # gather motion list info
             # -- define 'group name' and 'group path' --
@@ -240,10 +242,7 @@ class HDFMapControl6K(HDFMapControlTemplate):
 
             # -- check ML name --
             try:
-                ml_name = mlg.attrs['Motion list']
-                if np.issubdtype(type(ml_name), np.bytes_):
-                    # decode to 'utf-8'
-                    ml_name = ml_name.decode('utf-8')
+                ml_name = mlg_attrs['Motion list']
 
                 if ml['name'] != ml_name:
                     warn_str = ("Discovered motion list name '"
@@ -265,12 +264,7 @@ class HDFMapControl6K(HDFMapControlTemplate):
             for pair in pairs:
                 try:
                     # get attribute value
-                    val = mlg.attrs[pair[1]]
-
-                    # condition value
-                    if np.issubdtype(type(val), np.bytes_):
-                        # - val is a np.bytes_ string
-                        val = val.decode('utf-8')
+                    val = mlg_attrs[pair[1]]
 
                     # assign val
                     ml['config'][pair[0]] = val
@@ -283,8 +277,8 @@ class HDFMapControl6K(HDFMapControlTemplate):
 
             # -- check 'delta' --
             try:
-                val = np.array([mlg.attrs['Delta x'],
-                                mlg.attrs['Delta y'],
+                val = np.array([mlg_attrs['Delta x'],
+                                mlg_attrs['Delta y'],
                                 0.0])
                 ml['config']['delta'] = val
             except KeyError:
@@ -296,8 +290,8 @@ class HDFMapControl6K(HDFMapControlTemplate):
 
             # -- check 'center' --
             try:
-                val = np.array([mlg.attrs['Grid center x'],
-                                mlg.attrs['Grid center y'],
+                val = np.array([mlg_attrs['Grid center x'],
+                                mlg_attrs['Grid center y'],
                                 0.0])
                 ml['config']['center'] = val
             except KeyError:
@@ -310,8 +304,8 @@ class HDFMapControl6K(HDFMapControlTemplate):
 
             # -- check 'npoints' --
             try:
-                val = np.array([mlg.attrs['Nx'],
-                                mlg.attrs['Ny'],
+                val = np.array([mlg_attrs['Nx'],
+                                mlg_attrs['Ny'],
                                 1])
                 ml['config']['npoints'] = val
             except KeyError:
@@ -360,8 +354,9 @@ class HDFMapControl6K(HDFMapControlTemplate):
             pl = {'name': _match.group('NAME'),
                   'config': {}}
 
-            # get pl group
+            # get pl group and a snapshot of its attributes
             plg = self.group[gname]
+            plg_attrs = read_attrs(plg)
 
             # gather pl info
             # -- define 'group name', 'group path', and 'probe name' --
@@ -372,10 +367,7 @@ class HDFMapControl6K(HDFMapControlTemplate):
             # -- check PL name --
             try:
                 # get value
-                pl_name = plg.attrs['Probe']
-                if np. issubdtype(type(pl_name), np.bytes_):
-                    # decode to 'utf-8'
-                    pl_name = pl_name.decode('utf-8')
+                pl_name = plg_attrs['Probe']
 
                 # check against discovered probe name
                 if pl['name'] != pl_name:
@@ -398,7 +390,7 @@ class HDFMapControl6K(HDFMapControlTemplate):
                 pl['config']['receptacle'] = int(_match.group('RNUM'))
 
                 # get value
-                rnum = plg.attrs['Receptacle']
+                rnum = plg_attrs['Receptacle']
 
                 # check against discovered receptacle number
                 if pl['config']['receptacle'] != rnum:
@@ -428,12 +420,7 @@ class HDFMapControl6K(HDFMapControlTemplate):
             for pair in pairs:
                 try:
                     # get value
-                    val = plg.attrs[pair[1]]
-
-                    # condition value
-                    if np.issubdtype(type(val), np.bytes_):
-                        # - val is a np.bytes_ string
-                        val = val.decode('utf-8')
+                    val = plg_attrs[pair[1]]
 
                     # assign val
                     pl['config'][pair[0]] = val
@@ -14,7 +14,7 @@ import os
 import re
 import unittest as ut
 
-from bapsflib._hdf.maps import FauxHDFBuilder
+from bapsflib.synthetic import FauxHDFBuilder
 
 from .. import ConType
 from ..templates import (HDFMapControlTemplate,
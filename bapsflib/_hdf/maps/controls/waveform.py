@@ -17,6 +17,7 @@ from warnings import warn
 
 from .contype import ConType
 from .templates import HDFMapControlCLTemplate
+from ..helpers import read_attrs
 
 
 class HDFMapControlWaveform(HDFMapControlCLTemplate):
@@ -68,8 +69,9 @@ class HDFMapControlWaveform(HDFMapControlCLTemplate):
         # - assume all configurations are active (i.e. used)
         #
         for name in self.subgroup_names:
-            # get configuration group
+            # get configuration group and a snapshot of its attributes
             cong = self.group[name]
+            cong_attrs = read_attrs(cong)
 
             # get dataset
             try:
@@ -92,26 +94,16 @@ class HDFMapControlWaveform(HDFMapControlCLTemplate):
             for pair in pairs:
                 try:
                     # get attribute value
-                    val = cong.attrs[pair[1]]
+                    val = cong_attrs[pair[1]]
 
                     # condition value
+                    # - strings are already decoded to 'utf-8'
                     if pair[0] == 'command list':
-                        # - val gets returned as a np.bytes_ string
                         # - split line returns
                         # - remove trailing/leading whitespace
                         #
-                        val = val.decode('utf-8').splitlines()
-                        val = tuple([cls.strip() for cls in val])
-                    elif pair[0] in ('IP address',
-                                     'generator device',
-                                     'initial state'):
-                        # - val is a np.bytes_ string
-                        #
-                        val = val.decode('utf-8')
-                    else:
-                        # no conditioning is needed
-                        # 'GPIB address' val is np.uint32
-                        pass
+                        val = tuple([cls.strip()
+                                     for cls in val.splitlines()])
 
                     # assign val to _configs
                     self._configs[name][pair[0]] = val
@@ -8,7 +8,6 @@
 # License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
 #   license terms and contributor agreement.
 #
-import astropy.units as u
 import h5py
 import numpy as np
 import os
@@ -19,6 +18,7 @@ from typing import (Any, Dict, Tuple, Union)
 from warnings import warn
 
 from .templates import HDFMapDigiTemplate
+from ..helpers import read_attrs
 
 
 class HDFMapDigiSIS3301(HDFMapDigiTemplate):
@@ -109,6 +109,8 @@ class HDFMapDigiSIS3301(HDFMapDigiTemplate):
             number of data samples average together
             "
         """
+        import astropy.units as u
+
         # 'Raw data + config/SIS 3301' group has only one possible
         # adc ('SIS 3301')
         # adc_info = (
@@ -127,14 +129,17 @@ class HDFMapDigiSIS3301(HDFMapDigiTemplate):
         # elements of `adc_info`
         conns = self._find_adc_connections(adc_name, config_group)
 
+        # snapshot of the configuration attributes
+        config_attrs = read_attrs(config_group)
+
         for conn in conns:
             # define 'bit' and 'clock rate'
             conn[2]['bit'] = 14
             conn[2]['clock rate'] = u.Quantity(100.0, unit='MHz')
 
             # add 'shot average (software)' to dict
-            if 'Shots to average' in config_group.attrs:
-                shtave = config_group.attrs['Shots to average']
+            if 'Shots to average' in config_attrs:
+                shtave = config_attrs['Shots to average']
                 if shtave == 0 or shtave == 1:
                     shtave = None
             else:
@@ -143,9 +148,8 @@ class HDFMapDigiSIS3301(HDFMapDigiTemplate):
 
             # add 'sample average (hardware)' to dict
             splave = None
-            if 'Samples to average' in config_group.attrs:
-                avestr = config_group.attrs['Samples to average']
-                avestr = avestr.decode('utf-8')
+            if 'Samples to average' in config_attrs:
+                avestr = config_attrs['Samples to average']
 
                 if avestr != 'No averaging':
                     _match = re.fullmatch(
@@ -536,7 +540,7 @@ class HDFMapDigiSIS3301(HDFMapDigiTemplate):
             # get board number
             brd_group = config_group[board]
             try:
-                brd = brd_group.attrs['Board']
+                brd = read_attrs(brd_group)['Board']
             except KeyError:
                 raise HDFMappingError(
                     self.info['group path'],
@@ -578,7 +582,7 @@ class HDFMapDigiSIS3301(HDFMapDigiTemplate):
                 # get channel number
                 ch_group = brd_group[ch_key]
                 try:
-                    ch = ch_group.attrs['Channel']
+                    ch = read_attrs(ch_group)['Channel']
                 except KeyError:
                     raise HDFMappingError(
                         self.info['group path'],
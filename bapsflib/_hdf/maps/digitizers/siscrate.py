@@ -8,7 +8,6 @@
 # License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
 #   license terms and contributor agreement.
 #
-import astropy.units as u
 import h5py
 import numpy as np
 import re
@@ -18,6 +17,7 @@ from typing import (Any, Dict, Tuple, Union)
 from warnings import warn
 
 from .templates import HDFMapDigiTemplate
+from ..helpers import read_attrs
 
 
 class HDFMapDigiSISCrate(HDFMapDigiTemplate):
@@ -509,7 +509,7 @@ class HDFMapDigiSISCrate(HDFMapDigiTemplate):
         :returns: tuple of active (used) analog-digital-converter names
         """
         active_adcs = []
-        adc_types = config_group.attrs['SIS crate board types']
+        adc_types = read_attrs(config_group)['SIS crate board types']
         if 2 in adc_types:
             active_adcs.append('SIS 3302')
         if 3 in adc_types:
@@ -562,6 +562,8 @@ class HDFMapDigiSISCrate(HDFMapDigiTemplate):
             number of data samples average together
             "
         """
+        import astropy.units as u
+
         config_path = self.configs[config_name]['config group path']
         config_group = self.group.get(config_path)
         active = self.configs[config_name]['active']
@@ -590,9 +592,10 @@ class HDFMapDigiSISCrate(HDFMapDigiTemplate):
         }
 
         # get slot numbers and configuration indices
-        slots = config_group.attrs[
+        config_attrs = read_attrs(config_group)
+        slots = config_attrs[
             'SIS crate slot numbers']  # type: np.ndarray
-        indices = config_group.attrs[
+        indices = config_attrs[
             'SIS crate config indices']  # type: np.ndarray
 
         # ensure slots and indices are 1D arrays of the same size
@@ -656,6 +659,9 @@ class HDFMapDigiSISCrate(HDFMapDigiTemplate):
 
         # Determine connected (brd, ch) combinations
         for name, config_index in gnames:
+            # snapshot of the adc configuration attributes
+            adc_attrs = read_attrs(config_group[name])
+
             # find board number
             brd = None
             for slot, index, board, adc in adc_pairs:
@@ -680,8 +686,8 @@ class HDFMapDigiSISCrate(HDFMapDigiTemplate):
                 # SIS 3305
                 _patterns = (r"FPGA 1 Enabled\s(?P<CH>\d+)",
                              r"FPGA 2 Enabled\s(?P<CH>\d+)")
-            for key, val in config_group[name].attrs.items():
-                if 'Enabled' in key and val == b'TRUE':
+            for key, val in adc_attrs.items():
+                if 'Enabled' in key and val == 'TRUE':
                     ch = None
                     for pat in _patterns:
                         _match = re.fullmatch(pat, key)
@@ -707,10 +713,8 @@ class HDFMapDigiSISCrate(HDFMapDigiTemplate):
 
             # determine shot averaging
             shot_ave = None
-            if 'Shot averaging (software)' \
-                    in config_group[name].attrs:
-                shot_ave = config_group[name].attrs[
-                    'Shot averaging (software)']
+            if 'Shot averaging (software)' in adc_attrs:
+                shot_ave = adc_attrs['Shot averaging (software)']
                 if shot_ave in (0, 1):
                     shot_ave = None
 
@@ -724,9 +728,8 @@ class HDFMapDigiSISCrate(HDFMapDigiTemplate):
                 # - the HDF5 attribute is the power to 2
                 # - So, a hardware sample of 5 actually means the number
                 #   of points sampled is 2^5
-                if 'Sample averaging (hardware)' \
-                        in config_group[name].attrs:
-                    sample_ave = config_group[name].attrs[
+                if 'Sample averaging (hardware)' in adc_attrs:
+                    sample_ave = adc_attrs[
                         'Sample averaging (hardware)']
                     if sample_ave == 0:
                         sample_ave = None
@@ -737,7 +740,7 @@ class HDFMapDigiSISCrate(HDFMapDigiTemplate):
             if adc_name == 'SIS 3305':
                 # has different clock rate modes
                 try:
-                    cr_mode = config_group[name].attrs['Channel mode']
+                    cr_mode = adc_attrs['Channel mode']
                     cr_mode = int(cr_mode)
                 except (KeyError, ValueError):
                     why = ("HDF5 structure unexpected..."
@@ -15,7 +15,7 @@ import h5py
 import numpy as np
 import unittest as ut
 
-from bapsflib._hdf.maps import FauxHDFBuilder
+from bapsflib.synthetic import FauxHDFBuilder
 
 from ..map_digis import HDFMapDigitizers
 from ..templates import HDFMapDigiTemplate
@@ -18,7 +18,7 @@ import os
 import unittest as ut
 import warnings
 
-from bapsflib._hdf.maps import FauxHDFBuilder
+from bapsflib.synthetic import FauxHDFBuilder
 from unittest import mock
 
 from ..templates import HDFMapDigiTemplate
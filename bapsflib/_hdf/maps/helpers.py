@@ -0,0 +1,73 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Helper functions shared by the mapping classes.
+"""
+import h5py
+import numpy as np
+
+from h5py import (h5a, h5s)
+from typing import (Any, Dict, Union)
+
+__all__ = ['read_attrs']
+
+
+def read_attrs(obj: Union[h5py.Group, h5py.Dataset],
+               decode=True) -> Dict[str, Any]:
+    """
+    Snapshot of all the HDF5 attributes of **obj** as a dictionary.
+
+    The attributes are read in a single pass over the object's
+    attribute table with the low-level :mod:`h5py.h5a` API (one
+    open/read per attribute, no look-up by name or
+    :class:`KeyError` for missing keys).  Attributes that need the
+    full conversion of :attr:`h5py.Group.attrs` (e.g. variable-length
+    strings, empty dataspaces, or array types) are read through it.
+
+    :param obj: HDF5 group or dataset
+    :param bool decode: :code:`True` (DEFAULT) to decode byte string
+        scalars to :code:`'utf-8'` strings
+    :return: dictionary of attribute name to value
+
+    :Example:
+
+        >>> mlg = f['Raw data + config/6K Compumotor/Motion list: XY']
+        >>> attrs = read_attrs(mlg)
+        >>> attrs['Motion list'], attrs.get('Nx', None)
+        ('XY', 11)
+    """
+    if isinstance(obj, h5py.File):
+        # file attributes are the root group attributes
+        obj = obj['/']
+    attrs = {}
+    oid = obj.id
+
+    def _read(name: bytes, *args):
+        attr = h5a.open(oid, name)
+        dtype = attr.dtype
+        if dtype.kind in 'biufcS' and dtype.subdtype is None \
+                and dtype.fields is None \
+                and attr.get_space().get_simple_extent_type() \
+                != h5s.NULL:
+            arr = np.ndarray(attr.shape, dtype=dtype)
+            attr.read(arr)
+            val = arr[()] if arr.ndim == 0 else arr
+        else:
+            val = obj.attrs[name]
+        attrs[name.decode('utf-8')] = val
+
+    h5a.iterate(oid, _read)
+
+    if decode:
+        for name, val in attrs.items():
+            if isinstance(val, (bytes, np.bytes_)):
+                attrs[name] = val.decode('utf-8')
+    return attrs
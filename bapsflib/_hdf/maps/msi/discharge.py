@@ -14,6 +14,7 @@ import numpy as np
 from bapsflib.utils.errors import HDFMappingError
 from warnings import warn
 
+from ..helpers import read_attrs
 from .templates import HDFMapMSITemplate
 
 
@@ -60,9 +61,10 @@ class HDFMapMSIDischarge(HDFMapMSITemplate):
                   'Voltage conversion factor'),
                  ('t0', 'Start time'),
                  ('dt', 'Timestep')]
+        group_attrs = read_attrs(self.group, decode=False)
         for pair in pairs:
             try:
-                self._configs[pair[0]] = [self.group.attrs[pair[1]]]
+                self._configs[pair[0]] = [group_attrs[pair[1]]]
             except KeyError:
                 self._configs[pair[0]] = []
                 warn("Attribute '" + pair[1]
@@ -14,6 +14,7 @@ import numpy as np
 from bapsflib.utils.errors import HDFMappingError
 from warnings import warn
 
+from ..helpers import read_attrs
 from .templates import HDFMapMSITemplate
 
 
@@ -55,9 +56,10 @@ class HDFMapMSIGasPressure(HDFMapMSITemplate):
         pairs = [('RGA AMUs', 'RGA AMUs'),
                  ('ion gauge calib tag', 'Ion gauge calibration tag'),
                  ('RGA calib tag', 'RGA calibration tag')]
+        group_attrs = read_attrs(self.group, decode=False)
         for pair in pairs:
             try:
-                val = self.group.attrs[pair[1]]
+                val = group_attrs[pair[1]]
                 if isinstance(val, (list, tuple, np.ndarray)):
                     self._configs[pair[0]] = val
                 else:
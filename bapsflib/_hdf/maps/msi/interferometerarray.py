@@ -14,6 +14,7 @@ import numpy as np
 from bapsflib.utils.errors import HDFMappingError
 from warnings import warn
 
+from ..helpers import read_attrs
 from .templates import HDFMapMSITemplate
 
 
@@ -89,9 +90,10 @@ class HDFMapMSIInterferometerArray(HDFMapMSITemplate):
         self._configs['dt'] = []
         self._configs['n_bar_L'] = []
         self._configs['z'] = []
+        group_attrs = read_attrs(self.group, decode=False)
         for pair in pairs[0:2]:
             try:
-                val = self.group.attrs[pair[1]]
+                val = group_attrs[pair[1]]
                 if isinstance(val, (list, tuple, np.ndarray)):
                     self._configs[pair[0]] = val
                 else:
@@ -189,10 +191,11 @@ class HDFMapMSIInterferometerArray(HDFMapMSITemplate):
 
                 # populate general info values
                 self._configs['interferometer name'].append(name)
+                sub_attrs = read_attrs(self.group[name], decode=False)
                 for pair in pairs[3::]:
                     try:
                         self._configs[pair[0]].append(
-                            self.group[name].attrs[pair[1]])
+                            sub_attrs[pair[1]])
                     except KeyError:
                         self._configs[pair[0]].append(None)
                         warn("Attribute '" + pair[1]
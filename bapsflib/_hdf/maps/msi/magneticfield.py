@@ -14,6 +14,7 @@ import numpy as np
 from bapsflib.utils.errors import HDFMappingError
 from warnings import warn
 
+from ..helpers import read_attrs
 from .templates import HDFMapMSITemplate
 
 
@@ -54,9 +55,10 @@ class HDFMapMSIMagneticField(HDFMapMSITemplate):
         # initialize general info values
         pairs = [('calib tag', 'Calibration tag'),
                  ('z', 'Profile z locations')]
+        group_attrs = read_attrs(self.group, decode=False)
         for pair in pairs:
             try:
-                val = self.group.attrs[pair[1]]
+                val = group_attrs[pair[1]]
                 if isinstance(val, (list, tuple, np.ndarray)):
                     self._configs[pair[0]] = val
                 else:
@@ -13,7 +13,7 @@ import numpy as np
 import os
 import unittest as ut
 
-from bapsflib._hdf.maps import FauxHDFBuilder
+from bapsflib.synthetic import FauxHDFBuilder
 
 from ..templates import HDFMapMSITemplate
 
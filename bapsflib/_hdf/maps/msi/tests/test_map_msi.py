@@ -14,7 +14,7 @@
 import numpy as np
 import unittest as ut
 
-from bapsflib._hdf.maps import FauxHDFBuilder
+from bapsflib.synthetic import FauxHDFBuilder
 
 from ..map_msi import HDFMapMSI
 from ..templates import HDFMapMSITemplate
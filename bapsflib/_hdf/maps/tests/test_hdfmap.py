@@ -13,7 +13,7 @@
 #
 import unittest as ut
 
-from .fauxhdfbuilder import FauxHDFBuilder
+from bapsflib.synthetic import FauxHDFBuilder
 from ..controls import HDFMapControls
 from ..controls.templates import HDFMapControlTemplate
 from ..digitizers import HDFMapDigitizers
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import h5py
+import numpy as np
+import os
+import tempfile
+import unittest as ut
+
+from ..helpers import read_attrs
+
+
+class TestReadAttrs(ut.TestCase):
+    """Test case for :func:`~bapsflib._hdf.maps.helpers.read_attrs`."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.f = h5py.File(os.path.join(self.tmpdir.name, 'attrs.hdf5'),
+                           'w')
+
+    def tearDown(self):
+        self.f.close()
+        self.tmpdir.cleanup()
+
+    def test_values(self):
+        grp = self.f.create_group('Motion list: XY')
+        attrs = {
+            'int': np.int32(5),
+            'float': 2.5,
+            'bool': np.bool_(True),
+            'complex': np.complex64(1 + 2j),
+            'fixed bytes': np.bytes_(b'XY'),
+            'vlen str': 'Motion list',
+            'int array': np.arange(6, dtype=np.uint16).reshape(2, 3),
+            'bytes array': np.array([b'a', b'bc']),
+            'compound': np.array([(1, 2.0)],
+                                 dtype=[('a', np.int8),
+                                        ('b', np.float64)]),
+            'array type': np.zeros((), dtype=(np.float32, (3,))),
+        }
+        for name, val in attrs.items():
+            grp.attrs[name] = val
+        grp.attrs['empty'] = h5py.Empty(np.dtype(np.float32))
+
+        # undecoded snapshot is identical to per-key reads
+        snapshot = read_attrs(grp, decode=False)
+        self.assertEqual(sorted(snapshot), sorted(grp.attrs))
+        for name in grp.attrs:
+            expected = grp.attrs[name]
+            val = snapshot[name]
+            self.assertIs(type(val), type(expected), name)
+            if isinstance(expected, np.ndarray):
+                self.assertEqual(val.dtype, expected.dtype, name)
+                self.assertTrue(np.array_equal(val, expected), name)
+            else:
+                self.assertEqual(val, expected, name)
+
+        # byte string scalars are decoded
+        snapshot = read_attrs(grp)
+        self.assertEqual(snapshot['fixed bytes'], 'XY')
+        self.assertIsInstance(snapshot['fixed bytes'], str)
+        self.assertEqual(snapshot['vlen str'], 'Motion list')
+        self.assertTrue(np.array_equal(snapshot['bytes array'],
+                                       attrs['bytes array']))
+        self.assertEqual(snapshot['int'], 5)
+
+    def test_objects(self):
+        # file, dataset, and attribute-less groups
+        self.f.attrs['version'] = np.bytes_(b'1.2')
+        self.assertEqual(read_attrs(self.f), {'version': '1.2'})
+
+        dset = self.f.create_dataset('data', data=np.arange(3))
+        dset.attrs['Channel'] = np.int32(2)
+        self.assertEqual(read_attrs(dset), {'Channel': 2})
+
+        self.assertEqual(read_attrs(self.f.create_group('empty')), {})
+
+
+if __name__ == '__main__':
+    ut.main()
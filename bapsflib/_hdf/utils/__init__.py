@@ -12,8 +12,17 @@
 This package contains an assortment of utility classes used to
 access and interface with the HDF5 files generated at BaPSF.
 """
-from . import (file, hdfoverview, hdfreadcontrol, hdfreaddata,
-               hdfreadmsi, helpers)
+from bapsflib.utils import lazyload
 
-__all__ = ['file', 'hdfoverview', 'hdfreadcontrol', 'hdfreaddata',
-           'hdfreadmsi', 'helpers']
+__getattr__, __dir__, __all__ = lazyload.attach(
+    __name__,
+    submodules=['cache', 'file', 'hdfoverview', 'hdfreadcontrol',
+                'hdfreaddata', 'hdfreadmsi', 'header', 'helpers',
+                'lazy', 'live', 'memory', 'metadata', 'plasma', 'pool',
+                'query', 'readstats', 'spatial'],
+    submod_attrs={'cache': ['ReadCache'],
+                  'memory': ['set_memory_budget'],
+                  'metadata': ['SharedInfo'],
+                  'pool': ['FilePool'],
+                  'query': ['ShotQuery'],
+                  'spatial': ['SpatialIndex']})
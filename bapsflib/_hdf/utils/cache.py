@@ -0,0 +1,337 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+An opt-in LRU cache for the results of
+:meth:`~.file.File.read_data`, :meth:`~.file.File.read_controls`, and
+:meth:`~.file.File.read_msi`, so repeating a read with the same
+arguments does not re-read the HDF5 file.
+
+Cached results are keyed by the normalized read arguments, including
+the memory budget (:code:`max_memory` and :code:`out_of_core`), and
+are invalidated when any dataset involved in the read changes extent
+(e.g. a file followed in SWMR mode grows).  :code:`use_memmap` and
+:code:`scratch_dir` do not change a result and are not part of the
+key.  A cache hit returns its own :code:`read_stats` with
+:attr:`~.readstats.ReadStats.cache_hit` set, and honors
+:code:`log_stats`.
+
+:Example:
+
+    >>> f = File('run.hdf5', read_cache='1G')
+    >>> data = f.read_data(1, 1, add_controls=['6K Compumotor'])
+    >>> data = f.read_data(1, 1, add_controls=['6K Compumotor'])
+    >>> f.read_cache.hits
+    1
+"""
+import copy
+import hashlib
+import numpy as np
+import os
+import threading
+
+from collections import OrderedDict
+from typing import (Any, Dict, Hashable, Iterable, List, Tuple, Union)
+
+from .file import File
+from .header import condition_where
+from .helpers import (condition_controls, digitizer_dataset_paths)
+from .spatial import (condition_nearest, condition_region,
+                      motion_control)
+from .memory import (MemoryBudget, parse_size)
+from .readstats import ReadStats
+
+__all__ = ['ReadCache']
+
+#: key and dataset paths of a cacheable read
+CacheKey = Tuple[Hashable, Tuple[str, ...]]
+
+
+def _selection_key(selection: Any) -> Hashable:
+    """
+    Build a hashable key of an :code:`index` or :code:`shotnum`
+    selection.  Lists and arrays with the same elements give the same
+    key.
+    """
+    if isinstance(selection, slice):
+        return 'slice', selection.start, selection.stop, selection.step
+    elif isinstance(selection, type(Ellipsis)):
+        return 'ellipsis'
+    elif isinstance(selection, (int, np.integer)) \
+            and not isinstance(selection, bool):
+        return 'int', int(selection)
+
+    arr = np.asarray(selection)
+    if arr.dtype.kind not in 'iu' and arr.size != 0:
+        # let the read raise the appropriate error
+        raise TypeError('selection can not be cached')
+    arr = arr.astype(np.int64).ravel()
+    return 'array', hashlib.sha1(arr.tobytes()).hexdigest()
+
+
+def _controls_key(hdf_file: File,
+                  controls) -> Tuple[Tuple, Tuple[str, ...]]:
+    """
+    Condition **controls** and return them as a tuple along with the
+    paths of their datasets.
+    """
+    if not bool(controls):
+        return (), ()
+    controls = tuple(condition_controls(hdf_file, controls))
+    paths = tuple(
+        hdf_file.file_map.controls[cname].configs[cconfn][
+            'dset paths'][0]
+        for cname, cconfn in controls)
+    return controls, paths
+
+
+def _budget_key(kwargs: Dict[str, Any]) -> Tuple[Any, bool]:
+    """
+    Build a hashable key of the memory budget keywords in **kwargs**,
+    since the budget determines if a read raises a
+    :class:`~.memory.MemoryBudgetError`.
+    """
+    budget = MemoryBudget.from_kwargs(dict(kwargs))
+    return budget.max_memory, budget.out_of_core
+
+
+def _dset_paths(configs: Dict[str, Any]) -> List[str]:
+    """Collect all :code:`'dset paths'` entries of a configs dict."""
+    paths = []
+    for key, val in configs.items():
+        if key == 'dset paths':
+            paths.extend(val)
+        elif isinstance(val, dict):
+            paths.extend(_dset_paths(val))
+    return paths
+
+
+def _is_memmap(arr: np.ndarray) -> bool:
+    """Determine if **arr** is backed by a :class:`numpy.memmap`."""
+    while arr is not None:
+        if isinstance(arr, np.memmap):
+            return True
+        arr = arr.base if isinstance(arr, np.ndarray) else None
+    return False
+
+
+class ReadCache(object):
+    """
+    Thread-safe LRU cache of read results with a byte budget.
+
+    Cached arrays are made read-only.  A lookup returns a read-only
+    view of the cached array, or a copy if the cache was created with
+    :code:`copy=True`, and the meta-info (:code:`info`) of the
+    returned array is always a copy.
+    """
+
+    def __init__(self, max_bytes: Union[int, str] = '256M', copy=False):
+        """
+        :param max_bytes: maximum number of bytes held by the cache
+            (e.g. :code:`2 ** 28` or :code:`'256M'`)
+        :type max_bytes: Union[int, str]
+        :param bool copy: :code:`True` to return copies of cached
+            arrays, :code:`False` (DEFAULT) to return read-only views
+        """
+        self._max_bytes = parse_size(max_bytes)
+        if self._max_bytes is None or self._max_bytes < 0:
+            raise ValueError('`max_bytes` must be >= 0')
+        self._copy = bool(copy)
+        self._entries = OrderedDict()  # type: OrderedDict
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+        #: number of lookups that returned a cached result
+        self.hits = 0
+
+        #: number of lookups that did not return a cached result
+        self.misses = 0
+
+    @property
+    def copy(self) -> bool:
+        """:code:`True` if lookups return copies of cached arrays."""
+        return self._copy
+
+    @property
+    def max_bytes(self) -> int:
+        """Maximum number of bytes held by the cache."""
+        return self._max_bytes
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes currently held by the cache."""
+        return self._nbytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    # ---- keys                                                    ----
+    @staticmethod
+    def data_key(hdf_file: File, board: int, channel: int,
+                 index=slice(None), shotnum=slice(None),
+                 digitizer=None, adc=None, config_name=None,
+                 keep_bits=False, add_controls=None,
+                 intersection_set=True, where=None, region=None,
+                 nearest=None, **kwargs) -> CacheKey:
+        """
+        Cache key and dataset paths of a
+        :meth:`~.file.File.read_data` call.  The digitizer,
+        configuration, and adc are normalized to the dataset they
+        resolve to.
+        """
+        _, dset_path, dheader_path, _ = digitizer_dataset_paths(
+            hdf_file, board, channel, digitizer=digitizer,
+            config_name=config_name, adc=adc)
+        controls, cpaths = _controls_key(hdf_file, add_controls)
+
+        # a spatial selection depends on the motion control dataset
+        spatial = (condition_region(region),
+                   condition_nearest(nearest))
+        if any(spatial):
+            motion = motion_control(hdf_file, controls)
+            _, mpaths = _controls_key(hdf_file, [motion])
+            spatial += (motion,)
+            cpaths += mpaths
+
+        key = ('data', os.path.abspath(hdf_file.filename), dset_path,
+               _selection_key(index), _selection_key(shotnum),
+               bool(keep_bits), controls, bool(intersection_set),
+               condition_where(where), spatial, _budget_key(kwargs))
+        return key, (dset_path, dheader_path) + cpaths
+
+    @staticmethod
+    def controls_key(hdf_file: File, controls, shotnum=slice(None),
+                     intersection_set=True, **kwargs) -> CacheKey:
+        """
+        Cache key and dataset paths of a
+        :meth:`~.file.File.read_controls` call.
+        """
+        controls, cpaths = _controls_key(hdf_file, controls)
+        key = ('controls', os.path.abspath(hdf_file.filename),
+               controls, _selection_key(shotnum),
+               bool(intersection_set), _budget_key(kwargs))
+        return key, cpaths
+
+    @staticmethod
+    def msi_key(hdf_file: File, msi_diag: str, **kwargs) -> CacheKey:
+        """
+        Cache key and dataset paths of a
+        :meth:`~.file.File.read_msi` call.
+        """
+        paths = _dset_paths(hdf_file.file_map.msi[msi_diag].configs)
+        key = ('msi', os.path.abspath(hdf_file.filename), msi_diag,
+               _budget_key(kwargs))
+        return key, tuple(sorted(set(paths)))
+
+    @staticmethod
+    def extents(hdf_file: File,
+                paths: Iterable[str]) -> Tuple[Tuple[int, ...], ...]:
+        """
+        Current shapes of the datasets at **paths**, refreshed first if
+        **hdf_file** is opened in SWMR mode.
+        """
+        swmr = getattr(hdf_file, 'swmr_mode', False)
+        shapes = []
+        for path in paths:
+            dset = hdf_file.get(path)
+            if swmr:
+                dset.refresh()
+            shapes.append(dset.shape)
+        return tuple(shapes)
+
+    # ---- lookup                                                  ----
+    def get(self, key: Hashable, extents: Tuple,
+            log_stats=False) -> Union[Any, None]:
+        """
+        Return the cached result of **key**, or :code:`None` if there
+        is none or the datasets of the read changed extent since it was
+        cached (**extents**, see :meth:`extents`).
+
+        The :code:`read_stats` of a returned result describe the cache
+        lookup (:attr:`~.readstats.ReadStats.cache_hit` is
+        :code:`True`), not the read that filled the cache.
+
+        :param log_stats: passed as :code:`log` to the
+            :class:`~.readstats.ReadStats` of the cache hit
+        :type log_stats: Union[bool, logging.Logger]
+        """
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is not None and entry[1] != extents:
+                # the file grew since the result was cached
+                self._pop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        stats = getattr(entry[0], '_read_stats', None)
+        if stats is None:
+            return self._detach(entry[0])
+
+        hit = ReadStats(stats.name, log=log_stats)
+        hit.cache_hit = True
+        hit.rows_selected = stats.rows_selected
+        with hit.stage('cache lookup'):
+            out = self._detach(entry[0])
+        hit.finalize()
+        out._read_stats = hit
+        return out
+
+    def put(self, key: Hashable, extents: Tuple, data: np.ndarray):
+        """
+        Cache **data** as the result of **key**, evicting the least
+        recently used results to stay within :attr:`max_bytes`, and
+        return it as returned by :meth:`get`.  Results larger than
+        :attr:`max_bytes` or read out-of-core are not cached.
+        """
+        if data.nbytes > self._max_bytes or _is_memmap(data):
+            return data
+
+        data.flags.writeable = False
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (data, extents)
+            self._nbytes += data.nbytes
+            while self._nbytes > self._max_bytes:
+                self._pop(next(iter(self._entries)))
+        return self._detach(data)
+
+    def clear(self):
+        """Remove all cached results."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def _pop(self, key: Hashable):
+        data, _ = self._entries.pop(key)
+        self._nbytes -= data.nbytes
+
+    def _detach(self, data: np.ndarray) -> np.ndarray:
+        """
+        Return a read-only view (or a copy) of cached **data** that
+        does not share its meta-info dictionaries.
+        """
+        out = data.copy() if self._copy else data.view(type(data))
+        if hasattr(data, '_info'):
+            out._info = copy.deepcopy(data._info)
+        if getattr(data, '_plasma', None) is not None:
+            # plasma parameters are immutable quantities
+            out._plasma = copy.copy(data._plasma)
+        return out
+
+    def __repr__(self):
+        return ('<ReadCache {} result(s), {} of {} bytes, '
+                '{} hit(s), {} miss(es)>'.format(
+                    len(self), self._nbytes, self._max_bytes,
+                    self.hits, self.misses))
@@ -16,6 +16,8 @@ from bapsflib._hdf.maps import (HDFMap, HDFMapControls,
                                 HDFMapDigitizers, HDFMapMSI)
 from typing import (Any, Dict, List, Tuple, Union)
 
+from .header import HeaderCache
+
 
 class File(h5py.File):
     """
@@ -40,7 +42,18 @@ class File(h5py.File):
         :param silent: set :code:`True` to suppress warnings
             (:code:`False` DEFAULT)
         :param kwargs:  additional keywords passed on to
-            :class:`h5py.File`
+            :class:`h5py.File` (e.g. :code:`swmr=True` to read a file
+            that is still being written, see :meth:`follow`)
+
+        :Keyword Arguments:
+            * **file_map** (:class:`~bapsflib._hdf.maps.hdfmap.HDFMap`)
+              -- an existing map of the same file to use instead of
+              re-mapping the file (e.g. to share one map among several
+              handles, see :class:`~.pool.FilePool`).  The map must be
+              treated as read-only.
+            * **read_cache** (:code:`Union[int, str, ReadCache]`) --
+              byte budget of a read cache to enable (see
+              :meth:`set_read_cache`), DEFAULT is no cache
 
         :Example:
 
@@ -57,8 +70,22 @@ class File(h5py.File):
             raise ValueError(
                 "Only `mode` readonly 'r' and read/write 'r+' are "
                 "supported.")
+        if kwargs.get('swmr', False) and mode != 'r':
+            raise ValueError(
+                "`swmr=True` is only supported with `mode` readonly "
+                "'r'.")
+        file_map = kwargs.pop('file_map', None)
+        read_cache = kwargs.pop('read_cache', None)
+        if file_map is not None and not isinstance(file_map, HDFMap):
+            raise TypeError(
+                "`file_map` must be an instance of HDFMap, got "
+                "type {}".format(type(file_map)))
         kwargs['mode'] = mode
         h5py.File.__init__(self, name, **kwargs)
+        self.set_read_cache(read_cache)
+        self._header_cache = HeaderCache()
+        self._field_profile = None
+        self._spatial_indexes = {}
 
         # -- define device paths --
         #: Internal HDF5 path for control devices. (DEFAULT :code:`'/'`)
@@ -77,7 +104,10 @@ class File(h5py.File):
             warnings.simplefilter(warn_filter)
 
             # create map
-            self._map_file()
+            if file_map is None:
+                self._map_file()
+            else:
+                self._file_map = file_map
 
             # build `_info` attribute
             self._build_info()
@@ -90,8 +120,15 @@ class File(h5py.File):
             'absolute file path': os.path.abspath(self.filename),
         }
 
+    def _clear_caches(self):
+        """Clear the caches that depend on the file mapping."""
+        self._header_cache.clear()
+        self._field_profile = None
+        self._spatial_indexes.clear()
+
     def _map_file(self):
         """Map/re-map the HDF5 file. (Builds :attr:`file_map`)"""
+        self._clear_caches()
         self._file_map = HDFMap(
             self,
             control_path=self.CONTROL_PATH,
@@ -113,6 +150,15 @@ class File(h5py.File):
         """HDF5 file map (:class:`~bapsflib._hdf.maps.hdfmap.HDFMap`)"""
         return self._file_map
 
+    @property
+    def header_cache(self) -> HeaderCache:
+        """
+        Cache of the shot number and voltage offset columns of the
+        digitizer header datasets (:class:`~.header.HeaderCache`),
+        which is cleared when the file is re-mapped.
+        """
+        return self._header_cache
+
     @property
     def info(self) -> Dict[str, Any]:
         """
@@ -135,6 +181,132 @@ class File(h5py.File):
 
         return HDFOverview(self)
 
+    @property
+    def read_cache(self):
+        """
+        Cache of read results (:class:`~.cache.ReadCache`), or
+        :code:`None` if caching is disabled (DEFAULT).
+        """
+        return self._read_cache
+
+    def set_read_cache(self, max_bytes: Union[int, str, None] = '256M',
+                       copy=False):
+        """
+        Enable caching of the results of :meth:`read_data`,
+        :meth:`read_controls`, and :meth:`read_msi`.  Repeating a read
+        with the same arguments then returns the cached result, as long
+        as the datasets involved have not changed extent.
+
+        :param max_bytes: byte budget of the cache (e.g.
+            :code:`'1G'`), a :class:`~.cache.ReadCache` instance to
+            use (e.g. to share a cache among handles), or :code:`None`
+            to disable caching
+        :type max_bytes: Union[int, str, ReadCache, None]
+        :param bool copy: :code:`True` to return copies of cached
+            results, :code:`False` (DEFAULT) to return read-only views
+
+        :Example:
+
+            >>> f = File('run.hdf5')
+            >>> f.set_read_cache('1G')
+            >>> data = f.read_data(1, 1)   # read from disk
+            >>> data = f.read_data(1, 1)   # read from cache
+            >>> f.read_cache.hits
+            1
+        """
+        from .cache import ReadCache
+
+        if max_bytes is None or isinstance(max_bytes, ReadCache):
+            self._read_cache = max_bytes
+        else:
+            self._read_cache = ReadCache(max_bytes, copy=copy)
+
+    def _cached_read(self, key_func, read, *args, **kwargs):
+        """
+        Return the cached result of the read identified by
+        :code:`key_func(self, *args, **kwargs)`, or call **read** and
+        cache its result.
+        """
+        cache = self._read_cache
+        if cache is None:
+            return read()
+
+        try:
+            key, paths = key_func(self, *args, **kwargs)
+            extents = cache.extents(self, paths)
+        except (KeyError, TypeError, ValueError):
+            # leave reporting invalid arguments to the read
+            return read()
+
+        data = cache.get(key, extents,
+                         log_stats=kwargs.get('log_stats', False))
+        if data is None:
+            data = cache.put(key, extents, read())
+        return data
+
+    def follow(self, board: int, channel: int,
+               poll_interval=1.0, timeout=None, start=0,
+               block_size=None, silent=False, **kwargs):
+        """
+        Follow a digitizer dataset that is still being written and
+        yield newly recorded shots as
+        :class:`~.hdfreaddata.HDFReadData` blocks.  The file should be
+        opened with :code:`swmr=True` so dataset extents are refreshed
+        on each poll.  Only rows appended since the previous poll are
+        read to update the shot number index.
+
+        If control devices are added (:code:`add_controls`), then a
+        shot is held back until every control device has recorded it.
+
+        :param board: digitizer board number
+        :param channel: digitizer channel number
+        :param float poll_interval: seconds between polls for new
+            shots (DEFAULT :code:`1.0`)
+        :param timeout: stop after this many seconds without new
+            shots, :code:`None` (DEFAULT) to follow indefinitely
+        :type timeout: Union[float, None]
+        :param start: dataset row to start following from (DEFAULT
+            :code:`0`), :code:`None` to only yield shots recorded after
+            the call
+        :type start: Union[int, None]
+        :param block_size: maximum number of shots per yielded block
+        :type block_size: Union[int, None]
+        :param bool silent:
+
+            :code:`False` (DEFAULT).  Set :code:`True` to ignore any
+            UserWarnings (soft-warnings)
+
+        :param kwargs: keywords passed on to
+            :class:`~.hdfreaddata.HDFReadData` (except :code:`index`
+            and :code:`shotnum`)
+        :rtype: Iterator[:class:`~.hdfreaddata.HDFReadData`]
+
+        :Example:
+
+            >>> # open a file still being written by the DAQ
+            >>> f = File('run.hdf5', swmr=True)
+            >>>
+            >>> # process shots as they are recorded, stop once no
+            >>> # new shots arrive for 60 s
+            >>> for data in f.follow(1, 1, timeout=60,
+            ...                      add_controls=['6K Compumotor']):
+            ...     print(data['shotnum'][-1], data['xyz'][-1])
+        """
+        from .live import follow_data
+
+        warn_filter = 'ignore' if silent else 'default'
+        gen = follow_data(self, board, channel,
+                          poll_interval=poll_interval, timeout=timeout,
+                          start=start, block_size=block_size, **kwargs)
+        while True:
+            with warnings.catch_warnings():
+                warnings.simplefilter(warn_filter)
+                try:
+                    data = next(gen)
+                except StopIteration:
+                    return
+            yield data
+
     def read_controls(self,
                       controls: List[Union[str, Tuple[str, Any]]],
                       shotnum=slice(None),
@@ -172,6 +344,18 @@ class File(h5py.File):
             :class:`~.hdfreadcontrol.HDFReadControl`
             for details)
 
+        :param max_memory:
+
+            memory budget of the read in bytes (e.g. :code:`2 ** 30`
+            or :code:`'1G'`).  DEFAULT is the global budget set by
+            :func:`~.memory.set_memory_budget`.  If the estimated
+            footprint exceeds the budget, a
+            :class:`~.memory.MemoryBudgetError` is raised before any
+            data is read, unless :code:`out_of_core=True` is passed,
+            in which case the data is read into a scratch
+            :class:`numpy.memmap`.
+
+        :type max_memory: Union[int, str, None]
         :param bool silent:
 
             :code:`False` (DEFAULT).  Set :code:`True` to ignore any
@@ -213,15 +397,19 @@ class File(h5py.File):
             ['6K Compumotor', 'Waveform']
 
         """
+        from .cache import ReadCache
         from .hdfreadcontrol import HDFReadControl
 
         warn_filter = 'ignore' if silent else 'default'
         with warnings.catch_warnings():
             warnings.simplefilter(warn_filter)
-            data = HDFReadControl(self, controls,
-                                  shotnum=shotnum,
-                                  intersection_set=intersection_set,
-                                  **kwargs)
+            data = self._cached_read(
+                ReadCache.controls_key,
+                lambda: HDFReadControl(
+                    self, controls, shotnum=shotnum,
+                    intersection_set=intersection_set, **kwargs),
+                controls, shotnum=shotnum,
+                intersection_set=intersection_set, **kwargs)
 
         return data
 
@@ -229,8 +417,8 @@ class File(h5py.File):
                   index=slice(None), shotnum=slice(None),
                   digitizer=None, adc=None,
                   config_name=None, keep_bits=False, add_controls=None,
-                  intersection_set=True, silent=False,
-                  **kwargs):
+                  intersection_set=True, where=None, region=None,
+                  nearest=None, silent=False, **kwargs):
         """
         Reads data from digitizer datasets and attaches control device
         data when requested. (see :class:`.hdfreaddata.HDFReadData`
@@ -273,6 +461,50 @@ class File(h5py.File):
             :math:`shotnum \le 0`. (see
             :class:`~.hdfreaddata.HDFReadData` for details)
 
+        :param where:
+
+            dictionary of digitizer header fields to the condition
+            a shot must satisfy to be read, e.g.
+            :code:`{'Clipped': 0, 'Max': ('<', 16000)}` to skip
+            saturated shots.  The conditions are evaluated on the
+            small header dataset, so the traces of the skipped shots
+            are never read. (see :func:`~.header.condition_where`)
+
+        :type where: Dict[str, Any]
+        :param region:
+
+            region of probe positions selecting the shots to read,
+            either :code:`(min, max)` bounds per axis, e.g.
+            :code:`{'x': (0, 10), 'y': (-5, 5)}`, or a sphere, e.g.
+            :code:`{'center': (2, -3), 'radius': 1}`.  The region is
+            resolved to shot numbers on the cached
+            :meth:`spatial_index` of the motion control device in
+            :data:`add_controls` (or the file's only motion control
+            device), so only the traces of those shots are read.
+            (see :func:`~.spatial.condition_region`)
+
+        :type region: Dict[str, Any]
+        :param nearest:
+
+            point selecting the shots recorded at the nearest probe
+            position, e.g. :code:`(2, -3)`, or a dictionary
+            :code:`{'point': (2, -3), 'k': 4}` for the :code:`k`
+            nearest positions. (see
+            :func:`~.spatial.condition_nearest`)
+
+        :type nearest: Union[Tuple[float, ...], Dict[str, Any]]
+        :param max_memory:
+
+            memory budget of the read in bytes (e.g. :code:`2 ** 30`
+            or :code:`'1G'`).  DEFAULT is the global budget set by
+            :func:`~.memory.set_memory_budget`.  If the estimated
+            footprint exceeds the budget, a
+            :class:`~.memory.MemoryBudgetError` is raised before any
+            data is read, unless :code:`out_of_core=True` is passed,
+            in which case the data is read in chunks into a scratch
+            :class:`numpy.memmap`.
+
+        :type max_memory: Union[int, str, None]
         :param bool silent:
 
             :code:`False` (DEFAULT).  Set :code:`True` to ignore any
@@ -321,21 +553,30 @@ class File(h5py.File):
             >>> #       which prints to screen a report of the
             >>> #       digitizer hookup
         """
+        from .cache import ReadCache
         from .hdfreaddata import HDFReadData
 
+        read_kwargs = {
+            'index': index,
+            'shotnum': shotnum,
+            'digitizer': digitizer,
+            'adc': adc,
+            'config_name': config_name,
+            'keep_bits': keep_bits,
+            'add_controls': add_controls,
+            'intersection_set': intersection_set,
+            'where': where,
+            'region': region,
+            'nearest': nearest,
+        }
         warn_filter = 'ignore' if silent else 'default'
         with warnings.catch_warnings():
             warnings.simplefilter(warn_filter)
-            data = HDFReadData(self, board, channel,
-                               index=index,
-                               shotnum=shotnum,
-                               digitizer=digitizer,
-                               adc=adc,
-                               config_name=config_name,
-                               keep_bits=keep_bits,
-                               add_controls=add_controls,
-                               intersection_set=intersection_set,
-                               **kwargs)
+            data = self._cached_read(
+                ReadCache.data_key,
+                lambda: HDFReadData(self, board, channel,
+                                    **read_kwargs, **kwargs),
+                board, channel, **read_kwargs, **kwargs)
 
         return data
 
@@ -345,6 +586,18 @@ class File(h5py.File):
         :class:`~.hdfreadmsi.HDFReadMSI` for more detail.
 
         :param msi_diag: name of MSI diagnostic
+        :param max_memory:
+
+            memory budget of the read in bytes (e.g. :code:`2 ** 30`
+            or :code:`'1G'`).  DEFAULT is the global budget set by
+            :func:`~.memory.set_memory_budget`.  If the estimated
+            footprint exceeds the budget, a
+            :class:`~.memory.MemoryBudgetError` is raised before any
+            data is read, unless :code:`out_of_core=True` is passed,
+            in which case the data is read in chunks into a scratch
+            :class:`numpy.memmap`.
+
+        :type max_memory: Union[int, str, None]
         :param bool silent:
 
             :code:`False` (DEFAULT).  Set :code:`True` to ignore any
@@ -367,10 +620,292 @@ class File(h5py.File):
             bapsflib._hdf.utils.hdfreadmsi.HDFReadMSI
         """
         from bapsflib._hdf.utils.hdfreadmsi import HDFReadMSI
+        from .cache import ReadCache
 
         warn_filter = 'ignore' if silent else 'default'
         with warnings.catch_warnings():
             warnings.simplefilter(warn_filter)
-            data = HDFReadMSI(self, msi_diag, **kwargs)
+            data = self._cached_read(
+                ReadCache.msi_key,
+                lambda: HDFReadMSI(self, msi_diag, **kwargs),
+                msi_diag, **kwargs)
 
         return data
+
+    def shot_query(self):
+        """
+        Start a query selecting shots by conditions on control device
+        and MSI diagnostic values.  Only the referenced columns are
+        read.  (see :class:`~.query.ShotQuery` for details)
+
+        :rtype: :class:`~.query.ShotQuery`
+
+        :Example:
+
+            >>> query = (f.shot_query()
+            ...          .msi('Discharge', 'data valid', '==', 1)
+            ...          .msi('Discharge', 'peak current', '>', 4000.))
+            >>> data = f.read_data(1, 1, shotnum=query.shotnum())
+            >>> print(query.explain())
+        """
+        from .query import ShotQuery
+
+        return ShotQuery(self)
+
+    def spatial_index(self, control: str = None, config_name=None):
+        """
+        Index of the shots recorded at each probe position of a motion
+        control device, used by the :code:`region` and
+        :code:`nearest` selections of :meth:`read_data`.  The index
+        is built once, from only the shot number and position columns
+        of the control dataset, and rebuilt if the dataset grows.
+        (see :class:`~.spatial.SpatialIndex` for details)
+
+        :param str control: name of the motion control device
+            (DEFAULT the file's only motion control device)
+        :param config_name: configuration name, required if the
+            control device has more than one configuration
+        :rtype: :class:`~.spatial.SpatialIndex`
+
+        :Example:
+
+            >>> sindex = f.spatial_index('6K Compumotor', 3)
+            >>> sindex.within((2., -3.), 1.)
+        """
+        from bapsflib._hdf.maps.controls.contype import ConType
+
+        from .helpers import condition_controls
+        from .query import (_Plan, _read_control_field)
+        from .spatial import (motion_control, SpatialIndex)
+
+        if control is None:
+            cname, cconfn = motion_control(self)
+        else:
+            if config_name is not None:
+                control = (control, config_name)
+            cname, cconfn = condition_controls(self, [control])[0]
+            if self.file_map.controls[cname].contype \
+                    != ConType.motion:
+                raise ValueError(
+                    "Control device '{}' is not a motion control "
+                    "device".format(cname))
+
+        # validate a cached index against the dataset extent
+        cconfig = self.file_map.controls[cname].configs[cconfn]
+        n_rows = self[cconfig['dset paths'][0]].shape[0]
+        cached = self._spatial_indexes.get((cname, cconfn), None)
+        if cached is not None and cached[0] == n_rows:
+            return cached[1]
+
+        shotnum, xyz = _read_control_field(_Plan(self), cname, 'xyz',
+                                           config_name=cconfn)
+        sindex = SpatialIndex(shotnum, xyz,
+                              name='{}/{}'.format(cname, cconfn))
+        self._spatial_indexes[(cname, cconfn)] = (n_rows, sindex)
+        return sindex
+
+    def to_dask(self, board: int, channel: int, chunks=(256, None),
+                shotnum=slice(None), digitizer=None, adc=None,
+                config_name=None, keep_bits=False, add_controls=None,
+                silent=False):
+        """
+        Lazily read a digitizer signal as a 2D
+        :class:`dask.array.Array` of shape
+        :code:`(n_shots, n_samples)`.  Each task of the Dask graph
+        reads one block of shots and samples from the HDF5 dataset
+        and converts it to voltage like
+        :class:`~.hdfreaddata.HDFReadData`.  Nothing is read until the
+        array (or a reduction of it) is computed, which must be done
+        with a thread based scheduler (the Dask array default) while
+        the file is open.  (requires the optional :mod:`dask`
+        package, see :mod:`~.lazy`)
+
+        :param board: digitizer board number
+        :param channel: digitizer channel number
+        :param chunks:
+
+            block size as :code:`(shots, samples)` or the number of
+            shots per block.  :code:`None` (or :code:`-1`) spans a
+            full axis.  DEFAULT is :code:`(256, None)`.
+
+        :param shotnum: HDF5 global shot number
+        :type shotnum: Union[int, list(int), slice(), numpy.array]
+        :param str digitizer: name of digitizer
+        :param str adc: name of the digitizer's analog-digital converter
+        :param str config_name: name of digitizer configuration
+        :param bool keep_bits:
+
+            :code:`True` to keep digitizer signal in bits,
+            :code:`False` (default) to convert digitizer signal to
+            voltage
+
+        :param add_controls:
+
+            control device(s) the shots must also be recorded by (see
+            :meth:`read_data`)
+
+        :type add_controls: List[Union[str, Tuple[str, Any]]]
+        :param bool silent:
+
+            :code:`False` (DEFAULT).  Set :code:`True` to ignore any
+            UserWarnings (soft-warnings)
+
+        :rtype: :class:`dask.array.Array`
+
+        :Example:
+
+            >>> # mean signal of a full run, 512 shots per task
+            >>> arr = f.to_dask(1, 1, chunks=512)
+            >>> mean = arr.mean(axis=0).compute()
+        """
+        from .lazy import to_dask
+
+        warn_filter = 'ignore' if silent else 'default'
+        with warnings.catch_warnings():
+            warnings.simplefilter(warn_filter)
+            data, _ = to_dask(
+                self, board, channel, chunks=chunks, shotnum=shotnum,
+                digitizer=digitizer, adc=adc, config_name=config_name,
+                keep_bits=keep_bits, add_controls=add_controls)
+
+        return data
+
+    def to_xarray(self, board: int, channel: int, chunks=(256, None),
+                  shotnum=slice(None), digitizer=None, adc=None,
+                  config_name=None, keep_bits=False, add_controls=None,
+                  silent=False):
+        """
+        Lazily read a digitizer signal as a Dask backed
+        :class:`xarray.DataArray` with dimensions
+        :code:`('shotnum', 'time')`.  The :code:`'time'` coordinate is
+        in seconds (the sample index if the clock rate is unknown) and,
+        if control devices are added, the :code:`'x'`, :code:`'y'`,
+        :code:`'z'` and other scalar control fields are coordinates
+        along :code:`'shotnum'`.  The meta-info of the read is stored
+        in :code:`attrs`.  Takes the same arguments as
+        :meth:`to_dask`.  (requires the optional :mod:`dask` and
+        :mod:`xarray` packages, see :mod:`~.lazy`)
+
+        :rtype: :class:`xarray.DataArray`
+
+        :Example:
+
+            >>> data = f.to_xarray(1, 1,
+            ...                    add_controls=['6K Compumotor'])
+            >>> # average signal at each probe position
+            >>> avg = data.groupby('x').mean('shotnum').compute()
+        """
+        from .lazy import to_xarray
+
+        warn_filter = 'ignore' if silent else 'default'
+        with warnings.catch_warnings():
+            warnings.simplefilter(warn_filter)
+            data = to_xarray(
+                self, board, channel, chunks=chunks, shotnum=shotnum,
+                digitizer=digitizer, adc=adc, config_name=config_name,
+                keep_bits=keep_bits, add_controls=add_controls)
+
+        return data
+
+    def read_plasma(self, shotnum, z, kTe, kTi, m_i, silent=False,
+                    **kwargs):
+        """
+        Compute per-shot plasma parameters (:code:`'fce'`,
+        :code:`'fpe'`, :code:`'lD'`, :code:`'VA'`, ...) in one
+        vectorized pass, with the magnetic field interpolated from the
+        :code:`'Magnetic field'` MSI profile at the probe's axial
+        location **z** and the electron density taken from the
+        :code:`'Interferometer array'` MSI summary.  (see
+        :func:`~.plasma.read_plasma` for details)
+
+        :param shotnum: HDF5 global shot numbers
+        :type shotnum: Union[list(int), numpy.ndarray]
+        :param z: axial location (in cm) of the probe, either one
+            location for all shots or one location per shot
+        :param kTe: electron temperature (in eV)
+        :param kTi: ion temperature (in eV)
+        :param m_i: ion mass (in g)
+        :param bool silent:
+
+            :code:`False` (DEFAULT).  Set :code:`True` to ignore any
+            UserWarnings (soft-warnings)
+
+        :param kwargs: additional keywords passed on to
+            :func:`~.plasma.read_plasma` (e.g. :code:`Z`,
+            :code:`gamma`, :code:`interferometer`, or
+            :code:`parameters`)
+        :rtype: :class:`numpy.ndarray`
+
+        :Example:
+
+            >>> from bapsflib.plasma.core import AMU
+            >>> pdata = f.read_plasma(
+            ...     [1, 2, 3], z=958.5, kTe=5., kTi=1., m_i=4. * AMU)
+            >>> pdata['fce']
+            array([-2.79924628e+09, -2.79924628e+09, -2.79924628e+09])
+        """
+        from .plasma import read_plasma
+
+        warn_filter = 'ignore' if silent else 'default'
+        with warnings.catch_warnings():
+            warnings.simplefilter(warn_filter)
+            data = read_plasma(self, shotnum, z, kTe, kTi, m_i,
+                               **kwargs)
+
+        return data
+
+    def add_plasma(self, data, z, kTe, kTi, m_i, silent=False,
+                   **kwargs):
+        """
+        Return a copy of the read result **data** (e.g. from
+        :meth:`read_data`) with the per-shot plasma parameters of
+        :meth:`read_plasma` appended as extra fields.  (see
+        :func:`~.plasma.add_plasma` for details)
+
+        :param data: read result with a :code:`'shotnum'` field
+        :param z: axial location (in cm) of the probe, either one
+            location for all shots or one location per shot
+        :param kTe: electron temperature (in eV)
+        :param kTi: ion temperature (in eV)
+        :param m_i: ion mass (in g)
+        :param bool silent:
+
+            :code:`False` (DEFAULT).  Set :code:`True` to ignore any
+            UserWarnings (soft-warnings)
+
+        :param kwargs: additional keywords passed on to
+            :func:`~.plasma.read_plasma`
+        """
+        from .plasma import add_plasma
+
+        warn_filter = 'ignore' if silent else 'default'
+        with warnings.catch_warnings():
+            warnings.simplefilter(warn_filter)
+            data = add_plasma(data, self, z, kTe, kTi, m_i, **kwargs)
+
+        return data
+
+    def B_at_probe(self, shotnum, z):
+        """
+        Interpolate the :code:`'Magnetic field'` MSI axial profile at
+        the probe's axial location **z** for every shot in
+        **shotnum**, all shots at once.  Only the profile rows of the
+        requested shots are read and the profile z-grid is cached.
+        (see :func:`~.plasma.B_at_probe` for details)
+
+        :param shotnum: HDF5 global shot numbers
+        :type shotnum: Union[int, list(int), numpy.ndarray]
+        :param z: axial location (in cm) of the probe, either one
+            location for all shots or one location per shot
+        :return: magnetic field (in Gauss) per shot, NaN for shots not
+            recorded or a **z** outside of the profile
+        :rtype: :class:`numpy.ndarray`
+
+        :Example:
+
+            >>> # field at z = 958.5 cm for the first 1000 shots
+            >>> Bo = f.B_at_probe(np.arange(1, 1001), 958.5)
+        """
+        from .plasma import B_at_probe
+
+        return B_at_probe(self, shotnum, z)
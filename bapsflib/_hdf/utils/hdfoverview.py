@@ -8,12 +8,14 @@
 # License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
 #   license terms and contributor agreement.
 #
+import json
 import os
 import platform
 import pprint as pp
 
 from contextlib import redirect_stdout
 from datetime import datetime
+from typing import (Any, Dict)
 
 from .file import File
 from ..maps.controls.templates import HDFMapControlTemplate
@@ -84,6 +86,103 @@ class HDFOverview(object):
             with redirect_stdout(of):
                 self.print()
 
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Machine-readable version of the overview report (see
+        :meth:`print`).  All values are JSON serializable types and
+        quantities become :code:`{'value': value, 'unit': unit}`
+        dictionaries.
+
+        :Example:
+
+            >>> f = File('sample.hdf5')
+            >>> overview = f.overview.to_dict()
+            >>> list(overview)
+            ['generated by', 'generated date', 'general', 'discovery',
+             'digitizers', 'controls', 'msi']
+            >>> overview['discovery']['digitizers']['devices']
+            ['SIS crate']
+        """
+        from bapsflib import __version__
+        from bapsflib.export.helpers import json_safe
+
+        fmap = self._fmap
+        main_digi = fmap.main_digitizer
+        discovery = {}
+        for key, dtype in (('controls', 'control'),
+                           ('digitizers', 'digitizer'),
+                           ('msi', 'msi')):
+            path = fmap.DEVICE_PATHS[dtype]
+            discovery[key] = {'path': path,
+                              'found': path in self._file,
+                              'devices': list(getattr(fmap, key))}
+        discovery['digitizers']['main'] = \
+            None if main_digi is None else main_digi.device_name
+        discovery['unknowns'] = list(fmap.unknowns)
+
+        return {
+            'generated by': 'bapsflib v' + __version__,
+            'generated date':
+                datetime.now().replace(microsecond=0).isoformat(),
+            'general': json_safe(self._file.info),
+            'discovery': discovery,
+            'digitizers': {
+                name: self._digitizer_dict(_map)
+                for name, _map in fmap.digitizers.items()},
+            'controls': {
+                name: {'path': _map.info['group path'],
+                       'contype': str(_map.contype),
+                       'configs': json_safe(_map.configs)}
+                for name, _map in fmap.controls.items()},
+            'msi': {
+                name: {'path': _map.info['group path'],
+                       'configs': json_safe(_map.configs)}
+                for name, _map in fmap.msi.items()},
+        }
+
+    def to_json(self, filename=None, indent=2) -> str:
+        """
+        JSON version of the overview report (see :meth:`to_dict`).
+
+        :param str filename: name of a JSON file to also save the
+            overview to
+        :param int indent: JSON indentation level, :code:`None` for a
+            compact single line
+        :return: the JSON string
+        """
+        text = json.dumps(self.to_dict(), indent=indent)
+        if filename is not None:
+            with open(filename, 'w') as of:
+                of.write(text + '\n')
+        return text
+
+    @staticmethod
+    def _digitizer_dict(digi: HDFMapDigiTemplate) -> Dict[str, Any]:
+        """
+        Dictionary (for :meth:`to_dict`) of the digitizer
+        configurations and their adc connections.
+        """
+        from bapsflib.export.helpers import json_safe
+
+        configs = {}
+        for cname, config in digi.configs.items():
+            conns = {}
+            for adc in config['adc']:
+                conns[adc] = []
+                for brd, chs, adc_stats in config[adc]:
+                    conn = {'board': brd, 'channels': chs}
+                    conn.update(adc_stats)
+                    conns[adc].append(json_safe(conn))
+            configs[cname] = {
+                'active': bool(config['active']),
+                'adc': list(config['adc']),
+                'path': config['config group path'],
+                'connections': conns,
+            }
+        return {'path': digi.info['group path'],
+                'adcs': list(digi.device_adcs),
+                'configs': configs}
+
     def report_general(self):
         """
         Prints general HDF5 file info.
@@ -8,11 +8,9 @@
 # License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
 #   license terms and contributor agreement.
 #
-import copy
 import h5py
 import numpy as np
 import os
-import time
 
 from bapsflib._hdf.maps.controls.templates import \
     (HDFMapControlTemplate, HDFMapControlCLTemplate)
@@ -23,13 +21,24 @@ from warnings import warn
 from .file import File
 from .helpers import (build_shotnum_dset_relation,
                       condition_controls, condition_shotnum,
-                      do_shotnum_intersection)
+                      do_shotnum_intersection, null_fill)
+from .memory import MemoryBudget
+from .metadata import SharedInfo
+from .readstats import ReadStats
 
 # define type aliases
 ControlMap = Union[HDFMapControlTemplate, HDFMapControlCLTemplate]
 ControlsType = Union[str, Iterable[Union[str, Tuple[str, Any]]]]
 IndexDict = Dict[str, np.ndarray]
 
+#: meta-info of an :class:`HDFReadControl` not created by a read
+_DEFAULT_INFO = {
+    'source file': None,
+    'controls': None,
+    'probe name': None,
+    'port': (None, None),
+}
+
 
 class HDFReadControl(np.ndarray):
     """
@@ -107,6 +116,21 @@ class HDFReadControl(np.ndarray):
             :data:`shotnum` and the shot numbers contained in each
             control device dataset. :code:`False` will return the union
             instead of the intersection
+        :param log_stats: :code:`False` (DEFAULT) to only record read
+            statistics in :attr:`read_stats`, :code:`True` to also log
+            them to the :mod:`~.readstats` module logger (at the
+            :code:`DEBUG` level), or a :class:`logging.Logger` to log
+            them to
+        :param max_memory: memory budget of the read in bytes (e.g.
+            :code:`2 ** 30` or :code:`'1G'`), DEFAULT is the global
+            budget set by :func:`~.memory.set_memory_budget`
+        :type max_memory: Union[int, str, None]
+        :param bool out_of_core: :code:`True` to read into a scratch
+            :class:`numpy.memmap` if :data:`max_memory` is exceeded,
+            :code:`False` to raise a
+            :class:`~.memory.MemoryBudgetError`
+        :param str scratch_dir: directory for the scratch file of
+            an out-of-core read
 
         Behavior of :data:`shotnum` and :data:`intersection_set`:
             * :data:`shotnum` indexing starts at 1
@@ -123,16 +147,12 @@ class HDFReadControl(np.ndarray):
               :code:`numpy.nan`, or :code:`''`, depending on the
               :code:`numpy.dtype`.
         """
-        # initialize timing
-        tt = []
-        if 'timeit' in kwargs:  # pragma: no cover
-            timeit = kwargs['timeit']
-            if timeit:
-                tt.append(time.time())
-            else:
-                timeit = False
-        else:
-            timeit = False
+        # initialize read statistics
+        stats = ReadStats(cls.__name__,
+                          log=kwargs.get('log_stats', False))
+
+        # initialize memory budget
+        budget = MemoryBudget.from_kwargs(kwargs)
 
         # ---- Condition `hdf_file`                                 ----
         # - `hdf_file` is a lapd.File object
@@ -142,12 +162,6 @@ class HDFReadControl(np.ndarray):
                 "`hdf_file` is NOT type `"
                 + File.__module__ + "." + File.__qualname__ + "`")
 
-        # print execution timing
-        if timeit:  # pragma: no cover
-            tt.append(time.time())
-            print('tt - hdf_file conditioning: '
-                  '{} ms'.format((tt[-1] - tt[-2]) * 1.E3))
-
         # ---- Examine file map object                              ----
         # grab instance of _fmap
         _fmap = hdf_file.file_map
@@ -170,11 +184,8 @@ class HDFReadControl(np.ndarray):
         except KeyError:
             controls = condition_controls(hdf_file, controls)
 
-        # print execution timing
-        if timeit:  # pragma: no cover
-            tt.append(time.time())
-            print('tt - condition controls: '
-                  '{} ms'.format((tt[-1] - tt[-2]) * 1.E3))
+        # record execution timing
+        stats.checkpoint('condition controls')
 
         # ---- Condition shotnum                                    ----
         # shotnum -- global HDF5 file shot number
@@ -230,7 +241,10 @@ class HDFReadControl(np.ndarray):
             # gather control datasets and shotnumkey's
             cmap = _fmap.controls[cname]
             cdset_path = cmap.configs[cconfn]['dset paths'][0]
-            cdset_dict[cname] = hdf_file.get(cdset_path)
+            cdset_dict[cname] = stats.track(hdf_file.get(cdset_path))
+            if getattr(hdf_file, 'swmr_mode', False):
+                # pick up rows appended by a SWMR writer
+                cdset_dict[cname].refresh()
             shotnumkey = \
                 cmap.configs[cconfn]['shotnum']['dset field'][0]
             shotnumkey_dict[cname] = shotnumkey
@@ -272,11 +286,8 @@ class HDFReadControl(np.ndarray):
             shotnum, sni_dict, index_dict = \
                 do_shotnum_intersection(shotnum, sni_dict, index_dict)
 
-        # print execution timing
-        if timeit:  # pragma: no cover
-            tt.append(time.time())
-            print('tt - condition shotnum: '
-                  '{} ms'.format((tt[-1] - tt[-2]) * 1.E3))
+        # record execution timing
+        stats.checkpoint('condition shotnum')
 
         # ---- Build obj                                            ----
         # Define dtype and shape for numpy array
@@ -297,22 +308,23 @@ class HDFReadControl(np.ndarray):
                     fconfig['shape'],
                 ))
 
-        # print execution timing
-        if timeit:  # pragma: no cover
-            tt.append(time.time())
-            print('tt - define dtype: '
-                  '{} ms'.format((tt[-1] - tt[-2]) * 1.E3))
+        # Check memory budget
+        # - the footprint is the returned array plus the rows read
+        #   from each control dataset
+        estimate = shape[0] * np.dtype(dtype).itemsize
+        for cname, cdset in cdset_dict.items():
+            estimate += len(index_dict[cname]) * cdset.dtype.itemsize
+        out_of_core = budget.check(estimate, cls.__name__)
 
         # Initialize Control Data
-        data = np.empty(shape, dtype=dtype)
+        # - for intersection_set=False the array is pre-filled with
+        #   NULL values, so only rows present in a control dataset
+        #   need to be gathered
+        data = budget.empty(shape, dtype, out_of_core)
+        if not intersection_set:
+            null_fill(data)
         data['shotnum'] = shotnum
 
-        # print execution timing
-        if timeit:  # pragma: no cover
-            tt.append(time.time())
-            print('tt - initialize data np.ndarray: '
-                  '{} ms'.format((tt[-1] - tt[-2]) * 1.E3))
-
         # Assign Control Data to Numpy array
         for control in controls:
             # control name (cname) and configuration name (cconfn)
@@ -323,15 +335,21 @@ class HDFReadControl(np.ndarray):
             cmap = _fmap.controls[cname]
             cconfig = cmap.configs[cconfn]
             cdset = cdset_dict[cname]
-            sni = sni_dict[cname]
             index = index_dict[cname].tolist()  # type: List
 
+            # rows of data filled by the control dataset
+            # - shotnum[rows] = cdset[index, shotnumkey]
+            # - all rows are filled if intersection_set = True
+            if intersection_set:
+                rows = np.arange(shape[0])
+            else:
+                rows = np.flatnonzero(sni_dict[cname])
+
             # populate control data array
             # 1. scan over numpy fields
             # 2. scan over the dset fields that will fill the numpy
             #    fields
             # 3. split between a command list fill or a direct fill
-            # 4. NaN fill if intersection_set = False
             #
             for nf_name, fconfig \
                     in cconfig['state values'].items():
@@ -354,24 +372,23 @@ class HDFReadControl(np.ndarray):
 
                         # retrieve the array of command indices
                         ci_arr = cdset[index, df_name]
+                        if ci_arr.dtype.names is not None:
+                            # h5py returns a compound array for an
+                            # empty selection
+                            ci_arr = ci_arr[df_name]
 
                         # assign command values to data
-                        for ci, command in enumerate(cl):
-                            # Order of operations
-                            # 1. find where command index (ci) is in the
-                            #    command index array (ci_arr)
-                            # 2. construct a new sni for ci
-                            # 3. fill data
-                            #
-                            # find where ci is in ci_arr
-                            ii = np.where(ci_arr == ci, True, False)
-
-                            # construct new sni
-                            sni_for_ci = np.zeros(sni.shape, dtype=bool)
-                            sni_for_ci[np.where(sni)[0][ii]] = True
-
-                            # assign values
-                            data[nf_name][sni_for_ci] = command
+                        # - look up all commands at once, skipping
+                        #   command indices outside the command list
+                        ii = np.logical_and(ci_arr >= 0,
+                                            ci_arr < len(cl))
+                        commands = np.array(
+                            cl, dtype=data.dtype[nf_name].base)[
+                            ci_arr[ii]]
+                        commands = commands.reshape(
+                            commands.shape
+                            + (1,) * len(data.dtype[nf_name].shape))
+                        data[nf_name][rows[ii]] = commands
                     else:
                         # direct fill (NO command list)
                         try:
@@ -429,71 +446,30 @@ class HDFReadControl(np.ndarray):
 
                         if data.dtype[nf_name].shape != ():
                             # field contains an array (e.g. 'xyz')
-                            # data[nf_name][sni, npi] = \
+                            # data[nf_name][rows, npi] = \
                             #     cdset[index, df_name]
-                            data[nf_name][sni, npi] = arr
+                            data[nf_name][rows, npi] = arr
                         else:
                             # field is a constant
-                            # data[nf_name][sni] = \
+                            # data[nf_name][rows] = \
                             #     cdset[index, df_name]
-                            data[nf_name][sni] = arr
+                            data[nf_name][rows] = arr
 
-                    # handle NaN fill
-                    if not intersection_set:
-                        # overhead
-                        sni_not = np.logical_not(sni)
-                        dtype = data.dtype[nf_name].base
-
-                        #
-                        if data.dtype[nf_name].shape != ():
-                            ii = np.s_[sni_not, npi]
-                        else:
-                            ii = np.s_[sni_not]
-
-                        # NaN fill
-                        if np.issubdtype(dtype, np.signedinteger):
-                            data[nf_name][ii] = -99999
-                        elif np.issubdtype(dtype, np.unsignedinteger):
-                            data[nf_name][ii] = 0
-                        elif np.issubdtype(dtype, np.floating):
-                            # any float type
-                            data[nf_name][ii] = np.nan
-                        elif np.issubdtype(dtype, np.flexible):
-                            # string, unicode, void
-                            data[nf_name][ii] = ''
-                        else:
-                            # no real NaN concept exists
-                            # - this shouldn't happen though
-                            warn('dtype ({}) of '.format(dtype)
-                                 + '{} has no NaN '.format(nf_name)
-                                 + 'concept...no NaN fill done')
-
-            # print execution timing
-            if timeit:  # pragma: no cover
-                tt.append(time.time())
-                print('tt - fill data - '
-                      + '{}: '.format(cname)
-                      + '{} ms'.format((tt[-1] - tt[-2]) * 1.E3))
-
-        # print execution timing
-        if timeit:  # pragma: no cover
-            n_controls = len(controls)
-            tt.append(time.time())
-            print('tt - fill data array: '
-                  '{} ms'.format((tt[-1] - tt[-n_controls-2]) * 1.E3)
-                  + ' (intersection_set={})'.format(intersection_set))
+            # record execution timing
+            stats.rows_selected = max(stats.rows_selected, len(index))
+            stats.checkpoint('control read - {}'.format(cname))
 
         # -- Define `obj`                                           ----
         obj = data.view(cls)
 
         # -- Populate `_info`                                      ----
         # initialize `_info`
-        obj._info = {
+        obj._info = SharedInfo({
             'source file': os.path.abspath(hdf_file.filename),
             'controls': {},
             'probe name': None,
             'port': (None, None),
-        }
+        })
 
         # add control meta-info
         for control in controls:
@@ -506,7 +482,9 @@ class HDFReadControl(np.ndarray):
             cconfig = cmap.configs[cconfn]  # type: dict
 
             # populate
-            obj._info['controls'][cname] = {
+            # - the configuration items are shared with the mapping
+            #   (copy-on-write) instead of deep-copied
+            cinfo = {
                 'device group path': cmap.info['group path'],
                 'device dataset path': cconfig['dset paths'][0],
                 'contype': cmap.contype,
@@ -514,14 +492,13 @@ class HDFReadControl(np.ndarray):
             }
             for key, val in cconfig.items():
                 if key not in ['dset paths', 'shotnum', 'state values']:
-                    obj._info['controls'][cname][key] = \
-                        copy.deepcopy(val)
+                    cinfo[key] = val
+            obj._info['controls'][cname] = SharedInfo(cinfo)
 
-        # print execution timing
-        if timeit:  # pragma: no cover
-            tt.append(time.time())
-            print('tt - total execution time: '
-                  '{} ms'.format((tt[-1] - tt[0]) * 1.E3))
+        # record execution timing
+        stats.checkpoint('build info')
+        stats.finalize()
+        obj._read_stats = stats
 
         # return obj
         return obj
@@ -534,18 +511,46 @@ class HDFReadControl(np.ndarray):
 
         # Define info attribute
         # (for view casting and new from template)
-        self._info = getattr(obj, '_info', {
-            'source file': None,
-            'controls': None,
-            'probe name': None,
-            'port': (None, None),
-        })
+        self._info = getattr(obj, '_info', None)
+        if self._info is None:
+            self._info = SharedInfo(_DEFAULT_INFO)
+
+        # Define read statistics attribute
+        self._read_stats = getattr(obj, '_read_stats', None)
 
     @property
     def info(self) -> dict:
         """A dictionary of meta-info for the control device."""
         return self._info
 
+    @property
+    def read_stats(self) -> Union[ReadStats, None]:
+        """
+        Statistics (stage timings, number of HDF5 reads, bytes read, and
+        rows selected) recorded while reading the control data.
+        (:class:`~.readstats.ReadStats`)
+        """
+        return self._read_stats
+
+    def to_arrow(self):
+        """
+        Convert to a :class:`pyarrow.Table` with one column per field
+        and :attr:`info` as schema metadata.  See
+        :func:`bapsflib.export.arrow.to_arrow`.
+        """
+        from bapsflib.export.arrow import to_arrow
+
+        return to_arrow(self)
+
+    def to_parquet(self, where, **kwargs):
+        """
+        Write to the Parquet file **where**.  See
+        :func:`bapsflib.export.arrow.to_parquet`.
+        """
+        from bapsflib.export.arrow import to_parquet
+
+        to_parquet(self, where, **kwargs)
+
 
 # add example to __new__ docstring
 HDFReadControl.__new__.__doc__ += "\n"
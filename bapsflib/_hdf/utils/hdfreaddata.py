@@ -10,19 +10,70 @@
 #
 #
 import astropy.units as u
-import copy
 import numpy as np
 import os
-import time
 
-from bapsflib.plasma import core
 from typing import Union
 from warnings import warn
 
+from bapsflib.utils.errors import HDFEmptyIntersectionError
+
 from .file import File
 from .helpers import (build_sndr_for_simple_dset, condition_controls,
-                      condition_shotnum, do_shotnum_intersection)
+                      condition_shotnum, do_shotnum_intersection,
+                      memmap_dataset, null_fill)
 from .hdfreadcontrol import HDFReadControl
+from .header import (condition_where, where_mask)
+from .memory import MemoryBudget
+from .metadata import SharedInfo
+from .readstats import ReadStats
+from .spatial import (condition_nearest, condition_region,
+                      motion_control)
+
+
+#: meta-info of an :class:`HDFReadData` not created by a read
+_DEFAULT_INFO = {
+    'source file': None,
+    'device group path': None,
+    'device dataset path': None,
+    'configuration name': None,
+    'adc': None,
+    'bit': None,
+    'clock rate': None,
+    'sample average': None,
+    'shot average': None,
+    'board': None,
+    'channel': None,
+    'voltage offset': None,
+    'probe name': None,
+    'port': (None, None),
+    'signal units': None,
+    'controls': {},
+}
+
+#: default (unset) plasma parameters, built on first use
+_PLASMA_DEFAULTS = {}  # type: dict
+
+
+def _default_plasma() -> SharedInfo:
+    """Default (unset) :attr:`HDFReadData.plasma` dictionary."""
+    if not _PLASMA_DEFAULTS:
+        from bapsflib.plasma import core
+
+        _PLASMA_DEFAULTS.update({
+            'Bo': None,
+            'kT': None,
+            'kTe': None,
+            'kTi': None,
+            'gamma': core.FloatUnit(1.0, 'arb'),
+            'm_e': core.ME,
+            'm_i': None,
+            'n': None,
+            'n_e': None,
+            'n_i': None,
+            'Z': None
+        })
+    return SharedInfo(_PLASMA_DEFAULTS)
 
 
 # noinspection PyInitNewSignature
@@ -108,7 +159,8 @@ class HDFReadData(np.ndarray):
                 adc=None,
                 keep_bits=False,
                 add_controls=None,
-                intersection_set=True, **kwargs):
+                intersection_set=True, where=None, region=None,
+                nearest=None, **kwargs):
         """
         :param hdf_file: HDF5 file object
         :param board: analog-digital-converter board number
@@ -133,6 +185,50 @@ class HDFReadData(np.ndarray):
             :data:`shotnum` and the shot numbers contained in each
             control device and digitizer dataset. :code:`False` will
             return the union of shot numbers.
+        :param where: header predicates selecting the shots to read,
+            e.g. :code:`{'Clipped': 0, 'Max': ('<', 16000)}` (see
+            :func:`~.header.condition_where`).  The predicates are
+            evaluated on the (cached) digitizer header dataset, so
+            only the traces of the selected shots are read.  If no
+            shot of the selection satisfies the predicates, then
+            :class:`~bapsflib.utils.errors.HDFEmptyIntersectionError`
+            is raised.
+        :type where: Dict[str, Any]
+        :param region: region of probe positions selecting the shots
+            to read, either :code:`(min, max)` bounds per axis (e.g.
+            :code:`{'x': (0, 10), 'y': (-5, 5)}`) or a sphere (e.g.
+            :code:`{'center': (2, -3), 'radius': 1}`) (see
+            :func:`~.spatial.condition_region`).  The positions are
+            taken from the motion control device among
+            :data:`add_controls`, or else the file's only motion
+            control device.  If no shot of the selection is in the
+            region, then
+            :class:`~bapsflib.utils.errors.HDFEmptyIntersectionError`
+            is raised (for any :data:`intersection_set`).
+        :type region: Dict[str, Any]
+        :param nearest: point selecting the shots at the nearest
+            probe position (see :func:`~.spatial.condition_nearest`)
+        :type nearest: Union[Tuple[float, ...], Dict[str, Any]]
+        :param log_stats: :code:`False` (DEFAULT) to only record read
+            statistics in :attr:`read_stats`, :code:`True` to also log
+            them to the :mod:`~.readstats` module logger (at the
+            :code:`DEBUG` level), or a :class:`logging.Logger` to log
+            them to
+        :param max_memory: memory budget of the read in bytes (e.g.
+            :code:`2 ** 30` or :code:`'1G'`), DEFAULT is the global
+            budget set by :func:`~.memory.set_memory_budget`
+        :type max_memory: Union[int, str, None]
+        :param bool out_of_core: :code:`True` to read into a scratch
+            :class:`numpy.memmap` in chunks if :data:`max_memory` is
+            exceeded, :code:`False` to raise a
+            :class:`~.memory.MemoryBudgetError`
+        :param str scratch_dir: directory for the scratch file of
+            an out-of-core read
+        :param bool use_memmap: :code:`True` (DEFAULT) to gather the
+            digitizer signal from a memory map of the dataset when the
+            dataset is stored contiguous and unfiltered (see
+            :func:`~.helpers.memmap_dataset`), :code:`False` to always
+            read through h5py
 
         Behavior of :data:`index`, :data:`shotnum` and
         :data:`intersection_set`:
@@ -145,16 +241,16 @@ class HDFReadData(np.ndarray):
               digitizer dataset, the :data:`index` keyword will always
               execute quicker than the :data:`shotnum` keyword.
         """
-        # initialize timing
-        tt = []
-        if 'timeit' in kwargs:  # pragma: no cover
-            timeit = kwargs['timeit']
-            if timeit:
-                tt.append(time.time())
-            else:
-                timeit = False
-        else:
-            timeit = False
+        # initialize read statistics
+        log_stats = kwargs.pop('log_stats', False)
+        stats = ReadStats(cls.__name__, log=log_stats)
+
+        # initialize memory budget
+        budget = MemoryBudget.from_kwargs(kwargs)
+
+        # condition header predicates
+        where = condition_where(where)
+        use_memmap = kwargs.pop('use_memmap', True)
 
         # ---- Condition hdf_file                                   ----
         # - `hdf_file` is a lapd.File object
@@ -164,12 +260,6 @@ class HDFReadData(np.ndarray):
                 "`hdf_file` is NOT type `"
                 + File.__module__ + "." + File.__qualname__ + "`")
 
-        # print execution timing
-        if timeit:  # pragma: no cover
-            tt.append(time.time())
-            print('tt - `hdf_file` conditioning: '
-                  '{} ms'.format((tt[-1] - tt[-2]) * 1.E3))
-
         # ---- Examine file map object                              ----
         # grab instance of `HDFMap`
         _fmap = hdf_file.file_map
@@ -186,11 +276,8 @@ class HDFReadData(np.ndarray):
         else:
             controls = []
 
-        # print execution timing
-        if timeit:  # pragma: no cover
-            tt.append(time.time())
-            print('tt - `add_controls` conditioning: '
-                  '{} ms'.format((tt[-1] - tt[-2]) * 1.E3))
+        # record execution timing
+        stats.checkpoint('condition controls')
 
         # ---- Condition `digitizer` keyword                        ----
         if not bool(_fmap.digitizers):
@@ -242,8 +329,12 @@ class HDFReadData(np.ndarray):
         dhname = _dmap.construct_header_dataset_name(
             board, channel, **kwargs)
         dpath = _dmap.info['group path'] + '/'
-        dset = hdf_file.get(dpath + dname)
-        dheader = hdf_file.get(dpath + dhname)
+        dset = stats.track(hdf_file.get(dpath + dname))
+        dheader = stats.track(hdf_file.get(dpath + dhname))
+        if getattr(hdf_file, 'swmr_mode', False):
+            # pick up rows appended by a SWMR writer
+            dset.refresh()
+            dheader.refresh()
 
         # define `config_name`
         if config_name is None:
@@ -253,11 +344,34 @@ class HDFReadData(np.ndarray):
         shotnumkey = \
             _dmap.configs[config_name]['shotnum']['dset field'][0]
 
-        # print execution timing
-        if timeit:  # pragma: no cover
-            tt.append(time.time())
-            print('tt - get dset and dheader: '
-                  '{} ms'.format((tt[-1] - tt[-2]) * 1.E3))
+        # replace `dheader` by its cached shot number and offset
+        # columns (and the columns of the `where` predicates)
+        # - the columns are read once per file, so the shot number
+        #   look-ups below do not each cost an HDF5 read
+        dheader = hdf_file.header_cache.get(
+            dheader, shotnumkey, fields=[field for field, _ in where])
+
+        # rows of the header dataset satisfying `where`
+        where_rows = where_mask(dheader, where) if where else None
+
+        # shot numbers at the probe positions of `region` and `nearest`
+        # - resolved on the file's cached spatial index of the motion
+        #   control device
+        region = condition_region(region)
+        nearest = condition_nearest(nearest)
+        if region or nearest:
+            motion, mconfig = motion_control(hdf_file, controls)
+            sindex = hdf_file.spatial_index(motion, mconfig)
+            region_sn = sindex.select(region, nearest)
+            if region_sn.size == 0:
+                raise HDFEmptyIntersectionError(
+                    'Input `region` or `nearest` would result in a '
+                    'NULL array')
+        else:
+            region_sn = None
+
+        # record execution timing
+        stats.checkpoint('get dset and dheader')
 
         # ---- Condition shots, index, and shotnum ----
         # index   -- row index of digitizer dataset
@@ -355,14 +469,30 @@ class HDFReadData(np.ndarray):
             # define `shotnum`
             shotnum = dheader[index.tolist(), shotnumkey]
 
+            # drop the rows not satisfying `where`
+            if where_rows is not None:
+                keep = where_rows[index]
+                index = index[keep]
+                shotnum = shotnum[keep]
+                if index.size == 0 and keep.size != 0:
+                    raise HDFEmptyIntersectionError(
+                        'Input `where` would result in a NULL array')
+
+            # drop the shots outside `region` or `nearest`
+            if region_sn is not None:
+                keep = np.isin(shotnum, region_sn)
+                index = index[keep]
+                shotnum = shotnum[keep]
+                if index.size == 0 and keep.size != 0:
+                    raise HDFEmptyIntersectionError(
+                        'Input `region` or `nearest` would result in '
+                        'a NULL array')
+
             # define sni
             sni = np.ones(shotnum.shape[0], dtype=np.bool)
 
-            # print execution timing
-            if timeit:  # pragma: no cover
-                tt.append(time.time())
-                print('tt - condition index: '
-                      '{} ms'.format((tt[-1] - tt[-2]) * 1.E3))
+            # record execution timing
+            stats.checkpoint('condition shotnum')
         else:
             # Condition `shotnum` keyword
             #
@@ -416,6 +546,16 @@ class HDFReadData(np.ndarray):
                                         {'digi': dheader},
                                         {'digi': shotnumkey})
 
+            # drop the shots outside `region` or `nearest`
+            # - also for intersection_set=False, the shots outside the
+            #   region are not filled with NULL values
+            if region_sn is not None:
+                shotnum = shotnum[np.isin(shotnum, region_sn)]
+                if shotnum.size == 0:
+                    raise HDFEmptyIntersectionError(
+                        'Input `region` or `nearest` would result in '
+                        'a NULL array')
+
             # Calc. the corresponding `index` and `sni`
             # - `shotnum` will be converted from list to np.array
             # - `index` and `sni` will be np.array's
@@ -427,6 +567,13 @@ class HDFReadData(np.ndarray):
             index, sni = build_sndr_for_simple_dset(shotnum, dheader,
                                                     shotnumkey)
 
+            # treat the rows not satisfying `where` like shot numbers
+            # missing from the digitizer dataset
+            if where_rows is not None:
+                keep = where_rows[index.astype(np.intp)]
+                sni[np.flatnonzero(sni)[np.logical_not(keep)]] = False
+                index = index[keep]
+
             # perform intersection
             if intersection_set:
                 shotnum, sni_dict, index_dict = \
@@ -435,11 +582,25 @@ class HDFReadData(np.ndarray):
                 sni = sni_dict['digi']
                 index = index_dict['digi']
 
-            # print execution timing
-            if timeit:  # pragma: no cover
-                tt.append(time.time())
-                print('tt - condition shotnum: '
-                      '{} ms'.format((tt[-1] - tt[-2]) * 1.E3))
+            # record execution timing
+            stats.checkpoint('condition shotnum')
+
+        # ---- Check memory budget                                  ----
+        # - the footprint is the returned array, the raw signal read
+        #   and the float temporaries of the voltage conversion
+        # - the digitizer part only depends on the number of shots, so
+        #   it is checked before any control data is read
+        #
+        sigtype = np.float32 if not keep_bits else dset.dtype
+        dtype = [('shotnum', np.uint32, 1),
+                 ('signal', sigtype, dset.shape[1]),
+                 ('xyz', np.float32, 3)]
+        raw_nbytes = dset.shape[1] * dset.dtype.itemsize
+        conv_nbytes = 0 if keep_bits \
+            else 2 * dset.shape[1] * np.dtype(np.float32).itemsize
+        budget.check(shotnum.shape[0] * (np.dtype(dtype).itemsize
+                                         + raw_nbytes + conv_nbytes),
+                     cls.__name__)
 
         # ---- Retrieve Control Data                                ----
         # 1. retrieve the numpy array for control data
@@ -455,13 +616,14 @@ class HDFReadData(np.ndarray):
             cdata = HDFReadControl(hdf_file, controls,
                                    assume_controls_conditioned=True,
                                    shotnum=shotnum,
-                                   intersection_set=intersection_set)
+                                   intersection_set=intersection_set,
+                                   log_stats=log_stats,
+                                   budget=budget)
 
-            # print execution timing
-            if timeit:  # pragma: no cover
-                tt.append(time.time())
-                print('tt - read in cdata (control data): '
-                      '{} ms'.format((tt[-1] - tt[-2]) * 1.E3))
+            # record execution timing
+            stats.add_child('controls',
+                            getattr(cdata, 'read_stats', None))
+            stats.checkpoint('control read')
 
             # re-filter index, shotnum, and sni
             # - only need to be filtered if intersection_set=True
@@ -482,47 +644,59 @@ class HDFReadData(np.ndarray):
         #   file shot number
         # - shotkey = is the field name/key of the dheader shot number
         #   column
-        sigtype = np.float32 if not keep_bits else dset.dtype
         shape = shotnum.shape
-        dtype = [('shotnum', np.uint32, 1),
-                 ('signal', sigtype, dset.shape[1]),
-                 ('xyz', np.float32, 3)]
         if len(controls) != 0:
             for subdtype in cdata.dtype.descr:
                 if subdtype[0] not in [d[0] for d in dtype]:
                     dtype.append(subdtype)
 
-        # print execution timing
-        if timeit:  # pragma: no cover
-            tt.append(time.time())
-            print('tt - define dtype: '
-                  '{} ms'.format((tt[-1] - tt[-2]) * 1.E3))
+        # Check memory budget again, now with the control data
+        estimate = shape[0] * (np.dtype(dtype).itemsize + raw_nbytes
+                               + conv_nbytes)
+        if cdata is not None:
+            estimate += cdata.nbytes
+        out_of_core = budget.check(estimate, cls.__name__)
 
         # Initialize data array
-        data = np.empty(shape, dtype=dtype)
-
-        # print execution timing
-        if timeit:  # pragma: no cover
-            tt.append(time.time())
-            print('tt - initialize data np.ndarray: '
-                  '{} ms'.format((tt[-1] - tt[-2]) * 1.E3))
+        # - for intersection_set=False the array is pre-filled with
+        #   NULL values, so only rows present in the digitizer dataset
+        #   need to be gathered
+        data = budget.empty(shape, dtype, out_of_core)
+        if not intersection_set:
+            null_fill(data, nulls={
+                'signal': 0 if np.issubdtype(data['signal'].dtype,
+                                             np.integer) else np.nan})
 
         # fill 'shotnum' field of data array
         data['shotnum'] = shotnum
 
         # fill 'signal' fields of data array
-        index = index.tolist()
+        # - an out-of-core read is done in chunks of rows
+        # - contiguous, unfiltered datasets are gathered from a memory
+        #   map of the dataset instead of through h5py
+        sig_mmap = memmap_dataset(dset.dataset) if use_memmap else None
+        if sig_mmap is None:
+            index = index.tolist()
+
+        def read_rows(rows: slice) -> np.ndarray:
+            if sig_mmap is None:
+                return dset[index[rows], ...]
+
+            arr = sig_mmap[index[rows], ...]
+            stats.record_read(arr)
+            return arr
+
         if intersection_set:
             # fill signal
-            data['signal'] = dset[index, ...]
+            for sl in budget.iter_slices(len(index), raw_nbytes,
+                                         chunked=out_of_core):
+                data['signal'][sl] = read_rows(sl)
         else:
             # fill signal
-            data['signal'][sni] = dset[index, ...]
-            if np.issubdtype(data['signal'].dtype, np.integer):
-                data['signal'][np.logical_not(sni)] = 0
-            else:
-                # dtype is np.floating
-                data['signal'][np.logical_not(sni)] = np.nan
+            sni_rows = np.flatnonzero(sni)
+            for sl in budget.iter_slices(len(index), raw_nbytes,
+                                         chunked=out_of_core):
+                data['signal'][sni_rows[sl]] = read_rows(sl)
 
         # fill fields related to controls
         if len(controls) != 0:
@@ -550,11 +724,9 @@ class HDFReadData(np.ndarray):
             # fill xyz
             data['xyz'] = np.nan
 
-        # print execution timing
-        if timeit:  # pragma: no cover
-            tt.append(time.time())
-            print('tt - fill data array: '
-                  '{} ms'.format((tt[-1] - tt[-2]) * 1.E3))
+        # record execution timing
+        stats.rows_selected = len(index)
+        stats.checkpoint('signal read')
 
         # Define obj to be returned
         obj = data.view(cls)
@@ -568,7 +740,9 @@ class HDFReadData(np.ndarray):
             voffset = None
 
         # assign dataset meta-info
-        obj._info = {
+        # - the control meta-info is shared with `cdata`, which in
+        #   turn shares the mapping configurations (copy-on-write)
+        obj._info = SharedInfo({
             'source file': os.path.abspath(hdf_file.filename),
             'device group path': _dmap.info['group path'],
             'device dataset path': dpath + dname,
@@ -585,27 +759,14 @@ class HDFReadData(np.ndarray):
             'probe name': None,
             'port': (None, None),
             'signal units': u.bit,
-        }
-        if cdata is not None:
-            obj._info['controls'] = \
-                copy.deepcopy(cdata.info['controls'])
-        else:
-            obj._info['controls'] = {}
+            'controls': {} if cdata is None
+            else cdata.info['controls'],
+        })
 
         # plasma parameter dict
-        obj._plasma = {
-            'Bo': None,
-            'kT': None,
-            'kTe': None,
-            'kTi': None,
-            'gamma': core.FloatUnit(1.0, 'arb'),
-            'm_e': core.ME,
-            'm_i': None,
-            'n': None,
-            'n_e': None,
-            'n_i': None,
-            'Z': None
-        }  # pragma: no cover
+        # - defaults are built on first use of :attr:`plasma`, so
+        #   reading data does not import the plasma modules (scipy)
+        obj._plasma = None
 
         # convert to voltage
         # - 'signal' dtype is assigned based on keep_bit
@@ -621,16 +782,20 @@ class HDFReadData(np.ndarray):
                 offset = abs(obj.info['voltage offset'].value)
 
                 # calc voltage
-                obj['signal'] = (obj.dv.value * obj['signal']) - offset
+                # - an out-of-core read is converted in chunks of rows
+                dv = obj.dv.value
+                for sl in budget.iter_slices(obj.shape[0], conv_nbytes,
+                                             chunked=out_of_core):
+                    obj['signal'][sl] = \
+                        (dv * obj['signal'][sl]) - offset
 
                 # update 'signal units'
                 obj._info['signal units'] = u.volt
 
-        # print execution timing
-        if timeit:  # pragma: no cover
-            tt.append(time.time())
-            print('tt - execution time: '
-                  '{} ms'.format((tt[-1] - tt[0]) * 1.E3))
+        # record execution timing
+        stats.checkpoint('volt conversion')
+        stats.finalize()
+        obj._read_stats = stats
 
         # return obj
         return obj
@@ -642,39 +807,15 @@ class HDFReadData(np.ndarray):
             return
 
         # Define _info attribute
-        self._info = getattr(obj, '_info', {
-            'source file': None,
-            'device group path': None,
-            'device dataset path': None,
-            'configuration name': None,
-            'adc': None,
-            'bit': None,
-            'clock rate': None,
-            'sample average': None,
-            'shot average': None,
-            'board': None,
-            'channel': None,
-            'voltage offset': None,
-            'probe name': None,
-            'port': (None, None),
-            'signal units': None,
-            'controls': {},
-        })
+        self._info = getattr(obj, '_info', None)
+        if self._info is None:
+            self._info = SharedInfo(_DEFAULT_INFO)
 
         # Define plasma attribute
-        self._plasma = getattr(obj, '_plasma', {
-            'Bo': None,
-            'kT': None,
-            'kTe': None,
-            'kTi': None,
-            'gamma': core.FloatUnit(1.0, 'arb'),
-            'm_e': core.ME,
-            'm_i': None,
-            'n': None,
-            'n_e': None,
-            'n_i': None,
-            'Z': None
-        })  # pragma: no cover
+        self._plasma = getattr(obj, '_plasma', None)
+
+        # Define read statistics attribute
+        self._read_stats = getattr(obj, '_read_stats', None)
 
     def convert_signal(self, to_volt=False, to_bits=False, force=False):
         """converts signal from volts (bits) to bits (volts)"""
@@ -800,6 +941,15 @@ class HDFReadData(np.ndarray):
               (2. ** self.info['bit'] - 1.))
         return dv
 
+    @property
+    def read_stats(self) -> Union[ReadStats, None]:
+        """
+        Statistics (stage timings, number of HDF5 reads, bytes read, and
+        rows selected) recorded while reading the data.
+        (:class:`~.readstats.ReadStats`)
+        """
+        return self._read_stats
+
     @property
     def plasma(self):  # pragma: no cover
         """
@@ -862,6 +1012,8 @@ class HDFReadData(np.ndarray):
         | :const:`vTi`   | ion thermal velocity                        |
         +----------------+---------------------------------------------+
         """
+        if self._plasma is None:
+            self._plasma = _default_plasma()
         return self._plasma
 
     def set_plasma(self, Bo, kTe, kTi, m_i, n_e, Z, gamma=None,
@@ -878,6 +1030,11 @@ class HDFReadData(np.ndarray):
         :param int Z: ion charge number
         :param float gamma: adiabatic index (arb.)
         """
+        from bapsflib.plasma import core
+
+        if self._plasma is None:
+            self._plasma = _default_plasma()
+
         # define base values
         self._plasma['Bo'] = core.FloatUnit(Bo, 'G')
         self._plasma['kTe'] = core.FloatUnit(kTe, 'eV')
@@ -921,6 +1078,11 @@ class HDFReadData(np.ndarray):
         :param str key: one of the base plasma values
         :param value: value for key
         """
+        from bapsflib.plasma import core
+
+        if self._plasma is None:
+            self._plasma = _default_plasma()
+
         # set plasma value
         if key == 'Bo':
             self._plasma['Bo'] = core.FloatUnit(value, 'G')
@@ -959,6 +1121,8 @@ class HDFReadData(np.ndarray):
         Updates the calculated plasma constants (fci, fce, fpe, etc.) in
         :attr:`plasma`.
         """
+        from bapsflib.plasma import core
+
         # add key frequencies
         self._plasma['fce'] = core.fce(**self._plasma)
         self._plasma['fci'] = core.fci(**self._plasma)
@@ -10,11 +10,19 @@
 #
 #
 import bapsflib
-import copy
 import numpy as np
 import os
 
 from .file import File
+from .memory import MemoryBudget
+from .metadata import SharedInfo
+
+#: meta-info of an :class:`HDFReadMSI` not created by a read
+_DEFAULT_INFO = {
+    'source file': None,
+    'device name': None,
+    'device group path': None,
+}
 
 
 class HDFReadMSI(np.ndarray):
@@ -87,7 +95,20 @@ class HDFReadMSI(np.ndarray):
         :param hdf_file: HDF5 file object
         :type hdf_file: :class:`~bapsflib.lapd.File`
         :param str dname: name of desired MSI diagnostic
+        :param max_memory: memory budget of the read in bytes (e.g.
+            :code:`2 ** 30` or :code:`'1G'`), DEFAULT is the global
+            budget set by :func:`~.memory.set_memory_budget`
+        :type max_memory: Union[int, str, None]
+        :param bool out_of_core: :code:`True` to read into a scratch
+            :class:`numpy.memmap` in chunks if :data:`max_memory` is
+            exceeded, :code:`False` to raise a
+            :class:`~.memory.MemoryBudgetError`
+        :param str scratch_dir: directory for the scratch file of
+            an out-of-core read
         """
+        # initialize memory budget
+        budget = MemoryBudget.from_kwargs(kwargs)
+
         # ---- Condition `hdf_file`                                 ----
         # - `hdf_file` is a lapd.File object
         #
@@ -187,9 +208,22 @@ class HDFReadMSI(np.ndarray):
         # define dtype
         dtype = np.dtype(dtype_list)
 
+        # ---- Check memory budget                                  ----
+        # - the footprint is the returned array plus one read of the
+        #   largest signal dataset
+        sig_config = _map.configs['signals']
+        sig_nbytes = [
+            hdf_file[path].size * hdf_file[path].dtype.itemsize
+            for field in sig_config
+            for path in sig_config[field]['dset paths']
+        ]
+        estimate = int(np.prod(_map.configs['shape'])) * dtype.itemsize
+        estimate += max(sig_nbytes, default=0)
+        out_of_core = budget.check(estimate, cls.__name__)
+
         # ---- Define and Populate Numpy Array                      ----
         # create empty array
-        data = np.empty(_map.configs['shape'], dtype=dtype)
+        data = budget.empty(_map.configs['shape'], dtype, out_of_core)
 
         # fill 'shotnum'
         sn_config = _map.configs['shotnum']
@@ -215,7 +249,7 @@ class HDFReadMSI(np.ndarray):
         # fill 'signals'
         # TODO: ADD ABILITY TO READ FROM A STRUCTURED DATASET
         # - i.e. 'dset field' is not empty
-        sig_config = _map.configs['signals']
+        # - an out-of-core read is done in chunks of rows
         for field in sig_config:
             if len(sig_config[field]['dset paths']) == 1:
                 # get dataset
@@ -223,7 +257,14 @@ class HDFReadMSI(np.ndarray):
                 dset = hdf_file[path]
 
                 # fill array
-                data[field] = dset
+                if not out_of_core:
+                    data[field] = dset
+                else:
+                    row_nbytes = dset.dtype.itemsize \
+                        * int(np.prod(dset.shape[1:]))
+                    for sl in budget.iter_slices(dset.shape[0],
+                                                 row_nbytes):
+                        data[field][sl] = dset[sl]
             else:
                 # there are multiple rows in the dataset
                 # (e.g. interferometer)
@@ -236,7 +277,14 @@ class HDFReadMSI(np.ndarray):
                     dset = hdf_file[path]
 
                     # fill array
-                    data[field][:, ii, ...] = dset
+                    if not out_of_core:
+                        data[field][:, ii, ...] = dset
+                    else:
+                        row_nbytes = dset.dtype.itemsize \
+                            * int(np.prod(dset.shape[1:]))
+                        for sl in budget.iter_slices(dset.shape[0],
+                                                     row_nbytes):
+                            data[field][sl, ii, ...] = dset[sl]
 
         # fill 'meta'
         # TODO: ADD ABILITY TO READ FROM A REGULAR DATASET
@@ -272,14 +320,17 @@ class HDFReadMSI(np.ndarray):
         obj = data.view(cls)
 
         # ---- Define `_info` attribute                             ----
-        obj._info = {
+        # - the configuration items are shared with the mapping
+        #   (copy-on-write) instead of deep-copied
+        info = {
             'source file': os.path.abspath(hdf_file.filename),
             'device name': _map.info['group name'],
             'device group path': _map.info['group path']
         }
         for key, val in _map.configs.items():
             if key not in ['shape', 'shotnum', 'signals', 'meta']:
-                obj._info[key] = copy.deepcopy(val)
+                info[key] = val
+        obj._info = SharedInfo(info)
 
         # ---- Return `obj`                                         ----
         return obj
@@ -292,17 +343,34 @@ class HDFReadMSI(np.ndarray):
 
         # Define _info attribute
         # (for view casting and new from template)
-        self._info = getattr(obj, '_info', {
-            'source file': None,
-            'device name': None,
-            'device group path': None,
-        })
+        self._info = getattr(obj, '_info', None)
+        if self._info is None:
+            self._info = SharedInfo(_DEFAULT_INFO)
 
     @property
     def info(self):
         """A dictionary of meta-info for the MSI diagnostic."""
         return self._info
 
+    def to_arrow(self):
+        """
+        Convert to a :class:`pyarrow.Table` with one column per field
+        and :attr:`info` as schema metadata.  See
+        :func:`bapsflib.export.arrow.to_arrow`.
+        """
+        from bapsflib.export.arrow import to_arrow
+
+        return to_arrow(self)
+
+    def to_parquet(self, where, **kwargs):
+        """
+        Write to the Parquet file **where**.  See
+        :func:`bapsflib.export.arrow.to_parquet`.
+        """
+        from bapsflib.export.arrow import to_parquet
+
+        to_parquet(self, where, **kwargs)
+
 
 # add example to __new__ docstring
 HDFReadMSI.__new__.__doc__ += "\n"
@@ -0,0 +1,311 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+A per-file cache of the digitizer header datasets used by
+:class:`~.hdfreaddata.HDFReadData`.  The shot number and voltage
+offset columns of a header dataset are read once into memory and
+reused by all later reads of the same board and channel, instead of
+issuing a separate HDF5 read for every shot number look-up.
+
+The per-shot statistics recorded in the header datasets (e.g. the
+SIS digitizers' :code:`'Min'`, :code:`'Max'`, and :code:`'Clipped'`
+fields) can be cached as well and used to select shots with
+:func:`where_mask` before any trace is read.
+"""
+import h5py
+import numbers
+import numpy as np
+import operator
+import threading
+
+from typing import (Any, Dict, Iterable, Tuple, Union)
+
+__all__ = ['condition_where', 'HeaderCache', 'HeaderColumns',
+           'where_mask']
+
+#: header fields other than the shot number field that are cached
+CACHED_FIELDS = ('Offset',)
+
+#: comparison operators of a :code:`where` predicate
+WHERE_OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+#: conditioned :code:`where` predicates, see :func:`condition_where`
+Where = Tuple[Tuple[str, Tuple[Tuple[str, Any], ...]], ...]
+
+
+class HeaderColumns(object):
+    """
+    Read-only, in-memory stand-in for a digitizer header dataset that
+    holds a subset of its fields (columns).  It supports the slicing
+    used for shot number look-ups, i.e. :code:`columns[field]` and
+    :code:`columns[index, field]`, and behaves like
+    :class:`h5py.Dataset` for those selections (list selections are
+    returned in increasing row order and invalid selections raise a
+    :code:`ValueError`).
+    """
+
+    def __init__(self, name: str, columns: Dict[str, np.ndarray]):
+        """
+        :param str name: HDF5 path of the header dataset
+        :param columns: dictionary of the cached columns
+        """
+        self._name = name
+        self._columns = columns
+        for arr in columns.values():
+            arr.flags.writeable = False
+
+    @property
+    def name(self) -> str:
+        """HDF5 path of the header dataset."""
+        return self._name
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """Names of the cached fields."""
+        return tuple(self._columns.keys())
+
+    @property
+    def shape(self) -> Tuple[int]:
+        """Shape of the header dataset."""
+        return next(iter(self._columns.values())).shape
+
+    @property
+    def size(self) -> int:
+        """Number of rows in the header dataset."""
+        return self.shape[0]
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, item):
+        if isinstance(item, str):
+            index, field = Ellipsis, item
+        elif isinstance(item, tuple) and len(item) == 2 \
+                and isinstance(item[1], str):
+            index, field = item
+        else:
+            raise ValueError(
+                'Only `[field]` and `[index, field]` selections are '
+                'supported')
+
+        try:
+            column = self._columns[field]
+        except KeyError:
+            raise ValueError(
+                "Field '{}' is not cached for header dataset "
+                "'{}'".format(field, self._name))
+        try:
+            if isinstance(index, list):
+                # like h5py, rows of a list selection are returned in
+                # increasing order
+                n_rows = column.shape[0]
+                index = np.array(index, dtype=np.intp)
+                if np.any((index < -n_rows) | (index >= n_rows)):
+                    raise IndexError(
+                        'index out of range for header dataset with '
+                        '{} rows'.format(n_rows))
+                index = np.sort(index % max(n_rows, 1))
+            return column[index]
+        except IndexError as err:
+            raise ValueError(str(err))
+
+    def __repr__(self):
+        return '<HeaderColumns "{}": shape {}, fields {}>'.format(
+            self._name, self.shape, self.fields)
+
+
+class HeaderCache(object):
+    """
+    Thread-safe cache of :class:`HeaderColumns`, keyed by the HDF5
+    path of the header dataset.
+
+    An entry is validated against the current extent of the header
+    dataset on every look-up.  If the dataset grew (e.g. a file read
+    in SWMR mode), then only the appended rows are read.  If the
+    dataset shrank, then the entry is re-read.
+    """
+
+    def __init__(self):
+        self._entries = {}  # type: Dict[str, HeaderColumns]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, dheader: h5py.Dataset, shotnumkey: str,
+            fields: Iterable[str] = ()) -> HeaderColumns:
+        """
+        Return the cached columns of the header dataset **dheader**.
+        The shot number field **shotnumkey** and the voltage offset
+        field (:code:`'Offset'`) are cached, if present, along with
+        any additional **fields**.
+
+        :param dheader: digitizer header dataset
+        :param str shotnumkey: field name of the shot number column
+        :param fields: additional fields to cache (e.g. the
+            :code:`'Max'` and :code:`'Clipped'` columns of a
+            :code:`where` predicate)
+        """
+        for name in (shotnumkey,) + tuple(fields):
+            if name not in dheader.dtype.names:
+                raise ValueError(
+                    "Field '{}' not in header dataset '{}'".format(
+                        name, dheader.name))
+        names = tuple(
+            name for name in (shotnumkey,) + CACHED_FIELDS
+            if name in dheader.dtype.names)
+        n_rows = dheader.shape[0]
+
+        with self._lock:
+            entry = self._entries.get(dheader.name, None)
+
+            # keep the fields cached by earlier look-ups
+            if entry is not None:
+                names += tuple(name for name in entry.fields
+                               if name not in names
+                               and name in dheader.dtype.names)
+            names += tuple(name for name in fields
+                           if name not in names)
+
+            if entry is not None \
+                    and entry.fields == names \
+                    and entry.shape[0] == n_rows:
+                return entry
+
+            # read the missing rows
+            start = 0
+            if entry is not None \
+                    and entry.fields == names \
+                    and entry.shape[0] < n_rows:
+                start = entry.shape[0]
+            columns = _read_columns(dheader, names, start, n_rows)
+            if start != 0:
+                columns = {
+                    name: np.concatenate((entry[name], arr))
+                    for name, arr in columns.items()
+                }
+
+            entry = HeaderColumns(dheader.name, columns)
+            self._entries[dheader.name] = entry
+            return entry
+
+    def clear(self):
+        """Remove all cached header columns."""
+        with self._lock:
+            self._entries.clear()
+
+    def __repr__(self):
+        return '<HeaderCache {} header dataset(s)>'.format(len(self))
+
+
+def condition_where(where: Union[Dict[str, Any], None]) -> Where:
+    """
+    Condition the :code:`where` predicates of a
+    :meth:`~.file.File.read_data` call into a sorted, hashable tuple
+    of :code:`(field, ((op, value), ...))` pairs.
+
+    :param where: dictionary of header field names to a condition.  A
+        condition is a value the field must equal, an
+        :code:`(op, value)` comparison with :code:`op` one of
+        :code:`'=='`, :code:`'!='`, :code:`'<'`, :code:`'<='`,
+        :code:`'>'`, or :code:`'>='`, or a list of comparisons that
+        must all hold.
+    :return: the conditioned predicates (an empty tuple for
+        :code:`None`)
+
+    :Example:
+
+        >>> condition_where({'Clipped': 0,
+        ...                  'Max': [('>', 100), ('<', 16000)]})
+        (('Clipped', (('==', 0),)), ('Max', (('>', 100), ('<', 16000))))
+    """
+    if where is None:
+        return ()
+    elif not isinstance(where, dict):
+        raise TypeError('`where` must be a dictionary of header field '
+                        'names to conditions')
+
+    conditioned = []
+    for field in sorted(where):
+        if not isinstance(field, str):
+            raise TypeError('`where` keys must be header field names')
+
+        cond = where[field]
+        if isinstance(cond, tuple):
+            cond = [cond]
+        elif not isinstance(cond, list):
+            cond = [('==', cond)]
+
+        comparisons = []
+        for comp in cond:
+            if not isinstance(comp, tuple) or len(comp) != 2 \
+                    or comp[0] not in WHERE_OPERATORS:
+                raise ValueError(
+                    "Invalid `where` condition {} for field '{}', "
+                    "expected an (op, value) tuple with op in "
+                    "{}".format(comp, field, list(WHERE_OPERATORS)))
+            op, value = comp
+            if isinstance(value, np.generic):
+                value = value.item()
+            if not isinstance(value, numbers.Number):
+                raise TypeError(
+                    "`where` value {!r} for field '{}' is not a "
+                    "number".format(value, field))
+            comparisons.append((op, value))
+        conditioned.append((field, tuple(comparisons)))
+    return tuple(conditioned)
+
+
+def where_mask(columns: HeaderColumns,
+               where: Union[Dict[str, Any], Where]) -> np.ndarray:
+    """
+    Evaluate the :code:`where` predicates on the cached header
+    columns.
+
+    :param columns: cached header columns containing every field of
+        **where**
+    :param where: predicates (see :func:`condition_where`)
+    :return: boolean mask of the header dataset rows that satisfy
+        all the predicates
+    """
+    if isinstance(where, dict):
+        where = condition_where(where)
+
+    mask = np.ones(columns.shape[0], dtype=bool)
+    for field, comparisons in where:
+        column = columns[field]
+        for op, value in comparisons:
+            mask &= WHERE_OPERATORS[op](column, value)
+    return mask
+
+
+def _read_columns(dheader: h5py.Dataset, names: Tuple[str, ...],
+                  start: int, stop: int) -> Dict[str, np.ndarray]:
+    """
+    Read rows :code:`start:stop` of fields **names** from
+    **dheader** in one HDF5 read.
+    """
+    if stop <= start:
+        return {name: np.empty(0, dtype=dheader.dtype[name])
+                for name in names}
+
+    arr = dheader[(slice(start, stop),) + names]
+    if arr.dtype.names is None:
+        # h5py returns a plain array for a single field
+        return {names[0]: arr}
+    return {name: np.ascontiguousarray(arr[name]) for name in names}
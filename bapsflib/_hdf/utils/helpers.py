@@ -17,7 +17,9 @@ import numpy as np
 
 from bapsflib._hdf.maps.controls.templates import \
     (HDFMapControlTemplate, HDFMapControlCLTemplate)
+from bapsflib.utils.errors import HDFEmptyIntersectionError
 from typing import (Any, Dict, Iterable, List, Tuple, Union)
+from warnings import warn
 
 from .file import File
 
@@ -583,6 +585,60 @@ def condition_shotnum(shotnum: Any,
     return shotnum
 
 
+def digitizer_dataset_paths(
+        hdf_file: File, board: int, channel: int, digitizer=None,
+        config_name=None, adc=None) -> Tuple[str, str, str, str]:
+    """
+    Resolves the HDF5 paths of the signal and header datasets for
+    **board** and **channel** of a digitizer, without reading any
+    data.
+
+    :param hdf_file: HDF5 file object
+    :param board: analog-digital-converter board number
+    :param channel: analog-digital-converter channel number
+    :param str digitizer: name of the digitizer, :code:`None`
+        (DEFAULT) for the main digitizer
+    :param str config_name: name of the digitizer configuration
+    :param str adc: name of the analog-digital-converter
+    :return: the digitizer name, the signal dataset path, the header
+        dataset path, and the field name of the shot numbers in the
+        header dataset
+    """
+    _fmap = hdf_file.file_map
+    if digitizer is None:
+        _dmap = _fmap.main_digitizer
+        if _dmap is None:
+            raise ValueError(
+                "No main digitizer is identified..."
+                "need to specify `digitizer` kwarg")
+    else:
+        try:
+            _dmap = _fmap.digitizers[digitizer]
+        except KeyError:
+            raise ValueError(
+                "Specified Digitizer '{}'".format(digitizer)
+                + " is not among known digitizers "
+                "({})".format(list(_fmap.digitizers)))
+
+    kwargs = {}
+    if config_name is not None:
+        kwargs['config_name'] = config_name
+    else:
+        config_name = _dmap.active_configs[0]
+    if adc is not None:
+        kwargs['adc'] = adc
+
+    dpath = _dmap.info['group path'] + '/'
+    dset_path = dpath + _dmap.construct_dataset_name(board, channel,
+                                                     **kwargs)
+    dheader_path = dpath + _dmap.construct_header_dataset_name(
+        board, channel, **kwargs)
+    shotnumkey = \
+        _dmap.configs[config_name]['shotnum']['dset field'][0]
+
+    return _dmap.device_name, dset_path, dheader_path, shotnumkey
+
+
 def do_shotnum_intersection(
         shotnum: np.ndarray,
         sni_dict: IndexDict,
@@ -611,7 +667,8 @@ def do_shotnum_intersection(
                                            shotnum[sni],
                                            assume_unique=True)
     if shotnum_intersect.shape[0] == 0:
-        raise ValueError('Input `shotnum` would result in a NULL array')
+        raise HDFEmptyIntersectionError(
+            'Input `shotnum` would result in a NULL array')
 
     # now filter
     for cname in index_dict:
@@ -625,3 +682,84 @@ def do_shotnum_intersection(
 
     # return
     return shotnum, sni_dict, index_dict
+
+
+def memmap_dataset(dset: h5py.Dataset) -> Union[np.memmap, None]:
+    """
+    Memory-map the raw storage of **dset** as a read-only
+    :class:`numpy.memmap`, bypassing the HDF5 library entirely.  This
+    is only possible for datasets that are stored contiguous,
+    unfiltered (no compression), and non-empty in a single on-disk
+    file (:code:`'sec2'` or :code:`'stdio'` driver).
+
+    :param dset: dataset to be memory-mapped
+    :return: read-only memory map of **dset**, or :code:`None` if
+        **dset** does not qualify
+
+    .. note::
+
+        If the file is opened with write intent, then the file is
+        flushed before the memory map is created so the memory map
+        reflects any data written through h5py.
+    """
+    if not isinstance(dset, h5py.Dataset) \
+            or dset.dtype.kind not in ('b', 'i', 'u', 'f', 'c') \
+            or dset.size == 0:
+        return None
+
+    # examine storage layout
+    plist = dset.id.get_create_plist()
+    if plist.get_layout() != h5py.h5d.CONTIGUOUS \
+            or plist.get_nfilters() != 0 \
+            or plist.get_external_count() != 0:
+        return None
+
+    # examine file
+    hdf_file = dset.file
+    if hdf_file.driver not in ('sec2', 'stdio'):
+        return None
+    offset = dset.id.get_offset()
+    if offset is None:
+        # storage is not allocated
+        return None
+    if hdf_file.mode != 'r':
+        hdf_file.flush()
+
+    return np.memmap(hdf_file.filename, dtype=dset.dtype, mode='r',
+                     offset=offset, shape=dset.shape)
+
+
+def null_fill(data: np.ndarray, nulls: Dict[str, Any] = None):
+    """
+    Fill every field of the structured array **data** with its NULL
+    value in a single broadcast assignment of a NULL record.  The NULL
+    value of a field depends on its :code:`numpy.dtype`:
+
+    * :code:`-99999` for signed integers
+    * :code:`0` for unsigned integers
+    * :code:`numpy.nan` for floats
+    * :code:`''` for strings
+
+    :param data: structured array to be filled
+    :param nulls: NULL values that override the defaults for the
+        named fields
+    """
+    if nulls is None:
+        nulls = {}
+
+    record = np.zeros((), dtype=data.dtype)
+    for name in data.dtype.names:
+        dtype = data.dtype[name].base
+        if name in nulls:
+            record[name] = nulls[name]
+        elif np.issubdtype(dtype, np.signedinteger):
+            record[name] = -99999
+        elif np.issubdtype(dtype, np.floating):
+            record[name] = np.nan
+        elif not np.issubdtype(dtype, np.unsignedinteger) \
+                and not np.issubdtype(dtype, np.flexible):
+            # no real NaN concept exists
+            # - zero initialization is used
+            warn('dtype ({}) of {} has no NaN '.format(dtype, name)
+                 + 'concept...no NaN fill done')
+    data[...] = record
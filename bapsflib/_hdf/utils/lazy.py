@@ -0,0 +1,239 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Lazy, chunked views of a digitizer dataset as
+`Dask <https://dask.org>`_ arrays and
+`xarray <https://xarray.pydata.org>`_ data arrays (see
+:meth:`~.file.File.to_dask` and :meth:`~.file.File.to_xarray`).
+
+Each task of the Dask graph reads one block of shots and samples
+straight from the HDF5 dataset and converts it to voltage exactly like
+:class:`~.hdfreaddata.HDFReadData`, so reductions over a full run can
+be scheduled block by block.
+
+.. note::
+
+    The graph tasks share the open :class:`~.file.File` handle, so
+    they must be computed with a thread based scheduler (the default
+    for Dask arrays) while the file is open.  This module requires the
+    optional :mod:`dask` (and :mod:`xarray`) packages.
+"""
+import numpy as np
+import os
+
+from bapsflib.utils.errors import HDFEmptyIntersectionError
+from typing import (Tuple, Union)
+
+from .file import File
+from .helpers import (build_sndr_for_simple_dset, condition_shotnum,
+                      digitizer_dataset_paths)
+
+__all__ = ['DEFAULT_CHUNKS', 'to_dask', 'to_xarray']
+
+#: default block size (shots, samples), :code:`None` is a full axis
+DEFAULT_CHUNKS = (256, None)
+
+
+class _LazySignal(object):
+    """
+    Dataset rows, shot numbers, and voltage conversion of a lazy
+    digitizer signal.
+    """
+
+    def __init__(self, hdf_file: File, board: int, channel: int,
+                 shotnum, digitizer, adc, config_name, keep_bits,
+                 add_controls):
+        _, dset_path, dheader_path, shotnumkey = \
+            digitizer_dataset_paths(hdf_file, board, channel,
+                                    digitizer=digitizer,
+                                    config_name=config_name, adc=adc)
+        dset = hdf_file.get(dset_path)
+        dheader = hdf_file.get(dheader_path)
+        if getattr(hdf_file, 'swmr_mode', False):
+            dset.refresh()
+            dheader.refresh()
+        dheader = hdf_file.header_cache.get(dheader, shotnumkey)
+
+        # dataset rows of the selected shot numbers
+        sn = condition_shotnum(shotnum, {'digi': dheader},
+                               {'digi': shotnumkey})
+        index, sni = build_sndr_for_simple_dset(sn, dheader,
+                                                shotnumkey)
+        sn = sn[sni]
+
+        # shots recorded by the control devices
+        self.controls = None
+        if bool(add_controls) and sn.size != 0:
+            self.controls = hdf_file.read_controls(
+                add_controls, shotnum=sn, silent=True)
+            mask = np.isin(sn, self.controls['shotnum'])
+            index, sn = index[mask], sn[mask]
+        if sn.size == 0:
+            raise HDFEmptyIntersectionError(
+                'Input `shotnum` would result in a NULL array')
+
+        # meta-info and voltage conversion from a one shot read
+        meta = hdf_file.read_data(
+            board, channel, index=int(index[0]), digitizer=digitizer,
+            adc=adc, config_name=config_name, keep_bits=keep_bits,
+            silent=True)
+
+        self.hdf_file = hdf_file
+        self.dset_path = dset_path
+        self.index = np.asarray(index, dtype=np.int64)
+        self.shotnum = sn.astype(np.uint32)
+        self.n_samples = dset.shape[1]
+        self.info = meta.info
+        self.dt = meta.dt
+        self.dtype = meta.dtype['signal'].base
+        self.conversion = None
+        if not keep_bits and meta.dv is not None:
+            self.conversion = (
+                meta.dv.value, abs(meta.info['voltage offset'].value))
+
+    def chunks(self, chunks) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """Block sizes along the shot and sample axes."""
+        if isinstance(chunks, (int, np.integer)) or chunks is None:
+            chunks = (chunks, None)
+        elif not isinstance(chunks, tuple) or len(chunks) != 2:
+            raise ValueError('`chunks` must be an int or a 2-tuple')
+        return tuple(
+            _split(size, step)
+            for size, step in zip((self.index.size, self.n_samples),
+                                  chunks))
+
+
+def _split(size: int, step: Union[int, None]) -> Tuple[int, ...]:
+    """Split an axis of **size** into blocks of **step**."""
+    if step is None or step == -1:
+        return size,
+    if step < 1:
+        raise ValueError('`chunks` must be >= 1, -1, or None')
+    step = int(step)
+    return (step,) * (size // step) + ((size % step,)
+                                       if size % step else ())
+
+
+def _read_block(hdf_file: File, dset_path: str, index: np.ndarray,
+                cols: slice, dtype: np.dtype,
+                conversion: Union[Tuple[float, float], None]):
+    """
+    Read the dataset rows **index** and columns **cols** and convert
+    them to the signal **dtype** (and voltage).
+    """
+    if index[-1] - index[0] + 1 == index.size:
+        # contiguous rows are read as a hyperslab
+        rows = slice(int(index[0]), int(index[-1]) + 1)
+    else:
+        rows = index.tolist()
+    arr = hdf_file.get(dset_path)[rows, cols].astype(dtype)
+    if conversion is not None:
+        # same operation order (and precision) as HDFReadData
+        dv, offset = conversion
+        arr = (dv * arr) - offset
+    return arr
+
+
+def to_dask(hdf_file: File, board: int, channel: int,
+            chunks=DEFAULT_CHUNKS, shotnum=slice(None), digitizer=None,
+            adc=None, config_name=None, keep_bits=False,
+            add_controls=None):
+    """
+    Build a lazy :class:`dask.array.Array` of the digitizer signal
+    of shape :code:`(n_shots, n_samples)`.  See
+    :meth:`~.file.File.to_dask`.
+    """
+    try:
+        import dask.array as da
+        from dask.base import tokenize
+    except ImportError:  # pragma: no cover
+        raise ImportError(
+            "`to_dask` requires the 'dask' package") from None
+
+    signal = _LazySignal(hdf_file, board, channel, shotnum, digitizer,
+                         adc, config_name, keep_bits, add_controls)
+    return _build_array(da, tokenize, signal, chunks), signal
+
+
+def _build_array(da, tokenize, signal: _LazySignal, chunks):
+    """Build the Dask graph with one read task per block."""
+    row_chunks, col_chunks = signal.chunks(chunks)
+    name = 'bapsflib-read-' + tokenize(
+        os.path.abspath(signal.hdf_file.filename), signal.dset_path,
+        signal.index, row_chunks, col_chunks, str(signal.dtype),
+        signal.conversion)
+
+    dsk = {}
+    row_start = 0
+    for ii, n_rows in enumerate(row_chunks):
+        index = signal.index[row_start:row_start + n_rows]
+        col_start = 0
+        for jj, n_cols in enumerate(col_chunks):
+            dsk[(name, ii, jj)] = (
+                _read_block, signal.hdf_file, signal.dset_path, index,
+                slice(col_start, col_start + n_cols), signal.dtype,
+                signal.conversion)
+            col_start += n_cols
+        row_start += n_rows
+    return da.Array(dsk, name, chunks=(row_chunks, col_chunks),
+                    dtype=signal.dtype)
+
+
+def to_xarray(hdf_file: File, board: int, channel: int,
+              chunks=DEFAULT_CHUNKS, shotnum=slice(None),
+              digitizer=None, adc=None, config_name=None,
+              keep_bits=False, add_controls=None):
+    """
+    Build a lazy :class:`xarray.DataArray` of the digitizer signal.
+    See :meth:`~.file.File.to_xarray`.
+    """
+    try:
+        import xarray as xr
+    except ImportError:  # pragma: no cover
+        raise ImportError(
+            "`to_xarray` requires the 'xarray' package") from None
+    from bapsflib.export.helpers import json_safe
+
+    data, signal = to_dask(hdf_file, board, channel, chunks=chunks,
+                           shotnum=shotnum, digitizer=digitizer,
+                           adc=adc, config_name=config_name,
+                           keep_bits=keep_bits,
+                           add_controls=add_controls)
+
+    # coordinates
+    if signal.dt is None:
+        time = ('time', np.arange(signal.n_samples),
+                {'long_name': 'sample index'})
+    else:
+        time = ('time', np.arange(signal.n_samples) * signal.dt.value,
+                {'units': str(signal.dt.unit)})
+    coords = {'shotnum': signal.shotnum, 'time': time}
+    if signal.controls is not None:
+        # - like HDFReadData, 'xyz' is NaN without a probe drive
+        cdata = signal.controls[
+            np.isin(signal.controls['shotnum'], signal.shotnum)]
+        if 'xyz' in cdata.dtype.names:
+            xyz = np.asarray(cdata['xyz'])
+        else:
+            xyz = np.full((cdata.shape[0], 3), np.nan,
+                          dtype=np.float32)
+        for ii, axis in enumerate('xyz'):
+            coords[axis] = ('shotnum', xyz[:, ii])
+        for field in cdata.dtype.names:
+            if field not in ('shotnum', 'xyz') \
+                    and cdata.dtype[field].shape == ():
+                coords[field] = ('shotnum', np.asarray(cdata[field]))
+
+    attrs = json_safe(signal.info)
+    attrs['units'] = str(signal.info['signal units'])
+    return xr.DataArray(
+        data, dims=('shotnum', 'time'), coords=coords, attrs=attrs,
+        name='board{}_channel{}'.format(board, channel))
@@ -0,0 +1,249 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Live-tail access to HDF5 files that are still being written by the
+DAQ.  The file should be opened in SWMR (single-writer/multiple-reader)
+mode::
+
+    >>> f = bapsflib.lapd.File('run.hdf5', swmr=True)
+    >>> for data in f.follow(1, 1, add_controls=['6K Compumotor']):
+    ...     process(data)
+
+Only the rows appended since the previous poll are read to update the
+shot number indices of the digitizer and control datasets, so
+following a run never re-scans the full datasets.  The digitizer data
+of released shots is read by row index, the shot numbers are only
+matched against the control datasets.
+"""
+import h5py
+import numpy as np
+import time
+
+from typing import (Any, Iterator, Union)
+
+from .file import File
+from .helpers import (condition_controls, digitizer_dataset_paths)
+
+__all__ = ['follow_data', 'ShotIndex']
+
+
+class ShotIndex(object):
+    """
+    Incrementally updated shot number index of a dataset that is being
+    appended to.  Each call to :meth:`update` reads only the shot
+    numbers of rows appended since the previous call.
+    """
+
+    def __init__(self, hdf_file: h5py.File, dset_path: str,
+                 shotnumkey: str, start=0, swmr=False):
+        """
+        :param hdf_file: HDF5 file object containing the dataset
+        :param str dset_path: path of the dataset containing the shot
+            numbers
+        :param str shotnumkey: field name in the dataset that contains
+            the shot numbers
+        :param int start: row to start indexing from
+        :param bool swmr: :code:`True` if **hdf_file** is opened in SWMR
+            mode, so the dataset extent is refreshed before each read
+        """
+        # Note: `dset.file` always reports `swmr_mode=False`, so the
+        #       mode is passed in explicitly
+        self._file = hdf_file
+        self._dset_path = dset_path
+        self._swmr = swmr
+        self._shotnumkey = shotnumkey
+        self._start = start
+        self._shotnum = np.empty(0, dtype=np.uint32)
+
+    @property
+    def dataset(self) -> h5py.Dataset:
+        """
+        The indexed dataset, with its extent refreshed in SWMR mode.
+
+        .. note::
+
+            Under SWMR, HDF5 does not keep multiple open handles of the
+            same dataset consistent, so a fresh handle is returned on
+            every access and should not be held on to.
+        """
+        dset = self._file.get(self._dset_path)
+        if self._swmr:
+            dset.refresh()
+        return dset
+
+    @property
+    def start(self) -> int:
+        """Row of the dataset corresponding to :code:`shotnum[0]`."""
+        return self._start
+
+    @property
+    def shotnum(self) -> np.ndarray:
+        """Shot numbers of the rows indexed so far."""
+        return self._shotnum
+
+    @property
+    def n_rows(self) -> int:
+        """Number of dataset rows indexed so far (incl. skipped)."""
+        return self._start + self._shotnum.size
+
+    def update(self, stop=None) -> np.ndarray:
+        """
+        Refresh the dataset and index rows appended since the previous
+        update.
+
+        :param int stop: do not index beyond this row
+        :return: shot numbers of the newly indexed rows
+        """
+        dset = self.dataset
+        nrows = dset.shape[0] if stop is None \
+            else min(stop, dset.shape[0])
+        if nrows <= self.n_rows:
+            return np.empty(0, dtype=np.uint32)
+
+        new_sn = dset[self.n_rows:nrows, self._shotnumkey]
+        new_sn = np.asarray(new_sn, dtype=np.uint32)
+        self._shotnum = np.concatenate((self._shotnum, new_sn))
+        return new_sn
+
+    def last_shotnum(self) -> Union[int, None]:
+        """
+        Shot number of the last row currently in the dataset, or
+        :code:`None` if the dataset is empty.  Only the last row is
+        read.
+        """
+        dset = self.dataset
+        if dset.shape[0] == 0:
+            return None
+        return int(dset[-1, self._shotnumkey])
+
+
+def _n_rows(hdf_file: h5py.File, dset_path: str, swmr: bool) -> int:
+    """Current number of rows in dataset **dset_path**."""
+    dset = hdf_file.get(dset_path)
+    if swmr:
+        dset.refresh()
+    return dset.shape[0]
+
+
+def follow_data(hdf_file: File, board: int, channel: int,
+                poll_interval=1.0, timeout=None, start=0,
+                block_size=None, **kwargs) -> Iterator[Any]:
+    """
+    Generator that yields digitizer data of newly appended shots as
+    :class:`~.hdfreaddata.HDFReadData` blocks.  (see
+    :meth:`~bapsflib._hdf.utils.file.File.follow`)
+
+    :param hdf_file: HDF5 file object, preferably opened with
+        :code:`swmr=True`
+    :param board: analog-digital-converter board number
+    :param channel: analog-digital-converter channel number
+    :param float poll_interval: seconds to wait between polls for
+        new shots
+    :param timeout: stop iterating after this many seconds without new
+        shots, :code:`None` (DEFAULT) to follow indefinitely
+    :type timeout: Union[float, None]
+    :param start: dataset row to start following from, :code:`None`
+        to only yield shots recorded after the call
+    :type start: Union[int, None]
+    :param block_size: maximum number of shots per yielded block
+    :type block_size: Union[int, None]
+    :param kwargs: additional keywords passed on to
+        :class:`~.hdfreaddata.HDFReadData` (e.g. :code:`digitizer`,
+        :code:`adc`, :code:`config_name`, :code:`add_controls`)
+
+    .. note::
+
+        With :code:`add_controls`, a shot is only yielded once every
+        control device has recorded it.  A shot that a control device
+        never records is never yielded.
+    """
+    from .hdfreaddata import HDFReadData
+
+    for key in ('index', 'shotnum'):
+        if key in kwargs:
+            raise TypeError(
+                "follow() does not accept the `{}` keyword".format(key))
+    if block_size is not None and block_size < 1:
+        raise ValueError('`block_size` must be >= 1')
+
+    # ---- gather digitizer datasets                               ----
+    _fmap = hdf_file.file_map
+    digitizer, dset_path, dheader_path, shotnumkey = \
+        digitizer_dataset_paths(
+            hdf_file, board, channel,
+            digitizer=kwargs.get('digitizer', None),
+            config_name=kwargs.get('config_name', None),
+            adc=kwargs.get('adc', None))
+    kwargs['digitizer'] = digitizer
+
+    # ---- gather control datasets                                 ----
+    # - a shot is only yielded once it is recorded by every control
+    #   device, otherwise the intersection with the control data
+    #   would silently drop it
+    add_controls = kwargs.get('add_controls', None)
+    swmr = getattr(hdf_file, 'swmr_mode', False)
+    cindices = []
+    if bool(add_controls):
+        controls = condition_controls(hdf_file, add_controls)
+        kwargs['add_controls'] = controls
+        for cname, cconfn in controls:
+            cmap = _fmap.controls[cname]
+            cconfig = cmap.configs[cconfn]
+            cindices.append(ShotIndex(
+                hdf_file, cconfig['dset paths'][0],
+                cconfig['shotnum']['dset field'][0], swmr=swmr))
+
+    # ---- follow                                                  ----
+    # - dataset handles are only held for the duration of a poll,
+    #   HDF5 does not keep several open handles of a dataset
+    #   consistent while a SWMR writer appends to it
+    if start is None:
+        start = _n_rows(hdf_file, dheader_path, swmr)
+    digi_index = ShotIndex(hdf_file, dheader_path, shotnumkey,
+                           start=start, swmr=swmr)
+    pending = np.empty(0, dtype=np.uint32)
+    pending_rows = np.empty(0, dtype=np.intp)
+    tlast = time.monotonic()
+    while True:
+        # index newly appended rows
+        # - the signal dataset may be extended after its header
+        n_indexed = digi_index.n_rows
+        new_sn = digi_index.update(
+            stop=_n_rows(hdf_file, dset_path, swmr))
+        pending = np.concatenate((pending, new_sn))
+        pending_rows = np.concatenate(
+            (pending_rows,
+             np.arange(n_indexed, n_indexed + new_sn.size,
+                       dtype=np.intp)))
+
+        # only release shots recorded by all control devices
+        # - no assumption is made on the order control devices
+        #   record shots in
+        ready = np.ones(pending.shape, dtype=bool)
+        for cindex in cindices:
+            cindex.update()
+            ready &= np.isin(pending, cindex.shotnum)
+
+        if np.any(ready):
+            # read by the digitizer rows already indexed
+            rows = pending_rows[ready]
+            step = block_size or rows.size
+            for ii in range(0, rows.size, step):
+                yield HDFReadData(hdf_file, board, channel,
+                                  index=rows[ii:ii + step], **kwargs)
+            pending = pending[np.logical_not(ready)]
+            pending_rows = pending_rows[np.logical_not(ready)]
+            tlast = time.monotonic()
+        elif timeout is not None \
+                and time.monotonic() - tlast >= timeout:
+            return
+        else:
+            time.sleep(poll_interval)
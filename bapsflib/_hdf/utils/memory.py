@@ -0,0 +1,223 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Memory budgets for the HDF5 read classes.  A :class:`MemoryBudget`
+estimates whether a read fits within a given number of bytes and, if
+it does not, either raises a :class:`MemoryBudgetError` or backs the
+returned array with a scratch :class:`numpy.memmap` and performs the
+read in chunks.
+
+A global default budget can be set with :func:`set_memory_budget`,
+which applies to all reads that do not pass :code:`max_memory`
+explicitly.
+
+:Example:
+
+    >>> # raise if a read needs more than 4 GB
+    >>> set_memory_budget('4G')
+    >>>
+    >>> # read out-of-core into a scratch file when over budget
+    >>> data = f.read_data(1, 1, max_memory='4G', out_of_core=True)
+"""
+import numpy as np
+import tempfile
+
+from typing import (Any, Dict, Iterator, Tuple, Union)
+
+__all__ = ['get_memory_budget', 'MemoryBudget', 'MemoryBudgetError',
+           'parse_size', 'set_memory_budget']
+
+
+def parse_size(size: Union[int, float, str, None]) -> Union[int, None]:
+    """
+    Convert a human readable size (e.g. :code:`'500M'`, :code:`'2G'`)
+    into a number of bytes.  :code:`None` is passed through.
+    """
+    if size is None:
+        return None
+    elif isinstance(size, (int, float, np.integer, np.floating)):
+        return int(size)
+
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+    size = size.strip().upper().rstrip('B')
+    if size and size[-1] in units:
+        return int(float(size[:-1]) * units[size[-1]])
+    return int(float(size))
+
+
+def _format_size(nbytes: int) -> str:
+    """Format **nbytes** into a human readable string."""
+    for unit in ('bytes', 'KB', 'MB', 'GB'):
+        if nbytes < 1024:
+            return '{:.1f} {}'.format(nbytes, unit)
+        nbytes /= 1024
+    return '{:.1f} TB'.format(nbytes)
+
+
+class MemoryBudgetError(MemoryError):
+    """
+    Raised when the estimated memory footprint of a read exceeds the
+    memory budget and out-of-core reading is not enabled.
+    """
+
+    def __init__(self, estimate: int, max_memory: int, name: str):
+        """
+        :param estimate: estimated footprint of the read (in bytes)
+        :param max_memory: memory budget (in bytes)
+        :param name: name of the read (e.g. :code:`'HDFReadData'`)
+        """
+        self.estimate = estimate
+        self.max_memory = max_memory
+        super().__init__(
+            '{} needs an estimated {} which exceeds the '.format(
+                name, _format_size(estimate))
+            + 'memory budget of {}, '.format(_format_size(max_memory))
+            + 'pass `out_of_core=True` to read into a scratch file or '
+              'narrow the selection')
+
+
+class MemoryBudget(object):
+    """
+    A memory budget for a single read.
+    """
+
+    def __init__(self, max_memory=None, out_of_core=False,
+                 scratch_dir=None):
+        """
+        :param max_memory: maximum number of bytes a read may allocate
+            (e.g. :code:`2 ** 30` or :code:`'1G'`), :code:`None` for
+            no limit
+        :type max_memory: Union[int, str, None]
+        :param bool out_of_core: :code:`True` to back the returned
+            array with a scratch :class:`numpy.memmap` and read in
+            chunks when the budget is exceeded, :code:`False` to raise
+            a :class:`MemoryBudgetError`
+        :param str scratch_dir: directory for scratch files (DEFAULT
+            is :func:`tempfile.gettempdir`)
+        """
+        self.max_memory = parse_size(max_memory)
+        self.out_of_core = bool(out_of_core)
+        self.scratch_dir = scratch_dir
+
+    @classmethod
+    def from_kwargs(cls, kwargs: Dict[str, Any]) -> 'MemoryBudget':
+        """
+        Build a budget from the keywords :code:`max_memory`,
+        :code:`out_of_core`, and :code:`scratch_dir` in **kwargs**,
+        falling back to the global defaults (see
+        :func:`set_memory_budget`).  Any existing :code:`'budget'`
+        entry is used as-is.  The keywords are removed from
+        **kwargs**.
+        """
+        budget = kwargs.pop('budget', None)
+        default = get_memory_budget()
+        max_memory = kwargs.pop('max_memory', default.max_memory)
+        out_of_core = kwargs.pop('out_of_core', default.out_of_core)
+        scratch_dir = kwargs.pop('scratch_dir', default.scratch_dir)
+        if isinstance(budget, cls):
+            return budget
+        return cls(max_memory, out_of_core, scratch_dir)
+
+    def check(self, estimate: int, name: str) -> bool:
+        """
+        Compare the estimated footprint **estimate** (in bytes) of a
+        read against the budget.
+
+        :param estimate: estimated footprint (in bytes)
+        :param name: name of the read, used in error messages
+        :return: :code:`True` if the read needs to be done out-of-core,
+            :code:`False` if it fits in memory
+        :raises MemoryBudgetError: if the budget is exceeded and
+            out-of-core reading is not enabled
+        """
+        if self.max_memory is None or estimate <= self.max_memory:
+            return False
+        elif not self.out_of_core:
+            raise MemoryBudgetError(int(estimate), self.max_memory,
+                                    name)
+        return True
+
+    def empty(self, shape: Tuple[int, ...], dtype,
+              out_of_core: bool) -> np.ndarray:
+        """
+        Allocate an uninitialized array.  If **out_of_core** is
+        :code:`True`, then the array is a :class:`numpy.memmap` backed
+        by an anonymous scratch file that is removed once the array
+        is garbage collected.
+        """
+        if not out_of_core:
+            return np.empty(shape, dtype=dtype)
+
+        dtype = np.dtype(dtype)
+        if int(np.prod(shape)) * dtype.itemsize == 0:
+            # zero-sized memory maps are not allowed
+            return np.empty(shape, dtype=dtype)
+
+        # the memory map holds its own handle to the scratch file,
+        # so the file object can be closed right away
+        with tempfile.TemporaryFile(prefix='bapsflib-',
+                                    suffix='.scratch',
+                                    dir=self.scratch_dir) as scratch:
+            return np.memmap(scratch, dtype=dtype, mode='w+',
+                             shape=shape)
+
+    def chunk_rows(self, row_nbytes: int, n_rows: int) -> int:
+        """
+        Number of rows to process at once so that a temporary of
+        **row_nbytes** per row stays within the budget.
+        """
+        if self.max_memory is None or row_nbytes <= 0:
+            return max(n_rows, 1)
+        return max(1, min(n_rows, self.max_memory // row_nbytes))
+
+    def iter_slices(self, n_rows: int, row_nbytes: int,
+                    chunked=True) -> Iterator[slice]:
+        """
+        Yield :code:`slice` objects covering **n_rows** rows in chunks
+        sized by :meth:`chunk_rows`.  If **chunked** is :code:`False`,
+        then a single slice covering all rows is yielded.
+        """
+        step = self.chunk_rows(row_nbytes, n_rows) if chunked \
+            else max(n_rows, 1)
+        for start in range(0, n_rows, step):
+            yield slice(start, min(start + step, n_rows))
+
+    def __repr__(self):
+        return ('MemoryBudget(max_memory={!r}, out_of_core={!r}, '
+                'scratch_dir={!r})'.format(
+                    self.max_memory, self.out_of_core,
+                    self.scratch_dir))
+
+
+#: global default budget (see :func:`set_memory_budget`)
+_DEFAULT_BUDGET = MemoryBudget()
+
+
+def get_memory_budget() -> MemoryBudget:
+    """Return a copy of the global default :class:`MemoryBudget`."""
+    return MemoryBudget(_DEFAULT_BUDGET.max_memory,
+                        _DEFAULT_BUDGET.out_of_core,
+                        _DEFAULT_BUDGET.scratch_dir)
+
+
+def set_memory_budget(max_memory=None, out_of_core=False,
+                      scratch_dir=None):
+    """
+    Set the global default memory budget used by
+    :class:`~.hdfreaddata.HDFReadData`,
+    :class:`~.hdfreadcontrol.HDFReadControl`, and
+    :class:`~.hdfreadmsi.HDFReadMSI` when :code:`max_memory` is not
+    passed to the read.  (see :class:`MemoryBudget` for parameters)
+
+    Calling with no arguments removes the global budget.
+    """
+    global _DEFAULT_BUDGET
+    _DEFAULT_BUDGET = MemoryBudget(max_memory, out_of_core, scratch_dir)
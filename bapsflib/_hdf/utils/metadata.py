@@ -0,0 +1,190 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Copy-on-write meta-info for the :code:`info` dictionaries of
+:class:`~.hdfreaddata.HDFReadData`,
+:class:`~.hdfreadcontrol.HDFReadControl`, and
+:class:`~.hdfreadmsi.HDFReadMSI`.
+
+The meta-info of a read largely repeats the configuration dictionaries
+of the file mapping (e.g. the :code:`'motion lists'` and
+:code:`'probe'` dictionaries of a control device).  Instead of
+deep-copying them into every read, a :class:`SharedInfo` references
+them and only wraps a nested dictionary (or array) when it is
+accessed, so the mapping is not modified through the meta-info and
+creating or copying meta-info does not cost in the size of the shared
+configuration.
+"""
+import copy
+import numpy as np
+
+from collections.abc import (ItemsView, ValuesView)
+from typing import (Any, Dict)
+
+__all__ = ['SharedInfo']
+
+
+def _share(val: Any) -> Any:
+    """
+    Wrap a value of a shared dictionary so it can be handed out:
+    dictionaries become a copy-on-write :class:`SharedInfo` (or a
+    copy of one), lists are copied (with their items wrapped), and
+    arrays become read-only views.  Other values are returned as-is.
+    """
+    if isinstance(val, SharedInfo):
+        return val.copy()
+    elif isinstance(val, dict):
+        return SharedInfo(val)
+    elif isinstance(val, list):
+        return [_share(item) for item in val]
+    elif isinstance(val, np.ndarray) and val.flags.writeable:
+        val = val.view()
+        val.flags.writeable = False
+    return val
+
+
+class SharedInfo(dict):
+    """
+    A copy-on-write :class:`dict` of meta-info that shares its values
+    with a **base** dictionary, which is never modified.
+
+    The base items are copied shallowly.  A nested dictionary is
+    wrapped in a :class:`SharedInfo` of its own on first access, and
+    an array is returned as a read-only view, so changes to the
+    meta-info are recorded on the :class:`SharedInfo` and never reach
+    the base.  :meth:`copy` (as well as :func:`copy.copy` and
+    :func:`copy.deepcopy`) returns an independent
+    :class:`SharedInfo` whose cost is in the number of changed items,
+    not in the size of the nested base dictionaries.
+
+    .. note::
+
+        The copy-on-write wrapping is done by the :class:`dict`
+        methods :code:`[]`, :meth:`get`, :meth:`items`,
+        :meth:`values`, :meth:`pop`, and :meth:`setdefault`, which
+        also serve :code:`dict(info)` and :code:`{**info}`.  Calling
+        the :class:`dict` methods directly (e.g.
+        :code:`dict.items(info)`) bypasses the wrapping and exposes
+        the base values.  Use :meth:`to_dict` for a plain,
+        independent nested :class:`dict`.
+
+    :Example:
+
+        >>> config = {'probe': {'port': 19}, 'delta': np.ones(3)}
+        >>> info = SharedInfo(config)
+        >>> info['probe']['port'] = 20
+        >>> info['probe']['port'], config['probe']['port']
+        (20, 19)
+        >>> info['delta'][0] = 2.
+        ValueError: assignment destination is read-only
+    """
+    __slots__ = ('_shared',)
+
+    def __init__(self, base: Dict[Any, Any] = None, **kwargs):
+        """
+        :param base: the shared dictionary (its items are referenced,
+            not copied)
+        :param kwargs: items to set on top of **base**
+        """
+        super().__init__(() if base is None else base)
+        #: keys whose values are still shared with the base
+        self._shared = set(self.keys())
+        self.update(kwargs)
+
+    def __iter__(self):
+        # a dict subclass overriding __iter__ is not merged through
+        # CPython's dict fast path, so dict(info) and {**info} look
+        # up the items with __getitem__ and get wrapped values
+        return iter(dict.keys(self))
+
+    def __getitem__(self, key):
+        val = super().__getitem__(key)
+        if key in self._shared:
+            val = _share(val)
+            super().__setitem__(key, val)
+            self._shared.discard(key)
+        return val
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._shared.discard(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._shared.discard(key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def items(self):
+        return ItemsView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def pop(self, key, *default):
+        if key not in self and default:
+            return default[0]
+        val = self[key]
+        del self[key]
+        return val
+
+    def popitem(self):
+        key = next(reversed(list(self.keys())))
+        return key, self.pop(key)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, val in dict(*args, **kwargs).items():
+            self[key] = val
+
+    def clear(self):
+        super().clear()
+        self._shared.clear()
+
+    def copy(self) -> 'SharedInfo':
+        """
+        Return an independent copy that shares the nested values.
+        """
+        other = SharedInfo()
+        dict.update(other, dict.items(self))
+        other._shared = set(self._shared)
+        for key, val in dict.items(self):
+            if key in self._shared:
+                continue
+            elif isinstance(val, SharedInfo):
+                dict.__setitem__(other, key, val.copy())
+            elif isinstance(val, np.ndarray) and val.flags.writeable:
+                dict.__setitem__(other, key, val.copy())
+            elif isinstance(val, (dict, list)):
+                # a mutable value set on this dictionary is shared
+                # from now on, so both copies wrap it on access
+                self._shared.add(key)
+                other._shared.add(key)
+        return other
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo) -> 'SharedInfo':
+        return self.copy()
+
+    def __reduce__(self):
+        return SharedInfo, (self.to_dict(),)
+
+    def to_dict(self) -> Dict[Any, Any]:
+        """Return the meta-info as a plain, nested :class:`dict`."""
+        return {key: val.to_dict() if isinstance(val, SharedInfo)
+                else copy.deepcopy(val)
+                for key, val in self.items()}
@@ -0,0 +1,434 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Per-shot plasma parameters driven by the MSI diagnostics (see
+:meth:`~.file.File.read_plasma`, :meth:`~.file.File.add_plasma`, and
+:meth:`~.file.File.B_at_probe`).
+
+For every requested shot, the magnetic field :code:`'Bo'` is
+interpolated from the :code:`'Magnetic field'` axial profile at the
+probe's axial location :code:`z`, and the electron density
+:code:`'n_e'` is taken from the :code:`'Peak density'` of an
+:code:`'Interferometer array'` summary list.  All parameters of
+:mod:`bapsflib.plasma.vectorized` are then computed for all shots in
+one vectorized pass.
+"""
+import astropy.units as u
+import copy
+import numpy as np
+
+from bapsflib.plasma import vectorized
+from typing import (Iterable, Tuple)
+from warnings import warn
+
+from .file import File
+
+__all__ = ['PLASMA_PARAMETERS', 'PLASMA_UNITS', 'B_at_probe',
+           'MagneticFieldProfile', 'add_plasma', 'read_plasma']
+
+#: plasma parameters computed by DEFAULT
+PLASMA_PARAMETERS = ('fce', 'fci', 'fpe', 'fpi', 'fUH', 'fLH', 'lD',
+                     'lpe', 'lpi', 'rce', 'rci', 'cs', 'VA', 'vTe',
+                     'vTi')
+
+#: cgs units of the fields computed by :func:`read_plasma`
+PLASMA_UNITS = {
+    'z': 'cm', 'Bo': 'G', 'n_e': 'cm^-3',
+    'fce': 'Hz', 'fci': 'Hz', 'fpe': 'Hz', 'fpi': 'Hz', 'fUH': 'Hz',
+    'fLH': 'Hz', 'oce': 'rad s^-1', 'oci': 'rad s^-1',
+    'ope': 'rad s^-1', 'opi': 'rad s^-1', 'oUH': 'rad s^-1',
+    'oLH': 'rad s^-1', 'lD': 'cm', 'lpe': 'cm', 'lpi': 'cm',
+    'rce': 'cm', 'rci': 'cm', 'cs': 'cm s^-1', 'VA': 'cm s^-1',
+    'vTe': 'cm s^-1', 'vTi': 'cm s^-1',
+}
+
+
+def read_plasma(hdf_file: File, shotnum, z, kTe, kTi, m_i, Z=1,
+                gamma=1.0, Bo=None, n_e=None, interferometer=None,
+                parameters: Iterable[str] = PLASMA_PARAMETERS
+                ) -> np.ndarray:
+    """
+    Compute per-shot plasma parameters for the shot numbers
+    **shotnum** (in the given order).
+
+    :param hdf_file: HDF5 file object
+    :param shotnum: HDF5 global shot numbers
+    :type shotnum: Union[list(int), numpy.ndarray]
+    :param z: axial location (in cm) of the probe, either one location
+        for all shots or one location per shot
+    :param kTe: electron temperature (in eV)
+    :param kTi: ion temperature (in eV)
+    :param m_i: ion mass (in g)
+    :param Z: ion charge number (DEFAULT :code:`1`)
+    :param gamma: adiabatic index (DEFAULT :code:`1.0`)
+    :param Bo: magnetic field (in Gauss), DEFAULT is read from the
+        :code:`'Magnetic field'` MSI diagnostic
+    :param n_e: electron number density (in :math:`cm^{-3}`), DEFAULT
+        is read from the :code:`'Interferometer array'` MSI diagnostic
+    :param int interferometer: index of the interferometer providing
+        **n_e**, DEFAULT is the interferometer closest to **z**
+    :param parameters: names of the :mod:`bapsflib.plasma.vectorized`
+        functions to compute
+    :return: structured array with fields :code:`'shotnum'`,
+        :code:`'z'`, :code:`'Bo'`, :code:`'n_e'`, and one field per
+        parameter.  Shots not recorded by an MSI diagnostic are NaN.
+
+    .. note::
+
+        Any of **z**, **kTe**, **kTi**, **Bo**, and **n_e** can also be
+        an array with one entry per shot (or an
+        :class:`~astropy.units.Quantity`).
+    """
+    shotnum = np.asarray(shotnum, dtype=np.int64)
+    if shotnum.ndim != 1 or shotnum.size == 0 or shotnum.min() <= 0:
+        raise ValueError('`shotnum` must be a non-empty 1D array of '
+                         'shot numbers > 0')
+    z = _per_shot(_to_cm(z), shotnum.size, 'z')
+    parameters = tuple(parameters)
+    for name in parameters:
+        if name not in PLASMA_UNITS or name in ('z', 'Bo', 'n_e'):
+            raise ValueError(
+                "'{}' is not a plasma parameter".format(name))
+
+    # ---- base values from the MSI diagnostics                    ----
+    if Bo is None:
+        Bo = _magnetic_field(hdf_file, shotnum, z)
+    if n_e is None:
+        n_e = _electron_density(hdf_file, shotnum, z, interferometer)
+
+    params = vectorized.plasma_parameters(
+        Bo=_per_shot(Bo, shotnum.size, 'Bo'),
+        kTe=_per_shot(kTe, shotnum.size, 'kTe'),
+        kTi=_per_shot(kTi, shotnum.size, 'kTi'),
+        m_i=m_i, n_e=_per_shot(n_e, shotnum.size, 'n_e'), Z=Z,
+        gamma=gamma)
+
+    # ---- build array                                            ----
+    fields = ('Bo', 'n_e') + parameters
+    data = np.empty(shotnum.size, dtype=[('shotnum', np.uint32),
+                                         ('z', np.float64)]
+                    + [(name, np.float64) for name in fields])
+    data['shotnum'] = shotnum
+    data['z'] = z
+    for name in fields:
+        if name not in params:
+            params[name] = getattr(vectorized, name)(**params)
+        data[name] = params[name]
+    return data
+
+
+def add_plasma(data: np.ndarray, hdf_file: File, z, kTe, kTi, m_i,
+               **kwargs) -> np.ndarray:
+    """
+    Return a copy of the read result **data** (e.g. a
+    :class:`~.hdfreaddata.HDFReadData`) with the plasma values of its
+    shots (see :func:`read_plasma`) appended as the extra fields
+    :code:`'Bo'`, :code:`'n_e'`, and one field per parameter.  The
+    :code:`info` of **data** gains the item :code:`'plasma units'`
+    holding the cgs unit of each added field.
+
+    :param data: read result with a :code:`'shotnum'` field
+    :param hdf_file: HDF5 file object
+    :param z: axial location (in cm) of the probe, either one location
+        for all shots or one location per shot
+    :param kTe: electron temperature (in eV)
+    :param kTi: ion temperature (in eV)
+    :param m_i: ion mass (in g)
+    :param kwargs: additional keywords passed on to
+        :func:`read_plasma`
+
+    :Example:
+
+        >>> data = f.read_data(1, 1)
+        >>> data = add_plasma(data, f, z=958.5, kTe=5., kTi=1.,
+        ...                   m_i=4. * AMU,
+        ...                   parameters=('fce', 'fpe', 'VA'))
+        >>> data.dtype.names
+        ('shotnum', 'signal', 'xyz', 'Bo', 'n_e', 'fce', 'fpe', 'VA')
+    """
+    if not isinstance(data, np.ndarray) or data.dtype.names is None \
+            or 'shotnum' not in data.dtype.names or data.ndim != 1:
+        raise ValueError("`data` must be a 1D structured array with a "
+                         "'shotnum' field")
+    plasma = read_plasma(hdf_file, data['shotnum'], z, kTe, kTi, m_i,
+                         **kwargs)
+    fields = plasma.dtype.names[2:]
+    overlap = set(fields).intersection(data.dtype.names)
+    if overlap:
+        raise ValueError(
+            '`data` already has field(s) {}'.format(sorted(overlap)))
+
+    # copy `data` into the extended array
+    dtype = np.dtype(
+        [(name, data.dtype[name]) for name in data.dtype.names]
+        + [(name, np.float64) for name in fields])
+    obj = np.empty(data.shape, dtype=dtype).view(type(data))
+    obj.__array_finalize__(data)
+    for name in data.dtype.names:
+        obj[name] = data[name]
+    for name in fields:
+        obj[name] = plasma[name]
+
+    # record units
+    info = getattr(obj, '_info', None)
+    if isinstance(info, dict):
+        obj._info = copy.copy(info)
+        obj._info['plasma units'] = {
+            name: PLASMA_UNITS[name] for name in fields}
+    return obj
+
+
+def B_at_probe(hdf_file: File, shotnum, z) -> np.ndarray:
+    """
+    Interpolate the :code:`'Magnetic field'` MSI axial profile at the
+    probe location **z** for every shot in **shotnum**, all shots at
+    once.  Only the profile rows of the requested shots are read and
+    the z-grid is cached per file (see :class:`MagneticFieldProfile`).
+
+    :param hdf_file: HDF5 file object
+    :param shotnum: HDF5 global shot numbers
+    :type shotnum: Union[int, list(int), numpy.ndarray]
+    :param z: axial location (in cm) of the probe, either one location
+        for all shots or one location per shot
+    :return: magnetic field (in Gauss) per shot, NaN for shots not
+        recorded by the diagnostic or a **z** outside of the profile
+    """
+    return _field_profile(hdf_file)(shotnum, z)
+
+
+def _to_cm(z) -> np.ndarray:
+    """Convert the axial location **z** to cm."""
+    if isinstance(z, u.Quantity):
+        z = z.to_value(u.cm)
+    return np.asarray(z, dtype=np.float64)
+
+
+def _per_shot(value, n_shots: int, name: str):
+    """Ensure **value** is a scalar or has one entry per shot."""
+    if isinstance(value, u.Quantity):
+        arr = value
+    else:
+        arr = np.asarray(value, dtype=np.float64)
+    if arr.ndim == 0:
+        return arr
+    elif arr.ndim == 1 and arr.size == n_shots:
+        return arr
+    raise ValueError('`{}` must be a scalar or have one entry per '
+                     'shot ({})'.format(name, n_shots))
+
+
+def _msi_rows(msi_sn: np.ndarray,
+              shotnum: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rows of the MSI shot numbers **msi_sn** holding the shot numbers
+    **shotnum**, and the mask of the shot numbers that were found.
+    """
+    if msi_sn.size == 0:
+        return (np.zeros(shotnum.shape, dtype=np.intp),
+                np.zeros(shotnum.shape, dtype=bool))
+    order = np.argsort(msi_sn, kind='stable')
+    ii = np.searchsorted(msi_sn, shotnum, sorter=order)
+    ii[ii == msi_sn.size] = 0
+    rows = order[ii]
+    found = msi_sn[rows] == shotnum
+    return rows, found
+
+
+def _read_rows(dset, rows: np.ndarray, field=None,
+               cols=slice(None)) -> np.ndarray:
+    """
+    Read the sorted, unique **rows** of **dset** (and **field**, or the
+    columns **cols**) with one hyperslab if they are dense, or a point
+    selection otherwise.
+    """
+    start, stop = int(rows[0]), int(rows[-1]) + 1
+    dense = stop - start <= 2 * rows.size
+    sel = slice(start, stop) if dense else rows.tolist()
+    arr = dset[sel, cols] if field is None else dset[sel, field]
+    return arr[rows - start] if dense else arr
+
+
+class MagneticFieldProfile(object):
+    """
+    Batched interpolation of the :code:`'Magnetic field'` MSI axial
+    profiles (see :func:`B_at_probe`).  The z-grid and the shot number
+    column are read once and cached, and each call only reads the
+    profile rows of the requested shots and the profile columns that
+    bracket the requested z locations.
+    """
+
+    def __init__(self, hdf_file: File):
+        """
+        :param hdf_file: HDF5 file object
+        """
+        try:
+            _map = hdf_file.msi['Magnetic field']
+        except KeyError:
+            raise ValueError("'Magnetic field' MSI diagnostic not "
+                             "found") from None
+        self._hdf_file = hdf_file
+        self._summary_path = _map.configs['shotnum']['dset paths'][0]
+        self._sn_field = _map.configs['shotnum']['dset field'][0]
+        self._profile_path = \
+            _map.configs['signals']['magnetic field']['dset paths'][0]
+
+        # z-grid in ascending order
+        zgrid = np.asarray(_map.configs['z'], dtype=np.float64)
+        if zgrid.ndim != 1 or zgrid.size < 2:
+            raise ValueError("'Magnetic field' profile z locations "
+                             "are not defined")
+        self._descending = bool(zgrid[0] > zgrid[-1])
+        self._z = zgrid[::-1] if self._descending else zgrid
+        self._z.setflags(write=False)
+        if np.any(np.diff(self._z) <= 0):
+            raise ValueError("'Magnetic field' profile z locations "
+                             "are not monotonic")
+
+        self._shotnum = np.empty(0, dtype=np.int64)
+
+    @property
+    def z(self) -> np.ndarray:
+        """z-grid (in cm) of the profiles, in ascending order"""
+        return self._z
+
+    @property
+    def shotnum(self) -> np.ndarray:
+        """shot numbers recorded by the profile dataset"""
+        summary = self._hdf_file[self._summary_path]
+        if getattr(self._hdf_file, 'swmr_mode', False):
+            summary.refresh()
+        n_rows = summary.shape[0]
+        if n_rows != self._shotnum.size:
+            # only rows appended since the last call are read
+            start = self._shotnum.size if n_rows > self._shotnum.size \
+                else 0
+            new = summary[start:n_rows, self._sn_field]
+            self._shotnum = np.concatenate(
+                (self._shotnum[:start], new.astype(np.int64)))
+        return self._shotnum
+
+    def __call__(self, shotnum, z) -> np.ndarray:
+        """
+        Interpolate the profile of every shot in **shotnum** at the
+        axial location(s) **z**.
+
+        :param shotnum: HDF5 global shot numbers
+        :param z: axial location(s) (in cm), a scalar or one location
+            per shot
+        :return: magnetic field (in Gauss) per shot, NaN for shots
+            not recorded or **z** outside of the z-grid
+        """
+        shotnum = np.asarray(shotnum, dtype=np.int64).ravel()
+        z = np.broadcast_to(_to_cm(z), shotnum.shape)
+        Bo = np.full(shotnum.size, np.nan)
+        zgrid = self._z
+
+        rows, found = _msi_rows(self.shotnum, shotnum)
+        found &= (z >= zgrid[0]) & (z <= zgrid[-1])
+        if not np.any(found):
+            return Bo
+        zz = z[found]
+
+        # bracketing columns of each z
+        jj = np.clip(np.searchsorted(zgrid, zz) - 1, 0, zgrid.size - 2)
+        weight = (zz - zgrid[jj]) / (zgrid[jj + 1] - zgrid[jj])
+
+        # read only the needed rows and columns
+        urows, inverse = np.unique(rows[found], return_inverse=True)
+        cstart, cstop = int(jj.min()), int(jj.max()) + 2
+        if self._descending:
+            n = zgrid.size
+            cols = slice(n - cstop, n - cstart)
+        else:
+            cols = slice(cstart, cstop)
+        profile = _read_rows(self._hdf_file[self._profile_path], urows,
+                             cols=cols)
+        if self._descending:
+            profile = profile[:, ::-1]
+        profile = profile[inverse].astype(np.float64)
+
+        # batched linear interpolation
+        kk = np.arange(zz.size)
+        jj -= cstart
+        Bo[found] = (1.0 - weight) * profile[kk, jj] \
+            + weight * profile[kk, jj + 1]
+        return Bo
+
+
+def _field_profile(hdf_file: File) -> MagneticFieldProfile:
+    """
+    Get the (cached) :class:`MagneticFieldProfile` of **hdf_file**.
+    """
+    profile = getattr(hdf_file, '_field_profile', None)
+    if profile is None:
+        profile = MagneticFieldProfile(hdf_file)
+        hdf_file._field_profile = profile
+    return profile
+
+
+def _magnetic_field(hdf_file: File, shotnum: np.ndarray,
+                    z: np.ndarray) -> np.ndarray:
+    """
+    Interpolate the :code:`'Magnetic field'` axial profile of every
+    shot in **shotnum** at the axial location(s) **z**.
+    """
+    try:
+        profile = _field_profile(hdf_file)
+    except ValueError as err:
+        raise ValueError(str(err) + ", pass `Bo` instead") from None
+    Bo = profile(shotnum, z)
+    if np.all(np.isnan(Bo)):
+        warn("No requested shot was recorded by the 'Magnetic field' "
+             "MSI diagnostic at the requested z")
+    return Bo
+
+
+def _electron_density(hdf_file: File, shotnum: np.ndarray,
+                      z: np.ndarray, interferometer=None) -> np.ndarray:
+    """
+    Get the :code:`'Peak density'` of the interferometer
+    **interferometer** (DEFAULT is the closest to **z**) for every shot
+    in **shotnum**.
+    """
+    try:
+        _map = hdf_file.msi['Interferometer array']
+    except KeyError:
+        raise ValueError("'Interferometer array' MSI diagnostic not "
+                         "found, pass `n_e` instead") from None
+    config = _map.configs['meta']['peak density']
+    zlocs = np.asarray(_map.configs['z'], dtype=np.float64)
+    if interferometer is None:
+        # closest interferometer to each shot's z
+        zz = np.broadcast_to(z, shotnum.shape)
+        choice = np.argmin(np.abs(zz[:, None] - zlocs[None, :]), axis=1)
+    elif isinstance(interferometer, (int, np.integer)) \
+            and 0 <= interferometer < zlocs.size:
+        choice = np.full(shotnum.shape, interferometer)
+    else:
+        raise ValueError('`interferometer` must be an int in range '
+                         '[0, {})'.format(zlocs.size))
+
+    n_e = np.full(shotnum.size, np.nan)
+    for ii in np.unique(choice):
+        mask = choice == ii
+        dset = hdf_file[config['dset paths'][ii]]
+        sn_field = _map.configs['shotnum']['dset field'][0]
+        rows, found = _msi_rows(dset[sn_field], shotnum[mask])
+        if not np.any(found):
+            continue
+        urows, inverse = np.unique(rows[found], return_inverse=True)
+        values = _read_rows(dset, urows,
+                            config['dset field'][0])[inverse]
+        n_e[np.flatnonzero(mask)[found]] = values
+    if np.all(np.isnan(n_e)):
+        warn("No requested shot was recorded by the 'Interferometer "
+             "array' MSI diagnostic")
+    return n_e
@@ -0,0 +1,354 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+A thread-safe pool of open HDF5 file handles for services that read
+from several threads.  Each handle is checked out by one thread at a
+time, and all handles of the same file share a single file mapping,
+so the (expensive) mapping is only done once per file.
+
+:Example:
+
+    >>> from bapsflib import lapd
+    >>> pool = FilePool(lapd.File, max_handles=4, max_open_files=32,
+    ...                 idle_timeout=300, silent=True)
+    >>>
+    >>> # in a worker thread
+    >>> with pool.handle('run.hdf5') as f:
+    ...     data = f.read_data(1, 1, shotnum=slice(1, 100))
+    >>>
+    >>> # on shutdown
+    >>> pool.close()
+"""
+import os
+import threading
+import time
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import (Iterator, List, Type, Union)
+
+from .file import File
+
+__all__ = ['FilePool']
+
+
+class _PoolEntry(object):
+    """Open handles of a single file in a :class:`FilePool`."""
+
+    def __init__(self):
+        #: shared file map, :code:`None` until the first handle is
+        #: mapped
+        self.file_map = None
+
+        #: handle that built :attr:`file_map`, the map references
+        #: this handle so it is closed last
+        self.owner = None  # type: Union[File, None]
+
+        #: checked-in handles and the time they were checked in, as
+        #: (handle, time) tuples
+        self.idle = []  # type: List[tuple]
+
+        #: number of open handles (checked-in, checked-out, and being
+        #: opened)
+        self.n_open = 0
+
+
+class FilePool(object):
+    """
+    Thread-safe pool of open :class:`~.file.File` handles.
+
+    Up to **max_handles** handles are kept open per file.  All handles
+    of a file share the :class:`~bapsflib._hdf.maps.hdfmap.HDFMap`
+    built by the first handle, which must be treated as read-only.
+    When a thread requests a handle and all handles of the file are
+    checked out, the thread waits until one is checked in.
+
+    Handles that have been idle longer than **idle_timeout** are
+    closed on subsequent pool operations (or by
+    :meth:`evict_idle`), and when opening a new handle would exceed
+    **max_open_files**, then the least recently used idle handles are
+    closed first.
+    """
+
+    def __init__(self, file_class: Type[File] = File, max_handles=4,
+                 max_open_files=None, idle_timeout=None, **kwargs):
+        """
+        :param file_class: class used to open the files (e.g.
+            :class:`bapsflib.lapd.File`)
+        :param int max_handles: maximum number of open handles per file
+        :param max_open_files: maximum number of open handles across
+            all files, :code:`None` (DEFAULT) for no limit
+        :type max_open_files: Union[int, None]
+        :param idle_timeout: seconds after which an idle handle is
+            closed, :code:`None` (DEFAULT) to keep idle handles open
+        :type idle_timeout: Union[float, None]
+        :param kwargs: keywords passed on to **file_class** when
+            opening a handle (e.g. :code:`silent=True`)
+        """
+        if not (isinstance(file_class, type)
+                and issubclass(file_class, File)):
+            raise TypeError(
+                "`file_class` must be a subclass of "
+                "bapsflib._hdf.utils.file.File")
+        if max_handles < 1:
+            raise ValueError('`max_handles` must be >= 1')
+        if max_open_files is not None and max_open_files < 1:
+            raise ValueError('`max_open_files` must be >= 1')
+        if kwargs.get('mode', 'r') != 'r':
+            raise ValueError("Pooled handles must be opened read-only")
+        kwargs.pop('file_map', None)
+
+        self._file_class = file_class
+        self._max_handles = int(max_handles)
+        self._max_open_files = max_open_files
+        self._idle_timeout = idle_timeout
+        self._kwargs = kwargs
+
+        # entries are ordered from least to most recently used
+        self._entries = OrderedDict()  # type: OrderedDict
+        self._cond = threading.Condition()
+        self._closed = False
+
+    @property
+    def max_handles(self) -> int:
+        """Maximum number of open handles per file."""
+        return self._max_handles
+
+    @property
+    def max_open_files(self) -> Union[int, None]:
+        """Maximum number of open handles across all files."""
+        return self._max_open_files
+
+    @property
+    def idle_timeout(self) -> Union[float, None]:
+        """Seconds after which an idle handle is closed."""
+        return self._idle_timeout
+
+    @property
+    def n_open(self) -> int:
+        """Number of open handles across all files."""
+        with self._cond:
+            return self._n_open()
+
+    @property
+    def paths(self) -> List[str]:
+        """Absolute paths of the files with open handles."""
+        with self._cond:
+            return list(self._entries)
+
+    def _n_open(self) -> int:
+        return sum(entry.n_open for entry in self._entries.values())
+
+    def acquire(self, name: str, timeout=None) -> File:
+        """
+        Check out a handle of file **name**.  The handle must be
+        returned with :meth:`release` (see :meth:`handle` for a
+        context manager that does so).
+
+        :param str name: name (and path) of the file
+        :param timeout: seconds to wait for a handle to become
+            available, :code:`None` (DEFAULT) to wait indefinitely
+        :type timeout: Union[float, None]
+        :raises TimeoutError: if no handle became available within
+            **timeout**
+        """
+        path = os.path.abspath(name)
+        deadline = None if timeout is None \
+            else time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise ValueError('FilePool is closed')
+                self._evict_idle()
+
+                entry = self._entries.get(path, None)
+                if entry is None:
+                    entry = _PoolEntry()
+                    self._entries[path] = entry
+                self._entries.move_to_end(path)
+
+                # re-use an idle handle
+                if len(entry.idle) != 0:
+                    return entry.idle.pop()[0]
+
+                # open a new handle
+                # - wait until the first handle has mapped the file
+                mapping = entry.file_map is None and entry.n_open != 0
+                if not mapping and entry.n_open < self._max_handles \
+                        and self._make_room():
+                    entry.n_open += 1
+                    break
+
+                remaining = None if deadline is None \
+                    else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    if entry.n_open == 0:
+                        del self._entries[path]
+                    raise TimeoutError(
+                        "No handle of '{}' became ".format(path)
+                        + "available within {} s".format(timeout))
+                self._cond.wait(remaining)
+
+        # open outside of the lock so other files are not blocked
+        # while the file is mapped
+        try:
+            hdf_file = self._file_class(path, file_map=entry.file_map,
+                                        **self._kwargs)
+        except Exception:
+            with self._cond:
+                entry.n_open -= 1
+                if entry.n_open == 0 \
+                        and self._entries.get(path, None) is entry:
+                    del self._entries[path]
+                self._cond.notify_all()
+            raise
+
+        with self._cond:
+            if entry.file_map is None:
+                entry.file_map = hdf_file.file_map
+                entry.owner = hdf_file
+                self._cond.notify_all()
+        return hdf_file
+
+    def release(self, hdf_file: File):
+        """Check in a handle obtained from :meth:`acquire`."""
+        path = os.path.abspath(hdf_file.filename)
+        with self._cond:
+            entry = self._entries.get(path, None)
+            if entry is None or entry.file_map is not hdf_file.file_map:
+                raise ValueError(
+                    'handle does not belong to this FilePool')
+            entry.idle.append((hdf_file, time.monotonic()))
+            self._evict_idle()
+            self._cond.notify_all()
+
+    @contextmanager
+    def handle(self, name: str, timeout=None) -> Iterator[File]:
+        """
+        Context manager that checks out a handle of file **name** and
+        checks it back in on exit.  (see :meth:`acquire` for
+        parameters)
+
+        :Example:
+
+            >>> with pool.handle('run.hdf5') as f:
+            ...     data = f.read_data(1, 1)
+        """
+        hdf_file = self.acquire(name, timeout=timeout)
+        try:
+            yield hdf_file
+        finally:
+            self.release(hdf_file)
+
+    def evict_idle(self, idle_timeout=None) -> int:
+        """
+        Close handles that have been idle longer than **idle_timeout**
+        seconds.
+
+        :param idle_timeout: DEFAULT is the pool's
+            :attr:`idle_timeout`, use :code:`0` to close all idle
+            handles
+        :type idle_timeout: Union[float, None]
+        :return: number of closed handles
+        """
+        with self._cond:
+            n_closed = self._evict_idle(idle_timeout)
+            if n_closed:
+                self._cond.notify_all()
+            return n_closed
+
+    def _evict_idle(self, idle_timeout=None) -> int:
+        """:meth:`evict_idle` for callers already holding the lock."""
+        if idle_timeout is None:
+            idle_timeout = self._idle_timeout
+        if idle_timeout is None:
+            return 0
+
+        n_closed = 0
+        tnow = time.monotonic()
+        for path in list(self._entries):
+            entry = self._entries[path]
+
+            # the owner handle is visited last so it can be closed
+            # along with the others
+            idle = sorted(entry.idle,
+                          key=lambda item: item[0] is entry.owner)
+            for hdf_file, tidle in idle:
+                if tnow - tidle >= idle_timeout \
+                        and self._close_idle(path, hdf_file):
+                    n_closed += 1
+        return n_closed
+
+    def _make_room(self) -> bool:
+        """
+        Close the least recently used idle handles until another handle
+        can be opened without exceeding :attr:`max_open_files`.
+        Returns :code:`False` if that is not possible.
+        """
+        if self._max_open_files is None:
+            return True
+
+        while self._n_open() >= self._max_open_files:
+            # close the oldest idle handle that can be closed
+            candidates = sorted(
+                ((tidle, path, hdf_file)
+                 for path, entry in self._entries.items()
+                 for hdf_file, tidle in entry.idle),
+                key=lambda item: item[0])
+            for _, path, hdf_file in candidates:
+                if self._close_idle(path, hdf_file):
+                    break
+            else:
+                return False
+        return True
+
+    def _close_idle(self, path: str, hdf_file: File) -> bool:
+        """
+        Close idle handle **hdf_file** of file **path**.  The handle
+        that owns the shared file map is only closed once it is the
+        last open handle of the file.
+        """
+        entry = self._entries[path]
+        if hdf_file is entry.owner and entry.n_open != 1:
+            return False
+
+        entry.idle = [item for item in entry.idle
+                      if item[0] is not hdf_file]
+        entry.n_open -= 1
+        hdf_file.close()
+        if entry.n_open == 0:
+            # the file map references the closed owner handle
+            del self._entries[path]
+        return True
+
+    def close(self):
+        """
+        Close all idle handles and refuse further checkouts.  Handles
+        still checked out are closed when they are checked in.
+        """
+        with self._cond:
+            self._closed = True
+            self._idle_timeout = 0
+            self._evict_idle()
+            self._cond.notify_all()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return ('<FilePool {} open handle(s) of {} file(s) '
+                '(max_handles={})>'.format(self.n_open,
+                                           len(self.paths),
+                                           self._max_handles))
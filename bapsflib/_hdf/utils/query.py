@@ -0,0 +1,446 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Shot selection by conditions on control device and MSI diagnostic
+values.
+
+A :class:`ShotQuery` collects predicates such as "discharge
+:code:`'data valid'` is 1" or "Waveform :code:`'FREQ'` is 80 kHz".
+Each predicate only reads the shot number column and the columns of
+the referenced field from its dataset, and the shot numbers
+satisfying the predicates are combined with set operations.  The
+resulting shot numbers can be passed straight to
+:meth:`~.file.File.read_data` (or :meth:`~.file.File.read_controls`)
+as :code:`shotnum`.
+
+:Example:
+
+    >>> from bapsflib import lapd
+    >>> f = lapd.File('sample.hdf5')
+    >>> query = (f.shot_query()
+    ...          .msi('Discharge', 'data valid', '==', 1)
+    ...          .msi('Discharge', 'peak current', '>', 4000.)
+    ...          .control('Waveform', 'FREQ', '==', 80000.))
+    >>> data = f.read_data(1, 1, shotnum=query.shotnum())
+    >>> print(query.explain())
+"""
+import numpy as np
+
+from functools import reduce
+from typing import (Any, Callable, Dict, List, Tuple, Union)
+
+from .file import File
+from .header import WHERE_OPERATORS
+from .helpers import condition_controls
+
+__all__ = ['ShotQuery']
+
+#: predicate operators in addition to the comparison operators
+QUERY_OPERATORS = ('in',)
+
+
+class _Term(object):
+    """
+    A predicate on one field of a control device or MSI diagnostic.
+    """
+
+    def __init__(self, kind: str, device: str, field: str, op,
+                 value=None, config_name=None):
+        if callable(op):
+            value = None
+        elif op not in WHERE_OPERATORS and op not in QUERY_OPERATORS:
+            raise ValueError(
+                "Invalid operator {!r}, expected a callable or one of "
+                "{}".format(op, list(WHERE_OPERATORS)
+                            + list(QUERY_OPERATORS)))
+        elif op == 'in':
+            value = tuple(value)
+
+        self.kind = kind
+        self.device = device
+        self.field = field
+        self.op = op
+        self.value = value
+        self.config_name = config_name
+
+    def __str__(self):
+        device = repr(self.device)
+        if self.config_name is not None:
+            device += ' ({})'.format(self.config_name)
+        if callable(self.op):
+            cond = getattr(self.op, '__name__', repr(self.op))
+            cond = 'satisfies {}'.format(cond)
+        else:
+            cond = '{} {!r}'.format(self.op, self.value)
+        return '{} {} [{!r}] {}'.format(self.kind, device,
+                                        self.field, cond)
+
+    def mask(self, values: np.ndarray) -> np.ndarray:
+        """Evaluate the predicate on the field **values**."""
+        if callable(self.op):
+            mask = np.asarray(self.op(values), dtype=bool)
+        elif self.op == 'in':
+            mask = np.isin(values, self.value)
+        else:
+            mask = np.asarray(WHERE_OPERATORS[self.op](values,
+                                                       self.value))
+
+        # array valued fields (e.g. 'xyz') must satisfy the predicate
+        # in every element
+        if mask.ndim > 1:
+            mask = mask.reshape(mask.shape[0], -1).all(axis=1)
+        if mask.shape != values.shape[:1]:
+            raise ValueError(
+                'Predicate on {} did not give one value per '
+                'shot'.format(self))
+        return mask
+
+
+class _Plan(object):
+    """The columns read, and shots selected, by one evaluation."""
+
+    def __init__(self, hdf_file: File):
+        self.hdf_file = hdf_file
+        self.columns = {}  # type: Dict[Tuple[str, str], np.ndarray]
+        self.reads = []  # type: List[Dict[str, Any]]
+        self.counts = {}  # type: Dict[int, int]
+
+    def column(self, path: str, field: str) -> np.ndarray:
+        """
+        Read (once) the **field** column of the dataset at **path**.
+        """
+        key = (path, field)
+        if key not in self.columns:
+            dset = self.hdf_file[path]
+            arr = dset[field] if dset.dtype.names is not None \
+                else dset[...]
+            self.columns[key] = arr
+            self.reads.append({'dataset': path, 'field': field,
+                               'rows': arr.shape[0],
+                               'bytes': arr.nbytes})
+        return self.columns[key]
+
+
+def _read_control_field(plan: _Plan, control: str, field: str,
+                        config_name=None
+                        ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read the shot numbers and the values of a control device state
+    value, reading only the shot number, configuration, and field
+    columns of the control dataset.
+
+    :param plan: the plan recording (and caching) the column reads
+    :param str control: name of the control device
+    :param str field: name of the state value
+    :param config_name: configuration name, required if the control
+        device has more than one configuration
+    :return: the shot numbers and the field values of the rows
+        recorded for the configuration
+    """
+    hdf_file = plan.hdf_file
+    if config_name is not None:
+        control = (control, config_name)
+    cname, cconfn = condition_controls(hdf_file, [control])[0]
+    cmap = hdf_file.file_map.controls[cname]
+    cconfig = cmap.configs[cconfn]
+    try:
+        fconfig = cconfig['state values'][field]
+    except KeyError:
+        raise ValueError(
+            "'{}' is not a state value of control '{}', valid "
+            "fields are {}".format(field, cname,
+                                   list(cconfig['state values'])))
+
+    # rows of the configuration
+    path = cconfig['dset paths'][0]
+    shotnum = plan.column(path, cconfig['shotnum']['dset field'][0])
+    rows = shotnum > 0
+    if not cmap.one_config_per_dset:
+        # the dataset records multiple configurations
+        configkey = [df for df in hdf_file[path].dtype.names
+                     if 'configuration' in df.casefold()]
+        if len(configkey) == 0:
+            raise ValueError(
+                'Can NOT find a configuration field in the control'
+                ' ({}) dataset'.format(cname))
+        rows &= plan.column(path, configkey[0]) \
+            == str(cconfn).encode()
+
+    # field values
+    columns = []
+    for df_name in fconfig['dset field']:
+        if df_name == '':
+            # field the dataset does not record (e.g. 'y' of the
+            # NI_XZ module)
+            columns.append(np.zeros(shotnum.shape,
+                                    dtype=fconfig['dtype']))
+            continue
+
+        column = plan.column(path, df_name)
+        if cmap.has_command_list:
+            cl = np.array(fconfig['command list'],
+                          dtype=fconfig['dtype'])
+            rows &= (column >= 0) & (column < cl.size)
+            column = cl[np.clip(column, 0, max(cl.size - 1, 0))]
+        columns.append(column)
+    values = columns[0] if len(columns) == 1 \
+        else np.stack(columns, axis=-1)
+
+    return shotnum[rows], values[rows]
+
+
+class ShotQuery(object):
+    """
+    Select shots by predicates on control device state values
+    (e.g. :code:`'xyz'` or :code:`'FREQ'`) and MSI diagnostic
+    :code:`'meta'` fields (e.g. :code:`'peak current'`).
+
+    Adding a predicate with :meth:`control` or :meth:`msi` returns a
+    new query that requires the predicate in addition to those of the
+    original query.  Queries on the same file can be combined with
+    :code:`&` (shots in both), :code:`|` (shots in either), and
+    :code:`-` (shots in the first but not the second).
+
+    A predicate is an operator (:code:`'=='`, :code:`'!='`,
+    :code:`'<'`, :code:`'<='`, :code:`'>'`, :code:`'>='`, or
+    :code:`'in'`) and a value, or a callable that is given the array
+    of field values and returns a boolean array.  Array valued fields
+    (e.g. :code:`'xyz'`) are compared element-wise and must satisfy
+    the predicate in every element, so a pair of :code:`'>='` and
+    :code:`'<='` predicates selects a box.
+
+    :Example:
+
+        >>> query = ShotQuery(f).control(
+        ...     '6K Compumotor', 'xyz', '>=', (0., -5., -np.inf),
+        ...     config_name=3).control(
+        ...     '6K Compumotor', 'xyz', '<=', (10., 5., np.inf),
+        ...     config_name=3)
+        >>> query.shotnum()
+        array([ 12,  13,  14, ...], dtype=uint32)
+    """
+
+    def __init__(self, hdf_file: File, _node=None):
+        """
+        :param hdf_file: HDF5 file object
+        """
+        if not isinstance(hdf_file, File):
+            raise TypeError(
+                "`hdf_file` is NOT type `"
+                + File.__module__ + "." + File.__qualname__ + "`")
+        self._file = hdf_file
+        self._node = _node
+        self._plan = None  # type: Union[_Plan, None]
+
+    # ---- building                                                ----
+    def control(self, control: str, field: str,
+                op: Union[str, Callable[[np.ndarray], np.ndarray]],
+                value=None, config_name=None) -> 'ShotQuery':
+        """
+        Add a predicate on a control device state value.
+
+        :param str control: name of the control device
+        :param str field: name of the state value (e.g. :code:`'xyz'`
+            or :code:`'command'`), see the :code:`'state values'` of
+            the device's configuration
+        :param op: comparison operator or callable predicate
+        :param value: value to compare with (a collection of values
+            for :code:`'in'`)
+        :param config_name: configuration name, required if the
+            control device has more than one configuration
+        :return: the new query
+        """
+        return self._add(_Term('control', control, field, op, value,
+                               config_name))
+
+    def msi(self, msi_diag: str, field: str,
+            op: Union[str, Callable[[np.ndarray], np.ndarray]],
+            value=None) -> 'ShotQuery':
+        """
+        Add a predicate on a :code:`'meta'` field of an MSI
+        diagnostic.
+
+        :param str msi_diag: name of the MSI diagnostic
+        :param str field: name of the :code:`'meta'` field (e.g.
+            :code:`'peak current'`)
+        :param op: comparison operator or callable predicate
+        :param value: value to compare with (a collection of values
+            for :code:`'in'`)
+        :return: the new query
+        """
+        return self._add(_Term('MSI', msi_diag, field, op, value))
+
+    def _add(self, term: _Term) -> 'ShotQuery':
+        return self & ShotQuery(self._file, _node=('term', term))
+
+    def _combine(self, other: 'ShotQuery', how: str) -> 'ShotQuery':
+        if not isinstance(other, ShotQuery):
+            return NotImplemented
+        elif other._file is not self._file:
+            raise ValueError('Can only combine queries on the same '
+                             'file')
+        elif self._node is None:
+            return ShotQuery(self._file, _node=other._node)
+        elif other._node is None:
+            return ShotQuery(self._file, _node=self._node)
+
+        # flatten nested nodes of the same operation
+        nodes = []
+        for node in (self._node, other._node):
+            if node[0] == how and how != 'not':
+                nodes.extend(node[1])
+            else:
+                nodes.append(node)
+        return ShotQuery(self._file, _node=(how, nodes))
+
+    def __and__(self, other: 'ShotQuery') -> 'ShotQuery':
+        return self._combine(other, 'and')
+
+    def __or__(self, other: 'ShotQuery') -> 'ShotQuery':
+        return self._combine(other, 'or')
+
+    def __sub__(self, other: 'ShotQuery') -> 'ShotQuery':
+        return self._combine(other, 'not')
+
+    # ---- evaluation                                              ----
+    def shotnum(self) -> np.ndarray:
+        """
+        Evaluate the query.
+
+        :return: sorted array of the shot numbers that satisfy the
+            query
+        """
+        if self._node is None:
+            raise ValueError('The query has no predicates')
+
+        plan = _Plan(self._file)
+        shotnum = self._evaluate(self._node, plan)
+        self._plan = plan
+        return shotnum
+
+    def _evaluate(self, node, plan: _Plan) -> np.ndarray:
+        if node[0] == 'term':
+            shotnum, values = self._read_term(node[1], plan)
+            shotnum = np.unique(shotnum[node[1].mask(values)])
+        else:
+            shotnums = [self._evaluate(child, plan)
+                        for child in node[1]]
+            combine = {'and': np.intersect1d,
+                       'or': np.union1d,
+                       'not': np.setdiff1d}[node[0]]
+            shotnum = reduce(combine, shotnums)
+        shotnum = shotnum.astype(np.uint32, copy=False)
+        plan.counts[id(node)] = shotnum.size
+        return shotnum
+
+    def _read_term(self, term: _Term,
+                   plan: _Plan) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Read the shot numbers and field values of a predicate.
+        """
+        if term.kind == 'control':
+            return _read_control_field(plan, term.device, term.field,
+                                       config_name=term.config_name)
+        return self._read_msi(term, plan)
+
+    def _read_msi(self, term: _Term,
+                  plan: _Plan) -> Tuple[np.ndarray, np.ndarray]:
+        try:
+            _map = self._file.file_map.msi[term.device]
+        except KeyError:
+            raise ValueError(
+                "'{}' is not among the known MSI diagnostics "
+                "{}".format(term.device, list(self._file.file_map.msi)))
+        meta = {field: fconfig
+                for field, fconfig in _map.configs['meta'].items()
+                if field != 'shape'}
+        try:
+            fconfig = meta[term.field]
+        except KeyError:
+            raise ValueError(
+                "'{}' is not a 'meta' field of MSI diagnostic '{}', "
+                "valid fields are {}".format(term.field, term.device,
+                                             list(meta)))
+
+        sn_config = _map.configs['shotnum']
+        shotnum = plan.column(sn_config['dset paths'][0],
+                              sn_config['dset field'][0])
+
+        # field values
+        # - multiple datasets (e.g. one per interferometer) give a
+        #   column per dataset
+        columns = []
+        for ii, path in enumerate(fconfig['dset paths']):
+            dset_field = fconfig['dset field'][0] \
+                if len(fconfig['dset field']) == 1 \
+                else fconfig['dset field'][ii]
+            columns.append(plan.column(path, dset_field))
+        values = columns[0] if len(columns) == 1 \
+            else np.stack(columns, axis=1)
+
+        return shotnum, values
+
+    # ---- reporting                                               ----
+    @property
+    def columns_read(self) -> List[Dict[str, Any]]:
+        """
+        The dataset columns read by the last evaluation
+        (:meth:`shotnum`), as dictionaries with the :code:`'dataset'`
+        path, :code:`'field'`, number of :code:`'rows'`, and
+        :code:`'bytes'` read.
+        """
+        if self._plan is None:
+            return []
+        return [dict(read) for read in self._plan.reads]
+
+    def explain(self) -> str:
+        """
+        Describe the query: its predicates and the number of shots
+        each selects, and the dataset columns read to evaluate it.
+        The query is evaluated if it has not been yet.
+        """
+        if self._plan is None:
+            self.shotnum()
+        plan = self._plan
+
+        lines = ['ShotQuery on {!r}'.format(self._file.filename)]
+
+        def describe(node, depth):
+            count = plan.counts.get(id(node), None)
+            label = str(node[1]) if node[0] == 'term' \
+                else {'and': 'ALL OF', 'or': 'ANY OF',
+                      'not': 'FIRST BUT NOT THE REST OF'}[node[0]]
+            lines.append('{}{} -> {} shot(s)'.format(
+                '  ' * depth, label, count))
+            if node[0] != 'term':
+                for child in node[1]:
+                    describe(child, depth + 1)
+
+        describe(self._node, 1)
+        lines.append('columns read:')
+        for read in plan.reads:
+            lines.append('  {} [{!r}]: {} rows, {} bytes'.format(
+                read['dataset'], read['field'], read['rows'],
+                read['bytes']))
+        lines.append('total: {} column(s), {} bytes'.format(
+            len(plan.reads), sum(read['bytes'] for read in plan.reads)))
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        n_terms = 0
+        stack = [self._node] if self._node is not None else []
+        while stack:
+            node = stack.pop()
+            if node[0] == 'term':
+                n_terms += 1
+            else:
+                stack.extend(node[1])
+        return '<ShotQuery {} predicate(s)>'.format(n_terms)
@@ -0,0 +1,233 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Instrumentation for the HDF5 read classes.  A :class:`ReadStats`
+instance records per-stage wall-clock durations, the number of HDF5
+read calls, the number of bytes read, and the number of rows selected
+during a read.
+"""
+import h5py
+import logging
+import numpy as np
+import time
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import (Any, Dict)
+
+__all__ = ['ReadStats', 'TrackedDataset']
+
+#: module logger, stage timings are emitted at the :code:`DEBUG` level
+logger = logging.getLogger(__name__)
+
+
+class ReadStats(object):
+    """
+    Records timing and I/O statistics for a single read operation
+    (e.g. one :class:`~.hdfreaddata.HDFReadData` construction).
+
+    :Example:
+
+        >>> stats = ReadStats('HDFReadData')
+        >>> with stats.stage('signal read'):
+        ...     arr = stats.track(dset)[0:10, ...]
+        >>> stats.n_reads
+        1
+        >>> stats.as_dict()['stages']
+        OrderedDict([('signal read', 0.0012)])
+    """
+
+    def __init__(self, name: str, log=False):
+        """
+        :param str name: name of the instrumented read (used as the
+            prefix of log records)
+        :param log: :code:`False` (DEFAULT) to disable logging,
+            :code:`True` to log stage timings to the module logger
+            at the :code:`DEBUG` level, or an instance of
+            :class:`logging.Logger` to log to
+        :type log: Union[bool, logging.Logger]
+        """
+        self._name = name
+        self._stages = OrderedDict()  # type: Dict[str, float]
+        self._children = OrderedDict()  # type: Dict[str, ReadStats]
+        self.n_reads = 0
+        self.bytes_read = 0
+        self.rows_selected = 0
+
+        #: :code:`True` if the result was served by a
+        #: :class:`~.cache.ReadCache` instead of being read
+        self.cache_hit = False
+
+        if isinstance(log, logging.Logger):
+            self._logger = log
+        elif log:
+            self._logger = logger
+        else:
+            self._logger = None
+
+        self._t0 = time.perf_counter()
+        self._tlast = self._t0
+        self._total = None  # set by finalize()
+
+    @property
+    def name(self) -> str:
+        """Name of the instrumented read."""
+        return self._name
+
+    @property
+    def stages(self) -> Dict[str, float]:
+        """
+        Ordered dictionary of stage names and their wall-clock
+        duration (in seconds).
+        """
+        return self._stages
+
+    @property
+    def children(self) -> Dict[str, 'ReadStats']:
+        """
+        Statistics of nested reads (e.g. the
+        :class:`~.hdfreadcontrol.HDFReadControl` read performed by
+        :class:`~.hdfreaddata.HDFReadData`).
+        """
+        return self._children
+
+    @property
+    def total_time(self) -> float:
+        """
+        Total wall-clock time (in seconds) of the read.  If the read
+        has not been finalized, then this is the elapsed time since
+        the object was created.
+        """
+        if self._total is None:
+            return time.perf_counter() - self._t0
+        return self._total
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Context manager that times the enclosed block and records it
+        under **name**.  Re-entering an existing stage accumulates
+        its duration.
+        """
+        tstart = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self._tlast = time.perf_counter()
+            self._record_stage(name, self._tlast - tstart)
+
+    def checkpoint(self, name: str):
+        """
+        Record the time elapsed since the previous checkpoint (or
+        stage, or object creation) under the stage **name**.
+        """
+        tnow = time.perf_counter()
+        self._record_stage(name, tnow - self._tlast)
+        self._tlast = tnow
+
+    def _record_stage(self, name: str, dt: float):
+        """Accumulate duration **dt** (in sec) for stage **name**."""
+        self._stages[name] = self._stages.get(name, 0.0) + dt
+        if self._logger is not None \
+                and self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug('%s - %s: %.3f ms',
+                               self._name, name, dt * 1.E3)
+
+    def track(self, dset: h5py.Dataset) -> 'TrackedDataset':
+        """
+        Wrap **dset** so every slicing read is counted in
+        :attr:`n_reads` and :attr:`bytes_read`.
+        """
+        if isinstance(dset, TrackedDataset):
+            return dset
+        return TrackedDataset(dset, self)
+
+    def record_read(self, arr: Any):
+        """Record one HDF5 read call that returned **arr**."""
+        self.n_reads += 1
+        try:
+            self.bytes_read += arr.nbytes
+        except AttributeError:
+            # numpy scalar or python scalar
+            self.bytes_read += np.asarray(arr).nbytes
+
+    def add_child(self, key: str, stats: 'ReadStats'):
+        """
+        Nest the statistics **stats** of a sub-read under **key**.
+        The I/O counts of the child are folded into this object.
+        """
+        if stats is None:
+            return
+        self._children[key] = stats
+        self.n_reads += stats.n_reads
+        self.bytes_read += stats.bytes_read
+
+    def finalize(self):
+        """
+        Freeze :attr:`total_time` and emit a summary log record (if
+        logging is enabled).
+        """
+        self._total = time.perf_counter() - self._t0
+        if self._logger is not None \
+                and self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(
+                '%s - total: %.3f ms (%d reads, %d bytes, %d rows)',
+                self._name, self._total * 1.E3, self.n_reads,
+                self.bytes_read, self.rows_selected)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the statistics as a (nested) dictionary."""
+        return {
+            'name': self._name,
+            'total time': self.total_time,
+            'stages': OrderedDict(self._stages),
+            'n reads': self.n_reads,
+            'bytes read': self.bytes_read,
+            'rows selected': self.rows_selected,
+            'cache hit': self.cache_hit,
+            'children': OrderedDict(
+                (key, val.as_dict())
+                for key, val in self._children.items()),
+        }
+
+    def __repr__(self):
+        return ('<ReadStats {!r}: {:.3f} ms, '.format(
+                    self._name, self.total_time * 1.E3)
+                + '{} reads, {} bytes, {} rows>'.format(
+                    self.n_reads, self.bytes_read, self.rows_selected))
+
+
+class TrackedDataset(object):
+    """
+    Thin proxy around a :class:`h5py.Dataset` that reports each
+    slicing read to a :class:`ReadStats` instance.  All other
+    attributes are passed through to the wrapped dataset.
+    """
+
+    def __init__(self, dset: h5py.Dataset, stats: ReadStats):
+        self._dset = dset
+        self._stats = stats
+
+    @property
+    def dataset(self) -> h5py.Dataset:
+        """The wrapped :class:`h5py.Dataset`."""
+        return self._dset
+
+    def __getitem__(self, item):
+        arr = self._dset[item]
+        self._stats.record_read(arr)
+        return arr
+
+    def __getattr__(self, item):
+        return getattr(self._dset, item)
+
+    def __len__(self):
+        return len(self._dset)
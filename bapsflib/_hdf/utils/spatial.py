@@ -0,0 +1,383 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Spatial index of the probe positions recorded by a motion control
+device (e.g. :code:`'6K Compumotor'` or :code:`'NI_XZ'`), used to
+resolve the :code:`region` and :code:`nearest` selections of
+:meth:`~.file.File.read_data` to shot numbers.
+
+A probe drive visits a grid of positions and records many shots at
+each, so the index groups the shots by their distinct position.
+Box regions are evaluated on the distinct positions, and sphere
+(circle) regions and nearest position look-ups use a
+:class:`scipy.spatial.cKDTree` of them.  The index of a
+configuration is built once per file (see
+:meth:`~.file.File.spatial_index`) from only the shot number and
+position columns of the control dataset.
+"""
+import numbers
+import numpy as np
+
+from bapsflib._hdf.maps.controls.contype import ConType
+from typing import (Any, Dict, Iterable, Sequence, Tuple, Union)
+
+from .file import File
+from .helpers import condition_controls
+
+__all__ = ['condition_nearest', 'condition_region', 'motion_control',
+           'SpatialIndex']
+
+#: position axes, in the order of the :code:`'xyz'` state value
+AXES = 'xyz'
+
+#: conditioned :code:`region` or :code:`nearest` selection
+Selection = Tuple[Any, ...]
+
+
+class SpatialIndex(object):
+    """
+    Index of the shots recorded at each probe position.
+
+    :Example:
+
+        >>> sindex = f.spatial_index('6K Compumotor', config_name=3)
+        >>> # shots within 1 cm of (x, y) = (2, -3)
+        >>> sindex.within((2., -3.), 1.)
+        >>> # shots in a rectangle
+        >>> sindex.box(x=(0., 10.), y=(-5., 5.))
+        >>> # shots at the position nearest to (x, y, z) = (2, 0, 0)
+        >>> sindex.nearest((2., 0., 0.))
+    """
+
+    def __init__(self, shotnum: np.ndarray, xyz: np.ndarray,
+                 name: str = None):
+        """
+        :param shotnum: shot numbers, shape :code:`(n,)`
+        :param xyz: probe position of each shot, shape :code:`(n, 3)`
+        :param str name: name of the indexed control configuration
+        """
+        shotnum = np.asarray(shotnum)
+        xyz = np.asarray(xyz, dtype=np.float64)
+        if xyz.ndim != 2 or xyz.shape != (shotnum.shape[0], len(AXES)):
+            raise ValueError(
+                '`xyz` must have shape (n, 3) for n shot numbers')
+
+        # shots without a valid position are not indexed
+        valid = np.all(np.isfinite(xyz), axis=1)
+        shotnum = shotnum[valid]
+        xyz = xyz[valid]
+
+        # group the shots by position
+        # - the shots of position ii are
+        #   shots[offsets[ii]:offsets[ii + 1]]
+        if xyz.shape[0] != 0:
+            positions, inverse = np.unique(xyz, axis=0,
+                                           return_inverse=True)
+        else:
+            positions = np.empty((0, len(AXES)), dtype=np.float64)
+            inverse = np.empty(0, dtype=np.intp)
+        order = np.argsort(inverse, kind='stable')
+        counts = np.bincount(inverse, minlength=positions.shape[0])
+
+        self._name = name
+        self._positions = positions
+        self._shots = shotnum[order].astype(np.uint32)
+        self._offsets = np.concatenate(([0], np.cumsum(counts)))
+        self._trees = {}  # type: Dict[str, Any]
+
+    @property
+    def name(self) -> Union[str, None]:
+        """Name of the indexed control configuration."""
+        return self._name
+
+    @property
+    def positions(self) -> np.ndarray:
+        """The distinct probe positions, shape :code:`(m, 3)`."""
+        return self._positions.view()
+
+    @property
+    def shotnum(self) -> np.ndarray:
+        """Sorted shot numbers of all indexed shots."""
+        return np.sort(self._shots)
+
+    def __len__(self):
+        return self._shots.shape[0]
+
+    def _axes(self, axes: Union[str, None], ndim: int) -> str:
+        """Condition the **axes** of an **ndim** point."""
+        if axes is None:
+            axes = AXES[:ndim]
+        if len(axes) != ndim or not set(axes) <= set(AXES) \
+                or len(set(axes)) != ndim:
+            raise ValueError(
+                "`axes` {!r} do not match a point with {} "
+                "coordinate(s)".format(axes, ndim))
+        return axes
+
+    def _tree(self, axes: str):
+        """KD-tree of the distinct positions projected on **axes**."""
+        if axes not in self._trees:
+            from scipy.spatial import cKDTree
+
+            cols = [AXES.index(axis) for axis in axes]
+            self._trees[axes] = cKDTree(self._positions[:, cols])
+        return self._trees[axes]
+
+    def _shots_at(self, pos_index: Iterable[int]) -> np.ndarray:
+        """Sorted shot numbers recorded at positions **pos_index**."""
+        pos_index = np.asarray(pos_index, dtype=np.intp)
+        starts = self._offsets[pos_index]
+        lengths = self._offsets[pos_index + 1] - starts
+
+        # gather the rows of the position groups in one go
+        ends = np.cumsum(lengths)
+        rows = np.arange(ends[-1] if ends.size else 0) \
+            + np.repeat(starts - (ends - lengths), lengths)
+        return np.sort(self._shots[rows])
+
+    def within(self, center: Sequence[float], radius: float,
+               axes: str = None) -> np.ndarray:
+        """
+        Shots recorded within **radius** of **center**.
+
+        :param center: the center point
+        :param float radius: radius of the sphere (circle for a 2D
+            **center**)
+        :param str axes: axes of the **center** coordinates (DEFAULT
+            the first :code:`len(center)` of :code:`'xyz'`)
+        :return: sorted shot numbers
+        """
+        center = np.asarray(center, dtype=np.float64).ravel()
+        axes = self._axes(axes, center.size)
+        if self._positions.shape[0] == 0:
+            return self._shots_at([])
+        return self._shots_at(self._tree(axes).query_ball_point(
+            center, radius))
+
+    def box(self, x: Tuple[float, float] = None,
+            y: Tuple[float, float] = None,
+            z: Tuple[float, float] = None) -> np.ndarray:
+        """
+        Shots recorded inside the box of (inclusive) bounds
+        :code:`(min, max)` along each of **x**, **y**, and **z**.  An
+        omitted axis, or a :code:`None` bound, is unbounded.
+
+        :return: sorted shot numbers
+        """
+        mask = np.ones(self._positions.shape[0], dtype=bool)
+        for ii, bounds in enumerate((x, y, z)):
+            if bounds is None:
+                continue
+            lower, upper = bounds
+            if lower is not None:
+                mask &= self._positions[:, ii] >= lower
+            if upper is not None:
+                mask &= self._positions[:, ii] <= upper
+        return self._shots_at(np.flatnonzero(mask))
+
+    def nearest(self, point: Sequence[float], k=1,
+                axes: str = None) -> np.ndarray:
+        """
+        Shots recorded at the **k** distinct positions nearest to
+        **point**.
+
+        :param point: the point
+        :param int k: number of distinct positions
+        :param str axes: axes of the **point** coordinates (DEFAULT
+            the first :code:`len(point)` of :code:`'xyz'`)
+        :return: sorted shot numbers
+        """
+        point = np.asarray(point, dtype=np.float64).ravel()
+        axes = self._axes(axes, point.size)
+        k = min(int(k), self._positions.shape[0])
+        if k < 1:
+            return self._shots_at([])
+        _, pos_index = self._tree(axes).query(point, k=k)
+        return self._shots_at(np.atleast_1d(pos_index))
+
+    def select(self, region=None, nearest=None) -> np.ndarray:
+        """
+        Shots satisfying a :code:`region` and/or :code:`nearest`
+        selection of :meth:`~.file.File.read_data` (see
+        :func:`condition_region` and :func:`condition_nearest`).
+
+        :return: sorted shot numbers
+        """
+        selected = []
+        if not _is_conditioned(region, ('box', 'sphere')):
+            region = condition_region(region)
+        if region:
+            if region[0] == 'box':
+                selected.append(self.box(**{
+                    axis: bounds for axis, bounds in region[1]}))
+            else:
+                _, center, radius, axes = region
+                selected.append(self.within(center, radius, axes))
+        if not _is_conditioned(nearest, ('nearest',)):
+            nearest = condition_nearest(nearest)
+        if nearest:
+            _, point, k, axes = nearest
+            selected.append(self.nearest(point, k, axes))
+
+        if len(selected) == 0:
+            return self.shotnum
+        elif len(selected) == 1:
+            return selected[0]
+        return np.intersect1d(*selected)
+
+    def __repr__(self):
+        return '<SpatialIndex {!r}: {} shot(s) at {} ' \
+               'position(s)>'.format(self._name, len(self),
+                                     self._positions.shape[0])
+
+
+def _is_conditioned(selection: Any, kinds: Tuple[str, ...]) -> bool:
+    """
+    :code:`True` if **selection** is already conditioned by
+    :func:`condition_region` or :func:`condition_nearest`.
+    """
+    return isinstance(selection, tuple) \
+        and (len(selection) == 0 or selection[0] in kinds)
+
+
+def _as_point(point: Any, name: str) -> Tuple[float, ...]:
+    """Condition a 1 to 3 coordinate point into a tuple of floats."""
+    try:
+        point = tuple(float(val) for val in point)
+    except (TypeError, ValueError):
+        raise TypeError('`{}` must be a sequence of 1 to 3 '
+                        'coordinates'.format(name))
+    if not 1 <= len(point) <= len(AXES):
+        raise ValueError('`{}` must have 1 to 3 '
+                         'coordinates'.format(name))
+    return point
+
+
+def condition_region(region: Union[Dict[str, Any], None]
+                     ) -> Selection:
+    """
+    Condition a :code:`region` selection into a hashable tuple.
+
+    :param region: either a box, given as :code:`(min, max)` bounds
+        for any of the keys :code:`'x'`, :code:`'y'`, and :code:`'z'`
+        (e.g. :code:`{'x': (0, 10), 'y': (-5, 5)}`), or a sphere
+        (circle), given by a :code:`'center'` point and a
+        :code:`'radius'` (e.g.
+        :code:`{'center': (2, -3), 'radius': 1}`) with the optional
+        :code:`'axes'` of the center coordinates
+    :return: :code:`('box', ((axis, min, max), ...))`,
+        :code:`('sphere', center, radius, axes)`, or an empty tuple
+        for :code:`None`
+    """
+    if region is None:
+        return ()
+    elif not isinstance(region, dict):
+        raise TypeError('`region` must be a dictionary')
+
+    if 'center' in region:
+        if not set(region) <= {'center', 'radius', 'axes'} \
+                or 'radius' not in region:
+            raise ValueError(
+                "A sphere `region` is given by a 'center', a "
+                "'radius', and optional 'axes'")
+        center = _as_point(region['center'], "region['center']")
+        radius = region['radius']
+        if not isinstance(radius, numbers.Real) or radius < 0:
+            raise ValueError("region['radius'] must be a non-negative "
+                             "number")
+        axes = region.get('axes', None)
+        axes = AXES[:len(center)] if axes is None else str(axes)
+        return 'sphere', center, float(radius), axes
+
+    if len(region) == 0 or not set(region) <= set(AXES):
+        raise ValueError(
+            "A box `region` is given by (min, max) bounds for any of "
+            "{}".format(list(AXES)))
+    bounds = []
+    for axis in sorted(region):
+        try:
+            lower, upper = region[axis]
+        except (TypeError, ValueError):
+            raise ValueError(
+                "region['{}'] must be a (min, max) pair".format(axis))
+        bounds.append((axis,
+                       None if lower is None else float(lower),
+                       None if upper is None else float(upper)))
+    return 'box', tuple((axis, (lower, upper))
+                        for axis, lower, upper in bounds)
+
+
+def condition_nearest(nearest: Union[Sequence[float], Dict[str, Any],
+                                     None]) -> Selection:
+    """
+    Condition a :code:`nearest` selection into a hashable tuple.
+
+    :param nearest: a point (e.g. :code:`(2, -3)`) to select the
+        shots at the probe position nearest to it, or a dictionary
+        with the :code:`'point'`, the number :code:`'k'` of nearest
+        positions, and the optional :code:`'axes'` of the point
+        coordinates
+    :return: :code:`('nearest', point, k, axes)` or an empty tuple
+        for :code:`None`
+    """
+    if nearest is None:
+        return ()
+
+    if isinstance(nearest, dict):
+        if not set(nearest) <= {'point', 'k', 'axes'} \
+                or 'point' not in nearest:
+            raise ValueError(
+                "A `nearest` dictionary is given by a 'point' and "
+                "optional 'k' and 'axes'")
+        point = nearest['point']
+        k = nearest.get('k', 1)
+        axes = nearest.get('axes', None)
+    else:
+        point, k, axes = nearest, 1, None
+
+    point = _as_point(point, 'nearest')
+    if not isinstance(k, numbers.Integral) or k < 1:
+        raise ValueError("nearest['k'] must be a positive integer")
+    axes = AXES[:len(point)] if axes is None else str(axes)
+    return 'nearest', point, int(k), axes
+
+
+def motion_control(hdf_file: File, controls=None) -> Tuple[str, Any]:
+    """
+    The motion control device (and configuration) providing the probe
+    positions of a read.
+
+    :param hdf_file: HDF5 file object
+    :param controls: the controls added to the read (see
+        :func:`~.helpers.condition_controls`), a motion control among
+        them is used
+    :return: the control device name and configuration name
+    :raises ValueError: if no motion control is added and the file
+        does not have exactly one motion control configuration
+    """
+    if bool(controls):
+        for cname, cconfn in condition_controls(hdf_file, controls):
+            cmap = hdf_file.file_map.controls[cname]
+            if cmap.contype == ConType.motion:
+                return cname, cconfn
+
+    candidates = [
+        (cname, cconfn)
+        for cname, cmap in hdf_file.file_map.controls.items()
+        if cmap.contype == ConType.motion
+        for cconfn in cmap.configs
+    ]
+    if len(candidates) != 1:
+        raise ValueError(
+            'Can not determine the probe positions, the file has {} '
+            'motion control configurations {}...add the motion control '
+            'to `add_controls`'.format(len(candidates), candidates))
+    return candidates[0]
@@ -10,7 +10,7 @@
 #
 import unittest as ut
 
-from bapsflib._hdf.maps import FauxHDFBuilder
+from bapsflib.synthetic import FauxHDFBuilder
 from functools import wraps
 
 from ..file import File
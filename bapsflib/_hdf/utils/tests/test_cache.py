@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import numpy as np
+import unittest as ut
+
+from . import (TestBase, with_bf)
+from ..cache import ReadCache
+from ..file import File
+from ..memory import MemoryBudgetError
+
+
+class TestReadCache(TestBase):
+    """
+    Test case for :class:`~bapsflib._hdf.utils.cache.ReadCache` and
+    the cached reads of :class:`~bapsflib._hdf.utils.file.File`.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+
+    def test_cache(self):
+        cache = ReadCache('1K')
+        self.assertEqual(cache.max_bytes, 1024)
+        self.assertFalse(cache.copy)
+        self.assertRaises(ValueError, ReadCache, None)
+        self.assertRaises(ValueError, ReadCache, -1)
+
+        # miss, then hit
+        arr = np.arange(64, dtype=np.int32)
+        self.assertIsNone(cache.get('a', ((64,),)))
+        out = cache.put('a', ((64,),), arr)
+        self.assertEqual(cache.nbytes, 256)
+        self.assertFalse(out.flags.writeable)
+        self.assertFalse(arr.flags.writeable)
+        hit = cache.get('a', ((64,),))
+        np.testing.assert_array_equal(hit, arr)
+        self.assertFalse(hit.flags.writeable)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # changed extents invalidate the entry
+        self.assertIsNone(cache.get('a', ((65,),)))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.nbytes, 0)
+
+        # LRU eviction
+        for key in 'abcd':
+            cache.put(key, (), np.zeros(64, dtype=np.int32))
+        self.assertEqual(len(cache), 4)
+        cache.get('a', ())
+        cache.put('e', (), np.zeros(64, dtype=np.int32))
+        self.assertEqual(len(cache), 4)
+        self.assertIsNone(cache.get('b', ()))
+        self.assertIsNotNone(cache.get('a', ()))
+        self.assertLessEqual(cache.nbytes, cache.max_bytes)
+
+        # too large to cache
+        big = np.zeros(1024, dtype=np.int32)
+        self.assertIs(cache.put('big', (), big), big)
+        self.assertTrue(big.flags.writeable)
+        self.assertIsNone(cache.get('big', ()))
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.nbytes), (0, 0))
+
+        # copies
+        cache = ReadCache('1K', copy=True)
+        cache.put('a', (), np.arange(4))
+        out = cache.get('a', ())
+        self.assertTrue(out.flags.writeable)
+        out[0] = 10
+        self.assertEqual(cache.get('a', ())[0], 0)
+
+    @with_bf
+    def test_read_data(self, _bf: File):
+        self.f.add_module('SIS 3301', {'n_configs': 1, 'sn_size': 20,
+                                       'nt': 10})
+        self.f.add_module('Waveform', {'n_configs': 1, 'sn_size': 20})
+        self.f.add_module('Discharge', {})
+        _bf._map_file()
+        _mod = self.f.modules['SIS 3301']
+        brd, ch = [ii[0] for ii in np.where(_mod.knobs.active_brdch)]
+        kwargs = {'digitizer': 'SIS 3301', 'silent': True}
+
+        self.assertIsNone(_bf.read_cache)
+        _bf.set_read_cache('1M')
+        cache = _bf.read_cache
+        self.assertIsInstance(cache, ReadCache)
+
+        # equivalent arguments hit the cache
+        data = _bf.read_data(brd, ch, add_controls=['Waveform'],
+                             shotnum=[1, 2, 3], **kwargs)
+        for extra in ({'shotnum': np.array([1, 2, 3])},
+                      {'shotnum': [1, 2, 3],
+                       'config_name': 'config01'}):
+            hit = _bf.read_data(brd, ch, add_controls=['Waveform'],
+                                **extra, **kwargs)
+            self.assertEqual(type(hit), type(data))
+            for field in data.dtype.names:
+                np.testing.assert_array_equal(hit[field], data[field])
+            self.assertEqual(hit.info, data.info)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+        # different arguments miss the cache
+        _bf.read_data(brd, ch, shotnum=[1, 2, 3], **kwargs)
+        _bf.read_data(brd, ch, add_controls=['Waveform'],
+                      shotnum=[1, 2, 3], keep_bits=True, **kwargs)
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+
+        # a hit reports its own read statistics
+        self.assertFalse(data.read_stats.cache_hit)
+        self.assertGreater(data.read_stats.n_reads, 0)
+        hit = _bf.read_data(brd, ch, add_controls=['Waveform'],
+                            shotnum=[1, 2, 3], **kwargs)
+        self.assertIsNot(hit.read_stats, data.read_stats)
+        self.assertTrue(hit.read_stats.cache_hit)
+        self.assertEqual(hit.read_stats.name, 'HDFReadData')
+        self.assertEqual(hit.read_stats.n_reads, 0)
+        self.assertEqual(hit.read_stats.bytes_read, 0)
+        self.assertEqual(hit.read_stats.rows_selected, 3)
+        self.assertEqual(list(hit.read_stats.stages), ['cache lookup'])
+        self.assertFalse(data.read_stats.cache_hit)
+        self.assertEqual((cache.hits, cache.misses), (3, 3))
+
+        # the memory budget is part of the key, use_memmap is not
+        with self.assertRaises(MemoryBudgetError):
+            _bf.read_data(brd, ch, add_controls=['Waveform'],
+                          shotnum=[1, 2, 3], max_memory=1, **kwargs)
+        _bf.read_data(brd, ch, add_controls=['Waveform'],
+                      shotnum=[1, 2, 3], use_memmap=False, **kwargs)
+        self.assertEqual((cache.hits, cache.misses), (4, 4))
+
+        # returned results can not modify the cache
+        self.assertFalse(hit.flags.writeable)
+        with self.assertRaises(ValueError):
+            hit['signal'][0] = 0.0
+        hit.info['probe name'] = 'modified'
+        hit = _bf.read_data(brd, ch, add_controls=['Waveform'],
+                            shotnum=[1, 2, 3], **kwargs)
+        self.assertIsNone(hit.info['probe name'])
+
+        # growing a dataset invalidates the cached result
+        cpath = list(_bf.file_map.controls['Waveform'].configs.values()
+                     )[0]['dset paths'][0]
+        cdata = self.f[cpath][...]
+        del self.f[cpath]
+        self.f.create_dataset(cpath, data=cdata[:10],
+                              maxshape=(None,), chunks=(5,))
+        _bf._map_file()
+        cache.clear()
+        data = _bf.read_controls(['Waveform'])
+        self.assertEqual(data.shape[0], 10)
+        self.assertEqual(_bf.read_controls(['Waveform']).shape[0], 10)
+        self.f[cpath].resize((20,))
+        self.f[cpath][10:] = cdata[10:]
+        self.f[cpath].flush()
+        self.assertEqual(_bf.read_controls(['Waveform']).shape[0], 20)
+        self.assertEqual((cache.hits, cache.misses), (6, 6))
+
+        # MSI
+        _bf.read_msi('Discharge')
+        data = _bf.read_msi('Discharge')
+        self.assertEqual(cache.hits, 7)
+        self.assertFalse(data.flags.writeable)
+
+        # invalid arguments are reported by the read
+        self.assertRaises(ValueError, _bf.read_data, brd, ch,
+                          digitizer='not a digitizer')
+
+        # disable
+        _bf.set_read_cache(None)
+        self.assertIsNone(_bf.read_cache)
+        data = _bf.read_msi('Discharge')
+        self.assertTrue(data.flags.writeable)
+
+        # share a cache among handles
+        with File(self.f.filename, control_path='Raw data + config',
+                  digitizer_path='Raw data + config', msi_path='MSI',
+                  read_cache=cache) as bf2:
+            self.assertIs(bf2.read_cache, cache)
+            bf2.read_msi('Discharge')
+            self.assertEqual(cache.hits, 8)
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -127,6 +127,9 @@ class TestFile(TestBase):
                 'keep_bits': True,
                 'add_controls': ['control'],
                 'intersection_set': True,
+                'where': {'Clipped': 0},
+                'region': None,
+                'nearest': None,
             }
             data = _bf.read_data(1, 2, **extras, silent=False)
             self.assertTrue(mock_rd.called)
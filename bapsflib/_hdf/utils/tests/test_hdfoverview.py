@@ -12,7 +12,9 @@
 #   license terms and contributor agreement.
 #
 import io
+import json
 import os
+import tempfile
 import unittest as ut
 
 from bapsflib._hdf.maps import HDFMap
@@ -468,6 +470,61 @@ class TestHDFOverview(TestBase):
             self.assertEqual(mock_o.call_count, 1)
             mock_o.assert_called_with(filename, 'w')
 
+    @with_bf
+    def test_to_dict(self, _bf: File):
+        _overview = self.create_overview(_bf)
+        overview = _overview.to_dict()
+        self.assertEqual(list(overview),
+                         ['generated by', 'generated date', 'general',
+                          'discovery', 'digitizers', 'controls',
+                          'msi'])
+        self.assertEqual(overview['general']['file'],
+                         _bf.info['file'])
+
+        # discovery
+        discovery = overview['discovery']
+        self.assertEqual(discovery['controls'],
+                         {'path': 'Raw data + config', 'found': True,
+                          'devices': ['Waveform']})
+        self.assertEqual(discovery['digitizers']['devices'],
+                         ['SIS 3301'])
+        self.assertEqual(discovery['digitizers']['main'], 'SIS 3301')
+        self.assertEqual(discovery['msi']['devices'], ['Discharge'])
+        self.assertEqual(discovery['unknowns'],
+                         ['/Raw data + config/Unknown'])
+
+        # details
+        digi = _bf.file_map.digitizers['SIS 3301']
+        config_name = list(digi.configs)[0]
+        config = overview['digitizers']['SIS 3301']['configs'][
+            config_name]
+        self.assertEqual(config['active'],
+                         digi.configs[config_name]['active'])
+        conn = config['connections']['SIS 3301'][0]
+        brd, chs, adc_stats = digi.configs[config_name]['SIS 3301'][0]
+        self.assertEqual(conn['board'], brd)
+        self.assertEqual(conn['channels'], list(chs))
+        self.assertEqual(conn['nshotnum'], adc_stats['nshotnum'])
+        self.assertEqual(conn['clock rate'],
+                         {'value': 100.0, 'unit': 'MHz'})
+        self.assertEqual(overview['controls']['Waveform']['contype'],
+                         str(_bf.file_map.controls['Waveform'].contype))
+        self.assertIn('Discharge', overview['msi'])
+
+        # JSON
+        self.assertEqual(json.loads(json.dumps(overview)), overview)
+        with mock.patch.object(_overview.__class__, 'to_dict',
+                               return_value=overview):
+            self.assertEqual(json.loads(_overview.to_json()),
+                             overview)
+            with tempfile.TemporaryDirectory() as tmpdir:
+                filename = os.path.join(tmpdir, 'overview.json')
+                text = _overview.to_json(filename=filename,
+                                         indent=None)
+                self.assertNotIn('\n', text)
+                with open(filename, 'r') as jf:
+                    self.assertEqual(json.load(jf), overview)
+
 
 if __name__ == '__main__':
     ut.main()
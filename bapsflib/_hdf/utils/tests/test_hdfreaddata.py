@@ -19,6 +19,7 @@ import unittest as ut
 
 from bapsflib._hdf.maps import HDFMap
 from bapsflib._hdf.maps.digitizers.sis3301 import HDFMapDigiSIS3301
+from bapsflib.utils.errors import HDFEmptyIntersectionError
 from unittest import mock
 
 from . import (TestBase, with_bf)
@@ -27,7 +28,8 @@ from ..hdfreadcontrol import HDFReadControl
 from ..hdfreaddata import (build_sndr_for_simple_dset,
                            condition_shotnum,
                            do_shotnum_intersection,
-                           HDFReadData)
+                           HDFReadData,
+                           memmap_dataset)
 
 
 class TestHDFReadData(TestBase):
@@ -503,6 +505,158 @@ class TestHDFReadData(TestBase):
         self.assertDataArrayValues(data, dset, indices, keep_bits=True)
         self.assertEqual(data.info['signal units'], u.bit)
 
+    @with_bf
+    def test_kwarg_use_memmap(self, _bf: File):
+        """Test behavior of keyword `use_memmap`."""
+        # setup
+        sn_size = 50
+        self.f.add_module('SIS 3301',
+                          {'n_configs': 1, 'sn_size': sn_size,
+                           'nt': 100})
+        _mod = self.f.modules['SIS 3301']
+        digi = 'SIS 3301'
+        bc_indices = np.where(_mod.knobs.active_brdch)
+        brd = bc_indices[0][0]
+        ch = bc_indices[1][0]
+        _bf._map_file()  # re-map file
+        dset_path = 'Raw data + config/SIS 3301/' \
+            + _mod.knobs.active_config[0] + ' [{}:{}]'.format(brd, ch)
+
+        # faux datasets are contiguous
+        self.assertIsInstance(memmap_dataset(_bf[dset_path]),
+                              np.memmap)
+
+        # memory-mapped and h5py reads agree
+        for kwargs in ({'index': slice(None)},
+                       {'index': [2, 5, 40]},
+                       {'shotnum': [3, 10, 70],
+                        'intersection_set': False},
+                       {'shotnum': slice(5, 30, 4), 'keep_bits': True}):
+            with mock.patch(
+                    'bapsflib._hdf.utils.hdfreaddata.memmap_dataset',
+                    wraps=memmap_dataset) as mock_mm:
+                data = HDFReadData(_bf, brd, ch, digitizer=digi,
+                                   **kwargs)
+                self.assertTrue(mock_mm.called)
+            ref = HDFReadData(_bf, brd, ch, digitizer=digi,
+                              use_memmap=False, **kwargs)
+            self.assertEqual(data.dtype, ref.dtype)
+            np.testing.assert_array_equal(data['shotnum'],
+                                          ref['shotnum'])
+            np.testing.assert_array_equal(data['signal'],
+                                          ref['signal'])
+
+        # memmap reads are counted
+        data = HDFReadData(_bf, brd, ch, digitizer=digi,
+                           index=[1, 2, 3], keep_bits=True)
+        self.assertGreaterEqual(data.read_stats.bytes_read,
+                                data['signal'].nbytes)
+
+        # `use_memmap=False` never maps the dataset
+        with mock.patch(
+                'bapsflib._hdf.utils.hdfreaddata.memmap_dataset') \
+                as mock_mm:
+            HDFReadData(_bf, brd, ch, digitizer=digi, use_memmap=False)
+            self.assertFalse(mock_mm.called)
+
+    @with_bf
+    def test_kwarg_where(self, _bf: File):
+        """Test behavior of keyword `where`."""
+        # setup
+        sn_size = 50
+        self.f.add_module('SIS 3301',
+                          {'n_configs': 1, 'sn_size': sn_size,
+                           'nt': 100})
+        _mod = self.f.modules['SIS 3301']
+        digi = 'SIS 3301'
+        bc_indices = np.where(_mod.knobs.active_brdch)
+        brd = bc_indices[0][0]
+        ch = bc_indices[1][0]
+        dset_path = 'Raw data + config/SIS 3301/' \
+            + _mod.knobs.active_config[0] + ' [{}:{}]'.format(brd, ch)
+
+        # flag shots 3, 10, and 11 as clipped
+        dheader = self.f[dset_path + ' headers']
+        clipped = dheader['Clipped']
+        clipped[[2, 9, 10]] = 1
+        dheader['Clipped'] = clipped
+        _bf._map_file()  # re-map file
+        hdata = _bf[dset_path + ' headers'][...]
+        good = np.flatnonzero(hdata['Clipped'] == 0)
+
+        # index
+        data = HDFReadData(_bf, brd, ch, digitizer=digi,
+                           where={'Clipped': 0}, keep_bits=True)
+        self.assertEqual(data['shotnum'].tolist(),
+                         hdata['Shot'][good].tolist())
+        np.testing.assert_array_equal(
+            data['signal'], _bf[dset_path][good.tolist(), ...])
+        data = HDFReadData(_bf, brd, ch, digitizer=digi,
+                           index=[1, 2, 3], where={'Clipped': 0})
+        self.assertEqual(data['shotnum'].tolist(), [2, 4])
+
+        # shotnum
+        for use_memmap in (True, False):
+            data = HDFReadData(_bf, brd, ch, digitizer=digi,
+                               shotnum=[1, 3, 10, 12, 70],
+                               where={'Clipped': ('==', 0)},
+                               use_memmap=use_memmap)
+            self.assertEqual(data['shotnum'].tolist(), [1, 12])
+            ref = HDFReadData(_bf, brd, ch, digitizer=digi,
+                              shotnum=[1, 12])
+            np.testing.assert_array_equal(data['signal'],
+                                          ref['signal'])
+
+        # shotnum w/ intersection_set=False
+        # - skipped shots are NULL like shots missing from the dataset
+        data = HDFReadData(_bf, brd, ch, digitizer=digi,
+                           shotnum=[1, 3, 12, 70],
+                           where={'Clipped': 0},
+                           intersection_set=False)
+        self.assertEqual(data['shotnum'].tolist(), [1, 3, 12, 70])
+        self.assertTrue(np.all(np.isnan(data['signal'][[1, 3]])))
+        self.assertFalse(np.any(np.isnan(data['signal'][[0, 2]])))
+
+        # comparisons on the per-shot statistics
+        limit = int(np.median(hdata['Max']))
+        data = HDFReadData(_bf, brd, ch, digitizer=digi, where={
+            'Clipped': 0, 'Max': [('>=', 0), ('<', limit)]})
+        mask = (hdata['Clipped'] == 0) & (hdata['Max'] < limit)
+        self.assertEqual(data['shotnum'].tolist(),
+                         hdata['Shot'][mask].tolist())
+        self.assertIn('Max', _bf.header_cache.get(
+            _bf[dset_path + ' headers'], 'Shot').fields)
+
+        # only the selected traces are read
+        data = HDFReadData(_bf, brd, ch, digitizer=digi,
+                           where={'Clipped': 1}, use_memmap=False)
+        self.assertEqual(data['shotnum'].tolist(), [3, 10, 11])
+        dset = _bf[dset_path]
+        self.assertLess(data.read_stats.bytes_read,
+                        dset.size * dset.dtype.itemsize // 4)
+
+        # no shot satisfies `where`
+        for extra in ({}, {'index': [1, 2, 3]},
+                      {'shotnum': [1, 2, 3]}):
+            with self.assertRaises(HDFEmptyIntersectionError):
+                HDFReadData(_bf, brd, ch, digitizer=digi,
+                            where={'Max': ('<', 0)}, **extra)
+
+        # read_data does not return a cached read w/o `where`
+        data = _bf.read_data(brd, ch, digitizer=digi, silent=True)
+        self.assertEqual(data.shape, (sn_size,))
+        data = _bf.read_data(brd, ch, digitizer=digi, silent=True,
+                             where={'Clipped': 0})
+        self.assertEqual(data.shape, (sn_size - 3,))
+
+        # invalid predicates
+        for where, err in (({'not a field': 0}, ValueError),
+                           ({'Clipped': ('~', 0)}, ValueError),
+                           ({'Clipped': 'zero'}, TypeError),
+                           ([('Clipped', 0)], TypeError)):
+            with self.assertRaises(err):
+                HDFReadData(_bf, brd, ch, digitizer=digi, where=where)
+
     @with_bf
     @mock.patch(
         'bapsflib._hdf.utils.hdfreaddata.do_shotnum_intersection',
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import numpy as np
+import unittest as ut
+
+from . import (TestBase, with_bf)
+from ..file import File
+from ..header import (condition_where, HeaderCache, HeaderColumns,
+                      where_mask)
+
+
+class TestHeaderColumns(ut.TestCase):
+    """
+    Test case for
+    :class:`~bapsflib._hdf.utils.header.HeaderColumns`.
+    """
+
+    def test_columns(self):
+        sn = np.arange(1, 11, dtype=np.uint32)
+        columns = HeaderColumns('/header', {
+            'Shot': sn.copy(),
+            'Offset': np.full(10, 0.5)})
+        self.assertEqual(columns.name, '/header')
+        self.assertEqual(columns.fields, ('Shot', 'Offset'))
+        self.assertEqual(columns.shape, (10,))
+        self.assertEqual(columns.size, 10)
+        self.assertEqual(len(columns), 10)
+
+        # selections
+        np.testing.assert_array_equal(columns['Shot'], sn)
+        self.assertEqual(columns[0, 'Shot'], 1)
+        self.assertEqual(columns[-1, 'Shot'], 10)
+        self.assertEqual(columns[0, 'Offset'], 0.5)
+        np.testing.assert_array_equal(columns[2:5, 'Shot'], [3, 4, 5])
+        np.testing.assert_array_equal(columns[[1, 4], 'Shot'], [2, 5])
+
+        # list selections are returned in increasing row order
+        first, last = columns[[-1, 0], 'Shot']
+        self.assertEqual((first, last), (1, 10))
+
+        # columns are read-only
+        with self.assertRaises(ValueError):
+            columns['Shot'][0] = 5
+
+        # invalid selections
+        self.assertRaises(ValueError, columns.__getitem__,
+                          (0, 'not a field'))
+        self.assertRaises(ValueError, columns.__getitem__,
+                          ([3, 10], 'Shot'))
+        self.assertRaises(ValueError, columns.__getitem__,
+                          (10, 'Shot'))
+        self.assertRaises(ValueError, columns.__getitem__, 0)
+
+    def test_where(self):
+        columns = HeaderColumns('/header', {
+            'Shot': np.arange(1, 7, dtype=np.uint32),
+            'Max': np.array([10, 200, 16383, 50, 16000, 0],
+                            dtype=np.int16),
+            'Clipped': np.array([0, 0, 1, 0, 0, 1], dtype=np.uint8)})
+
+        # conditioning
+        self.assertEqual(condition_where(None), ())
+        self.assertEqual(condition_where({}), ())
+        self.assertEqual(
+            condition_where({'Max': [('>', 0), ('<', np.int16(16000))],
+                             'Clipped': 0}),
+            (('Clipped', (('==', 0),)),
+             ('Max', (('>', 0), ('<', 16000)))))
+        self.assertEqual(condition_where({'Max': ('<=', 50.5)}),
+                         (('Max', (('<=', 50.5),)),))
+        self.assertRaises(TypeError, condition_where, [('Max', 0)])
+        self.assertRaises(TypeError, condition_where, {1: 0})
+        self.assertRaises(TypeError, condition_where, {'Max': 'a'})
+        self.assertRaises(ValueError, condition_where,
+                          {'Max': ('=<', 5)})
+        self.assertRaises(ValueError, condition_where,
+                          {'Max': [('<', 5, 6)]})
+
+        # evaluation
+        np.testing.assert_array_equal(
+            where_mask(columns, {'Clipped': 0}),
+            [True, True, False, True, True, False])
+        np.testing.assert_array_equal(
+            where_mask(columns, {'Clipped': 0,
+                                 'Max': [('>', 0), ('<', 16000)]}),
+            [True, True, False, True, False, False])
+        np.testing.assert_array_equal(
+            where_mask(columns, condition_where({'Max': ('!=', 0)})),
+            [True, True, True, True, True, False])
+        np.testing.assert_array_equal(where_mask(columns, ()),
+                                      np.ones(6, dtype=bool))
+        self.assertRaises(ValueError, where_mask, columns,
+                          {'Min': ('>', 0)})
+
+
+class TestHeaderCache(TestBase):
+    """
+    Test case for :class:`~bapsflib._hdf.utils.header.HeaderCache`.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+
+    @with_bf
+    def test_cache(self, _bf: File):
+        self.f.add_module('SIS 3301', {'n_configs': 1, 'sn_size': 20,
+                                       'nt': 10})
+        _bf._map_file()
+        _mod = self.f.modules['SIS 3301']
+        brd, ch = [ii[0] for ii in np.where(_mod.knobs.active_brdch)]
+        kwargs = {'digitizer': 'SIS 3301', 'silent': True}
+
+        cache = _bf.header_cache
+        self.assertIsInstance(cache, HeaderCache)
+        self.assertEqual(len(cache), 0)
+
+        # the header is read once per file
+        data = _bf.read_data(brd, ch, shotnum=[2, 5], **kwargs)
+        self.assertEqual(len(cache), 1)
+        first_reads = data.read_stats.n_reads
+        data = _bf.read_data(brd, ch, shotnum=slice(3, 8), **kwargs)
+        self.assertLess(data.read_stats.n_reads, first_reads)
+        self.assertEqual(data['shotnum'].tolist(), [3, 4, 5, 6, 7])
+        data = _bf.read_data(brd, ch, index=[0, -1], **kwargs)
+        self.assertEqual(data['shotnum'].tolist(), [1, 20])
+        self.assertEqual(len(cache), 1)
+
+        # entries are looked up by header dataset
+        dheader_path = data.info['device dataset path'] + ' headers'
+        dheader = _bf[dheader_path]
+        shotnumkey = _bf.file_map.digitizers['SIS 3301'].configs[
+            data.info['configuration name']]['shotnum'][
+            'dset field'][0]
+        columns = cache.get(dheader, shotnumkey)
+        self.assertIs(cache.get(dheader, shotnumkey), columns)
+        self.assertEqual(columns.fields, (shotnumkey, 'Offset'))
+        np.testing.assert_array_equal(columns[shotnumkey],
+                                      dheader[shotnumkey])
+        self.assertRaises(ValueError, cache.get, dheader,
+                          'not a field')
+
+        # additional fields are added to the entry and kept
+        columns = cache.get(dheader, shotnumkey, fields=['Max'])
+        self.assertEqual(columns.fields, (shotnumkey, 'Offset', 'Max'))
+        np.testing.assert_array_equal(columns['Max'], dheader['Max'])
+        self.assertIs(cache.get(dheader, shotnumkey), columns)
+        self.assertIs(cache.get(dheader, shotnumkey, fields=['Max']),
+                      columns)
+        self.assertEqual(
+            cache.get(dheader, shotnumkey,
+                      fields=['Clipped']).fields,
+            (shotnumkey, 'Offset', 'Max', 'Clipped'))
+        self.assertRaises(ValueError, cache.get, dheader, shotnumkey,
+                          fields=['not a field'])
+
+        # re-mapping the file clears the cache
+        _bf._map_file()
+        self.assertEqual(len(cache), 0)
+
+    @with_bf
+    def test_growth(self, _bf: File):
+        hdata = np.zeros(5, dtype=[('Shot', np.uint32),
+                                   ('Offset', np.float64),
+                                   ('Scale', np.float64)])
+        hdata['Shot'] = np.arange(1, 6)
+        dheader = self.f.create_dataset('headers', data=hdata,
+                                        maxshape=(None,))
+        self.f.flush()
+
+        cache = HeaderCache()
+        columns = cache.get(_bf['headers'], 'Shot')
+        self.assertEqual(columns.shape, (5,))
+        self.assertEqual(columns.fields, ('Shot', 'Offset'))
+
+        # only appended rows are read
+        dheader.resize((8,))
+        dheader[5:] = np.array([(6, 0., 0.), (7, 0., 0.), (8, 0., 0.)],
+                               dtype=hdata.dtype)
+        self.f.flush()
+        columns = cache.get(_bf['headers'], 'Shot')
+        self.assertEqual(columns['Shot'].tolist(), list(range(1, 9)))
+
+        # shrinking re-reads the entry
+        dheader.resize((3,))
+        self.f.flush()
+        columns = cache.get(_bf['headers'], 'Shot')
+        self.assertEqual(columns['Shot'].tolist(), [1, 2, 3])
+
+        # single cached field
+        self.f.create_dataset('headers2', data=hdata[['Shot']])
+        self.f.flush()
+        columns = cache.get(_bf['headers2'], 'Shot')
+        self.assertEqual(columns.fields, ('Shot',))
+        self.assertEqual(len(cache), 2)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    ut.main()
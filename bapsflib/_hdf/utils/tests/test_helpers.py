@@ -15,13 +15,15 @@ import numpy as np
 import unittest as ut
 
 from bapsflib._hdf.maps.controls.waveform import HDFMapControlWaveform
+from bapsflib.utils.errors import HDFEmptyIntersectionError
 from numpy.lib import recfunctions as rfn
 
 from . import (TestBase, with_bf)
 from ..file import File
 from ..helpers import (build_shotnum_dset_relation,
                        condition_controls, condition_shotnum,
-                       do_shotnum_intersection)
+                       do_shotnum_intersection, memmap_dataset,
+                       null_fill)
 
 
 class TestBuildShotnumDsetRelation(TestBase):
@@ -690,7 +692,7 @@ class TestDoShotnumIntersection(ut.TestCase):
         shotnum = np.arange(1, 21, 1, dtype=np.uint32)
         sni_dict = {'Waveform': np.zeros(shotnum.shape, dtype=bool)}
         index_dict = {'Waveform': np.array([])}
-        self.assertRaises(ValueError,
+        self.assertRaises(HDFEmptyIntersectionError,
                           do_shotnum_intersection,
                           shotnum, sni_dict, index_dict)
 
@@ -748,5 +750,73 @@ class TestDoShotnumIntersection(ut.TestCase):
             self.assertTrue(np.array_equal(index_dict[key], [5, 6]))
 
 
+class TestMemmapDataset(TestBase):
+    """Test Case for memmap_dataset"""
+
+    def setUp(self):
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+
+    @with_bf
+    def test_memmap_dataset(self, _bf: File):
+        data = np.arange(200, dtype='>i2').reshape(20, 10)
+        self.f.create_dataset('contiguous', data=data)
+        self.f.create_dataset('chunked', data=data, chunks=(5, 10))
+        self.f.create_dataset('compressed', data=data,
+                              compression='gzip')
+        self.f.create_dataset('unallocated', shape=(20, 10),
+                              dtype=np.int16)
+        self.f.create_dataset(
+            'compound', shape=(5,), dtype=[('f1', np.int16)])
+        self.f.create_group('group')
+
+        # contiguous datasets are mapped
+        mm = memmap_dataset(_bf['contiguous'])
+        self.assertIsInstance(mm, np.memmap)
+        self.assertEqual(mm.shape, data.shape)
+        self.assertEqual(mm.dtype, data.dtype)
+        self.assertFalse(mm.flags.writeable)
+        self.assertTrue(np.array_equal(mm, data))
+        self.assertTrue(np.array_equal(mm[[1, 5, 7], ...],
+                                       data[[1, 5, 7], ...]))
+
+        # other datasets fall back to h5py
+        for name in ('chunked', 'compressed', 'unallocated',
+                     'compound', 'group'):
+            self.assertIsNone(memmap_dataset(_bf[name]))
+
+
+class TestNullFill(ut.TestCase):
+    """Test Case for null_fill"""
+
+    def test_null_fill(self):
+        dtype = [('shotnum', np.uint32), ('xyz', np.float32, 3),
+                 ('count', np.int32), ('command', 'U10'),
+                 ('signal', np.float64, 4)]
+        data = np.empty(5, dtype=dtype)
+        null_fill(data)
+        self.assertTrue(np.all(data['shotnum'] == 0))
+        self.assertTrue(np.all(np.isnan(data['xyz'])))
+        self.assertTrue(np.all(data['count'] == -99999))
+        self.assertTrue(np.all(data['command'] == ''))
+        self.assertTrue(np.all(np.isnan(data['signal'])))
+
+        # override NULL values
+        null_fill(data, nulls={'signal': 0, 'count': -1})
+        self.assertTrue(np.all(data['signal'] == 0))
+        self.assertTrue(np.all(data['count'] == -1))
+
+        # dtypes without a NULL concept are zero filled
+        data = np.ones(3, dtype=[('flag', bool)])
+        with self.assertWarns(UserWarning):
+            null_fill(data)
+        self.assertFalse(np.any(data['flag']))
+
+        # zero-sized arrays
+        null_fill(np.empty(0, dtype=dtype))
+
+
 if __name__ == '__main__':
     ut.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import numpy as np
+import unittest as ut
+
+from . import TestBase
+from ..file import File
+
+try:
+    import dask.array as da
+except ImportError:  # pragma: no cover
+    da = None
+
+try:
+    import xarray as xr
+except ImportError:  # pragma: no cover
+    xr = None
+
+
+@ut.skipIf(da is None, "requires the 'dask' package")
+class TestLazy(TestBase):
+    """
+    Test case for :meth:`~bapsflib._hdf.utils.file.File.to_dask`,
+    :meth:`~bapsflib._hdf.utils.file.File.to_xarray`, and
+    :mod:`~bapsflib._hdf.utils.lazy`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.f.add_module('SIS 3301', {'n_configs': 1, 'sn_size': 40,
+                                       'nt': 12})
+        self.f.add_module('Waveform', {'n_configs': 1, 'sn_size': 30})
+        self.bf = File(self.f.filename,
+                       control_path='Raw data + config',
+                       digitizer_path='Raw data + config',
+                       msi_path='MSI', silent=True)
+        _mod = self.f.modules['SIS 3301']
+        brds, chs = np.where(_mod.knobs.active_brdch)
+        self.brd, self.ch = int(brds[0]), int(chs[0])
+
+    def tearDown(self):
+        self.bf.close()
+        super().tearDown()
+
+    def read(self, **kwargs):
+        return self.bf.read_data(self.brd, self.ch,
+                                 digitizer='SIS 3301', silent=True,
+                                 **kwargs)
+
+    def test_to_dask(self):
+        bf = self.bf
+
+        # full dataset
+        arr = bf.to_dask(self.brd, self.ch, chunks=(16, 5),
+                         digitizer='SIS 3301', silent=True)
+        expected = self.read()
+        self.assertIsInstance(arr, da.Array)
+        self.assertEqual(arr.chunks, ((16, 16, 8), (5, 5, 2)))
+        self.assertEqual(arr.dtype, expected['signal'].dtype)
+        np.testing.assert_array_equal(arr.compute(),
+                                      expected['signal'])
+        np.testing.assert_array_almost_equal(
+            arr.mean(axis=0).compute(),
+            expected['signal'].mean(axis=0))
+
+        # the graph is deterministic
+        arr2 = bf.to_dask(self.brd, self.ch, chunks=(16, 5),
+                          digitizer='SIS 3301', silent=True)
+        self.assertEqual(arr.name, arr2.name)
+
+        # non-contiguous shot numbers, bits, and an int chunk size
+        sn = [2, 3, 4, 9, 20, 33, 60]
+        arr = bf.to_dask(self.brd, self.ch, chunks=3, shotnum=sn,
+                         digitizer='SIS 3301', keep_bits=True,
+                         silent=True)
+        expected = self.read(shotnum=sn, keep_bits=True)
+        self.assertEqual(arr.chunks, ((3, 3), (12,)))
+        self.assertEqual(arr.dtype, expected['signal'].dtype)
+        np.testing.assert_array_equal(arr.compute(),
+                                      expected['signal'])
+
+        # shots must also be recorded by the control devices
+        arr = bf.to_dask(self.brd, self.ch, chunks=None,
+                         shotnum=slice(20, 40), digitizer='SIS 3301',
+                         add_controls=['Waveform'], silent=True)
+        expected = self.read(shotnum=slice(20, 40),
+                             add_controls=['Waveform'])
+        self.assertEqual(arr.shape, expected['signal'].shape)
+        np.testing.assert_array_equal(arr.compute(),
+                                      expected['signal'])
+
+    def test_errors(self):
+        bf = self.bf
+        kwargs = {'digitizer': 'SIS 3301', 'silent': True}
+        for chunks in (0, (4, 0), (1, 2, 3), [4, 4]):
+            self.assertRaises(ValueError, bf.to_dask, self.brd,
+                              self.ch, chunks=chunks, **kwargs)
+        self.assertRaises(ValueError, bf.to_dask, self.brd, self.ch,
+                          shotnum=[35, 36], add_controls=['Waveform'],
+                          **kwargs)
+        self.assertRaises(ValueError, bf.to_dask, self.brd, self.ch,
+                          shotnum=[100], **kwargs)
+
+    @ut.skipIf(xr is None, "requires the 'xarray' package")
+    def test_to_xarray(self):
+        bf = self.bf
+        data = bf.to_xarray(self.brd, self.ch, chunks=8,
+                            digitizer='SIS 3301',
+                            add_controls=['Waveform'], silent=True)
+        expected = self.read(add_controls=['Waveform'])
+        self.assertIsInstance(data, xr.DataArray)
+        self.assertIsInstance(data.data, da.Array)
+        self.assertEqual(data.dims, ('shotnum', 'time'))
+        np.testing.assert_array_equal(data['shotnum'],
+                                      expected['shotnum'])
+        np.testing.assert_array_almost_equal(
+            data['time'], np.arange(12) * expected.dt.value)
+        self.assertEqual(data['time'].attrs['units'],
+                         str(expected.dt.unit))
+        for ii, axis in enumerate('xyz'):
+            np.testing.assert_array_equal(data[axis],
+                                          expected['xyz'][:, ii])
+        np.testing.assert_array_equal(data['FREQ'], expected['FREQ'])
+        np.testing.assert_array_equal(data.values, expected['signal'])
+        self.assertEqual(data.attrs['digitizer'], 'SIS 3301')
+        self.assertEqual(data.attrs['units'], 'V')
+
+        # select by coordinate before computing
+        sub = data.sel(shotnum=slice(5, 9)).isel(time=slice(0, 4))
+        np.testing.assert_array_equal(
+            sub.values, expected['signal'][4:9, 0:4])
+
+        # bits
+        data = bf.to_xarray(self.brd, self.ch, digitizer='SIS 3301',
+                            keep_bits=True, silent=True)
+        self.assertEqual(data.attrs['units'], 'bit')
+        self.assertNotIn('x', data.coords)
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import numpy as np
+import unittest as ut
+
+from unittest import mock
+
+from . import (TestBase, with_bf)
+from ..file import File
+from ..hdfreaddata import HDFReadData
+from ..live import ShotIndex
+
+
+class TestFollow(TestBase):
+    """
+    Test case for :meth:`~bapsflib._hdf.utils.file.File.follow` and
+    :mod:`~bapsflib._hdf.utils.live`.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+
+    def _make_growable(self, dset_path: str,
+                       n_rows: int) -> np.ndarray:
+        """
+        Replace dataset **dset_path** of the faux file with a resizable
+        version containing only its first **n_rows** rows.  The full
+        data is returned so rows can be "recorded" later with
+        :meth:`_grow`.
+        """
+        dset = self.f[dset_path]
+        data = dset[...]
+        attrs = dict(dset.attrs)
+        del self.f[dset_path]
+        dset = self.f.create_dataset(
+            dset_path, data=data[:n_rows],
+            maxshape=(None,) + data.shape[1:],
+            chunks=(8,) + data.shape[1:])
+        dset.attrs.update(attrs)
+        return data
+
+    def _grow(self, dset_path: str, data: np.ndarray, n_rows: int):
+        """Append rows of **data** up to a total of **n_rows**."""
+        dset = self.f[dset_path]
+        start = dset.shape[0]
+        dset.resize((n_rows,) + dset.shape[1:])
+        dset[start:n_rows] = data[start:n_rows]
+        dset.flush()
+
+    @with_bf
+    def test_follow(self, _bf: File):
+        self.f.add_module('SIS 3301', {'n_configs': 1, 'sn_size': 20,
+                                       'nt': 10})
+        self.f.add_module('Waveform', {'n_configs': 1, 'sn_size': 20})
+        _bf._map_file()
+        _mod = self.f.modules['SIS 3301']
+        brd, ch = [ii[0] for ii in np.where(_mod.knobs.active_brdch)]
+        _dmap = _bf.file_map.digitizers['SIS 3301']
+        dpath = _dmap.info['group path'] + '/'
+        sig_path = dpath + _dmap.construct_dataset_name(brd, ch)
+        hdr_path = dpath + _dmap.construct_header_dataset_name(brd, ch)
+        _cmap = _bf.file_map.controls['Waveform']
+        cpath = list(_cmap.configs.values())[0]['dset paths'][0]
+        kwargs = {'digitizer': 'SIS 3301', 'silent': True}
+        full = _bf.read_data(brd, ch, add_controls=['Waveform'],
+                             **kwargs)
+
+        # only 10 shots recorded, controls lag behind
+        sig = self._make_growable(sig_path, 10)
+        hdr = self._make_growable(hdr_path, 10)
+        ctl = self._make_growable(cpath, 5)
+        _bf._map_file()
+
+        gen = _bf.follow(brd, ch, add_controls=['Waveform'],
+                         poll_interval=0, timeout=0, **kwargs)
+
+        # shots 1-5 are recorded by all devices
+        data = next(gen)
+        self.assertEqual(data['shotnum'].tolist(), list(range(1, 6)))
+        for field in data.dtype.names:
+            np.testing.assert_array_equal(data[field], full[field][:5])
+
+        # shots 6-10 are released once the control device catches up
+        self._grow(cpath, ctl, 20)
+        data = next(gen)
+        self.assertEqual(data['shotnum'].tolist(), list(range(6, 11)))
+
+        # only rows recorded in both the signal and header datasets
+        # are released
+        self._grow(hdr_path, hdr, 20)
+        self._grow(sig_path, sig, 15)
+        data = next(gen)
+        self.assertEqual(data['shotnum'].tolist(),
+                         list(range(11, 16)))
+        self._grow(sig_path, sig, 20)
+        data = next(gen)
+        self.assertEqual(data['shotnum'].tolist(),
+                         list(range(16, 21)))
+        for field in data.dtype.names:
+            np.testing.assert_array_equal(data[field],
+                                          full[field][15:])
+
+        # no new shots within `timeout`
+        self.assertRaises(StopIteration, next, gen)
+
+        # `block_size` and `start`
+        blocks = list(_bf.follow(brd, ch, poll_interval=0, timeout=0,
+                                 block_size=8, start=4, **kwargs))
+        self.assertEqual([block.shape[0] for block in blocks],
+                         [8, 8])
+        self.assertEqual(blocks[0]['shotnum'][0], 5)
+        self.assertEqual(blocks[-1]['shotnum'][-1], 20)
+        self.assertEqual(
+            list(_bf.follow(brd, ch, poll_interval=0, timeout=0,
+                            start=None, **kwargs)),
+            [])
+
+        # invalid arguments
+        with self.assertRaises(TypeError):
+            next(_bf.follow(brd, ch, shotnum=[1], **kwargs))
+        with self.assertRaises(TypeError):
+            next(_bf.follow(brd, ch, index=[1], **kwargs))
+        with self.assertRaises(ValueError):
+            next(_bf.follow(brd, ch, block_size=0, **kwargs))
+        with self.assertRaises(ValueError):
+            next(_bf.follow(brd, ch, digitizer='not a digitizer'))
+
+    @with_bf
+    def test_follow_controls(self, _bf: File):
+        self.f.add_module('SIS 3301', {'n_configs': 1, 'sn_size': 20,
+                                       'nt': 10})
+        self.f.add_module('Waveform', {'n_configs': 1, 'sn_size': 20})
+        _bf._map_file()
+        _mod = self.f.modules['SIS 3301']
+        brd, ch = [ii[0] for ii in np.where(_mod.knobs.active_brdch)]
+        _cmap = _bf.file_map.controls['Waveform']
+        cpath = list(_cmap.configs.values())[0]['dset paths'][0]
+        kwargs = {'digitizer': 'SIS 3301', 'silent': True}
+
+        # the control device records shots out of order, shot 20
+        # before shots 6-19
+        cdata = self.f[cpath][...]
+        order = list(range(5)) + [19] + list(range(5, 19))
+        self.f[cpath][...] = cdata[order]
+        ctl = self._make_growable(cpath, 6)
+        _bf._map_file()
+
+        with mock.patch('bapsflib._hdf.utils.hdfreaddata.HDFReadData',
+                        wraps=HDFReadData) as mock_read:
+            gen = _bf.follow(brd, ch, add_controls=['Waveform'],
+                             poll_interval=0, timeout=0, **kwargs)
+            data = next(gen)
+            self.assertEqual(data['shotnum'].tolist(),
+                             list(range(1, 6)) + [20])
+
+            # the digitizer data is read by row index
+            self.assertEqual(
+                mock_read.call_args[1]['index'].tolist(),
+                list(range(5)) + [19])
+            self.assertNotIn('shotnum', mock_read.call_args[1])
+
+            # shots 6-19 are released as they are recorded
+            self._grow(cpath, ctl, 10)
+            data = next(gen)
+            self.assertEqual(data['shotnum'].tolist(),
+                             list(range(6, 10)))
+            self._grow(cpath, ctl, 20)
+            data = next(gen)
+            self.assertEqual(data['shotnum'].tolist(),
+                             list(range(10, 20)))
+            self.assertRaises(StopIteration, next, gen)
+
+    @with_bf
+    def test_shot_index(self, _bf: File):
+        self.f.add_module('Waveform', {'n_configs': 1, 'sn_size': 20})
+        _bf._map_file()
+        _cmap = _bf.file_map.controls['Waveform']
+        config = list(_cmap.configs.values())[0]
+        cpath = config['dset paths'][0]
+        sn_key = config['shotnum']['dset field'][0]
+        ctl = self._make_growable(cpath, 0)
+
+        index = ShotIndex(_bf, cpath, sn_key, start=2)
+        self.assertIsNone(index.last_shotnum())
+        self.assertEqual(index.update().size, 0)
+
+        self._grow(cpath, ctl, 10)
+        self.assertEqual(index.last_shotnum(), 10)
+        self.assertEqual(index.update(stop=6).tolist(), [3, 4, 5, 6])
+        self.assertEqual(index.n_rows, 6)
+        self.assertEqual(index.update().tolist(), [7, 8, 9, 10])
+        self.assertEqual(index.shotnum.tolist(), list(range(3, 11)))
+        self.assertEqual(index.start, 2)
+        self.assertEqual(index.update().size, 0)
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import numpy as np
+import unittest as ut
+
+from unittest import mock
+
+from . import (TestBase, with_bf)
+from ..file import File
+from ..memory import (get_memory_budget, MemoryBudget,
+                      MemoryBudgetError, parse_size, set_memory_budget)
+
+
+def _is_memmap(arr: np.ndarray) -> bool:
+    """Determine if **arr** is backed by a :class:`numpy.memmap`."""
+    while arr is not None:
+        if isinstance(arr, np.memmap):
+            return True
+        arr = arr.base if isinstance(arr, np.ndarray) else None
+    return False
+
+
+class TestMemoryBudget(TestBase):
+    """
+    Test case for :class:`~bapsflib._hdf.utils.memory.MemoryBudget`
+    and the memory budgeted reads.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        set_memory_budget()
+
+    def test_parse_size(self):
+        self.assertIsNone(parse_size(None))
+        self.assertEqual(parse_size(100), 100)
+        self.assertEqual(parse_size(1.5e3), 1500)
+        self.assertEqual(parse_size('2K'), 2048)
+        self.assertEqual(parse_size('1.5 MB'), int(1.5 * 1024 ** 2))
+        self.assertEqual(parse_size('1G'), 1024 ** 3)
+        self.assertRaises(ValueError, parse_size, 'lots')
+
+    def test_budget(self):
+        # no limit
+        budget = MemoryBudget()
+        self.assertIsNone(budget.max_memory)
+        self.assertFalse(budget.check(2 ** 40, 'test'))
+        self.assertEqual(list(budget.iter_slices(10, 100)),
+                         [slice(0, 10)])
+        self.assertEqual(list(budget.iter_slices(0, 100)), [])
+
+        # limited
+        budget = MemoryBudget('1K')
+        self.assertEqual(budget.max_memory, 1024)
+        self.assertFalse(budget.check(1024, 'test'))
+        with self.assertRaises(MemoryBudgetError) as cm:
+            budget.check(2048, 'test')
+        self.assertEqual(cm.exception.estimate, 2048)
+        self.assertEqual(cm.exception.max_memory, 1024)
+        self.assertIsInstance(cm.exception, MemoryError)
+        self.assertIn('test', str(cm.exception))
+        self.assertEqual(budget.chunk_rows(100, 50), 10)
+        self.assertEqual(budget.chunk_rows(4096, 50), 1)
+        self.assertEqual(
+            list(budget.iter_slices(25, 100)),
+            [slice(0, 10), slice(10, 20), slice(20, 25)])
+        self.assertEqual(list(budget.iter_slices(25, 100,
+                                                 chunked=False)),
+                         [slice(0, 25)])
+
+        # out-of-core
+        budget = MemoryBudget('1K', out_of_core=True)
+        self.assertTrue(budget.check(2048, 'test'))
+        arr = budget.empty((10, 5), np.float32, True)
+        self.assertIsInstance(arr, np.memmap)
+        self.assertEqual(arr.shape, (10, 5))
+        arr[...] = 1.0
+        self.assertTrue(np.all(arr == 1.0))
+        arr = budget.empty((0, 5), np.float32, True)
+        self.assertNotIsInstance(arr, np.memmap)
+        self.assertNotIsInstance(budget.empty((10,), np.float32, False),
+                                 np.memmap)
+
+        # from kwargs
+        kwargs = {'max_memory': '2K', 'out_of_core': True, 'other': 1}
+        budget = MemoryBudget.from_kwargs(kwargs)
+        self.assertEqual(kwargs, {'other': 1})
+        self.assertEqual(budget.max_memory, 2048)
+        self.assertTrue(budget.out_of_core)
+        kwargs = {'budget': budget, 'max_memory': 5}
+        self.assertIs(MemoryBudget.from_kwargs(kwargs), budget)
+        self.assertEqual(kwargs, {})
+
+    def test_global_budget(self):
+        self.assertIsNone(get_memory_budget().max_memory)
+        set_memory_budget('1M', out_of_core=True)
+        budget = MemoryBudget.from_kwargs({})
+        self.assertEqual(budget.max_memory, 1024 ** 2)
+        self.assertTrue(budget.out_of_core)
+
+        # explicit keywords override the global budget
+        budget = MemoryBudget.from_kwargs({'max_memory': None})
+        self.assertIsNone(budget.max_memory)
+
+        # a copy is returned
+        get_memory_budget().max_memory = 5
+        self.assertEqual(get_memory_budget().max_memory, 1024 ** 2)
+
+        set_memory_budget()
+        self.assertIsNone(get_memory_budget().max_memory)
+
+    @with_bf
+    def test_read_data(self, _bf: File):
+        self.f.add_module('SIS 3301', {'n_configs': 1, 'sn_size': 50,
+                                       'nt': 100})
+        self.f.add_module('Waveform', {'n_configs': 1, 'sn_size': 50})
+        _bf._map_file()
+        _mod = self.f.modules['SIS 3301']
+        brd, ch = [ii[0] for ii in np.where(_mod.knobs.active_brdch)]
+        kwargs = {'digitizer': 'SIS 3301', 'silent': True}
+
+        # raise before reading
+        with self.assertRaises(MemoryBudgetError) as cm:
+            _bf.read_data(brd, ch, max_memory=1024, **kwargs)
+        self.assertGreater(cm.exception.estimate, 50 * 100 * 4)
+
+        # ... and before reading any control data
+        with mock.patch(
+                'bapsflib._hdf.utils.hdfreaddata.HDFReadControl') \
+                as mock_cread:
+            self.assertRaises(MemoryBudgetError, _bf.read_data, brd,
+                              ch, add_controls=['Waveform'],
+                              max_memory=1024, **kwargs)
+            mock_cread.assert_not_called()
+
+        # global budget
+        set_memory_budget(1024)
+        self.assertRaises(MemoryBudgetError, _bf.read_data, brd, ch,
+                          **kwargs)
+        data = _bf.read_data(brd, ch, max_memory=None, **kwargs)
+        self.assertFalse(_is_memmap(data))
+        set_memory_budget()
+
+        # out-of-core matches in-memory
+        for extra in ({},
+                      {'keep_bits': True},
+                      {'shotnum': [1, 5, 60],
+                       'intersection_set': False},
+                      {'add_controls': ['Waveform'],
+                       'shotnum': slice(2, 40, 3)}):
+            data = _bf.read_data(brd, ch, **extra, **kwargs)
+            ooc = _bf.read_data(brd, ch, max_memory=1024,
+                                out_of_core=True, **extra, **kwargs)
+            self.assertTrue(_is_memmap(ooc))
+            self.assertFalse(_is_memmap(data))
+            self.assertEqual(ooc.dtype, data.dtype)
+            for field in data.dtype.names:
+                np.testing.assert_array_equal(ooc[field], data[field])
+
+    @with_bf
+    def test_read_controls(self, _bf: File):
+        self.f.add_module('Waveform', {'n_configs': 1, 'sn_size': 50})
+        _bf._map_file()
+
+        self.assertRaises(MemoryBudgetError, _bf.read_controls,
+                          ['Waveform'], max_memory=64)
+        data = _bf.read_controls(['Waveform'])
+        ooc = _bf.read_controls(['Waveform'], max_memory=64,
+                                out_of_core=True)
+        self.assertTrue(_is_memmap(ooc))
+        self.assertTrue(np.array_equal(ooc, data))
+
+    @with_bf
+    def test_read_msi(self, _bf: File):
+        self.f.add_module('Interferometer array')
+        self.f.add_module('Magnetic field')
+        _bf._map_file()
+
+        for name in ('Interferometer array', 'Magnetic field'):
+            self.assertRaises(MemoryBudgetError, _bf.read_msi, name,
+                              max_memory=64)
+            data = _bf.read_msi(name)
+            ooc = _bf.read_msi(name, max_memory=64, out_of_core=True)
+            self.assertTrue(_is_memmap(ooc))
+            self.assertEqual(ooc.dtype, data.dtype)
+            for field in data.dtype.names:
+                if field == 'meta':
+                    continue
+                np.testing.assert_array_equal(ooc[field], data[field])
+
+
+if __name__ == '__main__':
+    ut.main()
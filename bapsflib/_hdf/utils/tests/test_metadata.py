@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import copy
+import numpy as np
+import pickle
+import unittest as ut
+
+from . import (TestBase, with_bf)
+from ..file import File
+from ..hdfreadcontrol import HDFReadControl
+from ..hdfreaddata import HDFReadData
+from ..hdfreadmsi import HDFReadMSI
+from ..metadata import SharedInfo
+
+
+class TestSharedInfo(ut.TestCase):
+    """
+    Test case for :class:`~bapsflib._hdf.utils.metadata.SharedInfo`.
+    """
+
+    def setUp(self):
+        self.base = {
+            'name': 'probe01',
+            'probe': {'port': 19, 'lists': {'ml-0001': {'n': 5}}},
+            'delta': np.ones(3),
+            'names': ['a', {'b': 1}],
+        }
+
+    def test_copy_on_write(self):
+        info = SharedInfo(self.base, extra=1)
+        self.assertIsInstance(info, dict)
+        self.assertEqual(list(info), ['name', 'probe', 'delta', 'names',
+                                      'extra'])
+        self.assertEqual(info['extra'], 1)
+
+        # changes do not reach the base
+        info['name'] = 'probe02'
+        info['probe']['port'] = 20
+        info['probe']['lists']['ml-0001']['n'] = 6
+        info['names'][1]['b'] = 2
+        info['names'].append('c')
+        del info['delta']
+        self.assertEqual(self.base['name'], 'probe01')
+        self.assertEqual(self.base['probe'],
+                         {'port': 19, 'lists': {'ml-0001': {'n': 5}}})
+        self.assertEqual(self.base['names'], ['a', {'b': 1}])
+        self.assertIn('delta', self.base)
+        self.assertEqual(info['probe']['port'], 20)
+        self.assertEqual(info['names'], ['a', {'b': 2}, 'c'])
+        self.assertNotIn('delta', info)
+
+        # arrays are read-only views
+        info = SharedInfo(self.base)
+        self.assertFalse(info['delta'].flags.writeable)
+        self.assertTrue(np.shares_memory(info['delta'],
+                                         self.base['delta']))
+        with self.assertRaises(ValueError):
+            info['delta'][0] = 2.
+        info['delta'] = np.zeros(3)
+        np.testing.assert_array_equal(self.base['delta'], np.ones(3))
+
+        # the other dict methods wrap too
+        info = SharedInfo(self.base)
+        info.get('probe')['port'] = 21
+        dict(info.items())['probe']['lists']['x'] = {}
+        list(info.values())[0]
+        info.setdefault('probe', {})['port'] = 22
+        self.assertEqual(info.pop('probe')['port'], 22)
+        self.assertEqual(info.pop('probe', None), None)
+        self.assertEqual(self.base['probe'],
+                         {'port': 19, 'lists': {'ml-0001': {'n': 5}}})
+
+        # plain dicts built from the meta-info hold wrapped values
+        info = SharedInfo(self.base)
+        for other in (dict(info), {**info}, dict(**info)):
+            self.assertIs(type(other), dict)
+            self.assertIsInstance(other['probe'], SharedInfo)
+            self.assertFalse(other['delta'].flags.writeable)
+            other['probe']['port'] = 23
+            other['probe']['lists']['ml-0001']['n'] = 7
+            other['names'][1]['b'] = 3
+            dict(other['probe'])['lists']['x'] = {}
+        self.assertEqual(self.base['probe'],
+                         {'port': 19, 'lists': {'ml-0001': {'n': 5}}})
+        self.assertEqual(self.base['names'], ['a', {'b': 1}])
+
+    def test_copy(self):
+        info = SharedInfo(self.base)
+        info['probe']['port'] = 20
+        info['mine'] = {'a': [1]}
+
+        for other in (info.copy(), copy.copy(info),
+                      copy.deepcopy(info)):
+            self.assertIsInstance(other, SharedInfo)
+            self.assertEqual(other['probe']['port'], 20)
+
+            # copies are independent
+            other['probe']['port'] = 30
+            other['mine']['a'].append(2)
+            other['names'].append('c')
+            self.assertEqual(info['probe']['port'], 20)
+            self.assertEqual(info['mine'], {'a': [1]})
+            self.assertEqual(info['names'], ['a', {'b': 1}])
+        self.assertEqual(self.base['probe']['port'], 19)
+
+        # equality, plain dicts, and pickling
+        other = info.copy()
+        self.assertEqual(other, info)
+        plain = info.to_dict()
+        self.assertIs(type(plain), dict)
+        self.assertIs(type(plain['probe']), dict)
+        self.assertTrue(plain['delta'].flags.writeable)
+        other = pickle.loads(pickle.dumps(info))
+        self.assertIsInstance(other, SharedInfo)
+        self.assertEqual(other['probe'], info['probe'])
+
+
+class TestSharedReadInfo(TestBase):
+    """
+    Test the meta-info of reads is shared with, and does not modify,
+    the file mapping.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.f.add_module('6K Compumotor',
+                          {'n_configs': 1, 'sn_size': 50,
+                           'n_motionlists': 1})
+        self.f.add_module('SIS 3301', {'n_configs': 1, 'sn_size': 50})
+        self.f.add_module('Discharge')
+        _mod = self.f.modules['SIS 3301']
+        bc_indices = np.where(_mod.knobs.active_brdch)
+        self.brd = bc_indices[0][0]
+        self.ch = bc_indices[1][0]
+
+    def tearDown(self):
+        super().tearDown()
+
+    @with_bf
+    def test_read_info(self, _bf: File):
+        cname = '6K Compumotor'
+        cmap = _bf.controls[cname]
+        cconfn = list(cmap.configs)[0]
+        config = cmap.configs[cconfn]
+        ml_name = list(config['motion lists'])[0]
+
+        cdata = HDFReadControl(_bf, [cname])
+        data = HDFReadData(_bf, self.brd, self.ch,
+                           digitizer='SIS 3301', add_controls=[cname])
+        mdata = HDFReadMSI(_bf, 'Discharge')
+        for info in (cdata.info, data.info, mdata.info):
+            self.assertIsInstance(info, SharedInfo)
+
+        # changes to a read's meta-info do not reach the mapping or
+        # the other reads
+        for rdata in (cdata, data):
+            ml = rdata.info['controls'][cname]['motion lists'][ml_name]
+            ml['motion count'] = -1
+            with self.assertRaises(ValueError):
+                ml['delta'][0] = 100.
+        self.assertNotEqual(
+            config['motion lists'][ml_name]['motion count'], -1)
+        self.assertEqual(
+            data.info['controls'][cname]['motion lists'][ml_name][
+                'motion count'], -1)
+        mdata.info['calib tag'] = 'tag'
+        self.assertNotEqual(
+            _bf.msi['Discharge'].configs.get('calib tag', None), 'tag')
+
+        # so do changes to plain dicts built from the meta-info of
+        # fresh reads
+        for rdata in (HDFReadControl(_bf, [cname]),
+                      HDFReadData(_bf, self.brd, self.ch,
+                                  digitizer='SIS 3301',
+                                  add_controls=[cname])):
+            for controls in (dict(rdata.info)['controls'],
+                             {**rdata.info}['controls']):
+                mls = dict(controls[cname])['motion lists']
+                mls[ml_name]['motion count'] = -2
+                {**mls}[ml_name]['motion count'] = -2
+        self.assertNotEqual(
+            config['motion lists'][ml_name]['motion count'], -2)
+
+        # slices share the meta-info of the read
+        self.assertIs(data[0:10].info, data.info)
+        self.assertIs(cdata[::2].info, cdata.info)
+        self.assertIs(mdata[0:1].info, mdata.info)
+
+        # a view of an array without meta-info gets the defaults
+        view = data.view(np.recarray).view(HDFReadData)
+        self.assertIsNone(view.info['source file'])
+        view.info['controls']['x'] = 1
+        other = data.view(np.recarray).view(HDFReadData)
+        self.assertEqual(other.info['controls'], {})
+
+        # plasma defaults are shared copy-on-write
+        plasma = data.plasma
+        self.assertIsNone(plasma['Bo'])
+        plasma['Bo'] = 1.
+        other = HDFReadData(_bf, self.brd, self.ch,
+                            digitizer='SIS 3301')
+        self.assertIsNone(other.plasma['Bo'])
+
+
+if __name__ == '__main__':
+    ut.main()
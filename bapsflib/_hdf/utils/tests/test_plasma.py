@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import astropy.units as u
+import numpy as np
+import unittest as ut
+
+from bapsflib.synthetic import FauxHDFBuilder
+from bapsflib.plasma import (core, vectorized)
+from unittest import mock
+
+from ..file import File
+from ..plasma import (MagneticFieldProfile, PLASMA_PARAMETERS,
+                      PLASMA_UNITS)
+
+
+class TestPlasma(ut.TestCase):
+    """
+    Test case for :meth:`~bapsflib._hdf.utils.file.File.read_plasma`,
+    :meth:`~bapsflib._hdf.utils.file.File.add_plasma`, and
+    :mod:`~bapsflib._hdf.utils.plasma`.
+    """
+
+    f = NotImplemented  # type: FauxHDFBuilder
+
+    #: shot numbers recorded by the MSI diagnostics (shot 7 is missing)
+    msi_shotnum = np.delete(np.arange(1, 21), 6)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.f = FauxHDFBuilder(
+            add_modules={'SIS 3301': {'n_configs': 1, 'sn_size': 20,
+                                      'nt': 8},
+                         'Magnetic field': {},
+                         'Interferometer array': {
+                             'n_interferometers': 3}})
+        cls._rewrite_msi(cls.f, cls.msi_shotnum)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.f.cleanup()
+
+    @staticmethod
+    def _rewrite_msi(f: FauxHDFBuilder, shotnum: np.ndarray):
+        """
+        Re-write the faux MSI datasets to record **shotnum**, with a
+        magnetic field profile linear in z (:math:`B = 1000 + z +
+        shotnum`) and an interferometer density of
+        :math:`(ii + 1) 10^{12} + 10^{9} shotnum`.
+        """
+        n = shotnum.size
+
+        # 'Magnetic field'
+        group = f['MSI/Magnetic field']
+        zgrid = group.attrs['Profile z locations']
+        summary = group['Magnetic field summary'][0:1]
+        summary = np.repeat(summary, n)
+        summary['Shot number'] = shotnum
+        for name, data in (
+                ('Magnetic field summary', summary),
+                ('Magnetic field profile',
+                 (1000. + zgrid[None, :]
+                  + shotnum[:, None]).astype(np.float32)),
+                ('Magnet power supply currents',
+                 np.zeros((n, 10), dtype=np.float32))):
+            del group[name]
+            group.create_dataset(name, data=data)
+
+        # 'Interferometer array'
+        group = f['MSI/Interferometer array']
+        for ii in range(group.attrs['Interferometer count']):
+            sub = group['Interferometer [{}]'.format(ii)]
+            summary = np.repeat(sub['Interferometer summary list'][0:1],
+                                n)
+            summary['Shot number'] = shotnum
+            summary['Peak density'] = (ii + 1) * 1.e12 + 1.e9 * shotnum
+            for name, data in (
+                    ('Interferometer summary list', summary),
+                    ('Interferometer trace',
+                     np.zeros((n, 10), dtype=np.float32))):
+                del sub[name]
+                sub.create_dataset(name, data=data)
+
+    def setUp(self):
+        self.bf = File(self.f.filename,
+                       control_path='Raw data + config',
+                       digitizer_path='Raw data + config',
+                       msi_path='MSI', silent=True)
+        _mod = self.f.modules['SIS 3301']
+        brds, chs = np.where(_mod.knobs.active_brdch)
+        self.brd, self.ch = int(brds[0]), int(chs[0])
+        self.m_i = 4.0 * core.AMU
+        self.zlocs = self.bf.msi['Interferometer array'].configs['z']
+
+    def tearDown(self):
+        self.bf.close()
+
+    def test_read_plasma(self):
+        bf = self.bf
+        sn = np.array([3, 1, 7, 12])
+        z = self.zlocs[1] + 0.25
+        pdata = bf.read_plasma(sn, z, kTe=5., kTi=1., m_i=self.m_i,
+                               silent=True)
+        self.assertEqual(pdata.dtype.names,
+                         ('shotnum', 'z', 'Bo', 'n_e')
+                         + PLASMA_PARAMETERS)
+        self.assertEqual(pdata['shotnum'].tolist(), sn.tolist())
+        np.testing.assert_array_equal(pdata['z'], z)
+
+        # MSI values, shot 7 was not recorded
+        found = sn != 7
+        np.testing.assert_allclose(pdata['Bo'][found],
+                                   1000. + z + sn[found], rtol=1.e-6)
+        np.testing.assert_allclose(pdata['n_e'][found],
+                                   2.e12 + 1.e9 * sn[found],
+                                   rtol=1.e-6)
+        self.assertTrue(np.all(np.isnan(
+            pdata[['Bo', 'n_e', 'fce']][2].tolist())))
+
+        # parameters agree with the scalar functions
+        for ii in np.flatnonzero(found):
+            args = {'Bo': pdata['Bo'][ii], 'n_e': pdata['n_e'][ii],
+                    'n_i': pdata['n_e'][ii], 'n': pdata['n_e'][ii],
+                    'kTe': 5., 'kT': 5., 'kTi': 1., 'm_i': self.m_i,
+                    'Z': 1}
+            for name in PLASMA_PARAMETERS:
+                self.assertAlmostEqual(
+                    pdata[name][ii] / getattr(core, name)(**args), 1.0,
+                    places=10)
+
+        # per-shot z (as a Quantity) selects per-shot interferometers
+        z = u.Quantity([self.zlocs[0], self.zlocs[2], 0., 0.], u.cm)
+        pdata = bf.read_plasma(sn, z, kTe=[1., 2., 3., 4.], kTi=1.,
+                               m_i=self.m_i, parameters=['vTe', 'oce'],
+                               silent=True)
+        self.assertEqual(pdata.dtype.names,
+                         ('shotnum', 'z', 'Bo', 'n_e', 'vTe', 'oce'))
+        np.testing.assert_allclose(
+            pdata['n_e'][[0, 1, 3]],
+            np.array([1.e12, 3.e12, 1.e12]) + 1.e9 * sn[[0, 1, 3]],
+            rtol=1.e-6)
+        np.testing.assert_allclose(pdata['vTe'],
+                                   vectorized.vTe([1., 2., 3., 4.]))
+
+        # given values and a chosen interferometer
+        pdata = bf.read_plasma(sn, 0., kTe=5., kTi=1., m_i=self.m_i,
+                               Bo=1000., interferometer=2, silent=True)
+        np.testing.assert_array_equal(pdata['Bo'], 1000.)
+        np.testing.assert_allclose(pdata['n_e'][found],
+                                   3.e12 + 1.e9 * sn[found],
+                                   rtol=1.e-6)
+
+        # z outside of the profile
+        pdata = bf.read_plasma(sn, -1.e4, kTe=5., kTi=1., m_i=self.m_i,
+                               silent=True)
+        self.assertTrue(np.all(np.isnan(pdata['Bo'])))
+
+    def test_add_plasma(self):
+        bf = self.bf
+        data = bf.read_data(self.brd, self.ch, shotnum=[2, 7, 9],
+                            digitizer='SIS 3301', silent=True)
+        pdata = bf.add_plasma(data, z=self.zlocs[0], kTe=5., kTi=1.,
+                              m_i=self.m_i, parameters=['fce', 'VA'],
+                              silent=True)
+        self.assertIsInstance(pdata, type(data))
+        self.assertEqual(
+            pdata.dtype.names,
+            data.dtype.names + ('Bo', 'n_e', 'fce', 'VA'))
+        for name in data.dtype.names:
+            np.testing.assert_array_equal(pdata[name], data[name])
+        np.testing.assert_allclose(pdata['Bo'][[0, 2]],
+                                   1000. + self.zlocs[0]
+                                   + np.array([2, 9]), rtol=1.e-6)
+        self.assertTrue(np.isnan(pdata['VA'][1]))
+        self.assertEqual(pdata.info['plasma units'],
+                         {name: PLASMA_UNITS[name]
+                          for name in ('Bo', 'n_e', 'fce', 'VA')})
+        self.assertNotIn('plasma units', data.info)
+        self.assertEqual(pdata.info['source file'],
+                         data.info['source file'])
+
+        # fields can not be added twice
+        self.assertRaises(ValueError, bf.add_plasma, pdata, 0., 5., 1.,
+                          self.m_i, silent=True)
+
+    def test_B_at_probe(self):
+        bf = self.bf
+        _map = bf.msi['Magnetic field']
+        zgrid = np.asarray(_map.configs['z'], dtype=np.float64)
+        profile = self.f['MSI/Magnetic field/Magnetic field profile']
+        profile = profile[...].astype(np.float64)
+
+        # batched interpolation agrees with a per-shot np.interp loop
+        sn = np.array([20, 3, 3, 7, 1, 15])
+        z = np.array([zgrid[0], 100.3, -42.1, 10., zgrid[-1], 1.e4])
+        Bo = bf.B_at_probe(sn, z)
+        rows = np.searchsorted(self.msi_shotnum, sn)
+        for ii, (row, zz) in enumerate(zip(rows, z)):
+            if sn[ii] == 7 or zz > zgrid[-1]:
+                self.assertTrue(np.isnan(Bo[ii]))
+            else:
+                self.assertAlmostEqual(
+                    Bo[ii], np.interp(zz, zgrid, profile[row]),
+                    places=3)
+
+        # one z for all shots
+        np.testing.assert_allclose(
+            bf.B_at_probe(self.msi_shotnum, 500.),
+            1000. + 500. + self.msi_shotnum, rtol=1.e-6)
+        np.testing.assert_allclose(bf.B_at_probe(4, 500. * u.cm),
+                                   [1504.], rtol=1.e-6)
+
+        # the profile z-grid and shot numbers are cached per file
+        cached = bf._field_profile
+        self.assertIsInstance(cached, MagneticFieldProfile)
+        bf.B_at_probe([1, 2], 0.)
+        self.assertIs(bf._field_profile, cached)
+        self.assertFalse(cached.z.flags.writeable)
+        np.testing.assert_array_equal(cached.shotnum, self.msi_shotnum)
+        with mock.patch.object(
+                File, 'msi', new_callable=mock.PropertyMock,
+                side_effect=AssertionError('map was accessed')):
+            bf.B_at_probe([1, 2], 0.)
+
+        # re-mapping clears the cache
+        bf._map_file()
+        self.assertIsNone(bf._field_profile)
+
+        # the profile z-grid may be descending
+        group = self.f['MSI/Magnetic field']
+        zattr = group.attrs['Profile z locations']
+        dset = group['Magnetic field profile']
+        data = dset[...]
+        try:
+            group.attrs['Profile z locations'] = zattr[::-1]
+            dset[...] = data[:, ::-1]
+            bf._map_file()
+            np.testing.assert_allclose(
+                bf.B_at_probe([1, 2], [500., 10.]), [1501., 1012.],
+                rtol=1.e-6)
+        finally:
+            group.attrs['Profile z locations'] = zattr
+            dset[...] = data
+            bf._map_file()
+
+        # no 'Magnetic field' MSI diagnostic
+        other = FauxHDFBuilder(add_modules={'Discharge': {}})
+        try:
+            with File(other.filename, silent=True) as of:
+                self.assertRaises(ValueError, of.B_at_probe, [1], 0.)
+        finally:
+            other.cleanup()
+
+    def test_errors(self):
+        bf = self.bf
+        args = (5., 1., self.m_i)
+        self.assertRaises(ValueError, bf.read_plasma, [], 0., *args)
+        self.assertRaises(ValueError, bf.read_plasma, [0, 1], 0.,
+                          *args)
+        self.assertRaises(ValueError, bf.read_plasma, [1, 2],
+                          [0., 1., 2.], *args)
+        self.assertRaises(ValueError, bf.read_plasma, [1, 2], 0.,
+                          *args, parameters=['signal'])
+        self.assertRaises(ValueError, bf.read_plasma, [1, 2], 0.,
+                          *args, interferometer=3)
+        self.assertRaises(ValueError, bf.add_plasma, np.arange(3), 0.,
+                          *args)
+
+        # shots not recorded by the MSI diagnostics
+        with self.assertWarns(UserWarning):
+            pdata = bf.read_plasma([100], 0., *args)
+        self.assertTrue(np.isnan(pdata['Bo'][0]))
+
+        # missing MSI diagnostics
+        other = FauxHDFBuilder(add_modules={'Discharge': {}})
+        try:
+            with File(other.filename, silent=True) as of:
+                self.assertRaises(ValueError, of.read_plasma, [1], 0.,
+                                  *args)
+                pdata = of.read_plasma([1], 0., *args, Bo=1000.,
+                                       n_e=1.e12)
+                self.assertAlmostEqual(pdata['fce'][0],
+                                       core.fce(1000.))
+        finally:
+            other.cleanup()
+
+
+if __name__ == '__main__':
+    ut.main()
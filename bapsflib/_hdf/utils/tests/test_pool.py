@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import numpy as np
+import threading
+import unittest as ut
+
+from bapsflib.synthetic import FauxHDFBuilder
+
+from . import TestBase
+from ..file import File
+from ..pool import FilePool
+
+
+class TestFilePool(TestBase):
+    """Test case for :class:`~bapsflib._hdf.utils.pool.FilePool`."""
+
+    def setUp(self):
+        super().setUp()
+        self.f.add_module('SIS 3301', {'n_configs': 1, 'sn_size': 20,
+                                       'nt': 10})
+        self.f.add_module('Waveform', {'n_configs': 1, 'sn_size': 20})
+        self.pool = FilePool(control_path='Raw data + config',
+                             digitizer_path='Raw data + config',
+                             msi_path='MSI', silent=True)
+
+    def tearDown(self):
+        self.pool.close()
+        super().tearDown()
+
+    def test_handles(self):
+        pool = self.pool
+        self.assertEqual(pool.max_handles, 4)
+        self.assertIsNone(pool.max_open_files)
+        self.assertIsNone(pool.idle_timeout)
+
+        # handles share one file map
+        with pool.handle(self.f.filename) as bf1:
+            self.assertIsInstance(bf1, File)
+            with pool.handle(self.f.filename) as bf2:
+                self.assertIsNot(bf1, bf2)
+                self.assertIs(bf1.file_map, bf2.file_map)
+                self.assertEqual(pool.n_open, 2)
+        self.assertEqual(pool.paths, [bf1.info['absolute file path']])
+
+        # idle handles are re-used
+        with pool.handle(self.f.filename) as bf3:
+            self.assertIn(bf3, (bf1, bf2))
+        self.assertEqual(pool.n_open, 2)
+
+        # handles can not be returned to another pool
+        self.assertRaises(ValueError,
+                          FilePool().release, bf3)
+
+        # all handles are checked out
+        pool = FilePool(max_handles=1, silent=True)
+        bf = pool.acquire(self.f.filename)
+        self.assertRaises(TimeoutError, pool.acquire, self.f.filename,
+                          timeout=0.01)
+        pool.release(bf)
+        self.assertIs(pool.acquire(self.f.filename, timeout=0.01), bf)
+        pool.release(bf)
+        pool.close()
+        self.assertFalse(bool(bf))
+        self.assertRaises(ValueError, pool.acquire, self.f.filename)
+
+        # invalid arguments
+        self.assertRaises(TypeError, FilePool, dict)
+        self.assertRaises(ValueError, FilePool, max_handles=0)
+        self.assertRaises(ValueError, FilePool, max_open_files=0)
+        self.assertRaises(ValueError, FilePool, mode='r+')
+        self.assertRaises(TypeError, File, self.f.filename,
+                          file_map={})
+
+    def test_eviction(self):
+        pool = self.pool
+        bf1 = pool.acquire(self.f.filename)
+        bf2 = pool.acquire(self.f.filename)
+        pool.release(bf1)
+        pool.release(bf2)
+
+        # the handle owning the shared file map is closed last
+        self.assertEqual(pool.evict_idle(), 0)
+        self.assertEqual(pool.evict_idle(0), 2)
+        self.assertFalse(bool(bf1))
+        self.assertFalse(bool(bf2))
+        self.assertEqual(pool.n_open, 0)
+        self.assertEqual(pool.paths, [])
+
+        # the owner stays open while other handles are checked out
+        bf1 = pool.acquire(self.f.filename)
+        bf2 = pool.acquire(self.f.filename)
+        pool.release(bf1)
+        self.assertEqual(pool.evict_idle(0), 0)
+        bf3 = pool.acquire(self.f.filename)
+        self.assertIs(bf3, bf1)
+        pool.release(bf1)
+        pool.release(bf2)
+
+        # idle timeout
+        pool = FilePool(idle_timeout=0, silent=True)
+        with pool.handle(self.f.filename) as bf:
+            self.assertTrue(bool(bf))
+        self.assertFalse(bool(bf))
+        self.assertEqual(pool.n_open, 0)
+
+        # max open files
+        other = FauxHDFBuilder()
+        try:
+            pool = FilePool(max_open_files=1, silent=True)
+            with pool.handle(self.f.filename) as bf:
+                self.assertRaises(TimeoutError, pool.acquire,
+                                  other.filename, timeout=0.01)
+            with pool.handle(other.filename) as bf_other:
+                self.assertFalse(bool(bf))
+                self.assertEqual(pool.n_open, 1)
+            pool.close()
+            self.assertFalse(bool(bf_other))
+        finally:
+            other.cleanup()
+
+    def test_threads(self):
+        with File(self.f.filename, control_path='Raw data + config',
+                  digitizer_path='Raw data + config', msi_path='MSI',
+                  silent=True) as bf:
+            _mod = self.f.modules['SIS 3301']
+            brd, ch = [ii[0]
+                       for ii in np.where(_mod.knobs.active_brdch)]
+            kwargs = {'digitizer': 'SIS 3301', 'silent': True,
+                      'add_controls': ['Waveform']}
+            expected = bf.read_data(brd, ch, **kwargs)
+
+        pool = FilePool(max_handles=2, control_path='Raw data + config',
+                        digitizer_path='Raw data + config',
+                        msi_path='MSI', silent=True)
+        results = []
+        errors = []
+        handles = set()
+
+        def worker():
+            try:
+                for _ in range(3):
+                    with pool.handle(self.f.filename) as _bf:
+                        handles.add(_bf)
+                        results.append(
+                            _bf.read_data(brd, ch, **kwargs))
+            except Exception as err:  # pragma: no cover
+                errors.append(err)
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        pool.close()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(results), 18)
+        self.assertLessEqual(len(handles), 2)
+        self.assertEqual(pool.n_open, 0)
+        for data in results:
+            for field in expected.dtype.names:
+                np.testing.assert_array_equal(data[field],
+                                              expected[field])
+
+
+if __name__ == '__main__':
+    ut.main()
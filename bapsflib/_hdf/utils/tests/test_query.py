@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import numpy as np
+import unittest as ut
+
+from . import (TestBase, with_bf)
+from ..file import File
+from ..query import ShotQuery
+
+
+class TestShotQuery(TestBase):
+    """Test case for :class:`~bapsflib._hdf.utils.query.ShotQuery`."""
+
+    def setUp(self):
+        super().setUp()
+
+        # 50 shots of a discharge, a 2 config Waveform (one dataset
+        # for both configs), and a 6K Compumotor probe
+        self.f.add_module('Discharge')
+        self.f.add_module('Waveform', {'n_configs': 2, 'sn_size': 50})
+        self.f.add_module('6K Compumotor',
+                          {'n_configs': 1, 'sn_size': 50,
+                           'n_motionlists': 1})
+        self.sixk_config = \
+            self.f.modules['6K Compumotor'].config_names[0]
+
+        # extend the discharge datasets to 50 shots
+        rng = np.random.RandomState(0)
+        grp = self.f['MSI/Discharge']
+        for name in ('Cathode-anode voltage', 'Discharge current'):
+            data = grp[name][...]
+            del grp[name]
+            grp.create_dataset(name,
+                               data=np.resize(data,
+                                              (50, data.shape[1])))
+        dsum = np.resize(grp['Discharge summary'][...], 50)
+        dsum['Shot number'] = np.arange(1, 51)
+        dsum['Data valid'] = rng.randint(0, 2, 50)
+        dsum['Peak current'] = rng.uniform(3000., 5000., 50)
+        del grp['Discharge summary']
+        grp.create_dataset('Discharge summary', data=dsum)
+
+        # waveform command indices
+        dset = self.f['Raw data + config/Waveform/Run time list']
+        wdata = dset[...]
+        wdata['Command index'] = rng.randint(
+            0, 3, wdata.shape[0]).astype(wdata.dtype['Command index'])
+        dset[...] = wdata
+
+    def tearDown(self):
+        super().tearDown()
+
+    @with_bf
+    def test_msi(self, _bf: File):
+        mdata = _bf.read_msi('Discharge')
+        valid = mdata['meta']['data valid'] == 1
+        high = mdata['meta']['peak current'] > 4000.
+
+        # single predicate
+        query = _bf.shot_query().msi('Discharge', 'data valid', '==', 1)
+        self.assertIsInstance(query, ShotQuery)
+        sn = query.shotnum()
+        self.assertEqual(sn.dtype, np.uint32)
+        self.assertEqual(sn.tolist(), mdata['shotnum'][valid].tolist())
+
+        # combined predicates only read the referenced columns
+        query = query.msi('Discharge', 'peak current', '>', 4000.)
+        self.assertEqual(query.shotnum().tolist(),
+                         mdata['shotnum'][valid & high].tolist())
+        self.assertEqual(
+            [(read['field'], read['rows'])
+             for read in query.columns_read],
+            [('Shot number', 50), ('Data valid', 50),
+             ('Peak current', 50)])
+
+        # callable predicates and 'in'
+        query = ShotQuery(_bf).msi(
+            'Discharge', 'peak current',
+            lambda current: (current > 3500.) & (current < 4500.))
+        mask = (mdata['meta']['peak current'] > 3500.) \
+            & (mdata['meta']['peak current'] < 4500.)
+        self.assertEqual(query.shotnum().tolist(),
+                         mdata['shotnum'][mask].tolist())
+        query = ShotQuery(_bf).msi('Discharge', 'data valid', 'in',
+                                   [0, 1])
+        self.assertEqual(query.shotnum().tolist(),
+                         mdata['shotnum'].tolist())
+
+    @with_bf
+    def test_controls(self, _bf: File):
+        # Waveform configurations share one dataset
+        for config in ('config01', 'config02'):
+            cdata = _bf.read_controls([('Waveform', config)])
+            field = [name for name in cdata.dtype.names
+                     if name != 'shotnum'][0]
+            value = cdata[field][0]
+            query = _bf.shot_query().control('Waveform', field, '==',
+                                             value, config_name=config)
+            self.assertEqual(
+                query.shotnum().tolist(),
+                cdata['shotnum'][cdata[field] == value].tolist())
+            self.assertIn('Configuration name',
+                          [read['field']
+                           for read in query.columns_read])
+
+        # a box of probe positions
+        cdata = _bf.read_controls([('6K Compumotor',
+                                    self.sixk_config)])
+        xyz = cdata['xyz']
+        lower = np.min(xyz, axis=0)
+        upper = np.median(xyz, axis=0)
+        query = _bf.shot_query() \
+            .control('6K Compumotor', 'xyz', '>=', lower,
+                     config_name=self.sixk_config) \
+            .control('6K Compumotor', 'xyz', '<=', upper,
+                     config_name=self.sixk_config)
+        mask = np.all((xyz >= lower) & (xyz <= upper), axis=1)
+        self.assertEqual(query.shotnum().tolist(),
+                         cdata['shotnum'][mask].tolist())
+
+        # the selection is a valid `shotnum` for read_controls
+        sn = query.shotnum()
+        cdata = _bf.read_controls([('6K Compumotor',
+                                    self.sixk_config)], shotnum=sn)
+        self.assertEqual(cdata['shotnum'].tolist(), sn.tolist())
+
+    @with_bf
+    def test_set_operations(self, _bf: File):
+        mdata = _bf.read_msi('Discharge')
+        sn = mdata['shotnum']
+        valid = mdata['meta']['data valid'] == 1
+        high = mdata['meta']['peak current'] > 4000.
+
+        q_valid = ShotQuery(_bf).msi('Discharge', 'data valid', '==', 1)
+        q_high = ShotQuery(_bf).msi('Discharge', 'peak current', '>',
+                                    4000.)
+        self.assertEqual((q_valid & q_high).shotnum().tolist(),
+                         sn[valid & high].tolist())
+        self.assertEqual((q_valid | q_high).shotnum().tolist(),
+                         sn[valid | high].tolist())
+        self.assertEqual((q_valid - q_high).shotnum().tolist(),
+                         sn[valid & ~high].tolist())
+
+        # a column shared by predicates is read once
+        query = q_valid | q_high
+        query.shotnum()
+        self.assertEqual(len(query.columns_read), 3)
+        self.assertEqual(repr(query), '<ShotQuery 2 predicate(s)>')
+
+        # explain
+        text = query.explain()
+        self.assertIn('ANY OF -> {} shot(s)'.format(
+            np.count_nonzero(valid | high)), text)
+        self.assertIn("MSI 'Discharge' ['data valid'] == 1 -> "
+                      "{} shot(s)".format(np.count_nonzero(valid)),
+                      text)
+        self.assertIn("['Peak current']: 50 rows", text)
+        self.assertIn('total: 3 column(s)', text)
+
+        # explain evaluates a query
+        self.assertIn('total: 3 column(s)',
+                      (q_valid & q_high).explain())
+
+    @with_bf
+    def test_raise_errors(self, _bf: File):
+        query = ShotQuery(_bf)
+        self.assertEqual(query.columns_read, [])
+        self.assertRaises(ValueError, query.shotnum)
+        self.assertRaises(TypeError, ShotQuery, None)
+        self.assertRaises(ValueError, query.msi, 'Discharge',
+                          'data valid', '=<', 1)
+
+        # unknown devices and fields
+        for bad in (query.msi('Not a diag', 'data valid', '==', 1),
+                    query.msi('Discharge', 'not a field', '==', 1),
+                    query.control('Waveform', 'not a field', '==', 1,
+                                  config_name='config01'),
+                    query.control('Waveform', 'command', '==', 1)):
+            self.assertRaises(ValueError, bad.shotnum)
+
+        # queries on different files
+        with File(self.f.filename, control_path='Raw data + config',
+                  digitizer_path='Raw data + config',
+                  msi_path='MSI') as other:
+            self.assertRaises(ValueError, query.__and__,
+                              ShotQuery(other))
+
+
+if __name__ == '__main__':
+    ut.main()
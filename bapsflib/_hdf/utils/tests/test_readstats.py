@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import logging
+import numpy as np
+import unittest as ut
+
+from . import (TestBase, with_bf)
+from ..file import File
+from ..hdfreadcontrol import HDFReadControl
+from ..hdfreaddata import HDFReadData
+from ..readstats import (ReadStats, TrackedDataset)
+
+
+class TestReadStats(TestBase):
+    """
+    Test case for :class:`~bapsflib._hdf.utils.readstats.ReadStats`.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+
+    def test_stats_basics(self):
+        stats = ReadStats('test')
+        self.assertEqual(stats.name, 'test')
+        self.assertEqual(stats.n_reads, 0)
+        self.assertEqual(stats.bytes_read, 0)
+        self.assertEqual(stats.rows_selected, 0)
+        self.assertFalse(stats.cache_hit)
+        self.assertEqual(len(stats.stages), 0)
+
+        # stages
+        with stats.stage('one'):
+            pass
+        stats.checkpoint('two')
+        with stats.stage('one'):
+            pass
+        self.assertEqual(list(stats.stages), ['one', 'two'])
+        for val in stats.stages.values():
+            self.assertIsInstance(val, float)
+            self.assertGreaterEqual(val, 0.0)
+
+        # children
+        child = ReadStats('child')
+        child.record_read(np.zeros(10, dtype=np.float32))
+        stats.add_child('child', child)
+        stats.add_child('none', None)
+        self.assertEqual(list(stats.children), ['child'])
+        self.assertEqual(stats.n_reads, 1)
+        self.assertEqual(stats.bytes_read, 40)
+
+        # finalize
+        stats.finalize()
+        total = stats.total_time
+        self.assertEqual(stats.total_time, total)
+
+        # as dict
+        sdict = stats.as_dict()
+        self.assertEqual(sdict['name'], 'test')
+        self.assertEqual(sdict['n reads'], 1)
+        self.assertEqual(sdict['bytes read'], 40)
+        self.assertEqual(sdict['total time'], total)
+        self.assertIn('child', sdict['children'])
+        self.assertIsInstance(repr(stats), str)
+
+    def test_logging(self):
+        logger = logging.getLogger('bapsflib.test_readstats')
+        with self.assertLogs(logger, level='DEBUG') as cm:
+            stats = ReadStats('test', log=logger)
+            stats.checkpoint('a stage')
+            stats.finalize()
+        self.assertEqual(len(cm.output), 2)
+        self.assertIn('a stage', cm.output[0])
+
+        # no logging by default
+        stats = ReadStats('test')
+        self.assertIsNone(stats._logger)
+
+    def test_tracked_dataset(self):
+        self.f.add_module('SIS 3301', {'n_configs': 1, 'sn_size': 50,
+                                       'nt': 100})
+        _mod = self.f.modules['SIS 3301']
+        config_name = _mod.knobs.active_config[0]
+        brd, ch = [ii[0] for ii in np.where(_mod.knobs.active_brdch)]
+        dset_path = 'Raw data + config/SIS 3301/' \
+                    + config_name + ' [{}:{}]'.format(brd, ch)
+        dset = self.f[dset_path]
+        stats = ReadStats('test')
+        tdset = stats.track(dset)
+
+        self.assertIsInstance(tdset, TrackedDataset)
+        self.assertIs(stats.track(tdset), tdset)
+        self.assertIs(tdset.dataset, dset)
+        self.assertEqual(tdset.shape, dset.shape)
+        self.assertEqual(len(tdset), len(dset))
+
+        arr = tdset[0:10, ...]
+        self.assertTrue(np.array_equal(arr, dset[0:10, ...]))
+        self.assertEqual(stats.n_reads, 1)
+        self.assertEqual(stats.bytes_read, arr.nbytes)
+
+    @with_bf
+    def test_read_stats_on_reads(self, _bf: File):
+        self.f.add_module('SIS 3301', {'n_configs': 1, 'sn_size': 50,
+                                       'nt': 100})
+        self.f.add_module('Waveform', {'n_configs': 1, 'sn_size': 50})
+        _bf._map_file()
+        _mod = self.f.modules['SIS 3301']
+        brd, ch = [ii[0] for ii in np.where(_mod.knobs.active_brdch)]
+
+        # HDFReadData
+        data = HDFReadData(_bf, brd, ch, digitizer='SIS 3301',
+                           shotnum=[2, 5, 10],
+                           add_controls=['Waveform'])
+        stats = data.read_stats
+        self.assertIsInstance(stats, ReadStats)
+        for stage in ('condition controls', 'condition shotnum',
+                      'control read', 'signal read',
+                      'volt conversion'):
+            self.assertIn(stage, stats.stages)
+        self.assertEqual(stats.rows_selected, 3)
+        self.assertGreater(stats.n_reads, 0)
+        self.assertGreaterEqual(stats.bytes_read, 3 * 100 * 2)
+        self.assertIn('controls', stats.children)
+
+        # stats propagate to views
+        self.assertIs(data[0:2].read_stats, stats)
+
+        # HDFReadControl
+        cdata = HDFReadControl(_bf, ['Waveform'], shotnum=[2, 5, 10])
+        self.assertIsInstance(cdata.read_stats, ReadStats)
+        self.assertEqual(cdata.read_stats.rows_selected, 3)
+        self.assertIn('control read - Waveform',
+                      cdata.read_stats.stages)
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import numpy as np
+import unittest as ut
+
+from bapsflib.utils.errors import HDFEmptyIntersectionError
+
+from . import (TestBase, with_bf)
+from ..file import File
+from ..hdfreaddata import HDFReadData
+from ..spatial import (condition_nearest, condition_region,
+                       motion_control, SpatialIndex)
+
+
+def _grid(sn_size=50):
+    """
+    Shot numbers and positions of a 5 x 5 (x, y) grid with 2 shots per
+    position.
+    """
+    shotnum = np.arange(1, sn_size + 1, dtype=np.uint32)
+    pos = (shotnum - 1) // 2
+    xyz = np.zeros((sn_size, 3), dtype=np.float64)
+    xyz[:, 0] = pos % 5
+    xyz[:, 1] = pos // 5 - 2.
+    return shotnum, xyz
+
+
+class TestSpatialIndex(ut.TestCase):
+    """
+    Test case for :class:`~bapsflib._hdf.utils.spatial.SpatialIndex`.
+    """
+
+    def setUp(self):
+        self.shotnum, self.xyz = _grid()
+        self.sindex = SpatialIndex(self.shotnum, self.xyz, name='grid')
+
+    def select(self, mask):
+        return self.shotnum[mask].tolist()
+
+    def test_index(self):
+        sindex = self.sindex
+        self.assertEqual(len(sindex), 50)
+        self.assertEqual(sindex.positions.shape, (25, 3))
+        self.assertEqual(sindex.shotnum.tolist(), self.shotnum.tolist())
+        self.assertEqual(sindex.name, 'grid')
+        self.assertEqual(repr(sindex),
+                         "<SpatialIndex 'grid': 50 shot(s) at 25 "
+                         "position(s)>")
+
+        # shots without a valid position are dropped
+        xyz = self.xyz.copy()
+        xyz[[0, 5], 1] = np.nan
+        sindex = SpatialIndex(self.shotnum, xyz)
+        self.assertEqual(len(sindex), 48)
+        self.assertNotIn(1, sindex.shotnum)
+        self.assertNotIn(6, sindex.shotnum)
+
+        # empty index
+        sindex = SpatialIndex(self.shotnum[:0], self.xyz[:0])
+        self.assertEqual(sindex.within((0., 0.), 1.).tolist(), [])
+        self.assertEqual(sindex.nearest((0., 0.)).tolist(), [])
+        self.assertEqual(sindex.box(x=(0., 1.)).tolist(), [])
+
+        # invalid shape
+        self.assertRaises(ValueError, SpatialIndex, self.shotnum,
+                          self.xyz[:, :2])
+        self.assertRaises(ValueError, SpatialIndex, self.shotnum[:-1],
+                          self.xyz)
+
+    def test_within(self):
+        xyz = self.xyz
+        dist = np.hypot(xyz[:, 0] - 2., xyz[:, 1] - 0.)
+        self.assertEqual(self.sindex.within((2., 0.), 1.).tolist(),
+                         self.select(dist <= 1.))
+
+        # a sphere
+        dist = np.linalg.norm(xyz - [1., 1., 0.5], axis=1)
+        self.assertEqual(
+            self.sindex.within((1., 1., 0.5), 1.2).tolist(),
+            self.select(dist <= 1.2))
+
+        # a circle in the (x, z) plane
+        dist = np.hypot(xyz[:, 0] - 3., xyz[:, 2])
+        self.assertEqual(
+            self.sindex.within((3., 0.), 0.5, axes='xz').tolist(),
+            self.select(dist <= 0.5))
+        self.assertRaises(ValueError, self.sindex.within, (3., 0.), 1.,
+                          axes='xyz')
+        self.assertRaises(ValueError, self.sindex.within, (3., 0.), 1.,
+                          axes='xx')
+
+    def test_box(self):
+        xyz = self.xyz
+        mask = (xyz[:, 0] >= 1.) & (xyz[:, 0] <= 3.) \
+            & (xyz[:, 1] >= -1.) & (xyz[:, 1] <= 0.5)
+        self.assertEqual(
+            self.sindex.box(x=(1., 3.), y=(-1., 0.5)).tolist(),
+            self.select(mask))
+
+        # open bounds
+        self.assertEqual(self.sindex.box(x=(3., None)).tolist(),
+                         self.select(xyz[:, 0] >= 3.))
+        self.assertEqual(self.sindex.box().tolist(),
+                         self.shotnum.tolist())
+        self.assertEqual(self.sindex.box(z=(1., 2.)).tolist(), [])
+
+    def test_nearest(self):
+        self.assertEqual(self.sindex.nearest((2.1, -0.2)).tolist(),
+                         [25, 26])
+        self.assertEqual(
+            self.sindex.nearest((2.1, -0.2, 0.), k=2).tolist(),
+            [15, 16, 25, 26])
+        self.assertEqual(
+            self.sindex.nearest((2.1, 0.), k=5, axes='xz').tolist(),
+            self.select(self.xyz[:, 0] == 2.))
+        self.assertEqual(len(self.sindex.nearest((0., 0.), k=100)), 50)
+
+    def test_select(self):
+        sindex = self.sindex
+        self.assertEqual(sindex.select().tolist(),
+                         self.shotnum.tolist())
+        self.assertEqual(
+            sindex.select(region={'x': (1., 2.)}).tolist(),
+            sindex.box(x=(1., 2.)).tolist())
+        self.assertEqual(
+            sindex.select(region={'center': (2., 0.),
+                                  'radius': 1.}).tolist(),
+            sindex.within((2., 0.), 1.).tolist())
+        self.assertEqual(
+            sindex.select(nearest={'point': (2., 0.), 'k': 2}).tolist(),
+            sindex.nearest((2., 0.), k=2).tolist())
+
+        # `region` and `nearest` are intersected
+        self.assertEqual(
+            sindex.select(region={'y': (None, 0.)},
+                          nearest={'point': (2., 0.), 'k': 5}).tolist(),
+            np.intersect1d(sindex.box(y=(None, 0.)),
+                           sindex.nearest((2., 0.), k=5)).tolist())
+
+        # conditioned selections
+        self.assertEqual(
+            sindex.select(condition_region({'x': (1., 2.)}),
+                          condition_nearest((1., 0.))).tolist(),
+            sindex.select({'x': (1., 2.)}, (1., 0.)).tolist())
+
+    def test_condition(self):
+        self.assertEqual(condition_region(None), ())
+        self.assertEqual(
+            condition_region({'y': (0, 1), 'x': (None, 2)}),
+            ('box', (('x', (None, 2.)), ('y', (0., 1.)))))
+        self.assertEqual(
+            condition_region({'center': [1, 2], 'radius': 3}),
+            ('sphere', (1., 2.), 3., 'xy'))
+        self.assertEqual(
+            condition_region({'center': (1, 2), 'radius': 3,
+                              'axes': 'xz'}),
+            ('sphere', (1., 2.), 3., 'xz'))
+        self.assertEqual(condition_nearest(None), ())
+        self.assertEqual(condition_nearest((1, 2, 3)),
+                         ('nearest', (1., 2., 3.), 1, 'xyz'))
+        self.assertEqual(condition_nearest({'point': (1,), 'k': 3}),
+                         ('nearest', (1.,), 3, 'x'))
+
+        # selections are hashable
+        hash(condition_region({'x': (0, 1)}))
+        hash(condition_nearest((1, 2)))
+
+        # errors
+        for region, err in (
+                ([0, 1], TypeError),
+                ({}, ValueError),
+                ({'w': (0, 1)}, ValueError),
+                ({'x': 1}, ValueError),
+                ({'center': (0, 0)}, ValueError),
+                ({'center': (0, 0), 'radius': -1}, ValueError),
+                ({'center': (0, 0), 'radius': 1, 'x': (0, 1)},
+                 ValueError),
+                ({'center': 'ab', 'radius': 1}, TypeError),
+                ({'center': (0, 0, 0, 0), 'radius': 1}, ValueError)):
+            self.assertRaises(err, condition_region, region)
+        for nearest, err in (
+                (1., TypeError),
+                ((), ValueError),
+                ({'k': 2}, ValueError),
+                ({'point': (0, 0), 'k': 0}, ValueError),
+                ({'point': (0, 0), 'k': 1.5}, ValueError)):
+            self.assertRaises(err, condition_nearest, nearest)
+
+
+class TestSpatialRead(TestBase):
+    """
+    Test case for the :code:`region` and :code:`nearest` selections
+    of :class:`~bapsflib._hdf.utils.hdfreaddata.HDFReadData`.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # a 6K Compumotor probe scanning a 5 x 5 grid and a digitizer
+        self.f.add_module('6K Compumotor',
+                          {'n_configs': 1, 'sn_size': 50,
+                           'n_motionlists': 1})
+        self.f.add_module('SIS 3301',
+                          {'n_configs': 1, 'sn_size': 50, 'nt': 100})
+        self.sixk_config = \
+            self.f.modules['6K Compumotor'].config_names[0]
+        _mod = self.f.modules['SIS 3301']
+        bc_indices = np.where(_mod.knobs.active_brdch)
+        self.brd = bc_indices[0][0]
+        self.ch = bc_indices[1][0]
+
+        self.shotnum, self.xyz = _grid()
+        grp = self.f['Raw data + config/6K Compumotor']
+        for name in grp:
+            if isinstance(grp[name], type(grp)) \
+                    or 'x' not in grp[name].dtype.names:
+                continue
+            cdata = grp[name][...]
+            cdata['x'] = self.xyz[:, 0]
+            cdata['y'] = self.xyz[:, 1]
+            cdata['z'] = self.xyz[:, 2]
+            grp[name][...] = cdata
+
+    def tearDown(self):
+        super().tearDown()
+
+    def read(self, _bf: File, **kwargs):
+        return HDFReadData(_bf, self.brd, self.ch,
+                           digitizer='SIS 3301', **kwargs)
+
+    @with_bf
+    def test_spatial_index(self, _bf: File):
+        config = ('6K Compumotor', self.sixk_config)
+        self.assertEqual(motion_control(_bf), config)
+        self.assertEqual(motion_control(_bf, ['6K Compumotor']), config)
+
+        # the index is built once per file
+        sindex = _bf.spatial_index()
+        self.assertIsInstance(sindex, SpatialIndex)
+        self.assertEqual(sindex.positions.shape, (25, 3))
+        self.assertIs(_bf.spatial_index('6K Compumotor'), sindex)
+        self.assertIs(_bf.spatial_index(*config), sindex)
+
+        # re-mapping the file clears the index
+        _bf._map_file()
+        self.assertIsNot(_bf.spatial_index(), sindex)
+
+        # not a motion control
+        self.f.add_module('Waveform', {'n_configs': 1, 'sn_size': 50})
+        _bf._map_file()
+        self.assertRaises(ValueError, _bf.spatial_index, 'Waveform')
+
+    @with_bf
+    def test_region(self, _bf: File):
+        box = {'x': (1., 3.), 'y': (-1., 0.5)}
+        mask = (self.xyz[:, 0] >= 1.) & (self.xyz[:, 0] <= 3.) \
+            & (self.xyz[:, 1] >= -1.) & (self.xyz[:, 1] <= 0.5)
+        ref = self.read(_bf)
+
+        # index
+        data = self.read(_bf, region=box)
+        self.assertEqual(data['shotnum'].tolist(),
+                         self.shotnum[mask].tolist())
+        np.testing.assert_array_equal(data['signal'],
+                                      ref['signal'][mask])
+        data = self.read(_bf, index=slice(0, 20), region=box)
+        self.assertEqual(data['shotnum'].tolist(),
+                         self.shotnum[:20][mask[:20]].tolist())
+
+        # shotnum
+        for use_memmap in (True, False):
+            data = self.read(_bf, shotnum=[1, 13, 14, 24, 70],
+                             region=box, use_memmap=use_memmap)
+            self.assertEqual(data['shotnum'].tolist(), [13, 14, 24])
+            np.testing.assert_array_equal(data['signal'],
+                                          ref['signal'][[12, 13, 23]])
+
+        # sphere and nearest
+        dist = np.hypot(self.xyz[:, 0] - 2., self.xyz[:, 1])
+        data = self.read(_bf, region={'center': (2., 0.),
+                                      'radius': 1.})
+        self.assertEqual(data['shotnum'].tolist(),
+                         self.shotnum[dist <= 1.].tolist())
+        data = self.read(_bf, nearest=(2.1, -0.2))
+        self.assertEqual(data['shotnum'].tolist(), [25, 26])
+
+        # with the control data
+        data = self.read(_bf, nearest=(2.1, -0.2),
+                         add_controls=['6K Compumotor'])
+        self.assertEqual(data['shotnum'].tolist(), [25, 26])
+        np.testing.assert_array_equal(data['xyz'][:, 0:2],
+                                      [[2., 0.], [2., 0.]])
+
+        # read_data and its cache
+        _bf.set_read_cache('1M')
+        data = _bf.read_data(self.brd, self.ch, digitizer='SIS 3301',
+                             region=box)
+        self.assertEqual(data['shotnum'].tolist(),
+                         self.shotnum[mask].tolist())
+        data = _bf.read_data(self.brd, self.ch, digitizer='SIS 3301',
+                             nearest=(0., -2.))
+        self.assertEqual(data['shotnum'].tolist(), [1, 2])
+        self.assertEqual(_bf.read_cache.hits, 0)
+        _bf.read_data(self.brd, self.ch, digitizer='SIS 3301',
+                      nearest=(0., -2.))
+        self.assertEqual(_bf.read_cache.hits, 1)
+
+    @with_bf
+    def test_empty_region(self, _bf: File):
+        # a region without any probe position
+        box = {'x': (1e6, 2e6)}
+        for extra in ({},
+                      {'index': slice(0, 20)},
+                      {'shotnum': [1, 2, 3]},
+                      {'shotnum': [1, 2, 3], 'intersection_set': False},
+                      {'add_controls': ['6K Compumotor']}):
+            with self.assertRaises(HDFEmptyIntersectionError):
+                self.read(_bf, region=box, **extra)
+
+        # a region without any shot of the selection
+        box = {'x': (1., 3.), 'y': (-1., 0.5)}
+        for extra in ({'index': [0, 1]},
+                      {'shotnum': [1, 2]},
+                      {'shotnum': [1, 2], 'intersection_set': False},
+                      {'shotnum': [1, 2],
+                       'add_controls': ['6K Compumotor']}):
+            with self.assertRaises(HDFEmptyIntersectionError):
+                self.read(_bf, region=box, **extra)
+
+    @with_bf
+    def test_raise_errors(self, _bf: File):
+        self.assertRaises(TypeError, self.read, _bf, region=[0, 1])
+        self.assertRaises(ValueError, self.read, _bf, nearest=())
+
+        # no motion control device to resolve the positions
+        self.f.remove_module('6K Compumotor')
+        _bf._map_file()
+        self.assertRaises(ValueError, self.read, _bf,
+                          region={'x': (0., 1.)})
+        self.assertRaises(ValueError, _bf.spatial_index)
+
+
+if __name__ == '__main__':
+    ut.main()
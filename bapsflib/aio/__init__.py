@@ -0,0 +1,31 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+asyncio interface to the HDF5 reads, for use in asyncio based
+services::
+
+    >>> from bapsflib import aio, lapd
+    >>> f = lapd.File('run.hdf5')
+    >>> data = await aio.read_data(f, 1, 1, shotnum=slice(1, 5000))
+
+Concurrent reads overlap their I/O waits on a bounded thread pool
+(see :func:`~.core.set_max_workers`).  Combine with
+:class:`~bapsflib._hdf.utils.pool.FilePool` to give each concurrent
+read its own file handle.
+"""
+from . import core
+from .core import (AsyncReadIterator, get_executor, iter_controls,
+                   iter_data, read_controls, read_data, read_msi,
+                   set_max_workers)
+
+__all__ = ['AsyncReadIterator', 'core', 'get_executor',
+           'iter_controls', 'iter_data', 'read_controls', 'read_data',
+           'read_msi', 'set_max_workers']
@@ -0,0 +1,387 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Awaitable versions of :meth:`~bapsflib._hdf.utils.file.File.read_data`,
+:meth:`~bapsflib._hdf.utils.file.File.read_controls`, and
+:meth:`~bapsflib._hdf.utils.file.File.read_msi`.
+
+The HDF5 work is run on a bounded thread pool (see
+:func:`set_max_workers`) so the event loop is never blocked, and shot
+selections are read in chunks of **chunk_size** shots.  A cancelled
+read stops after the chunk currently being read.
+"""
+import asyncio
+import functools
+import numpy as np
+import threading
+
+from concurrent.futures import (Executor, ThreadPoolExecutor)
+from typing import (Callable, List, Tuple, Union)
+
+from bapsflib._hdf.utils.file import File
+from bapsflib._hdf.utils.helpers import (condition_controls,
+                                         condition_shotnum,
+                                         digitizer_dataset_paths)
+from bapsflib._hdf.utils.memory import MemoryBudget
+from bapsflib._hdf.utils.readstats import ReadStats
+from bapsflib.utils.errors import HDFEmptyIntersectionError
+
+__all__ = ['AsyncReadIterator', 'DEFAULT_CHUNK_SIZE', 'get_executor',
+           'iter_controls', 'iter_data', 'read_controls', 'read_data',
+           'read_msi', 'set_max_workers']
+
+#: default number of shots read per chunk
+DEFAULT_CHUNK_SIZE = 1024
+
+#: default number of worker threads of the shared executor
+DEFAULT_MAX_WORKERS = 4
+
+_EXECUTOR = None  # type: Union[ThreadPoolExecutor, None]
+_EXECUTOR_LOCK = threading.Lock()
+_MAX_WORKERS = DEFAULT_MAX_WORKERS
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Return the shared executor the HDF5 work is run on.  It is created
+    on first use with the number of workers set by
+    :func:`set_max_workers`.
+    """
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
+        return _EXECUTOR
+
+
+def set_max_workers(max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Set the number of worker threads of the shared executor, which
+    bounds the number of reads executing at once.  Reads already
+    submitted to the previous executor are allowed to finish.
+    """
+    global _EXECUTOR, _MAX_WORKERS
+    if max_workers < 1:
+        raise ValueError('`max_workers` must be >= 1')
+    with _EXECUTOR_LOCK:
+        _MAX_WORKERS = int(max_workers)
+        if _EXECUTOR is not None:
+            _EXECUTOR.shutdown(wait=False)
+            _EXECUTOR = None
+
+
+async def _run(executor: Union[Executor, None], func: Callable,
+               *args, **kwargs):
+    """Run **func** on **executor** without blocking the event loop."""
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(
+        executor if executor is not None else get_executor(),
+        functools.partial(func, *args, **kwargs))
+
+
+def _split(arr: np.ndarray, chunk_size: int) -> List[np.ndarray]:
+    """
+    Split **arr** into chunks of at most **chunk_size** elements.  An
+    empty **arr** is kept as a single chunk, so the read raises the
+    same error as its synchronous counterpart.
+    """
+    return [arr[ii:ii + chunk_size]
+            for ii in range(0, arr.size, chunk_size)] or [arr]
+
+
+def _plan_data(hdf_file: File, board: int, channel: int, index,
+               shotnum, chunk_size: int,
+               kwargs) -> List[Tuple[str, np.ndarray]]:
+    """
+    Resolve the :meth:`~bapsflib._hdf.utils.file.File.read_data`
+    selection into chunks of either dataset indices or shot numbers.
+    Only the digitizer header dataset is accessed.
+    """
+    _, _, dheader_path, shotnumkey = digitizer_dataset_paths(
+        hdf_file, board, channel,
+        digitizer=kwargs.get('digitizer', None),
+        config_name=kwargs.get('config_name', None),
+        adc=kwargs.get('adc', None))
+    dheader = hdf_file.get(dheader_path)
+    if getattr(hdf_file, 'swmr_mode', False):
+        dheader.refresh()
+
+    # same precedence as HDFReadData
+    if isinstance(index, slice) and index == slice(None) \
+            and not (isinstance(shotnum, slice)
+                     and shotnum == slice(None)):
+        shotnum = condition_shotnum(shotnum, {'digi': dheader},
+                                    {'digi': shotnumkey})
+        return [('shotnum', chunk)
+                for chunk in _split(shotnum, chunk_size)]
+
+    sn_size = dheader.shape[0]
+    if isinstance(index, slice):
+        index = np.arange(*index.indices(sn_size))
+    elif isinstance(index, type(Ellipsis)):
+        index = np.arange(sn_size)
+    else:
+        index = np.array(index, ndmin=1)
+        if index.size == 0:
+            index = index.astype(np.int64)
+        elif index.dtype.kind not in 'iu':
+            raise TypeError("Valid `index` type not passed.")
+    if np.any((index >= sn_size) | (index < -sn_size)):
+        raise ValueError('`index` out of range for dataset of '
+                         'size {}'.format(sn_size))
+    index = np.unique(index % sn_size) if sn_size else index
+    return [('index', chunk) for chunk in _split(index, chunk_size)]
+
+
+def _plan_controls(hdf_file: File, controls, shotnum,
+                   chunk_size: int) -> List[Tuple[str, np.ndarray]]:
+    """
+    Resolve the :meth:`~bapsflib._hdf.utils.file.File.read_controls`
+    selection into chunks of shot numbers.  Only the shot numbers of
+    the control datasets are accessed.
+    """
+    _fmap = hdf_file.file_map
+    cdset_dict = {}
+    shotnumkey_dict = {}
+    for cname, cconfn in condition_controls(hdf_file, controls):
+        cconfig = _fmap.controls[cname].configs[cconfn]
+        cdset_dict[cname] = hdf_file.get(cconfig['dset paths'][0])
+        if getattr(hdf_file, 'swmr_mode', False):
+            cdset_dict[cname].refresh()
+        shotnumkey_dict[cname] = cconfig['shotnum']['dset field'][0]
+    shotnum = condition_shotnum(shotnum, cdset_dict, shotnumkey_dict)
+    return [('shotnum', chunk) for chunk in _split(shotnum, chunk_size)]
+
+
+def _merge(chunks: List[np.ndarray], name: str,
+           budget: MemoryBudget) -> np.ndarray:
+    """
+    Concatenate the chunks of a chunked read into a single array of
+    the same class.  The meta-info of the first chunk is kept and the
+    read statistics of all chunks are nested under a new
+    :class:`~bapsflib._hdf.utils.readstats.ReadStats`.
+
+    The merged array is checked against **budget**, so a merge over
+    budget raises a
+    :class:`~bapsflib._hdf.utils.memory.MemoryBudgetError` or, for
+    out-of-core reads, is allocated in a scratch file.
+    """
+    if len(chunks) == 1:
+        return chunks[0]
+
+    stats = ReadStats(name)
+    with stats.stage('merge'):
+        shape = (sum(chunk.shape[0] for chunk in chunks),) \
+            + chunks[0].shape[1:]
+        out_of_core = budget.check(
+            shape[0] * chunks[0].dtype.itemsize, name)
+        data = budget.empty(shape, chunks[0].dtype, out_of_core)
+        np.concatenate([chunk.view(np.ndarray) for chunk in chunks],
+                       out=data)
+        data = data.view(type(chunks[0]))
+        data.__array_finalize__(chunks[0])
+    for ii, chunk in enumerate(chunks):
+        chunk_stats = getattr(chunk, 'read_stats', None)
+        if chunk_stats is not None:
+            stats.add_child('chunk {}'.format(ii), chunk_stats)
+            stats.rows_selected += chunk_stats.rows_selected
+    stats.finalize()
+    data._read_stats = stats
+    return data
+
+
+class AsyncReadIterator(object):
+    """
+    Asynchronous iterator over a chunked read, each iteration yields
+    the data of the next chunk of shots.  (see :func:`iter_data` and
+    :func:`iter_controls`)
+
+    Chunks that do not contain any shots of the intersection (for
+    :code:`intersection_set=True`) are skipped, as detected by the
+    chunk read raising
+    :class:`~bapsflib.utils.errors.HDFEmptyIntersectionError`.  Any
+    other error of a chunk read is raised.
+    """
+
+    def __init__(self, plan: Callable, read: Callable,
+                 intersection_set: bool, executor=None):
+        """
+        :param plan: callable returning the list of chunk selections
+            as :code:`(keyword, array)` pairs
+        :param read: callable reading a chunk given the chunk
+            selection as a keyword
+        :param bool intersection_set: :code:`True` if the read is
+            restricted to the intersection of shot numbers
+        :param executor: executor to run the HDF5 work on,
+            :code:`None` for the shared executor
+        """
+        self._plan = plan
+        self._read = read
+        self._intersection_set = intersection_set
+        self._executor = executor
+        self._chunks = \
+            None  # type: Union[List[Tuple[str, np.ndarray]], None]
+        self._n_read = 0
+        self._error = None  # type: Union[ValueError, None]
+
+    @property
+    def n_chunks(self) -> Union[int, None]:
+        """
+        Number of chunks of the read, :code:`None` until the first
+        iteration.
+        """
+        return None if self._chunks is None else len(self._chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._chunks is None:
+            self._chunks = await _run(self._executor, self._plan)
+
+        while len(self._chunks) != 0:
+            key, chunk = self._chunks.pop(0)
+            try:
+                data = await _run(self._executor, self._read,
+                                  **{key: chunk})
+            except HDFEmptyIntersectionError as err:
+                # the chunk did not contain any shot of the
+                # intersection, any other error is raised
+                if not self._intersection_set:
+                    raise
+                self._error = err
+                continue
+            self._n_read += 1
+            return data
+
+        if self._n_read == 0 and self._error is not None:
+            # no chunk contained a shot of the intersection
+            raise self._error
+        raise StopAsyncIteration
+
+
+def iter_data(hdf_file: File, board: int, channel: int,
+              index=slice(None), shotnum=slice(None),
+              chunk_size=DEFAULT_CHUNK_SIZE, executor=None,
+              **kwargs) -> AsyncReadIterator:
+    """
+    Asynchronously iterate over the digitizer data selected by
+    **index** or **shotnum** in chunks of **chunk_size** shots.  Each
+    chunk is a :class:`~bapsflib._hdf.utils.hdfreaddata.HDFReadData`.
+
+    :param hdf_file: HDF5 file object
+    :param board: analog-digital-converter board number
+    :param channel: analog-digital-converter channel number
+    :param index: dataset row index(es), see
+        :meth:`~bapsflib._hdf.utils.file.File.read_data`
+    :param shotnum: HDF5 global shot number(s), see
+        :meth:`~bapsflib._hdf.utils.file.File.read_data`
+    :param int chunk_size: number of shots per chunk
+    :param executor: executor to run the HDF5 work on, :code:`None`
+        (DEFAULT) for the shared executor (see :func:`get_executor`)
+    :param kwargs: keywords passed on to
+        :meth:`~bapsflib._hdf.utils.file.File.read_data`
+
+    :Example:
+
+        >>> async for data in iter_data(f, 1, 1, chunk_size=500):
+        ...     await publish(data)
+    """
+    if chunk_size < 1:
+        raise ValueError('`chunk_size` must be >= 1')
+    plan = functools.partial(_plan_data, hdf_file, board, channel,
+                             index, shotnum, chunk_size, kwargs)
+    read = functools.partial(hdf_file.read_data, board, channel,
+                             **kwargs)
+    return AsyncReadIterator(plan, read,
+                             kwargs.get('intersection_set', True),
+                             executor=executor)
+
+
+def iter_controls(hdf_file: File, controls, shotnum=slice(None),
+                  chunk_size=DEFAULT_CHUNK_SIZE, executor=None,
+                  **kwargs) -> AsyncReadIterator:
+    """
+    Asynchronously iterate over the control device data selected by
+    **shotnum** in chunks of **chunk_size** shots.  Each chunk is a
+    :class:`~bapsflib._hdf.utils.hdfreadcontrol.HDFReadControl`.
+    (see :func:`iter_data` for parameters and
+    :meth:`~bapsflib._hdf.utils.file.File.read_controls` for
+    **controls** and **kwargs**)
+    """
+    if chunk_size < 1:
+        raise ValueError('`chunk_size` must be >= 1')
+    plan = functools.partial(_plan_controls, hdf_file, controls,
+                             shotnum, chunk_size)
+    read = functools.partial(hdf_file.read_controls, controls,
+                             **kwargs)
+    return AsyncReadIterator(plan, read,
+                             kwargs.get('intersection_set', True),
+                             executor=executor)
+
+
+async def read_data(hdf_file: File, board: int, channel: int,
+                    index=slice(None), shotnum=slice(None),
+                    chunk_size=DEFAULT_CHUNK_SIZE, executor=None,
+                    **kwargs):
+    """
+    Awaitable version of
+    :meth:`~bapsflib._hdf.utils.file.File.read_data`.  The selection
+    is read in chunks of **chunk_size** shots (see :func:`iter_data`)
+    which are concatenated into a single
+    :class:`~bapsflib._hdf.utils.hdfreaddata.HDFReadData`.  Memory
+    budget keywords (e.g. :code:`max_memory`) apply to each chunk and
+    to the merged array, all chunks are held in memory until they are
+    merged.
+
+    :Example:
+
+        >>> data = await read_data(f, 1, 1, shotnum=slice(1, 5000),
+        ...                        add_controls=['6K Compumotor'])
+    """
+    chunks = []
+    async for data in iter_data(hdf_file, board, channel, index=index,
+                                shotnum=shotnum, chunk_size=chunk_size,
+                                executor=executor, **kwargs):
+        chunks.append(data)
+    return await _run(executor, _merge, chunks, 'HDFReadData',
+                      MemoryBudget.from_kwargs(dict(kwargs)))
+
+
+async def read_controls(hdf_file: File, controls, shotnum=slice(None),
+                        chunk_size=DEFAULT_CHUNK_SIZE, executor=None,
+                        **kwargs):
+    """
+    Awaitable version of
+    :meth:`~bapsflib._hdf.utils.file.File.read_controls`.  The
+    selection is read in chunks of **chunk_size** shots (see
+    :func:`iter_controls`) which are concatenated into a single
+    :class:`~bapsflib._hdf.utils.hdfreadcontrol.HDFReadControl`.
+    Memory budget keywords apply as for :func:`read_data`.
+    """
+    chunks = []
+    async for data in iter_controls(hdf_file, controls, shotnum=shotnum,
+                                    chunk_size=chunk_size,
+                                    executor=executor, **kwargs):
+        chunks.append(data)
+    return await _run(executor, _merge, chunks, 'HDFReadControl',
+                      MemoryBudget.from_kwargs(dict(kwargs)))
+
+
+async def read_msi(hdf_file: File, msi_diag: str, executor=None,
+                   **kwargs):
+    """
+    Awaitable version of
+    :meth:`~bapsflib._hdf.utils.file.File.read_msi`.  MSI datasets
+    do not support shot selections, so the read is done in a single
+    step.
+    """
+    return await _run(executor, hdf_file.read_msi, msi_diag, **kwargs)
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import asyncio
+import numpy as np
+import threading
+import unittest as ut
+
+from bapsflib.synthetic import FauxHDFBuilder
+from bapsflib._hdf.utils.file import File
+from bapsflib._hdf.utils.hdfreadcontrol import HDFReadControl
+from bapsflib._hdf.utils.hdfreaddata import HDFReadData
+from bapsflib._hdf.utils.memory import MemoryBudgetError
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from .. import core as aio
+
+
+class TestAsyncReads(ut.TestCase):
+    """Test case for :mod:`bapsflib.aio`."""
+
+    f = NotImplemented  # type: FauxHDFBuilder
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.f = FauxHDFBuilder(
+            add_modules={'SIS 3301': {'n_configs': 1, 'sn_size': 40,
+                                      'nt': 10},
+                         'Waveform': {'n_configs': 1, 'sn_size': 30},
+                         'Discharge': {}})
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.f.cleanup()
+
+    def setUp(self):
+        self.bf = File(self.f.filename,
+                       control_path='Raw data + config',
+                       digitizer_path='Raw data + config',
+                       msi_path='MSI', silent=True)
+        _mod = self.f.modules['SIS 3301']
+        self.brd, self.ch = \
+            [ii[0] for ii in np.where(_mod.knobs.active_brdch)]
+        self.kwargs = {'digitizer': 'SIS 3301', 'silent': True}
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+        self.bf.close()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def assertDataEqual(self, data, expected):
+        self.assertEqual(type(data), type(expected))
+        self.assertEqual(data.dtype, expected.dtype)
+        for field in expected.dtype.names:
+            np.testing.assert_array_equal(data[field], expected[field])
+
+    def test_read_data(self):
+        bf = self.bf
+        for extra in ({},
+                      {'index': slice(3, 35, 2)},
+                      {'index': [-1, 0, 7, 7, 20]},
+                      {'index': []},
+                      {'shotnum': slice(5, 100)},
+                      {'shotnum': [50, 2, 12],
+                       'intersection_set': False},
+                      {'add_controls': ['Waveform']},
+                      {'add_controls': ['Waveform'],
+                       'intersection_set': False}):
+            expected = bf.read_data(self.brd, self.ch, **extra,
+                                    **self.kwargs)
+            data = self.run_async(aio.read_data(
+                bf, self.brd, self.ch, chunk_size=7, **extra,
+                **self.kwargs))
+            self.assertDataEqual(data, expected)
+            self.assertEqual(data.info, expected.info)
+            self.assertEqual(data.read_stats.rows_selected,
+                             expected.read_stats.rows_selected)
+
+        # chunks outside of the intersection are skipped
+        data = self.run_async(aio.read_data(
+            bf, self.brd, self.ch, chunk_size=4,
+            shotnum=slice(25, 40), add_controls=['Waveform'],
+            **self.kwargs))
+        self.assertEqual(data['shotnum'].tolist(),
+                         list(range(25, 31)))
+
+        # any other error of a chunk read is raised
+        def read(shotnum):
+            if shotnum[0] > 20:
+                raise ValueError('failed chunk read')
+            return bf.read_data(self.brd, self.ch, shotnum=shotnum,
+                                **self.kwargs)
+
+        async def collect():
+            async for _ in iterator:
+                pass
+
+        iterator = aio.AsyncReadIterator(
+            lambda: [('shotnum', np.arange(1, 21)),
+                     ('shotnum', np.arange(21, 41))],
+            read, intersection_set=True)
+        with self.assertRaisesRegex(ValueError, 'failed chunk read'):
+            self.run_async(collect())
+
+        # errors of the synchronous read are raised
+        for extra in ({'shotnum': [100, 200]},
+                      {'shotnum': [35, 36],
+                       'add_controls': ['Waveform']}):
+            with self.assertRaises(ValueError):
+                bf.read_data(self.brd, self.ch, **extra, **self.kwargs)
+            with self.assertRaises(ValueError):
+                self.run_async(aio.read_data(
+                    bf, self.brd, self.ch, chunk_size=1, **extra,
+                    **self.kwargs))
+        self.assertRaises(ValueError, self.run_async, aio.read_data(
+            bf, self.brd, self.ch, index=[40], **self.kwargs))
+        self.assertRaises(ValueError, self.run_async, aio.read_data(
+            bf, self.brd, self.ch, digitizer='not a digitizer'))
+        with self.assertRaises(ValueError):
+            aio.iter_data(bf, self.brd, self.ch, chunk_size=0)
+
+    def test_iter_data(self):
+        async def collect():
+            chunks = []
+            async for chunk in iterator:
+                chunks.append(chunk)
+            return chunks
+
+        iterator = aio.iter_data(self.bf, self.brd, self.ch,
+                                 chunk_size=16, **self.kwargs)
+        self.assertIsNone(iterator.n_chunks)
+        chunks = self.run_async(collect())
+        self.assertEqual(iterator.n_chunks, 0)
+        self.assertEqual([chunk.shape[0] for chunk in chunks],
+                         [16, 16, 8])
+        for chunk in chunks:
+            self.assertIsInstance(chunk, HDFReadData)
+        self.assertEqual(
+            np.concatenate([chunk['shotnum'] for chunk in chunks]
+                           ).tolist(),
+            list(range(1, 41)))
+
+        # controls
+        iterator = aio.iter_controls(self.bf, ['Waveform'],
+                                     chunk_size=8)
+        chunks = self.run_async(collect())
+        self.assertEqual([chunk.shape[0] for chunk in chunks],
+                         [8, 8, 8, 6])
+        for chunk in chunks:
+            self.assertIsInstance(chunk, HDFReadControl)
+
+    def test_read_controls_msi(self):
+        bf = self.bf
+        for extra in ({}, {'shotnum': [3, 1, 60]},
+                      {'shotnum': slice(2, 20, 3),
+                       'intersection_set': False}):
+            expected = bf.read_controls(['Waveform'], **extra)
+            data = self.run_async(aio.read_controls(
+                bf, ['Waveform'], chunk_size=4, **extra))
+            self.assertDataEqual(data, expected)
+            self.assertEqual(data.info, expected.info)
+
+        expected = bf.read_msi('Discharge')
+        data = self.run_async(aio.read_msi(bf, 'Discharge'))
+        self.assertDataEqual(data, expected)
+
+    def test_cancel(self):
+        # block the executor after the first chunk
+        executor = ThreadPoolExecutor(max_workers=1)
+        release = threading.Event()
+        n_calls = []
+        read_data = self.bf.read_data
+
+        def slow_read(*args, **kwargs):
+            n_calls.append(kwargs.get('index', None))
+            if len(n_calls) > 1:
+                release.wait(5)
+            return read_data(*args, **kwargs)
+
+        async def second_read(task):
+            while len(n_calls) < 2 and not task.done():
+                await asyncio.sleep(0.001)
+
+        async def cancel():
+            task = asyncio.ensure_future(aio.read_data(
+                self.bf, self.brd, self.ch, chunk_size=5,
+                executor=executor, **self.kwargs))
+            try:
+                await asyncio.wait_for(second_read(task), 5)
+            except asyncio.TimeoutError:
+                task.cancel()
+                self.fail('the second chunk read did not start')
+            if task.done():
+                # raises the error of a failed chunk read
+                await task
+                self.fail('the read finished before the cancellation')
+            task.cancel()
+            release.set()
+            try:
+                await task
+            except asyncio.CancelledError:
+                return True
+            return False
+
+        try:
+            with mock.patch.object(self.bf, 'read_data', new=slow_read):
+                self.assertTrue(self.run_async(cancel()))
+        finally:
+            release.set()
+            executor.shutdown(wait=True)
+
+        # no chunk was read after the cancellation
+        self.assertEqual(len(n_calls), 2)
+
+    def test_memory_budget(self):
+        # every chunk fits the budget, but the merged array does not
+        expected = self.bf.read_data(self.brd, self.ch, **self.kwargs)
+        budget = {'max_memory': expected.nbytes - 1}
+        with self.assertRaises(MemoryBudgetError):
+            self.run_async(aio.read_data(
+                self.bf, self.brd, self.ch, chunk_size=4, **budget,
+                **self.kwargs))
+
+        # out-of-core merges into a scratch file
+        data = self.run_async(aio.read_data(
+            self.bf, self.brd, self.ch, chunk_size=4, **budget,
+            out_of_core=True, **self.kwargs))
+        self.assertDataEqual(data, expected)
+        self.assertIsInstance(data.base, np.memmap)
+
+    def test_concurrent(self):
+        expected = self.bf.read_data(self.brd, self.ch, **self.kwargs)
+
+        async def many():
+            return await asyncio.gather(*[
+                aio.read_data(self.bf, self.brd, self.ch,
+                              chunk_size=8, **self.kwargs)
+                for _ in range(6)])
+
+        for data in self.run_async(many()):
+            self.assertDataEqual(data, expected)
+
+    def test_executor(self):
+        executor = aio.get_executor()
+        self.assertIs(aio.get_executor(), executor)
+        aio.set_max_workers(2)
+        self.assertIsNot(aio.get_executor(), executor)
+        self.assertRaises(ValueError, aio.set_max_workers, 0)
+        aio.set_max_workers()
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,37 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Export HDF5 data read by bapsflib to the storage formats of other
+analysis tool chains::
+
+    >>> from bapsflib import export, lapd
+    >>> f = lapd.File('run.hdf5')
+    >>> group = export.to_zarr(f, 'run.zarr', [(1, 1), (1, 2)],
+    ...                        controls=['6K Compumotor'])
+
+Control device and MSI results convert to Arrow tables and Parquet
+files (see :mod:`~bapsflib.export.arrow`)::
+
+    >>> table = f.read_controls(['6K Compumotor']).to_arrow()
+    >>> export.export_catalog(['run01.hdf5', 'run02.hdf5'], 'parquet',
+    ...                       msi=['Discharge'])
+
+The exporters only import their (optional) storage packages when
+called.
+"""
+from bapsflib.utils import lazyload
+
+__getattr__, __dir__, __all__ = lazyload.attach(
+    __name__,
+    submodules=['arrow', 'helpers', 'zarr'],
+    submod_attrs={'arrow': ['export_catalog', 'to_arrow',
+                            'to_parquet'],
+                  'zarr': ['to_zarr']})
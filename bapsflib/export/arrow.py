@@ -0,0 +1,258 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Convert the tabular, per-shot results of
+:meth:`~bapsflib._hdf.utils.file.File.read_controls` and
+:meth:`~bapsflib._hdf.utils.file.File.read_msi` into
+`Apache Arrow <https://arrow.apache.org>`_ tables and Parquet files.
+
+Fields of a structured array map to Arrow columns as follows:
+
+* numeric fields become primitive columns (the field values are
+  copied once into a contiguous buffer, see note below)
+* fields holding arrays (e.g. :code:`'xyz'` or an MSI trace) become
+  fixed size list columns
+* string fields (e.g. the commands parsed by
+  :class:`~bapsflib._hdf.maps.controls.clparse.CLParse`) become
+  dictionary encoded columns
+* nested structured fields (e.g. the MSI :code:`'meta'` field) become
+  struct columns
+
+The :code:`info` dictionary of a read is stored as JSON in the table
+schema metadata under the key :code:`b'bapsflib.info'`.
+
+.. note::
+
+    Conversion is not zero-copy.  A field of a structured array with
+    more than one field is strided (its values are :code:`itemsize`
+    bytes of the record apart), while Arrow buffers must be
+    contiguous, so every numeric and array field is gathered into a
+    new contiguous array which the Arrow array then wraps without a
+    further copy.
+
+.. note::
+
+    This module requires the optional :mod:`pyarrow` package.
+"""
+import json
+import numpy as np
+import os
+
+from typing import (Any, Dict, List)
+from warnings import warn
+
+from bapsflib._hdf.utils.file import File
+
+from .helpers import json_safe
+
+__all__ = ['INFO_KEY', 'export_catalog', 'to_arrow', 'to_parquet']
+
+#: schema metadata key of the :code:`info` dictionary
+INFO_KEY = b'bapsflib.info'
+
+
+def _import_pyarrow():
+    """Import :mod:`pyarrow`, or raise an informative ImportError."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:  # pragma: no cover
+        raise ImportError(
+            "Arrow export requires the 'pyarrow' package") from None
+    return pyarrow
+
+
+def to_arrow(data: np.ndarray, info: Dict[str, Any] = None):
+    """
+    Convert the structured array **data** (e.g. a
+    :class:`~bapsflib._hdf.utils.hdfreadcontrol.HDFReadControl` or
+    :class:`~bapsflib._hdf.utils.hdfreadmsi.HDFReadMSI`) into a
+    :class:`pyarrow.Table` with one column per field.
+
+    :param data: structured array of per-shot records
+    :param info: meta-info to store in the schema metadata, DEFAULT is
+        :code:`data.info` (if present)
+    :rtype: :class:`pyarrow.Table`
+
+    :Example:
+
+        >>> cdata = f.read_controls(['6K Compumotor'])
+        >>> table = to_arrow(cdata)
+        >>> table.column_names
+        ['shotnum', 'xyz', 'ptip_rot_theta', 'ptip_rot_phi']
+    """
+    pa = _import_pyarrow()
+    if not isinstance(data, np.ndarray) or data.dtype.names is None \
+            or data.ndim != 1:
+        raise ValueError('`data` must be a 1D structured numpy array')
+    if info is None:
+        info = getattr(data, 'info', None)
+
+    names = list(data.dtype.names)
+    columns = [_to_arrow_array(pa, data[name]) for name in names]
+    metadata = None
+    if info is not None:
+        metadata = {INFO_KEY: json.dumps(json_safe(info)).encode()}
+    return pa.Table.from_arrays(columns, names=names,
+                                metadata=metadata)
+
+
+def to_parquet(data: np.ndarray, where, info: Dict[str, Any] = None,
+               **kwargs):
+    """
+    Write the structured array **data** to a Parquet file, see
+    :func:`to_arrow`.
+
+    :param data: structured array of per-shot records
+    :param where: path or file-like object to write to
+    :param info: meta-info to store in the schema metadata, DEFAULT is
+        :code:`data.info` (if present)
+    :param kwargs: additional keywords passed on to
+        :func:`pyarrow.parquet.write_table` (e.g.
+        :code:`compression='zstd'`)
+    """
+    pa = _import_pyarrow()
+    pa.parquet.write_table(to_arrow(data, info=info), where, **kwargs)
+
+
+def export_catalog(catalog, root_dir: str, controls=None, msi=None,
+                   file_class=None, silent=True,
+                   **kwargs) -> Dict[str, List[str]]:
+    """
+    Export the control device and MSI diagnostic data of every run in
+    **catalog** to Parquet.  Each device is written to a directory of
+    **root_dir** as a Hive partitioned dataset with one file per run::
+
+        <root_dir>/<device>/run=<run>/part-0.parquet
+
+    so that reading the device directory (e.g.
+    :code:`pyarrow.parquet.read_table('<root_dir>/<device>')`) gives
+    a single table with a :code:`'run'` column.  Runs that do not
+    have a device are skipped.
+
+    :param catalog: runs to export, as an iterable of HDF5 file paths
+        (or opened :class:`~bapsflib._hdf.utils.file.File` objects), or
+        a dictionary of those keyed by run name.  A run is otherwise
+        named after its file name without extension.
+    :param str root_dir: directory to write the datasets to
+    :param controls: control devices to export, each as
+        :code:`name` or :code:`(name, configuration)`
+    :param msi: names of the MSI diagnostics to export
+    :param file_class: class used to open the file paths of
+        **catalog**, DEFAULT is :class:`bapsflib.lapd.File`
+    :param bool silent: :code:`True` (DEFAULT) to ignore any
+        UserWarnings (soft-warnings) of the reads
+    :param kwargs: additional keywords passed on to **file_class**
+    :return: dictionary of the written file paths keyed by device
+
+    :Example:
+
+        >>> paths = export_catalog(
+        ...     ['run01.hdf5', 'run02.hdf5'], 'parquet',
+        ...     controls=['6K Compumotor', 'Waveform'],
+        ...     msi=['Discharge', 'Gas pressure'])
+        >>> sorted(paths)
+        ['6K Compumotor', 'Discharge', 'Gas pressure', 'Waveform']
+    """
+    _import_pyarrow()
+    if file_class is None:
+        from bapsflib.lapd import File as file_class
+
+    if isinstance(catalog, dict):
+        runs = list(catalog.items())
+    else:
+        runs = [(None, entry) for entry in catalog]
+    controls = [] if controls is None else list(controls)
+    msi = [] if msi is None else list(msi)
+    devices = [control[0] if isinstance(control, tuple) else control
+               for control in controls] + msi
+
+    written = {}  # type: Dict[str, List[str]]
+    for run, entry in runs:
+        opened = not isinstance(entry, File)
+        hdf_file = file_class(entry, silent=silent, **kwargs) \
+            if opened else entry
+        if run is None:
+            run = os.path.splitext(os.path.basename(
+                hdf_file.filename))[0]
+
+        try:
+            for control, cname in zip(controls, devices):
+                if cname not in hdf_file.file_map.controls:
+                    continue
+                data = hdf_file.read_controls([control], silent=silent)
+                written.setdefault(cname, []).append(
+                    _write_partition(data, root_dir, cname, run))
+            for name in msi:
+                if name not in hdf_file.file_map.msi:
+                    continue
+                data = hdf_file.read_msi(name, silent=silent)
+                written.setdefault(name, []).append(
+                    _write_partition(data, root_dir, name, run))
+        finally:
+            if opened:
+                hdf_file.close()
+
+    missing = [name for name in devices if name not in written]
+    if missing and not silent:
+        warn('No run of the catalog has device(s) {}'.format(missing))
+    return written
+
+
+def _write_partition(data: np.ndarray, root_dir: str, device: str,
+                     run: str) -> str:
+    """Write **data** as the **run** partition of **device**."""
+    path = os.path.join(root_dir, device, 'run={}'.format(run))
+    os.makedirs(path, exist_ok=True)
+    path = os.path.join(path, 'part-0.parquet')
+    to_parquet(data, path)
+    return path
+
+
+def _to_arrow_array(pa, column: np.ndarray):
+    """
+    Convert the field **column** of a structured array into an Arrow
+    array.  A strided **column** (any field of a multi-field
+    structured array) is copied into a contiguous array first, since
+    Arrow buffers have no strides.
+    """
+    column = column.view(np.ndarray)
+    dtype = column.dtype
+    if dtype.names is None and not dtype.base.isnative:
+        # Arrow only holds native byte order
+        column = column.astype(dtype.base.newbyteorder('='))
+        dtype = column.dtype
+
+    if dtype.names is not None:
+        # nested structured field
+        return pa.StructArray.from_arrays(
+            [_to_arrow_array(pa, column[name]) for name in dtype.names],
+            names=list(dtype.names))
+    elif column.ndim > 1:
+        # array field, e.g. 'xyz'
+        size = int(np.prod(column.shape[1:]))
+        values = _to_arrow_array(
+            pa, np.ascontiguousarray(column).reshape(-1))
+        return pa.FixedSizeListArray.from_arrays(values, size)
+    elif dtype.kind in ('U', 'S'):
+        # commands and other strings, dictionary encoded
+        uniques, indices = np.unique(column, return_inverse=True)
+        if dtype.kind == 'U':
+            dictionary = pa.array(uniques.tolist(), type=pa.string())
+        else:
+            dictionary = pa.array(uniques.tolist(), type=pa.binary())
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices.astype(np.int32)), dictionary)
+    elif dtype.kind in ('i', 'u', 'f'):
+        # Arrow needs a contiguous buffer, so a strided field is
+        # copied here and the Arrow array wraps the copy
+        return pa.array(np.ascontiguousarray(column))
+    return pa.array(column.tolist())
@@ -0,0 +1,44 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Helper functions shared by the exporters of :mod:`bapsflib.export`.
+"""
+import numpy as np
+
+from typing import Any
+
+__all__ = ['json_safe']
+
+
+def json_safe(obj: Any) -> Any:
+    """
+    Convert the meta-info **obj** (e.g. the :code:`info` dictionary
+    of a read) into JSON serializable types.  Quantities become
+    :code:`{'value': value, 'unit': unit}` dictionaries and anything
+    else unknown becomes a string.
+    """
+    import astropy.units as u
+
+    if isinstance(obj, dict):
+        return {str(key): json_safe(val) for key, val in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [json_safe(val) for val in obj]
+    elif isinstance(obj, u.Quantity):
+        return {'value': json_safe(obj.value), 'unit': str(obj.unit)}
+    elif isinstance(obj, np.ndarray):
+        return json_safe(obj.tolist())
+    elif isinstance(obj, np.generic):
+        return obj.item()
+    elif isinstance(obj, bytes):
+        return obj.decode('utf-8', 'replace')
+    elif obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    return str(obj)
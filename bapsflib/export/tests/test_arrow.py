@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import json
+import numpy as np
+import os
+import tempfile
+import unittest as ut
+
+from bapsflib.synthetic import FauxHDFBuilder
+from bapsflib._hdf.utils.file import File
+
+from ..arrow import (INFO_KEY, export_catalog, to_arrow, to_parquet)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = None
+
+
+@ut.skipIf(pa is None, "requires the 'pyarrow' package")
+class TestToArrow(ut.TestCase):
+    """Test case for :mod:`bapsflib.export.arrow`."""
+
+    f = NotImplemented  # type: FauxHDFBuilder
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.f = FauxHDFBuilder(
+            add_modules={'Waveform': {'n_configs': 1, 'sn_size': 30},
+                         'Discharge': {}})
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.f.cleanup()
+
+    def setUp(self):
+        self.file_kwargs = {'control_path': 'Raw data + config',
+                            'digitizer_path': 'Raw data + config',
+                            'msi_path': 'MSI'}
+        self.bf = File(self.f.filename, silent=True,
+                       **self.file_kwargs)
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.bf.close()
+        self.tmpdir.cleanup()
+
+    def test_to_arrow(self):
+        data = np.zeros(4, dtype=[
+            ('shotnum', np.uint32),
+            ('xyz', np.float32, 3),
+            ('command', 'U12'),
+            ('raw', 'S4'),
+            ('valid', bool),
+            ('big', '>f4'),
+            ('meta', [('peak', np.float64), ('count', np.int8)])])
+        data['shotnum'] = [1, 2, 3, 4]
+        data['xyz'] = np.arange(12).reshape(4, 3)
+        data['command'] = ['FREQ 1', 'FREQ 2', 'FREQ 1', '']
+        data['raw'] = [b'a', b'b', b'a', b'a']
+        data['valid'] = [True, False, True, True]
+        data['big'] = [0.5, 1.5, np.nan, 2.0]
+        data['meta']['peak'] = [1., 2., 3., 4.]
+
+        table = to_arrow(data, info={'source file': 'run.hdf5'})
+        self.assertEqual(table.column_names, list(data.dtype.names))
+        self.assertEqual(table.num_rows, 4)
+        self.assertEqual(table.schema.field('shotnum').type,
+                         pa.uint32())
+        self.assertEqual(table.schema.field('xyz').type,
+                         pa.list_(pa.float32(), 3))
+        self.assertEqual(table.schema.field('big').type, pa.float32())
+        for name in ('command', 'raw'):
+            self.assertTrue(pa.types.is_dictionary(
+                table.schema.field(name).type))
+        self.assertEqual(
+            table.column('command').chunk(0).dictionary.to_pylist(),
+            ['', 'FREQ 1', 'FREQ 2'])
+        self.assertTrue(pa.types.is_struct(
+            table.schema.field('meta').type))
+
+        # values
+        self.assertEqual(table.column('shotnum').to_pylist(),
+                         [1, 2, 3, 4])
+        self.assertEqual(table.column('xyz').to_pylist()[1],
+                         [3.0, 4.0, 5.0])
+        self.assertEqual(table.column('command').to_pylist(),
+                         data['command'].tolist())
+        self.assertEqual(table.column('raw').to_pylist(),
+                         data['raw'].tolist())
+        self.assertEqual(table.column('valid').to_pylist(),
+                         data['valid'].tolist())
+        np.testing.assert_array_equal(
+            table.column('big').to_numpy(), data['big'])
+        self.assertEqual(table.column('meta').to_pylist()[2],
+                         {'peak': 3.0, 'count': 0})
+        self.assertEqual(json.loads(table.schema.metadata[INFO_KEY]),
+                         {'source file': 'run.hdf5'})
+
+        # invalid data
+        self.assertRaises(ValueError, to_arrow, np.arange(4))
+        self.assertRaises(ValueError, to_arrow,
+                          np.zeros((2, 2), dtype=data.dtype))
+
+    def test_reads(self):
+        # controls
+        cdata = self.bf.read_controls(['Waveform'])
+        table = cdata.to_arrow()
+        self.assertEqual(table.column_names, ['shotnum', 'FREQ'])
+        np.testing.assert_array_equal(table.column('FREQ').to_numpy(),
+                                      cdata['FREQ'])
+        info = json.loads(table.schema.metadata[INFO_KEY])
+        self.assertEqual(info['source file'], cdata.info['source file'])
+
+        # MSI
+        mdata = self.bf.read_msi('Discharge')
+        path = os.path.join(self.tmpdir.name, 'discharge.parquet')
+        mdata.to_parquet(path, compression='zstd')
+        table = pq.read_table(path)
+        self.assertEqual(table.column_names, list(mdata.dtype.names))
+        self.assertEqual(table.column('meta').to_pylist()[0].keys(),
+                         set(mdata.dtype['meta'].names))
+        for field in ('shotnum', 'voltage', 'current'):
+            np.testing.assert_array_equal(
+                np.array(table.column(field).to_pylist()),
+                mdata[field])
+
+        # module function
+        path = os.path.join(self.tmpdir.name, 'waveform.parquet')
+        to_parquet(cdata, path)
+        self.assertEqual(pq.read_table(path).num_rows, cdata.shape[0])
+
+    def test_export_catalog(self):
+        other = FauxHDFBuilder(add_modules={'Discharge': {}})
+        try:
+            root_dir = os.path.join(self.tmpdir.name, 'catalog')
+            paths = export_catalog(
+                {'run01': self.f.filename, 'run02': other.filename},
+                root_dir, controls=['Waveform'],
+                msi=['Discharge', 'Gas pressure'], file_class=File,
+                **self.file_kwargs)
+            self.assertEqual(sorted(paths), ['Discharge', 'Waveform'])
+            self.assertEqual(len(paths['Discharge']), 2)
+            self.assertEqual(len(paths['Waveform']), 1)
+
+            # a device directory reads as one table with a run column
+            table = pq.read_table(os.path.join(root_dir, 'Discharge'))
+            self.assertEqual(
+                sorted(set(table.column('run').to_pylist())),
+                ['run01', 'run02'])
+
+            # opened files are named after the file and left open
+            with self.assertWarns(UserWarning):
+                paths = export_catalog(
+                    [self.bf], root_dir, controls=[('Waveform',
+                                                    'config01')],
+                    msi=['Gas pressure'], silent=False)
+            run = os.path.splitext(
+                os.path.basename(self.f.filename))[0]
+            self.assertIn('run={}'.format(run), paths['Waveform'][0])
+            self.assertTrue(bool(self.bf.id))
+        finally:
+            other.cleanup()
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import numpy as np
+import os
+import tempfile
+import unittest as ut
+
+from bapsflib.synthetic import FauxHDFBuilder
+from bapsflib._hdf.utils.file import File
+
+from ..zarr import to_zarr
+
+try:
+    import zarr
+except ImportError:  # pragma: no cover
+    zarr = None
+
+
+@ut.skipIf(zarr is None, "requires the 'zarr' package")
+class TestToZarr(ut.TestCase):
+    """Test case for :func:`~bapsflib.export.zarr.to_zarr`."""
+
+    f = NotImplemented  # type: FauxHDFBuilder
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.f = FauxHDFBuilder(
+            add_modules={'SIS 3301': {'n_configs': 1, 'sn_size': 40,
+                                      'nt': 10},
+                         'Waveform': {'n_configs': 1, 'sn_size': 30}})
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.f.cleanup()
+
+    def setUp(self):
+        self.bf = File(self.f.filename,
+                       control_path='Raw data + config',
+                       digitizer_path='Raw data + config',
+                       msi_path='MSI', silent=True)
+        _mod = self.f.modules['SIS 3301']
+        brds, chs = np.where(_mod.knobs.active_brdch)
+        self.channels = list(zip(brds.tolist(), chs.tolist()))[:2]
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.bf.close()
+        self.tmpdir.cleanup()
+
+    def store(self, name='run.zarr'):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_export(self):
+        bf = self.bf
+        for n_workers in (1, 3):
+            group = to_zarr(bf, self.store(), self.channels,
+                            controls=['Waveform'], chunks=7,
+                            digitizer='SIS 3301', n_workers=n_workers,
+                            overwrite=True, silent=True)
+            self.assertIsInstance(group, zarr.hierarchy.Group)
+            self.assertEqual(group.attrs['source file'],
+                             os.path.abspath(self.f.filename))
+            np.testing.assert_array_equal(group['shotnum'],
+                                          np.arange(1, 31))
+            self.assertEqual(group['shotnum'].chunks, (7,))
+
+            for brd, ch in self.channels:
+                expected = bf.read_data(brd, ch, digitizer='SIS 3301',
+                                        add_controls=['Waveform'],
+                                        silent=True)
+                name = 'board{}_channel{}'.format(brd, ch)
+                arr = group['signals'][name]
+                self.assertEqual(arr.chunks, (7, 10))
+                np.testing.assert_array_equal(arr[...],
+                                              expected['signal'])
+                self.assertEqual(arr.attrs['digitizer'], 'SIS 3301')
+                self.assertEqual(arr.attrs['voltage offset']['unit'],
+                                 'V')
+            np.testing.assert_array_equal(group['xyz'], expected['xyz'])
+            np.testing.assert_array_equal(group['controls/FREQ'],
+                                          expected['FREQ'])
+            self.assertIn('Waveform',
+                          group['controls'].attrs['controls'])
+
+        # an existing group is not overwritten by default
+        self.assertRaises(ValueError, to_zarr, bf, self.store(),
+                          self.channels, digitizer='SIS 3301')
+
+    def test_options(self):
+        bf = self.bf
+        brd, ch = self.channels[0]
+
+        # union of shot numbers with NULL fills, named channels,
+        # per channel keywords, and chunking along time
+        group = to_zarr(bf, self.store(),
+                        {'probe': (brd, ch, {'keep_bits': True})},
+                        controls=['Waveform'], shotnum=slice(25, 45),
+                        intersection_set=False, chunks=(4, 5),
+                        compressor=None, digitizer='SIS 3301',
+                        silent=True)
+        expected = bf.read_data(brd, ch, digitizer='SIS 3301',
+                                shotnum=slice(25, 45), keep_bits=True,
+                                add_controls=['Waveform'],
+                                intersection_set=False, silent=True)
+        np.testing.assert_array_equal(group['shotnum'],
+                                      expected['shotnum'])
+        arr = group['signals/probe']
+        self.assertEqual(arr.chunks, (4, 5))
+        self.assertIsNone(arr.compressor)
+        self.assertEqual(arr.dtype, expected['signal'].dtype)
+        np.testing.assert_array_equal(arr[...], expected['signal'])
+        np.testing.assert_array_equal(group['controls/FREQ'],
+                                      expected['FREQ'])
+        self.assertTrue(np.all(np.isnan(group['xyz'][-10:])))
+
+        # controls only
+        group = to_zarr(bf, self.store('controls.zarr'), [],
+                        controls=['Waveform'], shotnum=[3, 1, 60])
+        self.assertEqual(group['shotnum'][...].tolist(), [1, 3])
+        self.assertNotIn('signals', group)
+
+    def test_errors(self):
+        bf = self.bf
+        brd, ch = self.channels[0]
+        store = self.store()
+        kwargs = {'digitizer': 'SIS 3301'}
+        self.assertRaises(TypeError, to_zarr, self.f, store,
+                          [(brd, ch)], **kwargs)
+        for channels in ([brd], [(brd, ch, {'index': 1})],
+                         [(brd, ch), (brd, ch)]):
+            self.assertRaises(ValueError, to_zarr, bf, store, channels,
+                              **kwargs)
+        self.assertRaises(ValueError, to_zarr, bf, store, [])
+        self.assertRaises(ValueError, to_zarr, bf, store, [(brd, ch)],
+                          chunks=0, **kwargs)
+        self.assertRaises(ValueError, to_zarr, bf, store, [(brd, ch)],
+                          n_workers=0, **kwargs)
+        self.assertRaises(ValueError, to_zarr, bf, store, [(brd, ch)],
+                          controls=['Waveform'], shotnum=[35, 36],
+                          **kwargs)
+        self.assertFalse(os.path.exists(store))
+
+
+if __name__ == '__main__':
+    ut.main()
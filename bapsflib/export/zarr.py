@@ -0,0 +1,337 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Export digitizer and control device data to a
+`Zarr <https://zarr.readthedocs.io>`_ store.
+
+Data is streamed from the HDF5 file in blocks of shots that align with
+the Zarr chunks along the shot axis, so a full digitizer channel is
+never held in memory and blocks can be written by parallel writers.
+
+.. note::
+
+    This module requires the optional :mod:`zarr` package.
+"""
+import numpy as np
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import (Any, Dict, List, Tuple, Union)
+
+from bapsflib._hdf.utils.file import File
+from bapsflib._hdf.utils.helpers import (build_shotnum_dset_relation,
+                                         condition_controls,
+                                         condition_shotnum,
+                                         digitizer_dataset_paths)
+from bapsflib.utils.errors import HDFEmptyIntersectionError
+
+from .helpers import json_safe
+
+__all__ = ['DEFAULT_CHUNK_SIZE', 'to_zarr']
+
+#: default number of shots per Zarr chunk (and per read)
+DEFAULT_CHUNK_SIZE = 1024
+
+#: conditioned channels, name -> (board, channel, read keywords)
+ChannelDict = Dict[str, Tuple[int, int, Dict[str, Any]]]
+
+
+def to_zarr(hdf_file: File, store, channels, controls=None,
+            shotnum=slice(None), intersection_set=True,
+            digitizer=None, adc=None, config_name=None,
+            keep_bits=False, chunks=DEFAULT_CHUNK_SIZE,
+            compressor='default', n_workers=1, overwrite=False,
+            silent=False):
+    """
+    Export digitizer channels and control device data of
+    **hdf_file** to a Zarr group.  The group is laid out as::
+
+        /shotnum             (n_shots,)
+        /xyz                 (n_shots, 3)
+        /signals/<name>      (n_shots, n_samples)  one per channel
+        /controls/<field>    (n_shots, ...)        one per field
+
+    Every array shares the shot axis :code:`shotnum`.  The
+    :attr:`~bapsflib._hdf.utils.hdfreaddata.HDFReadData.info` of each
+    channel is stored as attributes of its signal array, and the
+    control device info as attributes of the :code:`controls` group.
+
+    :param hdf_file: HDF5 file object
+    :param store: Zarr store or path of a directory store
+    :param channels: digitizer channels to export, as a list of
+        :code:`(board, channel)` or
+        :code:`(board, channel, read_kwargs)` tuples or as a dictionary
+        of such tuples keyed by array name.  Listed channels are named
+        :code:`'board<board>_channel<channel>'`.  **read_kwargs**
+        (:code:`digitizer`, :code:`adc`, :code:`config_name`,
+        :code:`keep_bits`) override the defaults given to this
+        function.
+    :param controls: control devices to export, see
+        :meth:`~bapsflib._hdf.utils.file.File.read_controls`
+    :param shotnum: shot numbers to export, see
+        :meth:`~bapsflib._hdf.utils.file.File.read_data`
+    :param bool intersection_set: :code:`True` (DEFAULT) to only
+        export shot numbers recorded by every channel and control
+        device, :code:`False` to export all shot numbers in
+        **shotnum** with NULL fills where a dataset did not record the
+        shot
+    :param digitizer: default digitizer name
+    :param adc: default analog-digital-converter name
+    :param config_name: default digitizer configuration name
+    :param bool keep_bits: default for keeping the digitizer bit values
+        instead of converting to voltage
+    :param chunks: number of shots per chunk, or a
+        :code:`(n_shots, n_samples)` tuple to also chunk the signal
+        arrays along time
+    :type chunks: Union[int, Tuple[int, int]]
+    :param compressor: :mod:`numcodecs` compressor,
+        :code:`'default'` (DEFAULT) for the Zarr default compressor,
+        or :code:`None` for no compression
+    :param int n_workers: number of parallel writer threads
+    :param bool overwrite: :code:`True` to overwrite an existing group
+        at **store**
+    :param bool silent: :code:`False` (DEFAULT).  Set :code:`True` to
+        ignore any UserWarnings (soft-warnings)
+    :return: the Zarr group
+    :rtype: :class:`zarr.hierarchy.Group`
+
+    :Example:
+
+        >>> from bapsflib import export, lapd
+        >>> f = lapd.File('run.hdf5')
+        >>> group = export.to_zarr(
+        ...     f, 'run.zarr', [(1, 1), (1, 2)],
+        ...     controls=['6K Compumotor'], n_workers=4)
+        >>> group['signals/board1_channel1'].shape
+        (5000, 12288)
+    """
+    try:
+        import zarr
+    except ImportError:  # pragma: no cover
+        raise ImportError(
+            "`to_zarr` requires the 'zarr' package") from None
+
+    if not isinstance(hdf_file, File):
+        raise TypeError(
+            "`hdf_file` is NOT type `"
+            + File.__module__ + "." + File.__qualname__ + "`")
+    if isinstance(chunks, (int, np.integer)):
+        chunks = (int(chunks), None)
+    elif not isinstance(chunks, tuple) or len(chunks) != 2:
+        raise ValueError('`chunks` must be an int or a 2-tuple')
+    if chunks[0] < 1 or (chunks[1] is not None and chunks[1] < 1):
+        raise ValueError('`chunks` must be >= 1')
+    if n_workers < 1:
+        raise ValueError('`n_workers` must be >= 1')
+
+    # condition channels and controls
+    channels = _condition_channels(channels, {
+        'digitizer': digitizer, 'adc': adc,
+        'config_name': config_name, 'keep_bits': keep_bits})
+    controls = condition_controls(hdf_file, controls) \
+        if bool(controls) else []
+    if len(channels) == 0 and len(controls) == 0:
+        raise ValueError('No `channels` or `controls` to export')
+
+    # shot numbers to export
+    sn = _plan_shotnum(hdf_file, channels, controls, shotnum,
+                       intersection_set)
+    rows = chunks[0]
+    blocks = [slice(start, min(start + rows, sn.size))
+              for start in range(0, sn.size, rows)]
+
+    # create group and shot axis
+    mode = 'w' if overwrite else 'w-'
+    root = zarr.open_group(store, mode=mode)
+    ckwargs = {} if compressor == 'default' \
+        else {'compressor': compressor}
+    root.attrs.update({
+        'source file': hdf_file.info['absolute file path'],
+        'intersection_set': bool(intersection_set),
+    })
+    root.create_dataset('shotnum', data=sn, chunks=(rows,), **ckwargs)
+    xyz = root.create_dataset('xyz', shape=(sn.size, 3),
+                              chunks=(rows, 3), dtype=np.float32,
+                              fill_value=np.nan, **ckwargs)
+
+    # the first block of each read defines the array layout
+    def read(key, block: slice):
+        if key is None:
+            return hdf_file.read_controls(
+                controls, shotnum=sn[block], intersection_set=False,
+                silent=silent)
+
+        board, channel, kwargs = channels[key]
+        return hdf_file.read_data(
+            board, channel, shotnum=sn[block], intersection_set=False,
+            silent=silent, **kwargs)
+
+    arrays = {}
+    keys = list(channels.keys()) + ([None] if controls else [])
+    for key in keys:
+        data = read(key, blocks[0])
+        arrays[key] = _create_arrays(root, key, data, sn.size, chunks,
+                                     ckwargs)
+        _write_block(arrays[key], xyz, data, blocks[0])
+
+    # stream the remaining blocks
+    def task(key, block: slice):
+        _write_block(arrays[key], xyz, read(key, block), block)
+
+    jobs = [(key, block) for block in blocks[1:] for key in keys]
+    if n_workers == 1:
+        for job in jobs:
+            task(*job)
+    else:
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            futures = [executor.submit(task, *job) for job in jobs]
+            for future in futures:
+                future.result()
+
+    return root
+
+
+def _condition_channels(channels, defaults: Dict[str, Any]) \
+        -> ChannelDict:
+    """
+    Condition the **channels** argument of :func:`to_zarr` into an
+    ordered dictionary of :code:`(board, channel, read_kwargs)`
+    tuples keyed by array name.
+    """
+    if isinstance(channels, dict):
+        items = list(channels.items())
+    else:
+        items = [(None, entry) for entry in channels]
+
+    conditioned = OrderedDict()  # type: ChannelDict
+    for name, entry in items:
+        if not isinstance(entry, (list, tuple)) \
+                or len(entry) not in (2, 3):
+            raise ValueError(
+                'Channel {} is not a (board, channel) or (board, '
+                'channel, read_kwargs) tuple'.format(entry))
+        board, channel = entry[0], entry[1]
+        kwargs = dict(defaults)
+        if len(entry) == 3:
+            unknown = set(entry[2]) - set(defaults)
+            if unknown:
+                raise ValueError(
+                    'Invalid read keywords {} for channel {}'.format(
+                        sorted(unknown), entry))
+            kwargs.update(entry[2])
+        if name is None:
+            name = 'board{}_channel{}'.format(board, channel)
+        if name in conditioned:
+            raise ValueError(
+                "Channel name '{}' is not unique, pass `channels` as "
+                "a dictionary to name them".format(name))
+        conditioned[name] = (board, channel, kwargs)
+    return conditioned
+
+
+def _plan_shotnum(hdf_file: File, channels: ChannelDict,
+                  controls: List[Tuple[str, Any]], shotnum,
+                  intersection_set: bool) -> np.ndarray:
+    """
+    Determine the shot numbers to export.  Only the shot number
+    columns of the digitizer header and control datasets are read.
+    """
+    swmr = getattr(hdf_file, 'swmr_mode', False)
+    dset_dict = OrderedDict()
+    shotnumkey_dict = {}
+    for name, (board, channel, kwargs) in channels.items():
+        _, _, dheader_path, shotnumkey = digitizer_dataset_paths(
+            hdf_file, board, channel, digitizer=kwargs['digitizer'],
+            config_name=kwargs['config_name'], adc=kwargs['adc'])
+        dheader = hdf_file.get(dheader_path)
+        if swmr:
+            dheader.refresh()
+        key = 'digitizer: ' + name
+        dset_dict[key] = hdf_file.header_cache.get(dheader, shotnumkey)
+        shotnumkey_dict[key] = shotnumkey
+
+    relations = []
+    for cname, cconfn in controls:
+        cmap = hdf_file.file_map.controls[cname]
+        cconfig = cmap.configs[cconfn]
+        cdset = hdf_file.get(cconfig['dset paths'][0])
+        if swmr:
+            cdset.refresh()
+        key = 'control: ' + cname
+        dset_dict[key] = cdset
+        shotnumkey_dict[key] = cconfig['shotnum']['dset field'][0]
+        relations.append((cdset, shotnumkey_dict[key], cmap, cconfn))
+
+    sn = condition_shotnum(shotnum, dset_dict, shotnumkey_dict)
+    if not intersection_set:
+        return sn
+
+    # only keep shot numbers recorded by every dataset
+    for key, dheader in dset_dict.items():
+        if key.startswith('digitizer: '):
+            sn = sn[np.isin(sn, dheader[shotnumkey_dict[key]])]
+    for relation in relations:
+        if sn.size == 0:
+            break
+        _, sni = build_shotnum_dset_relation(sn, *relation)
+        sn = sn[sni]
+    if sn.size == 0:
+        raise HDFEmptyIntersectionError(
+            'Input `shotnum` would result in a NULL array')
+    return sn
+
+
+def _create_arrays(root, key, data: np.ndarray, n_shots: int,
+                   chunks: Tuple[int, Union[int, None]],
+                   ckwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Create the Zarr arrays that the fields of **data** are written to,
+    with the meta-info of **data** as attributes.  Returns a
+    dictionary of the arrays keyed by field name.
+    """
+    arrays = {}
+    if key is not None:
+        # digitizer channel
+        dtype = data.dtype['signal']
+        n_samples = dtype.shape[0]
+        arr = root.require_group('signals').create_dataset(
+            key, shape=(n_shots, n_samples), dtype=dtype.base,
+            chunks=(chunks[0], chunks[1] or n_samples), **ckwargs)
+        arr.attrs.update(json_safe(data.info))
+        arrays['signal'] = arr
+        return arrays
+
+    # control devices
+    group = root.require_group('controls')
+    group.attrs.update(json_safe(data.info))
+    for field in data.dtype.names:
+        if field == 'shotnum':
+            continue
+        if field == 'xyz':
+            arrays['xyz'] = None
+            continue
+
+        dtype = data.dtype[field]
+        arrays[field] = group.create_dataset(
+            field, shape=(n_shots,) + dtype.shape, dtype=dtype.base,
+            chunks=(chunks[0],) + dtype.shape, **ckwargs)
+    return arrays
+
+
+def _write_block(arrays: Dict[str, Any], xyz, data: np.ndarray,
+                 block: slice):
+    """Write the fields of **data** to rows **block** of **arrays**."""
+    for field, arr in arrays.items():
+        if arr is None:
+            # 'xyz' is shared by all control devices
+            xyz[block] = data[field]
+        else:
+            arr[block] = data[field]
@@ -18,9 +18,9 @@ diameters, port spacing, etc.).  The :mod:`~bapsflib.lapd.tools` package
 contains functions and classes relevant for calculating LaPD parameters
 (e.g. converting port number to axial z location, etc.).
 """
-from . import _hdf
-from . import constants
-from . import tools
-from ._hdf.file import File
+from bapsflib.utils import lazyload
 
-__all__ = ['_hdf', 'constants', 'File', 'tools']
+__getattr__, __dir__, __all__ = lazyload.attach(
+    __name__,
+    submodules=['_hdf', 'constants', 'tools'],
+    submod_attrs={'_hdf.file': ['File']})
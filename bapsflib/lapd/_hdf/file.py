@@ -61,6 +61,7 @@ class File(BaseFile):
 
     def _map_file(self):
         """Map/re-map the LaPD HDF5 file. (Builds :attr:`file_map`)"""
+        self._clear_caches()
         self._file_map = LaPDMap(self,
                                  control_path=self.CONTROL_PATH,
                                  digitizer_path=self.DIGITIZER_PATH,
@@ -80,6 +81,59 @@ class File(BaseFile):
 
         return LaPDOverview(self)
 
+    def B_at_probe(self, shotnum, z=None, port=None, receptacle=None):
+        """
+        Interpolate the :code:`'Magnetic field'` MSI axial profile at
+        the probe location for every shot in **shotnum**, all shots at
+        once.  The probe location is given by exactly one of its axial
+        location **z**, its LaPD **port** number (see
+        :func:`~bapsflib.lapd.tools.portnum_to_z`), or the
+        :code:`'6K Compumotor'` **receptacle** whose probe list
+        defines the port.  (see
+        :meth:`bapsflib._hdf.utils.file.File.B_at_probe`)
+
+        :param shotnum: HDF5 global shot numbers
+        :type shotnum: Union[int, list(int), numpy.ndarray]
+        :param z: axial location (in cm) of the probe, either one
+            location for all shots or one location per shot
+        :param port: LaPD port number of the probe
+        :param int receptacle: receptacle number of the probe on the
+            :code:`'6K Compumotor'`
+        :return: magnetic field (in Gauss) per shot
+        :rtype: :class:`numpy.ndarray`
+
+        :Example:
+
+            >>> # field at the probe on receptacle 2 for every shot
+            >>> data = f.read_data(1, 1, add_controls=[
+            ...     ('6K Compumotor', 2)])
+            >>> Bo = f.B_at_probe(data['shotnum'], receptacle=2)
+        """
+        import astropy.units as u
+
+        from bapsflib.lapd.tools import portnum_to_z
+
+        if sum(arg is not None for arg in (z, port, receptacle)) != 1:
+            raise ValueError(
+                'Exactly one of `z`, `port`, or `receptacle` must be '
+                'specified')
+        if receptacle is not None:
+            try:
+                config = self.controls['6K Compumotor'].configs[
+                    receptacle]
+            except KeyError:
+                raise ValueError(
+                    "'6K Compumotor' receptacle {} not found".format(
+                        receptacle)) from None
+            port = config['probe']['port']
+            if port is None:
+                raise ValueError(
+                    "Probe list of receptacle {} does not define a "
+                    "port".format(receptacle))
+        if port is not None:
+            z = portnum_to_z(port).to(u.cm)
+        return super().B_at_probe(shotnum, z)
+
     def run_description(self):
         """Print description of the LaPD experimental run."""
         for line in self.info['run description'].splitlines():
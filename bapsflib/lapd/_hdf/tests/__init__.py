@@ -11,7 +11,7 @@
 import unittest as ut
 
 from bapsflib._hdf import File as BaseFile
-from bapsflib._hdf.maps import FauxHDFBuilder
+from bapsflib.synthetic import FauxHDFBuilder
 from bapsflib._hdf.utils.tests import with_bf
 from functools import wraps
 
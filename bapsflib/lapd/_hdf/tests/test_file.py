@@ -11,11 +11,14 @@
 # License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
 #   license terms and contributor agreement.
 #
+import astropy.units as u
 import io
 import bapsflib
+import numpy as np
 import unittest as ut
 
 from bapsflib._hdf.maps.hdfmap import HDFMap
+from bapsflib.lapd.tools import portnum_to_z
 from unittest import mock
 
 from . import (BaseFile, TestBase, with_bf, with_lapdf)
@@ -113,6 +116,36 @@ class TestLaPDFile(TestBase):
             self.assertNotEqual(mock_stdout.getvalue(), '')
             self.assertTrue(mock_info.called)
 
+    def test_B_at_probe(self):
+        self.f.add_module('6K Compumotor')
+        self.f.add_module('Magnetic field')
+
+        # profile of B = 1000 + z (in Gauss)
+        group = self.f['MSI/Magnetic field']
+        zgrid = group.attrs['Profile z locations'].astype(np.float64)
+        group['Magnetic field profile'][...] = 1000. + zgrid
+        sn = group['Magnetic field summary']['Shot number'][...]
+
+        with File(self.f.filename, silent=True) as lapdf:
+            # probe location by z, port, or 6K receptacle
+            z = portnum_to_z(27).to_value(u.cm)
+            np.testing.assert_allclose(lapdf.B_at_probe(sn, z=z),
+                                       1000. + z, rtol=1.e-6)
+            np.testing.assert_allclose(lapdf.B_at_probe(sn, port=27),
+                                       1000. + z, rtol=1.e-6)
+            _map = lapdf.controls['6K Compumotor']
+            receptacle = list(_map.configs)[0]
+            np.testing.assert_allclose(
+                lapdf.B_at_probe(sn, receptacle=receptacle),
+                1000. + z, rtol=1.e-6)
+
+            # exactly one location is required
+            self.assertRaises(ValueError, lapdf.B_at_probe, sn)
+            self.assertRaises(ValueError, lapdf.B_at_probe, sn, z=z,
+                              port=27)
+            self.assertRaises(ValueError, lapdf.B_at_probe, sn,
+                              receptacle=99)
+
 
 if __name__ == '__main__':
     ut.main()
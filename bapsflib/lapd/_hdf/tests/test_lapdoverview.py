@@ -67,6 +67,17 @@ class TestLaPDOverview(TestBase):
             self.assertNotEqual(mock_stdout.getvalue(), '')
             self.assertTrue(mock_rg_super.called)
 
+    @with_lapdf
+    def test_to_dict(self, _lapdf: File):
+        # LaPD run and experiment info is part of the general info
+        _lapdf.info['run name'] = 'run01'
+        overview = self.create_overview(_lapdf).to_dict()
+        general = overview['general']
+        self.assertEqual(general['lapd version'],
+                         _lapdf.info['lapd version'])
+        self.assertEqual(general['run name'], 'run01')
+        self.assertIn('exp set name', general)
+
 
 if __name__ == '__main__':
     ut.main()
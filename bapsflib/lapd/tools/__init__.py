@@ -13,6 +13,8 @@ This package contains a variety of tools (functions, classes, etc.)
 relevant to the LaPD and its configuration.
 """
 from . import tools
-from .tools import (portnum_to_z, z_to_portnum)
+from .tools import (portnum_to_z, portnum_to_z_array, z_to_portnum,
+                    z_to_portnum_array)
 
-__all__ = ['tools', 'portnum_to_z', 'z_to_portnum']
+__all__ = ['tools', 'portnum_to_z', 'portnum_to_z_array',
+           'z_to_portnum', 'z_to_portnum_array']
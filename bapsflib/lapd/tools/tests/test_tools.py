@@ -16,7 +16,8 @@ import bapsflib.lapd.constants as const
 import numpy as np
 import unittest as ut
 
-from bapsflib.lapd.tools import (portnum_to_z, z_to_portnum)
+from bapsflib.lapd.tools import (portnum_to_z, portnum_to_z_array,
+                                 z_to_portnum, z_to_portnum_array)
 
 
 class TestTools(ut.TestCase):
@@ -63,6 +64,46 @@ class TestTools(ut.TestCase):
         self.assertEqual(portnum.unit, u.dimensionless_unscaled)
         self.assertEqual(portnum.value, val.value)
 
+    def test_portnum_to_z_array(self):
+        portnums = np.array([[5, 20, 53], [0, 27.5, 60]])
+        for portnum in (5, 27.5, portnums, portnums.tolist()):
+            p2z = portnum_to_z_array(portnum)
+            val = portnum_to_z(np.asarray(portnum))
+            self.assertIsInstance(p2z, u.Quantity)
+            self.assertEqual(p2z.unit, u.cm)
+            self.assertEqual(p2z.shape, np.shape(portnum))
+            np.testing.assert_array_equal(p2z.value, val.value)
+
+            # plain floats
+            p2z = portnum_to_z_array(portnum, as_quantity=False)
+            self.assertNotIsInstance(p2z, u.Quantity)
+            self.assertEqual(p2z.dtype, np.float64)
+            np.testing.assert_array_equal(p2z, val.value)
+
+    def test_z_to_portnum_array(self):
+        zs = np.array([1051.155, 875.43, 447.3, 1214])
+        for z in (1214, zs, zs.reshape(2, 2),
+                  u.Quantity(zs, unit='cm'), u.Quantity(8.7, 'm')):
+            for round_to_nearest in (False, True):
+                portnum = z_to_portnum_array(
+                    z, round_to_nearest=round_to_nearest)
+                if not isinstance(z, u.Quantity):
+                    z = np.asarray(z, dtype=np.float64)
+                val = z_to_portnum(z, round_to_nearest=round_to_nearest)
+                self.assertIsInstance(portnum, u.Quantity)
+                self.assertEqual(portnum.unit, u.dimensionless_unscaled)
+                self.assertEqual(portnum.dtype, val.dtype)
+                np.testing.assert_array_equal(portnum.value, val.value)
+
+        # `unit` and plain floats
+        portnum = z_to_portnum_array(zs / 100., unit='m',
+                                     as_quantity=False)
+        self.assertNotIsInstance(portnum, u.Quantity)
+        np.testing.assert_allclose(portnum, z_to_portnum(zs).value)
+        portnum = z_to_portnum_array(zs, round_to_nearest=True,
+                                     as_quantity=False)
+        self.assertEqual(portnum.dtype, np.int8)
+
 
 if __name__ == '__main__':
     ut.main()
@@ -15,7 +15,12 @@ from typing import Union
 
 from .. import constants as const
 
-__all__ = ['portnum_to_z', 'z_to_portnum']
+__all__ = ['portnum_to_z', 'portnum_to_z_array', 'z_to_portnum',
+           'z_to_portnum_array']
+
+# constants in base units for the array-native conversions
+_PORT_SPACING_CM = float(const.port_spacing.cgs.value)
+_REF_PORT = float(const.ref_port.value)
 
 
 def portnum_to_z(portnum: Union[int, float]) -> u.Quantity:
@@ -63,3 +68,82 @@ def z_to_portnum(z: Union[int, float, u.Quantity], unit='cm',
 
     # return
     return portnum
+
+
+def portnum_to_z_array(portnum, as_quantity=True
+                       ) -> Union[u.Quantity, np.ndarray]:
+    """
+    Array-native version of :func:`portnum_to_z` for converting many
+    LaPD port numbers (e.g. per-shot positions or a whole motion list)
+    to axial z locations.  The conversion is done on plain floats and
+    the result is wrapped in a :class:`~astropy.units.Quantity` only
+    once at the end.
+
+    :param portnum: port number(s)
+    :type portnum: Union[int, float, numpy.ndarray]
+    :param bool as_quantity: :code:`True` (DEFAULT) to return a
+        :class:`~astropy.units.Quantity` in cm, :code:`False` to
+        return a plain :class:`numpy.ndarray` of floats in cm
+
+    .. note::
+
+        Port 53 defines z = 0 cm and is the most Northern port.  The +z
+        axis points South towards the main cathode.
+    """
+    z = _PORT_SPACING_CM * (_REF_PORT
+                            - np.asarray(portnum, dtype=np.float64))
+    # - `z` is a numpy scalar for scalar input, wrap it as an array so
+    #   Quantity never needs to copy
+    z = np.asarray(z)
+    return u.Quantity(z, u.cm, copy=False) if as_quantity else z
+
+
+def z_to_portnum_array(z, unit='cm', round_to_nearest=False,
+                       as_quantity=True
+                       ) -> Union[u.Quantity, np.ndarray]:
+    """
+    Array-native version of :func:`z_to_portnum` for converting many
+    LaPD axial z locations (e.g. per-shot positions or a whole motion
+    list) to port numbers.  The conversion is done on plain floats and
+    the result is wrapped in a :class:`~astropy.units.Quantity` only
+    once at the end.
+
+    :param z: axial z location(s)
+    :type z: Union[int, float, numpy.ndarray, astropy.units.Quantity]
+    :param unit: string or :class:`astropy.units` specifying the unit
+        of **z** if it is not a :class:`~astropy.units.Quantity`
+    :param bool round_to_nearest: :code:`False` (DEFAULT), :code:`True`
+        will round the port number to the nearest full integer
+    :param bool as_quantity: :code:`True` (DEFAULT) to return a
+        dimensionless :class:`~astropy.units.Quantity`, :code:`False`
+        to return a plain :class:`numpy.ndarray`
+
+    .. note::
+
+        Port 53 defines z = 0 cm and is the most Northern port.  The +z
+        axis points South towards the main cathode.
+    """
+    # convert to float cm
+    if isinstance(z, u.Quantity):
+        z = np.asarray(z.to_value(u.cm), dtype=np.float64)
+    else:
+        z = np.asarray(z, dtype=np.float64)
+        scale = u.Unit(unit).to(u.cm)
+        if scale != 1.0:
+            z = z * scale
+
+    # calc port number
+    portnum = _REF_PORT - (z / _PORT_SPACING_CM)
+
+    # convert to nearest port number
+    if round_to_nearest:
+        portnum = np.round(portnum).astype(np.int8)
+
+    # return
+    # - `portnum` is a numpy scalar for scalar input, wrap it as an
+    #   array so Quantity never needs to copy
+    portnum = np.asarray(portnum)
+    if as_quantity:
+        return u.Quantity(portnum, u.dimensionless_unscaled,
+                          dtype=portnum.dtype, copy=False)
+    return portnum
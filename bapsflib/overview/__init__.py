@@ -0,0 +1,28 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Package for machine-readable overviews of whole directories of HDF5
+files.  :func:`~.inventory.build_inventory` maps the files in a
+process pool and collects their
+:meth:`~bapsflib._hdf.utils.hdfoverview.HDFOverview.to_dict`
+overviews into one inventory, which is saved as JSON (full overviews)
+or CSV (one summary row per file).  A command line interface is
+provided by :mod:`~.cli`::
+
+    python -m bapsflib.overview /data/2018-06-14 -o inventory.json
+"""
+from bapsflib.utils import lazyload
+
+__getattr__, __dir__, __all__ = lazyload.attach(
+    __name__,
+    submodules=['cli', 'inventory'],
+    submod_attrs={'inventory': ['build_inventory', 'overview_file',
+                                'write_csv', 'write_json']})
@@ -0,0 +1,93 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Command line interface for
+:func:`~bapsflib.overview.inventory.build_inventory`.
+
+:Example:
+
+    Inventory of all runs recorded today with 8 worker processes,
+    re-using the overviews of files seen by the previous night's
+    report::
+
+        $ bapsflib-overview /data/2018-06-14 -o inventory.csv -j 8 \\
+              --cache-dir ~/.cache/bapsflib-overview
+"""
+import argparse
+import sys
+import time
+
+from typing import List
+
+from .inventory import (build_inventory, write_csv, write_json)
+
+__all__ = ['build_parser', 'main']
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser of the CLI."""
+    parser = argparse.ArgumentParser(
+        prog='bapsflib-overview',
+        description='Build a consolidated JSON/CSV inventory of the '
+                    'overviews of LaPD HDF5 files.')
+    parser.add_argument('paths', nargs='+',
+                        help='HDF5 files and/or directories of HDF5 '
+                             'files')
+    parser.add_argument('-r', '--recursive', action='store_true',
+                        help='also search sub-directories')
+    parser.add_argument('-o', '--output', default='-',
+                        help="output file, '-' for stdout (default: "
+                             "%(default)s)")
+    parser.add_argument('--format', choices=['json', 'csv'],
+                        help="output format (default: from the output "
+                             "file extension, else 'json')")
+    parser.add_argument('-j', '--jobs', type=int, dest='processes',
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('--cache-dir',
+                        help='directory to cache the file overviews in')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='do not print a summary')
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Entry point of the :code:`bapsflib-overview` command.
+
+    :param argv: command line arguments (DEFAULT :code:`sys.argv[1:]`)
+    :return: exit status
+    """
+    args = build_parser().parse_args(argv)
+    fmt = args.format
+    if fmt is None:
+        fmt = 'csv' if args.output.lower().endswith('.csv') else 'json'
+
+    tstart = time.time()
+    try:
+        inventory = build_inventory(args.paths,
+                                    recursive=args.recursive,
+                                    processes=args.processes,
+                                    cache_dir=args.cache_dir)
+    except (FileNotFoundError, ValueError) as err:
+        print('bapsflib-overview: error: {}'.format(err),
+              file=sys.stderr)
+        return 1
+
+    write = write_csv if fmt == 'csv' else write_json
+    write(inventory, sys.stdout if args.output == '-' else args.output)
+
+    if not args.quiet:
+        entries = inventory['files']
+        print('{} file(s) ({} cached, {} failed) in {:.1f} s'.format(
+            len(entries), sum(entry['cached'] for entry in entries),
+            sum(entry['error'] is not None for entry in entries),
+            time.time() - tstart), file=sys.stderr)
+    return 0
@@ -0,0 +1,257 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Consolidated overviews (inventories) of many HDF5 files.
+
+Each file is opened and mapped in a worker process of a process pool
+and reduced to its overview dictionary (see
+:meth:`~bapsflib._hdf.utils.hdfoverview.HDFOverview.to_dict`).
+With a **cache_dir** the overview of every file is also stored on
+disk, keyed by the file size and modification time, so repeated
+inventories (e.g. a nightly report) only map new or modified files.
+"""
+import csv
+import hashlib
+import json
+import os
+
+from bapsflib._hdf.utils.file import File
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import (Any, Dict, Iterable, List, TextIO, Type, Union)
+
+__all__ = ['build_inventory', 'CSV_COLUMNS', 'find_files',
+           'HDF5_EXTENSIONS', 'overview_file', 'summary_row',
+           'write_csv', 'write_json']
+
+#: file extensions collected from directories
+HDF5_EXTENSIONS = ('.hdf5', '.h5', '.hdf')
+
+#: columns of the CSV inventory (see :func:`summary_row`)
+CSV_COLUMNS = ['file', 'path', 'size', 'modified', 'cached', 'error',
+               'lapd version', 'run date', 'investigator',
+               'exp set name', 'exp name', 'run name', 'controls',
+               'digitizers', 'main digitizer', 'msi', 'unknowns']
+
+
+def find_files(paths: Union[str, Iterable[str]], recursive=False,
+               extensions=HDF5_EXTENSIONS) -> List[str]:
+    """
+    Collect the HDF5 files in **paths**.
+
+    :param paths: a path or paths of HDF5 files and/or directories
+        to search for files with one of the **extensions**
+    :param bool recursive: :code:`True` to also search the
+        sub-directories
+    :param extensions: file extensions of HDF5 files
+    :return: sorted absolute paths of the files
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    extensions = tuple(ext.lower() for ext in extensions)
+
+    files = set()
+    for path in paths:
+        if not os.path.isdir(path):
+            if not os.path.isfile(path):
+                raise FileNotFoundError(
+                    "No such file or directory: '{}'".format(path))
+            files.add(os.path.abspath(path))
+            continue
+        for root, dirs, names in os.walk(path):
+            files.update(
+                os.path.abspath(os.path.join(root, name))
+                for name in names
+                if name.lower().endswith(extensions))
+            if not recursive:
+                break
+    return sorted(files)
+
+
+def overview_file(path: str, file_class: Type[File] = None,
+                  cache_dir: str = None,
+                  file_kwargs: Dict[str, Any] = None
+                  ) -> Dict[str, Any]:
+    """
+    Inventory entry of a single HDF5 file.
+
+    :param str path: path of the HDF5 file
+    :param file_class: class used to open the file (DEFAULT
+        :class:`bapsflib.lapd.File`)
+    :param str cache_dir: directory to look up and store the
+        overview in, :code:`None` to always map the file
+    :param file_kwargs: additional keywords for **file_class**
+    :return: a dictionary with the file path, size, and modification
+        date, whether it came from the cache, an :code:`'error'`
+        string if the file could not be read, and the
+        :code:`'overview'` dictionary (see
+        :meth:`~bapsflib._hdf.utils.hdfoverview.HDFOverview.to_dict`)
+    """
+    if file_class is None:
+        from bapsflib.lapd import File as file_class
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    entry = {
+        'file': os.path.basename(path),
+        'path': path,
+        'size': stat.st_size,
+        'modified': datetime.fromtimestamp(
+            stat.st_mtime).replace(microsecond=0).isoformat(),
+        'cached': False,
+        'error': None,
+        'overview': None,
+    }
+
+    # re-use the overview of an unmodified file
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = os.path.join(
+            cache_dir,
+            hashlib.sha1(path.encode('utf-8')).hexdigest() + '.json')
+        try:
+            with open(cache_path, 'r') as cf:
+                cached = json.load(cf)
+            if cached['size'] == entry['size'] \
+                    and cached['mtime'] == stat.st_mtime:
+                entry['overview'] = cached['overview']
+                entry['cached'] = True
+                return entry
+        except (OSError, ValueError, KeyError):
+            pass
+
+    try:
+        with file_class(path, silent=True, **(file_kwargs or {})) as f:
+            entry['overview'] = f.overview.to_dict()
+    except Exception as err:
+        # one unreadable file must not fail the inventory
+        entry['error'] = '{}: {}'.format(type(err).__name__, err)
+        return entry
+
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = '{}.{}.tmp'.format(cache_path, os.getpid())
+        with open(tmp_path, 'w') as cf:
+            json.dump({'size': entry['size'], 'mtime': stat.st_mtime,
+                       'overview': entry['overview']}, cf)
+        os.replace(tmp_path, cache_path)
+    return entry
+
+
+def build_inventory(paths: Union[str, Iterable[str]], recursive=False,
+                    processes: int = None,
+                    file_class: Type[File] = None,
+                    cache_dir: str = None,
+                    file_kwargs: Dict[str, Any] = None
+                    ) -> Dict[str, Any]:
+    """
+    Build the overviews of all the HDF5 files in **paths** in a
+    process pool.
+
+    :param paths: a path or paths of HDF5 files and/or directories
+        (see :func:`find_files`)
+    :param bool recursive: :code:`True` to also search the
+        sub-directories
+    :param int processes: number of worker processes, :code:`None`
+        for one per CPU and :code:`1` to run in this process
+    :param file_class: class used to open the files (DEFAULT
+        :class:`bapsflib.lapd.File`)
+    :param str cache_dir: directory of the cached overviews (see
+        :func:`overview_file`)
+    :param file_kwargs: additional keywords for **file_class**
+    :return: inventory dictionary with a :code:`'files'` list of the
+        entries returned by :func:`overview_file`
+
+    :Example:
+
+        >>> inventory = build_inventory('/data/2018-06-14',
+        ...                             cache_dir='.overview-cache')
+        >>> write_csv(inventory, 'inventory.csv')
+    """
+    from bapsflib import __version__
+
+    files = find_files(paths, recursive=recursive)
+    args = (files, [file_class] * len(files),
+            [cache_dir] * len(files), [file_kwargs] * len(files))
+    if processes == 1 or len(files) <= 1:
+        entries = list(map(overview_file, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            entries = list(pool.map(overview_file, *args))
+
+    return {
+        'generated by': 'bapsflib v' + __version__,
+        'generated date':
+            datetime.now().replace(microsecond=0).isoformat(),
+        'files': entries,
+    }
+
+
+def summary_row(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten an inventory entry into one row of the CSV inventory
+    (columns :data:`CSV_COLUMNS`).
+    """
+    row = {key: entry[key] for key in ('file', 'path', 'size',
+                                       'modified', 'cached', 'error')}
+    overview = entry['overview']
+    if overview is None:
+        return row
+
+    general = overview['general']
+    for key in ('lapd version', 'run date', 'investigator',
+                'exp set name', 'exp name', 'run name'):
+        row[key] = general.get(key)
+    discovery = overview['discovery']
+    for key in ('controls', 'digitizers', 'msi'):
+        row[key] = ';'.join(discovery[key]['devices'])
+    row['main digitizer'] = discovery['digitizers']['main']
+    row['unknowns'] = ';'.join(discovery['unknowns'])
+    return row
+
+
+@contextmanager
+def _open_text(file: Union[str, TextIO], **kwargs):
+    """Open **file** for writing unless it is already a text stream."""
+    if hasattr(file, 'write'):
+        yield file
+    else:
+        with open(file, 'w', **kwargs) as of:
+            yield of
+
+
+def write_json(inventory: Dict[str, Any], file: Union[str, TextIO],
+               indent=2):
+    """
+    Save the full **inventory** as JSON.
+
+    :param inventory: inventory from :func:`build_inventory`
+    :param file: name of the JSON file or an open text stream
+    :param int indent: JSON indentation level
+    """
+    with _open_text(file) as of:
+        json.dump(inventory, of, indent=indent)
+        of.write('\n')
+
+
+def write_csv(inventory: Dict[str, Any], file: Union[str, TextIO]):
+    """
+    Save the **inventory** as CSV with one row per file (see
+    :func:`summary_row`).
+
+    :param inventory: inventory from :func:`build_inventory`
+    :param file: name of the CSV file or an open text stream
+    """
+    with _open_text(file, newline='') as of:
+        writer = csv.DictWriter(of, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        for entry in inventory['files']:
+            writer.writerow(summary_row(entry))
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest as ut
+
+from bapsflib._hdf.utils.file import File
+from bapsflib.synthetic import write_synthetic_file
+from contextlib import (redirect_stderr, redirect_stdout)
+from unittest import mock
+
+from ..cli import main
+from ..inventory import (build_inventory, CSV_COLUMNS, find_files,
+                         overview_file, write_csv, write_json)
+
+
+class TestInventory(ut.TestCase):
+    """Test case for :mod:`bapsflib.overview.inventory`."""
+
+    tmpdir = NotImplemented  # type: tempfile.TemporaryDirectory
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        # a day of runs, a sub-directory, and an unreadable file
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.root = cls.tmpdir.name
+        cls.runs = []
+        for ii, msi in enumerate((['Discharge'], [])):
+            path = os.path.join(cls.root, 'run{:02d}.hdf5'.format(ii))
+            write_synthetic_file(path, sn_size=10, nt=16, msi=msi,
+                                 seed=ii)
+            cls.runs.append(path)
+        os.mkdir(os.path.join(cls.root, 'sub'))
+        cls.sub_run = os.path.join(cls.root, 'sub', 'run02.h5')
+        write_synthetic_file(cls.sub_run, sn_size=10, nt=16,
+                             controls=[], msi=[])
+        cls.bad = os.path.join(cls.root, 'broken.hdf5')
+        with open(cls.bad, 'w') as f:
+            f.write('not an HDF5 file')
+        with open(os.path.join(cls.root, 'notes.txt'), 'w') as f:
+            f.write('not listed')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.tmpdir.cleanup()
+
+    def test_find_files(self):
+        self.assertEqual(find_files(self.root),
+                         sorted([self.bad] + self.runs))
+        self.assertEqual(find_files([self.root], recursive=True),
+                         sorted([self.bad, self.sub_run] + self.runs))
+        self.assertEqual(find_files([self.runs[0], self.runs[0]]),
+                         [self.runs[0]])
+        self.assertRaises(FileNotFoundError, find_files,
+                          os.path.join(self.root, 'missing.hdf5'))
+
+    def test_overview_file(self):
+        entry = overview_file(self.runs[0])
+        self.assertEqual(entry['file'], 'run00.hdf5')
+        self.assertEqual(entry['size'], os.path.getsize(self.runs[0]))
+        self.assertFalse(entry['cached'])
+        self.assertIsNone(entry['error'])
+        overview = entry['overview']
+        self.assertEqual(overview['discovery']['msi']['devices'],
+                         ['Discharge'])
+        self.assertIn('lapd version', overview['general'])
+
+        # file class and keywords
+        entry = overview_file(
+            self.runs[0], file_class=File,
+            file_kwargs={'control_path': 'Raw data + config',
+                         'digitizer_path': 'Raw data + config',
+                         'msi_path': 'MSI'})
+        self.assertNotIn('lapd version', entry['overview']['general'])
+
+        # unreadable files are reported, not raised
+        entry = overview_file(self.bad)
+        self.assertIsNone(entry['overview'])
+        self.assertTrue(entry['error'].startswith('OSError'))
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            entry = overview_file(self.runs[1], cache_dir=cache_dir)
+            self.assertFalse(entry['cached'])
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            # an unmodified file is not mapped again
+            with mock.patch('bapsflib.lapd.File') as mock_file:
+                cached = overview_file(self.runs[1],
+                                       cache_dir=cache_dir)
+                self.assertFalse(mock_file.called)
+            self.assertTrue(cached['cached'])
+            self.assertEqual(cached['overview'], entry['overview'])
+
+            # a modified file is
+            stat = os.stat(self.runs[1])
+            os.utime(self.runs[1],
+                     (stat.st_atime, stat.st_mtime + 10))
+            try:
+                entry = overview_file(self.runs[1],
+                                      cache_dir=cache_dir)
+                self.assertFalse(entry['cached'])
+            finally:
+                os.utime(self.runs[1], (stat.st_atime, stat.st_mtime))
+
+            # errors are not cached
+            overview_file(self.bad, cache_dir=cache_dir)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+    def test_build_inventory(self):
+        serial = build_inventory(self.root, recursive=True,
+                                 processes=1)
+        files = serial['files']
+        self.assertEqual([entry['path'] for entry in files],
+                         sorted([self.bad, self.sub_run] + self.runs))
+        self.assertTrue(serial['generated by'].startswith('bapsflib'))
+
+        # the process pool gives the same entries in the same order
+        pooled = build_inventory(self.root, recursive=True,
+                                 processes=2)
+        for entry, other in zip(files, pooled['files']):
+            self.assertEqual(entry['path'], other['path'])
+            self.assertEqual(entry['error'], other['error'])
+            if entry['overview'] is not None:
+                self.assertEqual(entry['overview']['discovery'],
+                                 other['overview']['discovery'])
+
+        # JSON and CSV output
+        text = io.StringIO()
+        write_json(serial, text)
+        self.assertEqual(json.loads(text.getvalue()), serial)
+
+        path = os.path.join(self.root, 'sub', 'inventory.csv')
+        try:
+            write_csv(serial, path)
+            with open(path, 'r', newline='') as f:
+                rows = list(csv.DictReader(f))
+        finally:
+            os.remove(path)
+        self.assertEqual(list(rows[0]), CSV_COLUMNS)
+        self.assertEqual(len(rows), len(files))
+        row = rows[[entry['path'] for entry in files].index(
+            self.runs[0])]
+        self.assertEqual(row['msi'], 'Discharge')
+        self.assertEqual(row['controls'], '6K Compumotor;Waveform')
+        self.assertEqual(row['main digitizer'], 'SIS crate')
+        row = rows[[entry['path'] for entry in files].index(self.bad)]
+        self.assertTrue(row['error'].startswith('OSError'))
+        self.assertEqual(row['msi'], '')
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # JSON to stdout
+            with redirect_stdout(io.StringIO()) as out:
+                self.assertEqual(main([self.runs[0], '-j', '1', '-q']),
+                                 0)
+            inventory = json.loads(out.getvalue())
+            self.assertEqual(len(inventory['files']), 1)
+
+            # CSV from the file extension, with a cache
+            path = os.path.join(tmpdir, 'inventory.csv')
+            args = [self.root, '-o', path, '-j', '2',
+                    '--cache-dir', os.path.join(tmpdir, 'cache')]
+            with redirect_stderr(io.StringIO()) as err:
+                self.assertEqual(main(args), 0)
+                self.assertEqual(main(args), 0)
+            self.assertEqual(err.getvalue().splitlines()[-1][:31],
+                             '3 file(s) (2 cached, 1 failed) ')
+            with open(path, 'r', newline='') as f:
+                self.assertEqual(len(list(csv.DictReader(f))), 3)
+
+            # missing path
+            with redirect_stderr(io.StringIO()) as err:
+                self.assertEqual(
+                    main([os.path.join(tmpdir, 'missing.hdf5')]), 1)
+            self.assertIn('No such file', err.getvalue())
+
+
+if __name__ == '__main__':
+    ut.main()
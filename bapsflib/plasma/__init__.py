@@ -8,6 +8,7 @@
 # License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
 #   license terms and contributor agreement.
 #
-from . import core
+from bapsflib.utils import lazyload
 
-__all__ = ['core']
+__getattr__, __dir__, __all__ = lazyload.attach(
+    __name__, submodules=['core', 'vectorized'])
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import astropy.units as u
+import numpy as np
+import unittest as ut
+
+from .. import (core, vectorized)
+
+
+class TestVectorized(ut.TestCase):
+    """Test case for :mod:`bapsflib.plasma.vectorized`."""
+
+    def setUp(self):
+        # 2 x 3 maps of the base plasma values
+        self.Bo = np.array([[500.], [1000.]])
+        self.n_e = np.array([1.e11, 1.e12, 5.e12])
+        self.kTe = np.array([[1., 5., 10.], [2., 4., 8.]])
+        self.kTi = 0.5
+        self.m_i = 4.0 * core.AMU
+        self.Z = 1
+
+    def test_functions(self):
+        args = {'Bo': self.Bo, 'n_e': self.n_e, 'n_i': self.n_e,
+                'kT': self.kTe, 'n': self.n_e, 'kTe': self.kTe,
+                'kTi': self.kTi, 'm_i': self.m_i, 'Z': self.Z,
+                'gamma': 1.0}
+        bargs = dict(zip(args.keys(), np.broadcast_arrays(
+            *[np.asarray(val) for val in args.values()])))
+        for name in vectorized.__all__:
+            if name in ('ArrayUnit', 'plasma_parameters'):
+                continue
+            func = getattr(vectorized, name)
+            result = func(**args)
+            self.assertIsInstance(result, vectorized.ArrayUnit)
+
+            # element-wise agreement with the scalar functions
+            expected = [getattr(core, name)(
+                **{key: val[ii] for key, val in bargs.items()})
+                for ii in np.ndindex(*bargs['Bo'].shape)]
+            self.assertEqual(result.unit, expected[0].unit)
+            np.testing.assert_allclose(
+                np.broadcast_to(result, bargs['Bo'].shape).ravel(),
+                expected, rtol=1.e-12)
+
+    def test_quantities(self):
+        n_e = self.n_e * u.cm ** -3
+        np.testing.assert_allclose(
+            vectorized.fpe(n_e.to(u.m ** -3)), vectorized.fpe(self.n_e))
+        np.testing.assert_allclose(
+            vectorized.fce(self.Bo * 1.e-4 * u.T),
+            vectorized.fce(self.Bo))
+        np.testing.assert_allclose(
+            vectorized.vTe((self.kTe * u.eV).to(
+                u.K, equivalencies=u.temperature_energy())),
+            vectorized.vTe(self.kTe), rtol=1.e-10)
+        np.testing.assert_allclose(
+            vectorized.VA(self.Bo, (4.0 * u.u), self.n_e),
+            vectorized.VA(self.Bo, self.m_i, self.n_e), rtol=1.e-6)
+        self.assertRaises(u.UnitConversionError, vectorized.fce,
+                          self.Bo * u.m)
+
+    def test_array_unit(self):
+        arr = vectorized.ArrayUnit([[1., 2.], [3., 4.]], 'cm')
+        self.assertEqual(arr.unit, 'cm')
+        self.assertEqual(arr[0].unit, 'cm')
+        self.assertEqual(arr.T.unit, 'cm')
+
+        # arithmetic drops the unit
+        self.assertNotIsInstance(arr * 2.0, vectorized.ArrayUnit)
+        self.assertNotIsInstance(arr.sum(), vectorized.ArrayUnit)
+
+        # scalars give 0-D arrays
+        arr = vectorized.fpe(1.e12)
+        self.assertEqual(arr.shape, ())
+        self.assertAlmostEqual(float(arr), core.fpe(1.e12))
+
+    def test_plasma_parameters(self):
+        params = vectorized.plasma_parameters(
+            self.Bo, self.kTe, self.kTi, self.m_i, self.n_e, self.Z)
+        for key in ('Bo', 'gamma', 'kT', 'kTe', 'kTi', 'm_i', 'n',
+                    'n_e', 'n_i', 'Z', 'fce', 'fci', 'fpe', 'fpi',
+                    'fUH', 'fLH', 'lD', 'lpe', 'lpi', 'rce', 'rci',
+                    'cs', 'VA', 'vTe', 'vTi'):
+            self.assertEqual(params[key].shape, (2, 3))
+            self.assertIsInstance(params[key], vectorized.ArrayUnit)
+        self.assertEqual(params['Bo'].unit, 'G')
+        self.assertEqual(params['lD'].unit, 'cm')
+        np.testing.assert_array_equal(params['kT'], params['kTe'])
+        np.testing.assert_allclose(
+            params['VA'][1, 2],
+            core.VA(1000., self.m_i, 5.e12), rtol=1.e-12)
+
+        # separate Debye length temperature and density
+        params = vectorized.plasma_parameters(
+            self.Bo, self.kTe, self.kTi, self.m_i, self.n_e, 2,
+            kT=self.kTi, n=1.e12)
+        np.testing.assert_allclose(params['lD'],
+                                   core.lD(self.kTi, 1.e12))
+        np.testing.assert_allclose(
+            params['n_i'], np.broadcast_to(self.n_e / 2, (2, 3)))
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,415 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Array-valued plasma parameters (in cgs).
+
+The functions of this module use the same formulas, names, and
+arguments as those of :mod:`~bapsflib.plasma.core`, but accept
+array-like arguments that are broadcast against each other (e.g. a
+:code:`(nx, ny)` density map with a :code:`(nx, 1)` field profile).
+An argument can also be an :class:`astropy.units.Quantity`, which is
+converted to the cgs unit of the argument (temperatures can be given
+in eV or K).  Results are :class:`ArrayUnit` arrays.
+
+:Example:
+
+    >>> import numpy as np
+    >>> from bapsflib.plasma import vectorized as vp
+    >>> from bapsflib.plasma.core import AMU
+    >>>
+    >>> # electron-plasma frequency (Hz) of a density map
+    >>> n_e = np.array([[1.e12, 2.e12], [3.e12, 4.e12]])
+    >>> vp.fpe(n_e).shape
+    (2, 2)
+    >>>
+    >>> # all parameters at once
+    >>> params = vp.plasma_parameters(
+    ...     Bo=[500., 1000.], kTe=5., kTi=1., m_i=4. * AMU,
+    ...     n_e=1.e12, Z=1)
+    >>> params['fce'].unit
+    'Hz'
+"""
+import numpy as np
+
+from astropy import units as u
+from scipy import constants
+from typing import Dict
+
+from .core import (C, E, ME)
+
+__all__ = ['ArrayUnit', 'cs', 'fce', 'fci', 'fLH', 'fpe', 'fpi', 'fUH',
+           'lD', 'lpe', 'lpi', 'oce', 'oci', 'oLH', 'ope', 'opi', 'oUH',
+           'plasma_parameters', 'rce', 'rci', 'VA', 'vTe', 'vTi']
+
+#: conversion factor from eV to erg
+_EV_TO_ERG = constants.e * 1.e7
+
+
+class ArrayUnit(np.ndarray):
+    """
+    Template class for arrays with a unit attribute.  Like
+    :class:`~bapsflib.plasma.core.FloatUnit`, the unit is kept by
+    indexing and slicing, but dropped by arithmetic.
+    """
+
+    def __new__(cls, value, cgs_unit):
+        """
+        :param value: array-like value
+        :param str cgs_unit: string representation of of cgs unit
+        """
+        obj = np.asarray(value, dtype=np.float64).view(cls)
+        obj._unit = cgs_unit
+        return obj
+
+    def __array_finalize__(self, obj):
+        self._unit = getattr(obj, '_unit', None)
+
+    def __array_wrap__(self, out_arr, context=None):
+        # results of ufuncs (arithmetic) are plain arrays
+        return np.ndarray.__array_wrap__(self, out_arr,
+                                         context).view(np.ndarray)
+
+    @property
+    def unit(self):
+        """units of array"""
+        return self._unit
+
+
+def _cgs(value, unit: u.UnitBase, equivalencies=None) -> np.ndarray:
+    """
+    Convert **value** to a float array in **unit** if it is a
+    :class:`~astropy.units.Quantity`, or take it as already in
+    **unit** otherwise.
+    """
+    if isinstance(value, u.Quantity):
+        value = value.to_value(unit, equivalencies=equivalencies)
+    return np.asarray(value, dtype=np.float64)
+
+
+def _B(Bo):
+    return _cgs(Bo, u.G)
+
+
+def _kT(kT):
+    """temperature in erg"""
+    return _cgs(kT, u.eV, u.temperature_energy()) * _EV_TO_ERG
+
+
+def _m(m):
+    return _cgs(m, u.g)
+
+
+def _n(n):
+    return _cgs(n, u.cm ** -3)
+
+
+def _Z(Z):
+    return _cgs(Z, u.dimensionless_unscaled)
+
+
+# ---- frequency constants ----
+def fce(Bo, **kwargs):
+    """
+    electron-cyclotron frequency (Hz), see
+    :func:`bapsflib.plasma.core.fce`
+
+    :param Bo: magnetic field (in Gauss)
+    """
+    return ArrayUnit(oce(Bo) / (2.0 * np.pi), 'Hz')
+
+
+def fci(Bo, m_i, Z, **kwargs):
+    """
+    ion-cyclotron frequency (Hz), see
+    :func:`bapsflib.plasma.core.fci`
+
+    :param Bo: magnetic-field (in Gauss)
+    :param m_i: ion-mass (in g)
+    :param Z: charge number
+    """
+    return ArrayUnit(oci(Bo, m_i, Z) / (2.0 * np.pi), 'Hz')
+
+
+def fLH(Bo, m_i, n_i, Z, **kwargs):
+    """
+    Lower-Hybrid Resonance frequency (Hz), see
+    :func:`bapsflib.plasma.core.fLH`
+
+    :param Bo: magnetic field (in Gauss)
+    :param m_i: ion mass (in g)
+    :param n_i: ion number density (in :math:`cm^{-3}`)
+    :param Z: ion charge number
+    """
+    return ArrayUnit(oLH(Bo, m_i, n_i, Z) / (2.0 * np.pi), 'Hz')
+
+
+def fpe(n_e, **kwargs):
+    """
+    electron-plasma frequency (Hz), see
+    :func:`bapsflib.plasma.core.fpe`
+
+    :param n_e: electron number density (in :math:`cm^{-3}`)
+    """
+    return ArrayUnit(ope(n_e) / (2.0 * np.pi), 'Hz')
+
+
+def fpi(m_i, n_i, Z, **kwargs):
+    """
+    ion-plasma frequency (Hz), see :func:`bapsflib.plasma.core.fpi`
+
+    :param m_i: ion mass (in g)
+    :param n_i: ion number density (in :math:`cm^{-3}`)
+    :param Z: ion charge number
+    """
+    return ArrayUnit(opi(m_i, n_i, Z) / (2.0 * np.pi), 'Hz')
+
+
+def fUH(Bo, n_e, **kwargs):
+    """
+    Upper-Hybrid Resonance frequency (Hz), see
+    :func:`bapsflib.plasma.core.fUH`
+
+    :param Bo: magnetic field (in Gauss)
+    :param n_e: electron number density (in :math:`cm^{-3}`)
+    """
+    return ArrayUnit(oUH(Bo, n_e) / (2.0 * np.pi), 'Hz')
+
+
+def oce(Bo, **kwargs):
+    """
+    electron-cyclotron frequency (rad/s), see
+    :func:`bapsflib.plasma.core.oce`
+
+    :param Bo: magnetic-field (in Gauss)
+    """
+    return ArrayUnit((-E * _B(Bo)) / (ME * C), 'rad s^-1')
+
+
+def oci(Bo, m_i, Z, **kwargs):
+    """
+    ion-cyclotron frequency (rad/s), see
+    :func:`bapsflib.plasma.core.oci`
+
+    :param Bo: magnetic-field (in Gauss)
+    :param m_i: ion-mass (in g)
+    :param Z: charge number
+    """
+    return ArrayUnit((_Z(Z) * E * _B(Bo)) / (_m(m_i) * C),
+                     'rad s^-1')
+
+
+def oLH(Bo, m_i, n_i, Z, **kwargs):
+    """
+    Lower-Hybrid Resonance frequency (rad/s), see
+    :func:`bapsflib.plasma.core.oLH`
+
+    :param Bo: magnetic field (in Gauss)
+    :param m_i: ion mass (in g)
+    :param n_i: ion number density (in :math:`cm^{-3}`)
+    :param Z: ion charge number
+    """
+    _opi = opi(m_i, n_i, Z)
+    _oce = oce(Bo)
+    _oci = oci(Bo, m_i, Z)
+    first_term = 1.0 / ((_oci ** 2) + (_opi ** 2))
+    second_term = 1.0 / np.abs(_oce * _oci)
+    return ArrayUnit(np.sqrt(1.0 / (first_term + second_term)),
+                     'rad s^-1')
+
+
+def ope(n_e, **kwargs):
+    """
+    electron-plasma frequency (rad/s), see
+    :func:`bapsflib.plasma.core.ope`
+
+    :param n_e: electron number density (in :math:`cm^{-3}`)
+    """
+    return ArrayUnit(np.sqrt(4 * np.pi * _n(n_e) * E * E / ME),
+                     'rad s^-1')
+
+
+def opi(m_i, n_i, Z, **kwargs):
+    """
+    ion-plasma frequency (rad/s), see
+    :func:`bapsflib.plasma.core.opi`
+
+    :param m_i: ion mass (in g)
+    :param n_i: ion number density (in :math:`cm^{-3}`)
+    :param Z: ion charge number
+    """
+    ZE = _Z(Z) * E
+    return ArrayUnit(np.sqrt(4 * np.pi * _n(n_i) * ZE * ZE / _m(m_i)),
+                     'rad s^-1')
+
+
+def oUH(Bo, n_e, **kwargs):
+    """
+    Upper-Hybrid Resonance frequency (rad/s), see
+    :func:`bapsflib.plasma.core.oUH`
+
+    :param Bo: magnetic field (in Gauss)
+    :param n_e: electron number density (in :math:`cm^{-3}`)
+    """
+    return ArrayUnit(np.sqrt((ope(n_e) ** 2) + (oce(Bo) ** 2)),
+                     'rad s^-1')
+
+
+# ---- length constants ----
+def lD(kT, n, **kwargs):
+    """
+    Debye Length (cm), see :func:`bapsflib.plasma.core.lD`
+
+    :param kT: temperature (in eV)
+    :param n: number density (in :math:`cm^{-3}`)
+    """
+    return ArrayUnit(np.sqrt(_kT(kT) / (4.0 * np.pi * _n(n))) / E,
+                     'cm')
+
+
+def lpe(n_e, **kwargs):
+    """
+    electron-inertial length (cm), see
+    :func:`bapsflib.plasma.core.lpe`
+
+    :param n_e: electron number density (in :math:`cm^{-3}`)
+    """
+    return ArrayUnit(C / ope(n_e), 'cm')
+
+
+def lpi(m_i, n_i, Z, **kwargs):
+    """
+    ion-inertial length (cm), see :func:`bapsflib.plasma.core.lpi`
+
+    :param m_i: ion mass (in g)
+    :param n_i: ion number density (in :math:`cm^{-3}`)
+    :param Z: ion charge number
+    """
+    return ArrayUnit(C / opi(m_i, n_i, Z), 'cm')
+
+
+def rce(Bo, kTe, **kwargs):
+    """
+    electron gyroradius (cm), see :func:`bapsflib.plasma.core.rce`
+
+    :param Bo: magnetic field (in Gauss)
+    :param kTe: electron temperature (in eV)
+    """
+    return ArrayUnit(vTe(kTe) / np.abs(oce(Bo)), 'cm')
+
+
+def rci(Bo, kTi, m_i, Z, **kwargs):
+    """
+    ion gyroradius (cm), see :func:`bapsflib.plasma.core.rci`
+
+    :param Bo: magnetic field (in Gauss)
+    :param kTi: ion temperature (in eV)
+    :param m_i: ion mass (in g)
+    :param Z: ion charge number
+    """
+    return ArrayUnit(vTi(kTi, m_i) / oci(Bo, m_i, Z), 'cm')
+
+
+# ---- velocity constants ----
+def cs(kTe, m_i, Z, gamma=1.0, **kwargs):
+    """
+    ion sound speed (cm/s), see :func:`bapsflib.plasma.core.cs`
+
+    :param kTe: electron temperature (in eV)
+    :param m_i: ion mass (in g)
+    :param Z: charge number
+    :param gamma: adiabatic index
+    """
+    return ArrayUnit(
+        np.sqrt(_cgs(gamma, u.dimensionless_unscaled) * _Z(Z)
+                * _kT(kTe) / _m(m_i)),
+        'cm s^-1')
+
+
+def VA(Bo, m_i, n_i, **kwargs):
+    """
+    Alfvén Velocity (cm/s), see :func:`bapsflib.plasma.core.VA`
+
+    :param Bo: magnetic field (in Gauss)
+    :param m_i: ion mass (in g)
+    :param n_i: ion number density (in :math:`cm^{-3}`)
+    """
+    return ArrayUnit(_B(Bo) / np.sqrt(4.0 * np.pi * _n(n_i) * _m(m_i)),
+                     'cm s^-1')
+
+
+def vTe(kTe, **kwargs):
+    """
+    electron thermal velocity (cm/s), see
+    :func:`bapsflib.plasma.core.vTe`
+
+    :param kTe: electron temperature (in eV)
+    """
+    return ArrayUnit(np.sqrt(_kT(kTe) / ME), 'cm s^-1')
+
+
+def vTi(kTi, m_i, **kwargs):
+    """
+    ion thermal velocity (cm/s), see :func:`bapsflib.plasma.core.vTi`
+
+    :param kTi: ion temperature (in eV)
+    :param m_i: ion mass (in g)
+    """
+    return ArrayUnit(np.sqrt(_kT(kTi) / _m(m_i)), 'cm s^-1')
+
+
+def plasma_parameters(Bo, kTe, kTi, m_i, n_e, Z, gamma=1.0, kT=None,
+                      n=None) -> Dict[str, ArrayUnit]:
+    """
+    Compute the key frequencies, lengths, and velocities of
+    :attr:`~bapsflib._hdf.utils.hdfreaddata.HDFReadData.plasma` in one
+    pass, with all arguments broadcast against each other.
+
+    :param Bo: magnetic field (in Gauss)
+    :param kTe: electron temperature (in eV)
+    :param kTi: ion temperature (in eV)
+    :param m_i: ion mass (in g)
+    :param n_e: electron number density (in :math:`cm^{-3}`)
+    :param Z: ion charge number
+    :param gamma: adiabatic index (DEFAULT :code:`1.0`)
+    :param kT: temperature for the Debye length, DEFAULT is **kTe**
+    :param n: number density for the Debye length, DEFAULT is **n_e**
+    :return: dictionary of the base values (:code:`'Bo'`,
+        :code:`'kTe'`, :code:`'n_i'`, ...) and computed parameters
+        (:code:`'fce'`, :code:`'lD'`, :code:`'VA'`, ...), each
+        broadcast to the common shape of the arguments
+    """
+    base = {
+        'Bo': ArrayUnit(_B(Bo), 'G'),
+        'gamma': ArrayUnit(_cgs(gamma, u.dimensionless_unscaled),
+                           'arb'),
+        'kTe': ArrayUnit(_kT(kTe) / _EV_TO_ERG, 'eV'),
+        'kTi': ArrayUnit(_kT(kTi) / _EV_TO_ERG, 'eV'),
+        'm_i': ArrayUnit(_m(m_i), 'g'),
+        'n_e': ArrayUnit(_n(n_e), 'cm^-3'),
+        'Z': ArrayUnit(_Z(Z), 'arb'),
+    }
+    base['n_i'] = ArrayUnit(base['n_e'] / base['Z'], 'cm^-3')
+    base['kT'] = base['kTe'] if kT is None \
+        else ArrayUnit(_kT(kT) / _EV_TO_ERG, 'eV')
+    base['n'] = base['n_e'] if n is None else ArrayUnit(_n(n), 'cm^-3')
+
+    params = dict(base)
+    for func in (fce, fci, fpe, fpi, fUH, fLH,  # frequencies
+                 lD, lpe, lpi, rce, rci,  # lengths
+                 cs, VA, vTe, vTi):  # velocities
+        params[func.__name__] = func(**base)
+
+    # broadcast everything to a common shape
+    shape = np.broadcast(*base.values()).shape
+    for key, value in params.items():
+        params[key] = ArrayUnit(np.broadcast_to(value, shape).copy(),
+                                value.unit)
+    return params
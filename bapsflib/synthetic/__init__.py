@@ -0,0 +1,31 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Package for generating synthetic LaPD HDF5 files.  The Faux* builders
+of :mod:`~.faux` build small HDF5 test files group by group, and
+:func:`~.writer.write_synthetic_file` stream-writes files of arbitrary
+size for load testing.  A command line interface is provided by
+:mod:`~.cli`::
+
+    python -m bapsflib.synthetic run.hdf5 --target-size 2G
+"""
+from . import (cli, faux, writer)
+from .faux import (FauxDischarge, FauxGasPressure, FauxHDFBuilder,
+                   FauxHeater, FauxInterferometerArray,
+                   FauxMagneticField, FauxN5700PS, FauxNIXZ,
+                   FauxSIS3301, FauxSISCrate, FauxSixK, FauxWaveform)
+from .writer import write_synthetic_file
+
+__all__ = ['cli', 'faux', 'FauxDischarge', 'FauxGasPressure',
+           'FauxHDFBuilder', 'FauxHeater', 'FauxInterferometerArray',
+           'FauxMagneticField', 'FauxN5700PS', 'FauxNIXZ',
+           'FauxSIS3301', 'FauxSISCrate', 'FauxSixK', 'FauxWaveform',
+           'write_synthetic_file', 'writer']
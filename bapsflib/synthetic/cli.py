@@ -0,0 +1,167 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Command line interface for
+:func:`~bapsflib.synthetic.writer.write_synthetic_file`.
+
+:Example:
+
+    Write a ~2 GB file with 8 SIS 3302 channels, a 5-shot gap starting
+    at shot number 1000, and a :code:`'Waveform'` device missing the
+    first 3 shots::
+
+        $ bapsflib-synthetic run.hdf5 --target-size 2G --channels 8 \\
+              --gap 1000:5 --misalign Waveform:3
+"""
+import argparse
+import os
+import sys
+import time
+
+from typing import (List, Tuple)
+
+from .writer import (parse_size, write_synthetic_file)
+
+__all__ = ['build_parser', 'main']
+
+
+def _gap(value: str) -> Tuple[int, int]:
+    """Parse a :code:`'start:length'` gap argument."""
+    try:
+        start, length = value.split(':')
+        return int(start), int(length)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "gap '{}' is not of the form 'start:length'".format(value))
+
+
+def _misalign(value: str) -> Tuple[str, int]:
+    """Parse a :code:`'device:shift'` misalignment argument."""
+    try:
+        name, shift = value.rsplit(':', 1)
+        return name, int(shift)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "misalignment '{}' is not of the form ".format(value)
+            + "'device:shift'")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser of the CLI."""
+    parser = argparse.ArgumentParser(
+        prog='bapsflib-synthetic',
+        description='Stream-write a synthetic LaPD HDF5 file for load '
+                    'testing.')
+    parser.add_argument('path', help='path of the HDF5 file to write')
+
+    size = parser.add_mutually_exclusive_group(required=True)
+    size.add_argument('-n', '--shots', type=int, dest='sn_size',
+                      help='number of recorded shots')
+    size.add_argument('-s', '--target-size', type=parse_size,
+                      help="approximate digitizer data size "
+                           "(e.g. '500M', '2G')")
+
+    digi = parser.add_argument_group('digitizer')
+    digi.add_argument('--digitizer', default='SIS crate',
+                      choices=['SIS crate', 'SIS 3301'])
+    digi.add_argument('--nt', type=int, default=10000,
+                      help='samples per trace (default: %(default)s)')
+    digi.add_argument('--boards', type=int, default=1, dest='n_boards',
+                      help='active SIS 3302/3301 boards')
+    digi.add_argument('--channels', type=int, default=1,
+                      dest='n_channels',
+                      help='active channels per board')
+    digi.add_argument('--sis3305-boards', type=int, default=0,
+                      help='active SIS 3305 boards')
+    digi.add_argument('--sis3305-mode', type=int, default=0,
+                      choices=[0, 1, 2],
+                      help='SIS 3305 mode (0 = 1.25 GHz, 1 = 2.5 GHz, '
+                           '2 = 5 GHz)')
+
+    devs = parser.add_argument_group('controls & MSI')
+    devs.add_argument('--controls', nargs='*',
+                      default=['6K Compumotor', 'Waveform'],
+                      help='control devices to add')
+    devs.add_argument('--probes', type=int, default=1, dest='n_probes',
+                      help="number of '6K Compumotor' probes")
+    devs.add_argument('--waveform-configs', type=int, default=1,
+                      help="number of 'Waveform' configurations")
+    devs.add_argument('--shots-per-position', type=int, default=1,
+                      help='shots recorded at each motion list '
+                           'position')
+    devs.add_argument('--msi', nargs='*',
+                      default=['Discharge', 'Gas pressure', 'Heater',
+                               'Interferometer array',
+                               'Magnetic field'],
+                      help='MSI diagnostics to add')
+
+    shots = parser.add_argument_group('shot numbers')
+    shots.add_argument('--gap', type=_gap, action='append',
+                       dest='gaps', metavar='START:LENGTH',
+                       help='remove LENGTH shot numbers starting at '
+                            'START (repeatable)')
+    shots.add_argument('--misalign', type=_misalign, action='append',
+                       metavar='DEVICE:SHIFT',
+                       help='drop the first SHIFT (last -SHIFT) shots '
+                            'of DEVICE (repeatable)')
+
+    parser.add_argument('--chunk-size', type=int,
+                        help='shots written per chunk')
+    parser.add_argument('--seed', type=int,
+                        help='random number generator seed')
+    parser.add_argument('-f', '--overwrite', action='store_true',
+                        help='overwrite an existing file')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='do not print a summary')
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Entry point of the :code:`bapsflib-synthetic` command.
+
+    :param argv: command line arguments (DEFAULT :code:`sys.argv[1:]`)
+    :return: exit status
+    """
+    args = build_parser().parse_args(argv)
+
+    tstart = time.time()
+    try:
+        path = write_synthetic_file(
+            args.path,
+            sn_size=args.sn_size,
+            nt=args.nt,
+            target_size=args.target_size,
+            digitizer=args.digitizer,
+            n_boards=args.n_boards,
+            n_channels=args.n_channels,
+            sis3305_boards=args.sis3305_boards,
+            sis3305_mode=args.sis3305_mode,
+            n_probes=args.n_probes,
+            waveform_configs=args.waveform_configs,
+            controls=args.controls,
+            msi=args.msi,
+            gaps=args.gaps,
+            misalign=dict(args.misalign or []),
+            shots_per_position=args.shots_per_position,
+            chunk_size=args.chunk_size,
+            seed=args.seed,
+            overwrite=args.overwrite)
+    except (FileExistsError, ValueError) as err:
+        print('bapsflib-synthetic: error: {}'.format(err),
+              file=sys.stderr)
+        return 1
+
+    if not args.quiet:
+        print('wrote {} ({:.1f} MB) in {:.1f} s'.format(
+            path, os.path.getsize(path) / 1024 ** 2,
+            time.time() - tstart))
+    return 0
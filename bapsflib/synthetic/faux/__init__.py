@@ -0,0 +1,26 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Faux* builders that lay out the HDF5 groups and datasets of the
+control devices, digitizers, and MSI diagnostics recorded at BaPSF.
+:class:`FauxHDFBuilder` assembles them into a (temporary) HDF5 file
+and is used throughout the test suite.
+"""
+from .controls import (FauxN5700PS, FauxNIXZ, FauxSixK, FauxWaveform)
+from .digitizers import (FauxSIS3301, FauxSISCrate)
+from .fauxhdfbuilder import FauxHDFBuilder
+from .msi import (FauxDischarge, FauxGasPressure, FauxHeater,
+                  FauxInterferometerArray, FauxMagneticField)
+
+__all__ = ['FauxDischarge', 'FauxGasPressure', 'FauxHDFBuilder',
+           'FauxHeater', 'FauxInterferometerArray', 'FauxMagneticField',
+           'FauxN5700PS', 'FauxNIXZ', 'FauxSIS3301', 'FauxSISCrate',
+           'FauxSixK', 'FauxWaveform']
@@ -14,17 +14,17 @@ import os
 import platform
 import tempfile
 
-from ..controls.tests import (
+from .controls import (
     FauxN5700PS,
     FauxNIXZ,
     FauxSixK,
     FauxWaveform,
 )
-from ..digitizers.tests import (
+from .digitizers import (
     FauxSIS3301,
     FauxSISCrate,
 )
-from ..msi.tests import (
+from .msi import (
     FauxDischarge,
     FauxGasPressure,
     FauxHeater,
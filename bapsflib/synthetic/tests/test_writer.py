@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import io
+import numpy as np
+import os
+import tempfile
+import unittest as ut
+import warnings
+
+from bapsflib.lapd import File
+from contextlib import redirect_stderr
+from unittest import mock
+
+from ..cli import main
+from ..writer import (build_shotnum, parse_size, write_synthetic_file)
+
+
+class TestSyntheticWriter(ut.TestCase):
+    """
+    Test case for
+    :func:`~bapsflib.synthetic.writer.write_synthetic_file`.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'synthetic.hdf5')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_parse_size(self):
+        self.assertEqual(parse_size(100), 100)
+        self.assertEqual(parse_size('100'), 100)
+        self.assertEqual(parse_size('2K'), 2048)
+        self.assertEqual(parse_size('1.5M'), int(1.5 * 1024 ** 2))
+        self.assertEqual(parse_size('2GB'), 2 * 1024 ** 3)
+        self.assertRaises(ValueError, parse_size, 'two')
+
+    def test_build_shotnum(self):
+        sn = build_shotnum(10)
+        self.assertTrue(np.array_equal(sn, np.arange(1, 11)))
+
+        sn = build_shotnum(10, gaps=[(3, 2), (8, 1)])
+        self.assertEqual(sn.size, 10)
+        self.assertTrue(np.array_equal(
+            sn, [1, 2, 5, 6, 7, 9, 10, 11, 12, 13]))
+
+        self.assertRaises(ValueError, build_shotnum, 10, [(0, 2)])
+
+    def test_write(self):
+        path = write_synthetic_file(
+            self.path, sn_size=50, nt=64, n_channels=2,
+            sis3305_boards=1, sis3305_mode=1, n_probes=2,
+            gaps=[(10, 5)], misalign={'Waveform': 3, 'Heater': -2},
+            chunk_size=7, seed=1)
+        self.assertEqual(path, self.path)
+        self.assertTrue(os.path.exists(path))
+
+        # refuse to overwrite
+        self.assertRaises(FileExistsError, write_synthetic_file,
+                          self.path, sn_size=10)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            with File(path) as lapdf:
+                self.assertEqual(list(lapdf.digitizers), ['SIS crate'])
+                self.assertEqual(sorted(lapdf.controls),
+                                 ['6K Compumotor', 'Waveform'])
+                self.assertEqual(len(lapdf.msi), 5)
+
+                # digitizer data
+                data = lapdf.read_data(1, 1, adc='SIS 3302')
+                sn = build_shotnum(50, gaps=[(10, 5)])
+                self.assertEqual(data.shape, (50,))
+                self.assertEqual(data['signal'].shape, (50, 64))
+                self.assertTrue(np.array_equal(data['shotnum'], sn))
+                self.assertTrue(np.all(np.isfinite(data['signal'])))
+
+                data = lapdf.read_data(1, 1, adc='SIS 3305',
+                                       shotnum=[1, 2])
+                self.assertEqual(data.shape, (2,))
+
+                # raw signals are unsigned bit values and match the
+                # 'Min' and 'Max' header fields
+                group = lapdf['Raw data + config/SIS crate']
+                for name in group:
+                    if not name.endswith(' headers'):
+                        continue
+                    header = group[name][...]
+                    signal = group[name[:-len(' headers')]][...]
+                    self.assertTrue(np.all(signal >= 0))
+                    self.assertTrue(np.array_equal(header['Min'],
+                                                   signal.min(axis=1)))
+                    self.assertTrue(np.array_equal(header['Max'],
+                                                   signal.max(axis=1)))
+
+                # control data
+                data = lapdf.read_data(
+                    1, 1, adc='SIS 3302',
+                    add_controls=[('6K Compumotor', 1)])
+                self.assertFalse(np.all(data['xyz'][:, 0] == 0.0))
+
+                # misaligned devices
+                data = lapdf.read_data(1, 1, adc='SIS 3302',
+                                       add_controls=['Waveform'])
+                self.assertTrue(np.array_equal(data['shotnum'], sn[3:]))
+                msi = lapdf.read_msi('Heater')
+                self.assertTrue(np.array_equal(msi['shotnum'],
+                                               sn[:-2]))
+                msi = lapdf.read_msi('Magnetic field')
+                self.assertEqual(msi.shape, (50,))
+
+    def test_target_size(self):
+        write_synthetic_file(self.path, target_size='100K', nt=128,
+                             controls=[], msi=[],
+                             digitizer='SIS 3301', seed=0)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            with File(self.path) as lapdf:
+                data = lapdf.read_data(0, 0)
+                self.assertEqual(data.shape,
+                                 (100 * 1024 // (2 * 128),))
+
+        # invalid inputs
+        self.assertRaises(ValueError, write_synthetic_file,
+                          self.path, overwrite=True)
+        self.assertRaises(ValueError, write_synthetic_file,
+                          self.path, sn_size=10, digitizer='SIS 3302',
+                          overwrite=True)
+
+    def test_partial_write(self):
+        # a failure part-way must not leave a partly written file
+        with mock.patch('bapsflib.synthetic.writer._write_control',
+                        side_effect=RuntimeError):
+            self.assertRaises(RuntimeError, write_synthetic_file,
+                              self.path, sn_size=10, nt=32, msi=[])
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_cli(self):
+        self.assertEqual(
+            main([self.path, '--shots', '20', '--nt', '32',
+                  '--gap', '5:2', '--misalign', 'Waveform:-1',
+                  '--msi', 'Discharge', '--seed', '0', '-q']),
+            0)
+        self.assertTrue(os.path.exists(self.path))
+
+        # file exists
+        with redirect_stderr(io.StringIO()) as err:
+            self.assertEqual(main([self.path, '--shots', '20', '-q']),
+                             1)
+        self.assertIn('already exists', err.getvalue())
+
+        # bad gap
+        with redirect_stderr(io.StringIO()):
+            self.assertRaises(SystemExit, main,
+                              [self.path, '--shots', '20',
+                               '--gap', '5'])
+
+
+if __name__ == '__main__':
+    ut.main()
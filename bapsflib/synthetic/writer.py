@@ -0,0 +1,474 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Streaming writer for large synthetic LaPD HDF5 files.
+
+The group layout and attributes are generated with the Faux* builders
+(e.g. :class:`~bapsflib.synthetic.faux.FauxSISCrate`) at a
+tiny shot count, then every per-shot dataset is re-created at full size
+and filled chunk-by-chunk.  This keeps memory usage bounded by the
+chunk size regardless of the final file size.
+"""
+import h5py
+import math
+import numpy as np
+import os
+import warnings
+
+from bapsflib._hdf.utils.memory import parse_size
+from typing import (Callable, Dict, Iterable, Tuple, Union)
+
+from .faux import FauxHDFBuilder
+
+__all__ = ['SHOTS_LAYOUT', 'build_shotnum', 'parse_size',
+           'write_synthetic_file']
+
+#: number of shots the Faux* builders lay out before the datasets are
+#: re-created at full size
+SHOTS_LAYOUT = 10
+
+#: approximate number of bytes written per chunk
+CHUNK_BYTES = 64 * 1024 * 1024
+
+# Note: the Faux* MSI builders always lay out 2 rows per dataset
+_MSI_LAYOUT_ROWS = 2
+
+# constant levels added to floating-point MSI traces
+_MSI_LEVELS = {
+    'Magnetic field profile': 1000.0,
+    'Magnet power supply currents': 2600.0,
+    'Cathode-anode voltage': 100.0,
+    'Discharge current': 5000.0,
+}
+
+# bit resolution of the digitizer ADCs
+_ADC_BITS = {
+    'SIS 3301': 14,
+    'SIS 3302': 16,
+    'SIS 3305': 10,
+}
+
+_KNOWN_MSI = ('Discharge', 'Gas pressure', 'Heater',
+              'Interferometer array', 'Magnetic field')
+
+
+def build_shotnum(sn_size: int,
+                  gaps: Iterable[Tuple[int, int]] = None) -> np.ndarray:
+    """
+    Build the global shot number array of a run with **sn_size**
+    recorded shots.
+
+    :param sn_size: number of recorded shots
+    :param gaps: iterable of :code:`(start, length)` tuples, each
+        removing :code:`length` shot numbers beginning at shot
+        number :code:`start`
+    :return: sorted :code:`np.uint32` array of length **sn_size**
+    """
+    gaps = [] if gaps is None else sorted(gaps)
+    total_gap = sum(length for _, length in gaps)
+
+    shotnum = np.arange(1, sn_size + total_gap + 1, dtype=np.uint32)
+    mask = np.ones(shotnum.shape, dtype=bool)
+    for start, length in gaps:
+        if start < 1 or length < 0:
+            raise ValueError(
+                'gap ({}, {}) is not valid'.format(start, length))
+        mask[start - 1:start - 1 + length] = False
+    shotnum = shotnum[mask]
+
+    return shotnum[:sn_size]
+
+
+def _misalign(shotnum: np.ndarray, shift: int) -> np.ndarray:
+    """
+    Apply a per-device misalignment.  A positive **shift** drops the
+    first :code:`shift` shots of the device, a negative **shift** drops
+    the last :code:`abs(shift)` shots.
+    """
+    if shift > 0:
+        return shotnum[shift:]
+    elif shift < 0:
+        return shotnum[:shift]
+    return shotnum
+
+
+def _chunk_rows(row_nbytes: int, chunk_size: Union[int, None]) -> int:
+    """Number of shots written per chunk."""
+    if chunk_size is not None:
+        return max(1, int(chunk_size))
+    return max(1, CHUNK_BYTES // max(1, row_nbytes))
+
+
+def _shotnum_field(dtype: np.dtype) -> Union[str, None]:
+    """Name of the shot number field in a structured dtype."""
+    if dtype.names is None:
+        return None
+    for name in dtype.names:
+        if 'shot' in name.casefold():
+            return name
+    return None
+
+
+def _recreate(group: h5py.Group, name: str,
+              n_rows: int) -> Tuple[h5py.Dataset, np.ndarray]:
+    """
+    Replace dataset **name** in **group** with an empty contiguous
+    dataset of **n_rows** rows.  Returns the new dataset and the
+    contents of the old (layout) dataset.
+    """
+    old = group[name]
+    layout = old[...]
+    attrs = dict(old.attrs)
+    shape = (n_rows,) + old.shape[1:]
+    dtype = old.dtype
+    del group[name]
+
+    dset = group.create_dataset(name, shape=shape, dtype=dtype)
+    dset.attrs.update(attrs)
+
+    return dset, layout
+
+
+def _stream(dset: h5py.Dataset, shotnum: np.ndarray,
+            rows_per_shot: int, chunk: int,
+            fill: Callable[[np.ndarray], np.ndarray]):
+    """
+    Fill **dset** chunk-by-chunk.  **fill** receives the shot numbers
+    of the chunk and returns the rows to be written.
+    """
+    for start in range(0, shotnum.size, chunk):
+        stop = min(start + chunk, shotnum.size)
+        dset[start * rows_per_shot:stop * rows_per_shot, ...] = \
+            fill(shotnum[start:stop])
+
+
+def _tile_rows(layout: np.ndarray, rows_per_shot: int,
+               n_shots: int) -> np.ndarray:
+    """Repeat the first shot's rows of **layout** for **n_shots**."""
+    return np.tile(layout[0:rows_per_shot], n_shots)
+
+
+def _write_digitizer(group: h5py.Group, shotnum: np.ndarray,
+                     rng: np.random.RandomState,
+                     chunk_size: Union[int, None]):
+    """Stream signal and header datasets of a digitizer group."""
+    # pair each signal dataset with its header dataset
+    names = [name for name in group
+             if isinstance(group[name], h5py.Dataset)
+             and not name.endswith(' headers')]
+    for name in names:
+        hname = name + ' headers'
+        if hname not in group:  # pragma: no cover
+            continue
+
+        dset, _ = _recreate(group, name, shotnum.size)
+        hdset, hlayout = _recreate(group, hname, shotnum.size)
+        snfield = _shotnum_field(hdset.dtype)
+        nt = dset.shape[1]
+        chunk = _chunk_rows(nt * dset.dtype.itemsize, chunk_size)
+
+        # a damped sine wave centered in the unsigned ADC range,
+        # like the raw bit values of real SIS data
+        # - 10-bit (SIS 3305) boards use a smaller amplitude
+        adc = 'SIS 3305' if 'SIS 3305' in name \
+            else 'SIS 3302' if 'SIS 3302' in name else 'SIS 3301'
+        maxval = min(2 ** _ADC_BITS[adc] - 1,
+                     np.iinfo(dset.dtype).max)
+        amp = 400 if adc == 'SIS 3305' else 8000
+        tt = np.arange(nt, dtype=np.float64)
+        period = max(nt / 8.0, 2.0)
+        base = 0.5 * maxval + amp * np.exp(-tt / max(nt, 1)) \
+            * np.sin(2.0 * np.pi * tt / period)
+
+        for start in range(0, shotnum.size, chunk):
+            stop = min(start + chunk, shotnum.size)
+            n_shots = stop - start
+
+            signal = rng.randint(-16, 17, size=(n_shots, nt))
+            signal = signal + base
+            np.clip(signal, 0, maxval, out=signal)
+            signal = signal.astype(dset.dtype)
+            dset[start:stop, ...] = signal
+
+            # 'Min' and 'Max' are unsigned for the SIS crate, the
+            # signal is within range of either header dtype
+            header = _tile_rows(hlayout, 1, n_shots)
+            header[snfield] = shotnum[start:stop]
+            for field, func in (('Min', np.min), ('Max', np.max)):
+                if field in header.dtype.names:
+                    header[field] = func(signal, axis=1).astype(
+                        header.dtype[field])
+            if 'Clipped' in header.dtype.names:
+                header['Clipped'] = 0
+            hdset[start:stop] = header
+
+
+def _write_control(group: h5py.Group, shotnum: np.ndarray,
+                   chunk_size: Union[int, None],
+                   shots_per_position: int):
+    """Stream the run-time datasets of a control device group."""
+    # update motion lists to describe a grid spanning all shots
+    n_positions = int(math.ceil(shotnum.size / shots_per_position))
+    nx = int(math.ceil(math.sqrt(n_positions)))
+    ny = int(math.ceil(n_positions / nx))
+    for name in group:
+        if name.startswith('Motion list'):
+            group[name].attrs.update({
+                'Data motion count': np.uint32(shotnum.size),
+                'Motion count': np.uint32(nx * ny),
+                'Nx': np.uint32(nx),
+                'Ny': np.uint32(ny),
+            })
+
+    names = [name for name in group
+             if isinstance(group[name], h5py.Dataset)]
+    for name in names:
+        if group[name].shape[0] % SHOTS_LAYOUT != 0:  # pragma: no cover
+            # not a per-shot dataset
+            continue
+        rows_per_shot = group[name].shape[0] // SHOTS_LAYOUT
+        dset, layout = _recreate(group, name,
+                                 rows_per_shot * shotnum.size)
+        snfield = _shotnum_field(dset.dtype)
+        chunk = _chunk_rows(rows_per_shot * dset.dtype.itemsize,
+                            chunk_size)
+        offset = [0]
+
+        def fill(sn: np.ndarray) -> np.ndarray:
+            rows = _tile_rows(layout, rows_per_shot, sn.size)
+            rows[snfield] = np.repeat(sn, rows_per_shot)
+
+            names = rows.dtype.names
+            if 'x' in names and 'y' in names:
+                # walk the motion list grid
+                index = offset[0] + np.arange(sn.size)
+                pos = index // shots_per_position
+                rows['x'] = (pos % nx - 0.5 * (nx - 1)) * 1.0
+                rows['y'] = (pos // nx - 0.5 * (ny - 1)) * 1.0
+            if 'Command index' in names:
+                # cycle through the command list
+                index = offset[0] + np.arange(sn.size)
+                rows['Command index'] = \
+                    np.repeat((index // 5) % 3, rows_per_shot)
+
+            offset[0] += sn.size
+            return rows
+
+        _stream(dset, shotnum, rows_per_shot, chunk, fill)
+
+
+def _write_msi(group: h5py.Group, shotnum: np.ndarray,
+               rng: np.random.RandomState,
+               chunk_size: Union[int, None]):
+    """Stream every per-shot dataset of a MSI diagnostic group."""
+    dsets = []
+
+    def collect(name, obj):
+        if isinstance(obj, h5py.Dataset) \
+                and obj.shape[0] == _MSI_LAYOUT_ROWS:
+            dsets.append((obj.parent, obj.name.split('/')[-1]))
+    group.visititems(collect)
+
+    for parent, name in dsets:
+        dset, layout = _recreate(parent, name, shotnum.size)
+        snfield = _shotnum_field(dset.dtype)
+        chunk = _chunk_rows(dset.dtype.itemsize
+                            * int(np.prod(dset.shape[1:])),
+                            chunk_size)
+
+        if snfield is not None:
+            def fill(sn: np.ndarray) -> np.ndarray:
+                rows = _tile_rows(layout, 1, sn.size)
+                rows[snfield] = sn
+                return rows
+        elif np.issubdtype(dset.dtype, np.floating):
+            level = _MSI_LEVELS.get(name, 0.0)
+
+            def fill(sn: np.ndarray) -> np.ndarray:
+                shape = (sn.size,) + dset.shape[1:]
+                return level + rng.standard_normal(size=shape)
+        else:  # pragma: no cover
+            def fill(sn: np.ndarray) -> np.ndarray:
+                return _tile_rows(layout, 1, sn.size)
+
+        _stream(dset, shotnum, 1, chunk, fill)
+
+
+def _active_brdch(digitizer: str, n_boards: int, n_channels: int,
+                  sis3305_boards: int, sis3305_mode: int) -> np.ndarray:
+    """Build the Faux* :code:`active_brdch` knob value."""
+    if digitizer == 'SIS 3301':
+        brdch = np.zeros((13, 8), dtype=bool)
+        brdch[:n_boards, :n_channels] = True
+        return brdch
+
+    brdch = np.zeros((), dtype=[('SIS 3302', bool, (4, 8)),
+                                ('SIS 3305', bool, (2, 8))])
+    brdch['SIS 3302'][:n_boards, :n_channels] = True
+    if sis3305_boards:
+        # enabled channels per FPGA depend on the acquisition mode
+        fpga_chs = {0: [0, 1, 2, 3], 1: [0, 2], 2: [0]}[sis3305_mode]
+        chs = [ch for ch in fpga_chs if ch < n_channels] or [0]
+        for brd in range(sis3305_boards):
+            for ch in chs:
+                brdch['SIS 3305'][brd, ch] = True
+                brdch['SIS 3305'][brd, ch + 4] = True
+    return brdch
+
+
+def write_synthetic_file(
+        path: str,
+        sn_size: int = None,
+        nt: int = 10000,
+        target_size: Union[int, str] = None,
+        digitizer: str = 'SIS crate',
+        n_boards: int = 1,
+        n_channels: int = 1,
+        sis3305_boards: int = 0,
+        sis3305_mode: int = 0,
+        n_probes: int = 1,
+        waveform_configs: int = 1,
+        controls: Iterable[str] = ('6K Compumotor', 'Waveform'),
+        msi: Iterable[str] = _KNOWN_MSI,
+        gaps: Iterable[Tuple[int, int]] = None,
+        misalign: Dict[str, int] = None,
+        shots_per_position: int = 1,
+        chunk_size: int = None,
+        seed: int = None,
+        overwrite: bool = False) -> str:
+    """
+    Write a synthetic LaPD HDF5 file of arbitrary size.
+
+    :param path: path of the file to write
+    :param sn_size: number of recorded shots (determined from
+        **target_size** if omitted)
+    :param nt: number of samples per digitizer trace
+    :param target_size: approximate size of the digitizer data
+        (e.g. :code:`'2G'`), used to determine **sn_size**
+    :param digitizer: :code:`'SIS crate'` (DEFAULT) or
+        :code:`'SIS 3301'`
+    :param n_boards: number of active (SIS 3302/3301) boards
+    :param n_channels: number of active channels per board
+    :param sis3305_boards: number of active SIS 3305 boards
+        (:code:`'SIS crate'` only)
+    :param sis3305_mode: SIS 3305 acquisition mode (0 = 1.25 GHz,
+        1 = 2.5 GHz, 2 = 5 GHz)
+    :param n_probes: number of :code:`'6K Compumotor'` probes
+        (configurations)
+    :param waveform_configs: number of :code:`'Waveform'`
+        configurations
+    :param controls: control devices to add
+    :param msi: MSI diagnostics to add
+    :param gaps: :code:`(start, length)` tuples of missing global shot
+        numbers (see :func:`build_shotnum`)
+    :param misalign: dictionary of device name to shot shift; a
+        positive shift drops the device's first shots, a negative
+        shift drops its last shots
+    :param shots_per_position: number of shots recorded at each
+        motion list position
+    :param chunk_size: number of shots written per chunk (DEFAULT
+        targets ~64 MB chunks)
+    :param seed: seed for the random number generator
+    :param overwrite: :code:`True` to overwrite an existing file
+    :return: absolute path of the written file
+
+    If writing fails part-way, the partly written file is removed
+    before the exception is re-raised.
+
+    :Example:
+
+        >>> path = write_synthetic_file('run.hdf5', target_size='2G',
+        ...                             nt=10000, n_channels=8,
+        ...                             gaps=[(100, 5)],
+        ...                             misalign={'Waveform': 3})
+        >>> f = bapsflib.lapd.File(path)
+    """
+    path = os.path.abspath(path)
+    if os.path.exists(path) and not overwrite:
+        raise FileExistsError(
+            "'{}' already exists, pass `overwrite=True`".format(path))
+    if digitizer not in ('SIS crate', 'SIS 3301'):
+        raise ValueError(
+            "`digitizer` must be 'SIS crate' or 'SIS 3301'")
+    controls = list(controls)
+    msi = list(msi)
+    misalign = {} if misalign is None else dict(misalign)
+
+    # -- determine number of shots                                 ----
+    brdch = _active_brdch(digitizer, n_boards, n_channels,
+                          sis3305_boards, sis3305_mode)
+    if digitizer == 'SIS 3301':
+        n_traces = int(np.count_nonzero(brdch))
+    else:
+        n_traces = int(np.count_nonzero(brdch['SIS 3302'])
+                       + np.count_nonzero(brdch['SIS 3305']))
+    if sn_size is None:
+        if target_size is None:
+            raise ValueError(
+                'one of `sn_size` or `target_size` must be given')
+        sn_size = parse_size(target_size) // (2 * nt * n_traces)
+    sn_size = int(sn_size)
+    if sn_size < 1:
+        raise ValueError('`sn_size` must be >= 1')
+    shotnum = build_shotnum(sn_size, gaps)
+
+    # -- lay out the file with the Faux* builders                  ----
+    modules = {
+        digitizer: {'sn_size': SHOTS_LAYOUT, 'nt': nt},
+    }
+    for name in controls:
+        if name == '6K Compumotor':
+            modules[name] = {'n_configs': n_probes}
+        elif name == 'Waveform':
+            modules[name] = {'n_configs': waveform_configs}
+        else:
+            modules[name] = {}
+        modules[name]['sn_size'] = SHOTS_LAYOUT
+    for name in msi:
+        modules[name] = {}
+
+    rng = np.random.RandomState(seed)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        fbuild = None
+        try:
+            fbuild = FauxHDFBuilder(name=path, add_modules=modules)
+            knobs = fbuild.modules[digitizer].knobs
+            if digitizer == 'SIS crate':
+                knobs.sis3305_mode = sis3305_mode
+            knobs.active_brdch = brdch
+
+            # -- re-create datasets at full size                   ----
+            group = fbuild['Raw data + config/' + digitizer]
+            _write_digitizer(group,
+                             _misalign(shotnum,
+                                       misalign.get(digitizer, 0)),
+                             rng, chunk_size)
+            for name in controls:
+                group = fbuild['Raw data + config/' + name]
+                _write_control(group,
+                               _misalign(shotnum,
+                                         misalign.get(name, 0)),
+                               chunk_size, shots_per_position)
+            for name in msi:
+                _write_msi(fbuild['MSI/' + name],
+                           _misalign(shotnum, misalign.get(name, 0)),
+                           rng, chunk_size)
+        except BaseException:
+            # do not leave a partly written file behind
+            if fbuild is not None:
+                fbuild.close()
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        fbuild.close()
+
+    return path
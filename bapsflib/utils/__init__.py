@@ -8,6 +8,6 @@
 # License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
 #   license terms and contributor agreement.
 #
-from . import (errors, warnings)
+from . import (errors, lazyload, warnings)
 
-__all__ = ['errors', 'warnings']
+__all__ = ['errors', 'lazyload', 'warnings']
@@ -16,6 +16,14 @@ class HDFMappingError(Exception):
         super().__init__("'" + device_name + "' mapping failed: " + why)
 
 
+class HDFEmptyIntersectionError(ValueError):
+    """
+    Exception for a shot number selection that has no shot numbers in
+    common with the datasets being read
+    """
+    pass
+
+
 class HDFReadError(Exception):
     """Exception for failed HDF5 reading"""
     pass
@@ -0,0 +1,81 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Lazy loading of package sub-modules and their attributes.
+
+A package :code:`__init__` declares its public API with :func:`attach`
+and the sub-modules are only imported on first attribute access (see
+`PEP 562 <https://www.python.org/dev/peps/pep-0562/>`_)::
+
+    __getattr__, __dir__, __all__ = lazyload.attach(
+        __name__,
+        submodules=['core'],
+        submod_attrs={'core': ['read_data']})
+
+so :code:`import bapsflib` does not pay for the sub-packages (and
+their :mod:`astropy` and :mod:`scipy` imports) a script never uses.
+On Python < 3.7 module level :code:`__getattr__` is not supported and
+everything is imported eagerly.
+"""
+import importlib
+import sys
+
+from typing import (Callable, Dict, Iterable, List, Tuple)
+
+__all__ = ['attach']
+
+
+def attach(package_name: str, submodules: Iterable[str] = (),
+           submod_attrs: Dict[str, Iterable[str]] = None
+           ) -> Tuple[Callable, Callable, List[str]]:
+    """
+    Attach lazily loaded sub-modules and attributes to a package.
+
+    :param str package_name: name of the package, the :code:`__name__`
+        of the calling :code:`__init__`
+    :param submodules: names of the sub-modules to expose
+    :param submod_attrs: mapping of sub-module name to the names of
+        its attributes to expose on the package
+    :return: the :code:`__getattr__`, :code:`__dir__`, and
+        :code:`__all__` to assign in the package namespace
+    """
+    submod_attrs = {} if submod_attrs is None else submod_attrs
+    attr_to_modules = {attr: mod for mod, attrs in submod_attrs.items()
+                       for attr in attrs}
+    submodules = set(submodules)
+    __all__ = sorted(submodules | set(attr_to_modules),
+                     key=str.lower)
+
+    def __getattr__(name):
+        if name in submodules:
+            return importlib.import_module(
+                '{}.{}'.format(package_name, name))
+        elif name in attr_to_modules:
+            submod = importlib.import_module(
+                '{}.{}'.format(package_name, attr_to_modules[name]))
+            attr = getattr(submod, name)
+
+            # cache on the package so __getattr__ is not called again
+            setattr(sys.modules[package_name], name, attr)
+            return attr
+        raise AttributeError(
+            "module '{}' has no attribute '{}'".format(package_name,
+                                                        name))
+
+    def __dir__():
+        return list(__all__)
+
+    if sys.version_info < (3, 7):  # pragma: no cover
+        # no module __getattr__ (PEP 562), load everything now
+        for name in __all__:
+            setattr(sys.modules[package_name], name, __getattr__(name))
+
+    return __getattr__, __dir__, list(__all__)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest as ut
+
+#: modules `import bapsflib` must not import
+HEAVY_MODULES = ('astropy', 'asyncio', 'h5py', 'scipy')
+
+
+def imported_modules(code: str) -> list:
+    """
+    Top-level modules imported after running **code** in a fresh
+    interpreter.
+    """
+    code += ('\nimport json, sys\n'
+             'print(json.dumps(sorted(set('
+             'name.split(".")[0] for name in sys.modules))))')
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.dirname(os.path.abspath(__file__)))))
+    env['PYTHONPATH'] = os.pathsep.join(
+        [root] + [path for path in (env.get('PYTHONPATH'),) if path])
+    out = subprocess.check_output([sys.executable, '-c', code],
+                                  env=env)
+    return json.loads(out.decode().splitlines()[-1])
+
+
+@ut.skipIf(sys.version_info < (3, 7),
+           'module __getattr__ requires Python >= 3.7')
+class TestLazyLoad(ut.TestCase):
+    """Test case for :mod:`bapsflib.utils.lazyload`."""
+
+    def setUp(self):
+        # a throw away package with lazily loaded sub-modules
+        self.tmpdir = tempfile.TemporaryDirectory()
+        pkg_dir = os.path.join(self.tmpdir.name, 'lazypkg')
+        os.mkdir(pkg_dir)
+        files = {
+            '__init__.py': """
+                from bapsflib.utils import lazyload
+
+                __getattr__, __dir__, __all__ = lazyload.attach(
+                    __name__, submodules=['alpha', 'beta'],
+                    submod_attrs={'beta': ['value']})
+                """,
+            'alpha.py': "LOADED = True\n",
+            'beta.py': "value = 42\n",
+        }
+        for name, code in files.items():
+            with open(os.path.join(pkg_dir, name), 'w') as f:
+                f.write(textwrap.dedent(code))
+        sys.path.insert(0, self.tmpdir.name)
+
+    def tearDown(self):
+        sys.path.remove(self.tmpdir.name)
+        for name in [name for name in sys.modules
+                     if name.split('.')[0] == 'lazypkg']:
+            del sys.modules[name]
+        self.tmpdir.cleanup()
+
+    def test_attach(self):
+        import lazypkg
+
+        self.assertEqual(lazypkg.__all__, ['alpha', 'beta', 'value'])
+        self.assertEqual(dir(lazypkg), lazypkg.__all__)
+        self.assertNotIn('lazypkg.alpha', sys.modules)
+        self.assertNotIn('lazypkg.beta', sys.modules)
+
+        # sub-modules load on access
+        self.assertTrue(lazypkg.alpha.LOADED)
+        self.assertIn('lazypkg.alpha', sys.modules)
+        self.assertNotIn('lazypkg.beta', sys.modules)
+
+        # attributes load their sub-module and are cached
+        self.assertEqual(lazypkg.value, 42)
+        self.assertIn('lazypkg.beta', sys.modules)
+        self.assertIn('value', vars(lazypkg))
+        from lazypkg import value
+        self.assertEqual(value, 42)
+
+        # unknown names
+        with self.assertRaises(AttributeError):
+            lazypkg.gamma
+        with self.assertRaises(ImportError):
+            from lazypkg import gamma  # noqa
+
+    def test_import_bapsflib(self):
+        # a startup regression (e.g. an eager astropy import) fails
+        modules = imported_modules('import bapsflib')
+        for name in HEAVY_MODULES:
+            self.assertNotIn(name, modules)
+
+        # the file classes do not need astropy or scipy until data
+        # with units is read
+        modules = imported_modules('from bapsflib.lapd import File')
+        self.assertIn('h5py', modules)
+        for name in ('astropy', 'scipy'):
+            self.assertNotIn(name, modules)
+
+    def test_public_api(self):
+        import bapsflib
+
+        # everything advertised by the lazy packages resolves
+        for pkg in (bapsflib, bapsflib._hdf, bapsflib._hdf.maps,
+                    bapsflib._hdf.utils, bapsflib.export,
+                    bapsflib.lapd, bapsflib.plasma):
+            for name in pkg.__all__:
+                self.assertIsNotNone(getattr(pkg, name),
+                                     '{}.{}'.format(pkg.__name__,
+                                                    name))
+        self.assertIs(bapsflib.lapd.File,
+                      bapsflib.lapd._hdf.file.File)
+        self.assertIs(bapsflib._hdf.File,
+                      bapsflib._hdf.utils.file.File)
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,27 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Performance benchmarks for :mod:`bapsflib`, written for
+`airspeed velocity <https://asv.readthedocs.io>`_.
+
+The benchmarks build synthetic LaPD HDF5 files with the Faux* builders
+(see :class:`~bapsflib.synthetic.faux.FauxHDFBuilder`)
+and time the hot paths of file mapping and reading.  Run with::
+
+    asv run
+
+or, against the current working tree only::
+
+    asv run --python=same --quick
+
+Generated files are cached in the directory given by the environment
+variable :code:`BAPSFLIB_BENCH_DIR` (a temporary directory by default).
+"""
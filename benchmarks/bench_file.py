@@ -0,0 +1,61 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""Benchmarks for opening and mapping HDF5 files."""
+from bapsflib import lapd
+from bapsflib._hdf.maps import HDFMap
+
+from .common import (digi_file, faux_file, SN_SIZES, SN_SWEEP_NT)
+
+
+class FileOpen(object):
+    """Time :class:`bapsflib.lapd.File` open (includes mapping)."""
+    params = [SN_SIZES]
+    param_names = ['sn_size']
+    timeout = 600
+
+    def setup(self, sn_size):
+        self.path = digi_file(sn_size, SN_SWEEP_NT)
+
+    def time_open(self, sn_size):
+        with lapd.File(self.path, silent=True):
+            pass
+
+    def time_remap(self, sn_size):
+        with lapd.File(self.path, silent=True) as f:
+            f._map_file()
+
+
+class MapAllDevices(object):
+    """Time mapping a file containing every known Faux* device."""
+    timeout = 600
+
+    def setup(self):
+        self.path = faux_file('all_devices', {
+            '6K Compumotor': {'n_configs': 3, 'n_motionlists': 10},
+            'N5700_PS': {'n_configs': 3},
+            'NI_XZ': {'n_motionlists': 10},
+            'Waveform': {'n_configs': 3},
+            'SIS crate': {'n_configs': 3, 'nt': 1000},
+            'Discharge': {},
+            'Gas pressure': {},
+            'Heater': {},
+            'Interferometer array': {},
+            'Magnetic field': {},
+        })
+        self.f = lapd.File(self.path, silent=True)
+
+    def teardown(self):
+        self.f.close()
+
+    def time_hdfmap(self):
+        HDFMap(self.f, control_path='Raw data + config',
+               digitizer_path='Raw data + config',
+               msi_path='MSI')
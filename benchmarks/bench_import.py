@@ -0,0 +1,51 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Import-time benchmarks.  Each :code:`timeraw_*` snippet runs in a fresh
+interpreter, so it measures the full cost of the import (see
+`asv <https://asv.readthedocs.io>`_).  A startup regression that pulls
+:mod:`astropy` or :mod:`scipy` back into :code:`import bapsflib` is
+also caught by the unit test
+:mod:`bapsflib.utils.tests.test_lazyload`.
+
+.. note::
+
+    Lazy loading keeps :mod:`astropy` out of :code:`import bapsflib`,
+    opening a file, and control or MSI reads, but not out of digitizer
+    reads.  :mod:`~bapsflib._hdf.utils.hdfreaddata` imports
+    :mod:`astropy.units` at module level because the meta-info of
+    every read holds astropy quantities (:code:`'signal units'` and
+    :code:`'voltage offset'`), so the first
+    :meth:`~bapsflib._hdf.utils.file.File.read_data` pays the astropy
+    import cost.  :meth:`timeraw_import_read_data` includes that cost
+    on purpose.
+"""
+
+
+class Import(object):
+    """Interpreter startup cost of importing bapsflib."""
+    # a fresh interpreter per sample is slow, keep the count low
+    repeat = (5, 10, 20.0)
+    number = 1
+
+    def timeraw_import_bapsflib(self):
+        return 'import bapsflib'
+
+    def timeraw_import_lapd_file(self):
+        return 'from bapsflib.lapd import File'
+
+    def timeraw_import_read_data(self):
+        # everything a digitizer read imports, astropy included
+        return ('from bapsflib.lapd import File\n'
+                'import bapsflib._hdf.utils.hdfreaddata')
+
+    def timeraw_import_plasma(self):
+        return 'import bapsflib.plasma.core'
@@ -0,0 +1,67 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""Benchmarks for the LaPD port number and z location conversions."""
+import numpy as np
+
+from bapsflib.lapd.tools import (portnum_to_z, portnum_to_z_array,
+                                 z_to_portnum, z_to_portnum_array)
+
+#: number of converted points
+N_POINTS = [1000, 1000000]
+
+
+class PortConversion(object):
+    """
+    Quantity based (:func:`~bapsflib.lapd.tools.portnum_to_z`) versus
+    array-native (:func:`~bapsflib.lapd.tools.portnum_to_z_array`)
+    conversions of arrays of port numbers and z locations.
+    """
+    params = [N_POINTS]
+    param_names = ['n_points']
+
+    def setup(self, n_points):
+        rng = np.random.RandomState(0)
+        self.portnum = rng.uniform(0., 60., n_points)
+        self.z = portnum_to_z_array(self.portnum, as_quantity=False)
+
+    def time_portnum_to_z(self, n_points):
+        portnum_to_z(self.portnum)
+
+    def time_portnum_to_z_array(self, n_points):
+        portnum_to_z_array(self.portnum)
+
+    def time_portnum_to_z_array_float(self, n_points):
+        portnum_to_z_array(self.portnum, as_quantity=False)
+
+    def time_z_to_portnum(self, n_points):
+        z_to_portnum(self.z)
+
+    def time_z_to_portnum_array(self, n_points):
+        z_to_portnum_array(self.z)
+
+    def time_z_to_portnum_array_rounded(self, n_points):
+        z_to_portnum_array(self.z, round_to_nearest=True)
+
+
+class PortConversionScalar(object):
+    """Per-call overhead of converting a single port or z location."""
+
+    def time_portnum_to_z(self):
+        portnum_to_z(27)
+
+    def time_portnum_to_z_array(self):
+        portnum_to_z_array(27)
+
+    def time_z_to_portnum(self):
+        z_to_portnum(830.7)
+
+    def time_z_to_portnum_array(self):
+        z_to_portnum_array(830.7)
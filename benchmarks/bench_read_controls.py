@@ -0,0 +1,57 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""
+Benchmarks for :meth:`bapsflib._hdf.utils.file.File.read_controls`.
+"""
+import warnings
+
+from bapsflib import lapd
+
+from .common import (digi_file, SN_SIZES, SN_SWEEP_NT)
+
+
+class ReadControls(object):
+    """
+    :code:`read_controls` timings for the command list based
+    :code:`'Waveform'` and the :code:`'6K Compumotor'` control devices.
+    """
+    params = [SN_SIZES]
+    param_names = ['sn_size']
+    timeout = 1200
+
+    def setup(self, sn_size):
+        warnings.simplefilter('ignore')
+        self.sn_size = sn_size
+        self.f = lapd.File(digi_file(sn_size, SN_SWEEP_NT), silent=True)
+
+    def teardown(self, sn_size):
+        self.f.close()
+
+    def time_command_list(self, sn_size):
+        self.f.read_controls(['Waveform'], silent=True)
+
+    def time_command_list_by_shotnum(self, sn_size):
+        self.f.read_controls(['Waveform'],
+                             shotnum=slice(1, sn_size + 1, 3),
+                             silent=True)
+
+    def time_sixk(self, sn_size):
+        self.f.read_controls([('6K Compumotor', 3)], silent=True)
+
+    def time_two_controls(self, sn_size):
+        self.f.read_controls(['Waveform', ('6K Compumotor', 3)],
+                             silent=True)
+
+    def time_two_controls_union(self, sn_size):
+        self.f.read_controls(['Waveform', ('6K Compumotor', 3)],
+                             shotnum=slice(1, sn_size + 10, 2),
+                             intersection_set=False,
+                             silent=True)
@@ -0,0 +1,108 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""Benchmarks for :meth:`bapsflib._hdf.utils.file.File.read_data`."""
+import warnings
+
+from bapsflib import lapd
+
+from .common import (digi_file, NT_SIZES, NT_SWEEP_SN_SIZE, SN_SIZES,
+                     SN_SWEEP_NT)
+
+
+class _ReadDataBase(object):
+    """Common setup for the :code:`read_data` benchmarks."""
+    timeout = 1200
+
+    def _open(self, sn_size, nt):
+        warnings.simplefilter('ignore')
+        self.sn_size = sn_size
+        self.f = lapd.File(digi_file(sn_size, nt), silent=True)
+
+    def teardown(self, *args):
+        self.f.close()
+
+    def _read(self, **kwargs):
+        return self.f.read_data(0, 0, digitizer='SIS 3301',
+                                silent=True, **kwargs)
+
+
+class ReadDataShotSweep(_ReadDataBase):
+    """
+    :code:`read_data` timings as the number of shots grows
+    (:data:`~.common.SN_SIZES`).
+    """
+    params = [SN_SIZES]
+    param_names = ['sn_size']
+
+    def setup(self, sn_size):
+        self._open(sn_size, SN_SWEEP_NT)
+
+    def time_read_all(self, sn_size):
+        self._read()
+
+    def time_read_by_index(self, sn_size):
+        self._read(index=slice(0, None, 2))
+
+    def time_read_by_shotnum(self, sn_size):
+        self._read(shotnum=slice(1, sn_size + 1, 2))
+
+    def time_read_by_shotnum_list(self, sn_size):
+        self._read(shotnum=list(range(1, sn_size + 1, 10)))
+
+    def time_read_where(self, sn_size):
+        self._read(where={'Clipped': 0, 'Max': ('>=', 0)})
+
+    def time_read_region(self, sn_size):
+        self._read(region={'center': (0., 0.), 'radius': 1.},
+                   add_controls=[('6K Compumotor', 3)])
+
+    def time_read_w_controls(self, sn_size):
+        self._read(shotnum=slice(1, sn_size + 1, 2),
+                   add_controls=['Waveform', ('6K Compumotor', 3)])
+
+    def time_read_w_controls_union(self, sn_size):
+        self._read(shotnum=slice(1, sn_size + 10, 2),
+                   add_controls=['Waveform', ('6K Compumotor', 3)],
+                   intersection_set=False)
+
+    def peakmem_read_all(self, sn_size):
+        self._read()
+
+
+class ReadDataSampleSweep(_ReadDataBase):
+    """
+    :code:`read_data` timings as the number of samples per shot grows
+    (:data:`~.common.NT_SIZES`).
+    """
+    params = [NT_SIZES]
+    param_names = ['nt']
+
+    def setup(self, nt):
+        self._open(NT_SWEEP_SN_SIZE, nt)
+
+    def time_read_all(self, nt):
+        self._read()
+
+    def time_read_keep_bits(self, nt):
+        self._read(keep_bits=True)
+
+    def time_read_by_index(self, nt):
+        self._read(index=slice(0, None, 2))
+
+    def time_read_by_shotnum(self, nt):
+        self._read(shotnum=slice(1, None, 2))
+
+    def time_read_union(self, nt):
+        self._read(shotnum=slice(1, NT_SWEEP_SN_SIZE + 100, 2),
+                   intersection_set=False)
+
+    def peakmem_read_all(self, nt):
+        self._read()
@@ -0,0 +1,37 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""Benchmarks for :meth:`bapsflib._hdf.utils.file.File.read_msi`."""
+import warnings
+
+from bapsflib import lapd
+
+from .common import faux_file
+
+MSI_DIAGNOSTICS = ['Discharge', 'Gas pressure', 'Heater',
+                   'Interferometer array', 'Magnetic field']
+
+
+class ReadMSI(object):
+    """:code:`read_msi` timings for every MSI diagnostic."""
+    params = [MSI_DIAGNOSTICS]
+    param_names = ['diagnostic']
+    timeout = 600
+
+    def setup(self, diagnostic):
+        warnings.simplefilter('ignore')
+        path = faux_file('msi', {name: {} for name in MSI_DIAGNOSTICS})
+        self.f = lapd.File(path, silent=True)
+
+    def teardown(self, diagnostic):
+        self.f.close()
+
+    def time_read_msi(self, diagnostic):
+        self.f.read_msi(diagnostic, silent=True)
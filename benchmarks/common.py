@@ -0,0 +1,86 @@
+# This file is part of the bapsflib package, a Python toolkit for the
+# BaPSF group at UCLA.
+#
+# http://plasma.physics.ucla.edu/
+#
+# Copyright 2017-2018 Erik T. Everson and contributors
+#
+# License: Standard 3-clause BSD; see "LICENSES/LICENSE.txt" for full
+#   license terms and contributor agreement.
+#
+"""Helpers shared by the benchmark modules."""
+import numpy as np
+import os
+import tempfile
+import warnings
+
+from bapsflib.synthetic import FauxHDFBuilder
+from typing import (Any, Dict)
+
+#: directory synthetic benchmark files are cached in
+BENCH_DIR = os.environ.get(
+    'BAPSFLIB_BENCH_DIR',
+    os.path.join(tempfile.gettempdir(), 'bapsflib-bench'))
+
+#: shot number sweep (number of shots)
+SN_SIZES = [1000, 10000, 100000, 1000000]
+
+#: number of samples per shot used for the shot number sweep
+SN_SWEEP_NT = 100
+
+#: sample sweep (number of samples per shot)
+NT_SIZES = [1000, 10000, 100000]
+
+#: number of shots used for the sample sweep
+NT_SWEEP_SN_SIZE = 1000
+
+
+def faux_file(name: str, modules: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Build (or re-use a previously built) synthetic LaPD HDF5 file.
+
+    Only one board/channel of the :code:`'SIS 3301'` digitizer is
+    kept active so the file size is dominated by the requested
+    :code:`sn_size` and :code:`nt`.
+
+    :param name: unique name of the file (without extension)
+    :param modules: modules passed to
+        :class:`~bapsflib.synthetic.faux.FauxHDFBuilder`
+        as :code:`add_modules`
+    :return: path to the HDF5 file
+    """
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    path = os.path.join(BENCH_DIR, name + '.hdf5')
+    if os.path.exists(path):
+        return path
+
+    # build in a temporary file so an interrupted build is not re-used
+    tmp_path = path + '.part'
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        fbuild = FauxHDFBuilder(name=tmp_path, add_modules=modules)
+        if 'SIS 3301' in fbuild.modules:
+            knobs = fbuild.modules['SIS 3301'].knobs
+            brdch = np.zeros(knobs.active_brdch.shape, dtype=bool)
+            brdch[0][0] = True
+            knobs.active_brdch = brdch
+        fbuild.close()
+    os.replace(tmp_path, path)
+
+    return path
+
+
+def digi_file(sn_size: int, nt: int, controls=True) -> str:
+    """
+    Synthetic file with a :code:`'SIS 3301'` digitizer and (optionally)
+    the :code:`'Waveform'` and :code:`'6K Compumotor'` control devices,
+    all recording **sn_size** shots.
+    """
+    modules = {'SIS 3301': {'sn_size': sn_size, 'nt': nt}}
+    name = 'digi_sn{}_nt{}'.format(sn_size, nt)
+    if controls:
+        modules['Waveform'] = {'sn_size': sn_size}
+        modules['6K Compumotor'] = {'sn_size': sn_size}
+        name += '_controls'
+
+    return faux_file(name, modules)
@@ -81,6 +81,11 @@ setup(
                       'h5py>=2.6',
                       'numpy>=1.7',
                       'scipy>=1.0.0'],
+    extras_require={
+        'arrow': ['pyarrow>=1.0'],
+        'dask': ['dask[array]', 'xarray'],
+        'zarr': ['zarr>=2.3'],
+    },
     python_requires='>=3.5',
     author='Erik T. Everson',
     author_email='eteveson@gmail.com',
@@ -88,7 +93,13 @@ setup(
     url='https://github.com/BaPSF/bapsflib',
     keywords=['bapsf', 'HDF5', 'lapd', 'physics', 'plasma', 'science'],
     classifiers=CLASSIFIERS,
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
+    entry_points={
+        'console_scripts': [
+            'bapsflib-overview = bapsflib.overview.cli:main',
+            'bapsflib-synthetic = bapsflib.synthetic.cli:main',
+        ],
+    },
     zip_safe=False,
     include_package_data=True,
     package_urls={